@@ -1 +1,29 @@
-from . import agent
+"""
+Professional Development Agent Package.
+
+The agents, their tools and the clients they use are imported lazily, on first access
+of `agent` or `root_agent`, so that importing a module of the package, e.g. the
+configuration or a utility module, does not pull in ADK and the Google Cloud client
+libraries. ADK's agent loader imports the package and then accesses `root_agent`, which
+loads the agents at that point.
+
+Example:
+    ```python
+    import adk_hackathon_professional_development_agent as package
+
+    root_agent = package.root_agent  # Imports the agents
+    ```
+"""
+
+import importlib
+from typing import Any
+
+__all__ = ["agent", "root_agent"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "agent":
+        return importlib.import_module(".agent", __name__)
+    if name == "root_agent":
+        return importlib.import_module(".agent", __name__).root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
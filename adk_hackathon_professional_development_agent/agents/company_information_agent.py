@@ -15,12 +15,18 @@ The agent can:
 
 Example:
     ```python
-    from agents.company_information_agent import company_information_agent
+    from agents.company_information_agent import (
+        ask_company_information_agent,
+        company_information_agent,
+    )
 
     # Get information about training policies
     response = company_information_agent.invoke(
         "What is our company's policy on external training courses?"
     )
+
+    # Ask it outside of a conversation, e.g. to prefetch the company policy
+    answer = await ask_company_information_agent("What is the training budget?")
     ```
 
 Note:
@@ -29,9 +35,13 @@ Note:
 """
 
 from google.adk.agents import LlmAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
 
-from ..config import config
 from ..tools.company_information_search_tool import company_information_search_tool
+from ..utils.answer_cache import cache_answer, use_cached_answer
+from ..utils.history_compaction import compact_history
+from ..utils.model_call_policy import get_model
 
 # The only reason the company_information_search_tool is not used directly is because, currently,
 # only one built-in tool is supported for each root agent or single agent. No other tools of any type can be used in the same agent.
@@ -39,7 +49,7 @@ from ..tools.company_information_search_tool import company_information_search_t
 # For more information, see https://google.github.io/adk-docs/tools/built-in-tools/#limitations
 company_information_agent = LlmAgent(
     name="CompanyInformationAgent",
-    model=config.model_name,
+    model=get_model("CompanyInformationAgent"),
     description="Can answer questions about the company's information.",
     instruction=(
         "You are a helpful agent who can answer questions about the company's information. "
@@ -49,4 +59,32 @@ company_information_agent = LlmAgent(
     tools=[
         company_information_search_tool,
     ],
+    before_model_callback=[use_cached_answer, compact_history],
+    after_model_callback=[cache_answer],
 )
+
+
+async def ask_company_information_agent(request: str) -> str:
+    """Ask the company information agent in a session of its own, like its AgentTool.
+
+    Args:
+        request (str): The question about the company
+
+    Returns:
+        str: The final answer of the agent
+    """
+    runner = InMemoryRunner(
+        agent=company_information_agent, app_name=company_information_agent.name
+    )
+    session = await runner.session_service.create_session(
+        app_name=company_information_agent.name, user_id="company_information"
+    )
+    answer = ""
+    async for event in runner.run_async(
+        user_id=session.user_id,
+        session_id=session.id,
+        new_message=types.Content(role="user", parts=[types.Part(text=request)]),
+    ):
+        if event.is_final_response() and event.content and event.content.parts:
+            answer = "\n".join(part.text for part in event.content.parts if part.text)
+    return answer
@@ -27,35 +27,76 @@ Example:
 Note:
     This agent works closely with the project_portfolio_tool to align skill
     development recommendations with actual project needs and opportunities
-    within the company.
+    within the company. The employee profile, company information, company policy
+    and project portfolio are prefetched concurrently before the first LLM call
+    (see utils.context_prefetch).
 """
 
+import functools
+
 from google.adk.agents import LlmAgent
 
 from ..config import config
+from ..tools.company_documents_search_tool import (
+    company_documents_search_tool,
+    search_company_documents,
+)
 from ..tools.company_information_tool import company_information_tool
 from ..tools.employee_profile_tool import employee_profile_tool
 from ..tools.project_portfolio_tool import project_portfolio_tool
-from ..tools.training_finder_tool import training_finder_tool
+from ..tools.project_skill_gaps_tool import project_skill_gaps_tool
+from ..tools.skill_gaps_tool import skill_gaps_tool
+from ..tools.skill_lookup_tool import skill_lookup_tool
+from ..tools.training_catalog_tool import training_catalog_tool
+from ..utils.context_prefetch import create_skills_context_prefetch
+from ..utils.history_compaction import compact_history
+from ..utils.metrics import clear_tool_call_labels, label_tool_call
+from ..utils.model_call_policy import get_model
+from ..utils.tool_memoization import memoize_result, use_memoized_result
+from ..utils.tool_output_shaping import shape_tool_result
+from .company_information_agent import ask_company_information_agent
 
+if config.company_information_backend == "local_index":
+    company_tool = company_documents_search_tool
+    company_tool_name = "search_company_documents"
+    ask_company_information = functools.partial(search_company_documents, top_k=3)
+else:
+    company_tool = company_information_tool
+    company_tool_name = "company_information_tool"
+    ask_company_information = ask_company_information_agent
 
 current_or_future_skills_development_agent = LlmAgent(
     name="CurrentOrFutureSkillsDevelopmentAgent",
-    model=config.model_name,
+    model=get_model("CurrentOrFutureSkillsDevelopmentAgent"),
     description="Detects employee current or future professional skills development needs based on the current skills and company information.",
     instruction=(
         "You are a helpful agent who can detect employee current professional skills development needs based on the current skills and company information. "
         "Based on the passed email address, call the 'get_employee_profile_tool' tool to get the employee profile and current skills. "
-        "Get the company information by calling the 'company_information_tool' tool. "
-        "Get the project portfolio by calling the 'get_project_portfolio_tool' tool. "
-        "Get the employee professional development company policy by calling the 'company_information_tool' tool. Make sure your recommendations align with the company policy. "
-        "If the user would like to find training opportunities, call the 'training_finder_tool' tool to find training opportunities. Make sure to display the training's name, description, skills, date when it can be started, cost in USD, and URL in a structured format to the user for all training opportunities even if the training_finder_tool already returned them."
+        f"Get the company information by calling the '{company_tool_name}' tool. "
+        "To prioritize the skills the employee should develop, call the 'get_top_skill_gaps' tool, which scores the skills the employee lacks against the whole project portfolio. "
+        "Only get the full project portfolio by calling the 'get_project_portfolio_tool' tool if you need project details beyond the ones returned by the other tools. "
+        "To find the active projects needing skills the employee lacks, call the 'get_project_skill_gaps' tool instead of comparing the skill lists yourself. "
+        "To find the colleagues having a skill, the projects needing it or the trainings covering it, call the 'look_up_skills' tool. "
+        f"Get the employee professional development company policy by calling the '{company_tool_name}' tool. Make sure your recommendations align with the company policy. "
+        "The employee profile, the company information, the company policy and the project portfolio may already be prefetched below. Use the prefetched context instead of calling the corresponding tools, and only call them for the parts that are missing or empty. "
+        "Prefetched employee profile: {prefetched_employee_profile?} "
+        "Prefetched company information: {prefetched_company_information?} "
+        "Prefetched company policy: {prefetched_company_policy?} "
+        "Prefetched project portfolio: {prefetched_project_portfolio?} "
+        "If the user would like to find training opportunities, call the 'find_trainings' tool with the skills to develop to find training opportunities. Make sure to display the training's name, description, skills, date when it can be started, cost in USD, and URL in a structured format to the user for all training opportunities even if the find_trainings tool already returned them."
     ),
     output_key="current_skills_development_needs",
     tools=[
-        company_information_tool,
+        company_tool,
         employee_profile_tool,
         project_portfolio_tool,
-        training_finder_tool,
+        project_skill_gaps_tool,
+        skill_gaps_tool,
+        skill_lookup_tool,
+        training_catalog_tool,
     ],
+    before_agent_callback=[create_skills_context_prefetch(ask_company_information)],
+    before_model_callback=[compact_history],
+    before_tool_callback=[label_tool_call, use_memoized_result],
+    after_tool_callback=[memoize_result, clear_tool_call_labels, shape_tool_result],
 )
@@ -31,15 +31,19 @@ Note:
 
 from google.adk.agents import LlmAgent
 
-from ..config import config
 from ..tools.employee_training_history_tool import employee_training_history_tool
 from ..tools.employee_remaining_training_budget_tool import (
     employee_remaining_training_budget_tool,
 )
+from ..utils.history_compaction import compact_history
+from ..utils.metrics import clear_tool_call_labels, label_tool_call
+from ..utils.model_call_policy import get_model
+from ..utils.tool_memoization import memoize_result, use_memoized_result
+from ..utils.tool_output_shaping import shape_tool_result
 
 employee_training_history_and_budget_agent = LlmAgent(
     name="EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent",
-    model=config.model_name,
+    model=get_model("EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent"),
     description="Describes and answers questions about the employee training history and remaining training budget.",
     instruction=(
         "You are a helpful agent who can describe and answer questions about the employee training history and remaining training budget. "
@@ -52,4 +56,7 @@ employee_training_history_and_budget_agent = LlmAgent(
         employee_training_history_tool,
         employee_remaining_training_budget_tool,
     ],
+    before_model_callback=[compact_history],
+    before_tool_callback=[label_tool_call, use_memoized_result],
+    after_tool_callback=[memoize_result, clear_tool_call_labels, shape_tool_result],
 )
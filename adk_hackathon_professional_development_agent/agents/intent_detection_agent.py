@@ -20,6 +20,9 @@ Supported Intents:
     - GET_SKILLS_DEVELOPMENT: Get skills assessment and recommendations
     - UNKNOWN: Default for unrecognized requests
 
+Messages confidently classified by the local intent router (see `utils.intent_router`)
+are transferred to the sub-agent without calling the LLM.
+
 Example:
     ```python
     from agents.intent_detection_agent import intent_detection_agent
@@ -32,7 +35,6 @@ Example:
 
 from google.adk.agents import LlmAgent
 
-from ..config import config
 from .professional_development_policy_agent import professional_development_policy_agent
 from .employee_training_history_and_budget_agent import (
     employee_training_history_and_budget_agent,
@@ -41,10 +43,13 @@ from .current_or_future_skills_development_agent import (
     current_or_future_skills_development_agent,
 )
 from .training_registerer_agent import training_registerer_agent
+from ..utils.history_compaction import compact_history
+from ..utils.intent_router import route_intent
+from ..utils.model_call_policy import get_model
 
 intent_detection_agent = LlmAgent(
     name="IntentDetectionAgent",
-    model=config.model_name,
+    model=get_model("IntentDetectionAgent"),
     description="Agent to detect the intent of the user's query.",
     instruction=(
         "You are a helpful agent who can detect user intent and contact the appropriate, specialized agent based on the detected intent. "
@@ -61,4 +66,5 @@ intent_detection_agent = LlmAgent(
         training_registerer_agent,
     ],
     output_key="email",
+    before_model_callback=[route_intent, compact_history],
 )
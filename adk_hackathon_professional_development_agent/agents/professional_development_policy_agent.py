@@ -3,8 +3,9 @@ Professional Development Policy Agent for Professional Development System.
 
 This agent specializes in explaining and interpreting the company's professional
 development policies. It provides clear, consistent information about training
-budgets, approval processes, and development opportunities using Vertex AI Search
-to access official policy documentation.
+budgets, approval processes, and development opportunities using Vertex AI Search,
+or the local document index when COMPANY_INFORMATION_BACKEND is "local_index", to
+access official policy documentation.
 
 Example:
     ```python
@@ -19,25 +20,43 @@ Example:
 Note:
     This agent works in conjunction with the company_information_agent but focuses
     specifically on professional development and training-related policies.
+    Its answers do not depend on the employee asking, so the answers to the first
+    question of a session are cached in the answer cache (see utils.answer_cache).
 """
 
 from google.adk.agents import LlmAgent
 
 from ..config import config
+from ..tools.company_documents_search_tool import company_documents_search_tool
 from ..tools.company_information_tool import (
     company_information_tool,
 )
+from ..utils.answer_cache import cache_answer, use_cached_answer
+from ..utils.history_compaction import compact_history
+from ..utils.model_call_policy import get_model
+from ..utils.tool_memoization import memoize_result, use_memoized_result
+
+if config.company_information_backend == "local_index":
+    policy_tool = company_documents_search_tool
+    policy_tool_instruction = "Use the 'search_company_documents' tool to search the company documents for the passages of the employee professional development company policy relevant to the question, and base your answer on these passages. "
+else:
+    policy_tool = company_information_tool
+    policy_tool_instruction = "Use the 'get_employee_professional_development_company_policy' tool to get the actual employee professional development company policy. "
 
 professional_development_policy_agent = LlmAgent(
     name="ProfessionalDevelopmentPolicyAgent",
-    model=config.model_name,
+    model=get_model("ProfessionalDevelopmentPolicyAgent"),
     description="Describes and answers questions about the employee professional development company policy.",
     instruction=(
         "You are a helpful agent who can describe and answer questions about the employee professional development company policy. "
         "You will be given a question about the employee professional development company policy. "
         "You will need to describe the employee professional development company policy and answer the question. "
         "You will need to make sure your recommendations align with the company policy. "
-        "Use the 'get_employee_professional_development_company_policy' tool to get the actual employee professional development company policy. "
+        + policy_tool_instruction
     ),
-    tools=[company_information_tool],
+    tools=[policy_tool],
+    before_model_callback=[use_cached_answer, compact_history],
+    after_model_callback=[cache_answer],
+    before_tool_callback=[use_memoized_result],
+    after_tool_callback=[memoize_result],
 )
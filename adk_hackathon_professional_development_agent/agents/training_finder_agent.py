@@ -17,18 +17,21 @@ Example:
 Note:
     This agent works in conjunction with the training_registerer_agent as part
     of the training workflow to provide a complete course registration experience.
+    Requests for skills already covered by the training catalog are answered by the
+    training catalog tool without running this agent (see tools.training_catalog_tool).
 """
 
 from google.adk.agents import LlmAgent
 from google.adk.tools import google_search
 
-from ..config import config
+from ..utils.history_compaction import compact_history
+from ..utils.model_call_policy import get_model
 
 # Tried calling the training_registerer_agent here, but it was not working due to
 # https://github.com/google/adk-python/issues/53
 training_finder_agent = LlmAgent(
     name="TrainingFinderAgent",
-    model=config.model_name,
+    model=get_model("TrainingFinderAgent"),
     description="Finds training opportunities for employees based on their current skills, company information, and project portfolio.",
     instruction=(
         "You are a helpful agent who can find training opportunities for employees based on their current skills, company profile, and project portfolio. "
@@ -38,4 +41,5 @@ training_finder_agent = LlmAgent(
     tools=[
         google_search,
     ],
+    before_model_callback=[compact_history],
 )
@@ -31,13 +31,15 @@ Note:
 
 from google.adk.agents import LlmAgent
 
-from ..config import config
 from ..tools.register_new_training_tool import register_new_training_tool
-
+from ..utils.history_compaction import compact_history
+from ..utils.metrics import clear_tool_call_labels, label_tool_call
+from ..utils.model_call_policy import get_model
+from ..utils.tool_memoization import memoize_result, use_memoized_result
 
 training_registerer_agent = LlmAgent(
     name="TrainingRegistererAgent",
-    model=config.model_name,
+    model=get_model("TrainingRegistererAgent"),
     description="Registers new training opportunities for employees.",
     instruction=(
         "You are a helpful agent who can register new training opportunities for employees. "
@@ -45,8 +47,12 @@ training_registerer_agent = LlmAgent(
         "You will need to register the new training opportunity in the database. "
         "Access the chosen training in session state under key 'chosen_training'. "
         "Use the 'register_new_employee_training_tool' tool to register the new training. "
+        "Confirm the registration to the user together with the registration ID returned by the tool. "
     ),
     tools=[
         register_new_training_tool,
     ],
+    before_model_callback=[compact_history],
+    before_tool_callback=[label_tool_call, use_memoized_result],
+    after_tool_callback=[memoize_result, clear_tool_call_labels],
 )
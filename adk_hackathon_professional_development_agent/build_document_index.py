@@ -0,0 +1,58 @@
+"""
+Local Document Index Build Script.
+
+This script builds the local search index of the company PDFs under
+`input_data/vertex_ai_search`, used by the agents instead of the Vertex AI Search data
+store when COMPANY_INFORMATION_BACKEND is "local_index". The index is otherwise built on
+first use; run the script to rebuild it after the documents change, or to build it ahead
+of a deployment. The new version of the index is switched to atomically, and the running
+workers reload it within DOCUMENT_INDEX_CHECK_SECONDS. Rebuilding the index rewrites the
+version stamp of the company documents in the index directory, invalidating the cached
+answers of the agents.
+
+Example:
+    ```bash
+    # Build the index into DOCUMENT_INDEX_DIR
+    python -m adk_hackathon_professional_development_agent.build_document_index
+
+    # Tune the passages and the hashed-embedding vectors
+    python -m adk_hackathon_professional_development_agent.build_document_index \\
+        --passage-words 100 --overlap-words 20 --vector-dimensions 0
+    ```
+"""
+
+import argparse
+import logging
+
+from .config import config
+from .utils.document_index import build_index
+from .utils.document_sync import LocalDocumentStorage, stamp_documents_version
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the local document index.")
+    parser.add_argument("--pdf-dir", default=config.company_documents_dir)
+    parser.add_argument("--index-dir", default=config.document_index_dir)
+    parser.add_argument("--passage-words", type=int, default=120)
+    parser.add_argument("--overlap-words", type=int, default=30)
+    parser.add_argument(
+        "--vector-dimensions",
+        type=int,
+        default=256,
+        help="Dimensions of the hashed-embedding vectors, 0 disables them",
+    )
+    args = parser.parse_args()
+
+    build_index(
+        args.pdf_dir,
+        args.index_dir,
+        passage_words=args.passage_words,
+        overlap_words=args.overlap_words,
+        vector_dimensions=args.vector_dimensions,
+    )
+    stamp_documents_version(LocalDocumentStorage(args.index_dir))
@@ -6,13 +6,157 @@ It handles all environment variables and configuration settings needed across th
 including Google Cloud Project settings, BigQuery configurations, and Vertex AI Search parameters.
 
 Environment Variables:
-    GOOGLE_CLOUD_PROJECT (str): The Google Cloud Project ID
+    GOOGLE_CLOUD_PROJECT (str): The Google Cloud Project ID, required by the BigQuery
+        data backend and by Vertex AI Search
     BIGQUERY_DATASET_ID (str): The BigQuery dataset ID (defaults to "amazincorp")
-    VERTEX_AI_SEARCH_DATA_STORE_ID (str): The Vertex AI Search data store ID
+    VERTEX_AI_SEARCH_DATA_STORE_ID (str): The Vertex AI Search data store ID, required
+        when the company documents are searched with Vertex AI Search
     VERTEX_AI_SEARCH_DATA_STORE_LOCATION (str): The location for Vertex AI Search data store
     VERTEX_AI_SEARCH_DATA_STORE_BUCKET (str): The GCS bucket for Vertex AI Search data
     MODEL_NAME (str): The name of the LLM model to use (defaults to "gemini-2.0-flash")
     VERTEX_AI_STAGING_BUCKET (str): The GCS bucket for Vertex AI staging
+    DATA_BACKEND (str): The data backend to use, "bigquery" or "local" (defaults to "bigquery")
+    LOCAL_DATA_DIR (str): The directory of the CSV files loaded by the local data backend
+        (defaults to "input_data/bigquery")
+    LOCAL_DATABASE_PATH (str): The SQLite database path of the local data backend
+        (defaults to ":memory:")
+    BIGQUERY_MAX_CONCURRENCY (int): The maximum number of data backend calls running at once
+        for the async operations (defaults to 8)
+    BIGQUERY_TIMEOUT_SECONDS (float): The timeout of a single data backend call in seconds
+        (defaults to 30)
+    QUERY_CACHE_MAX_ENTRIES (int): The maximum number of cached query results, 0 disables
+        the query cache (defaults to 1024)
+    QUERY_CACHE_TTL_SECONDS (str): Comma-separated per-table time-to-live of cached query
+        results, e.g. "employee_profiles=300,project_portfolio=600"
+    BATCH_LOADER_WINDOW_MS (float): How long employee email lookups are collected into
+        a single batched query in milliseconds (defaults to 5)
+    BATCH_LOADER_MAX_BATCH_SIZE (int): The maximum number of emails per batched query
+        (defaults to 100)
+    WRITE_AHEAD_LOG_PATH (str): The path of the write-ahead log of accepted rows
+        (defaults to "write_ahead_log.jsonl" in the repository root)
+    WRITE_BUFFER_MAX_ROWS (int): The number of buffered rows triggering a flush (defaults to 500)
+    WRITE_BUFFER_FLUSH_INTERVAL_SECONDS (float): How often buffered rows are flushed
+        (defaults to 1)
+    WRITE_MAX_ATTEMPTS (int): The number of attempts at writing a row, with exponential
+        backoff, before it is moved to the dead-letter log next to the write-ahead log
+        (defaults to 10)
+    WRITE_FEED_PATH (str): The path of the feed sharing the written rows between the
+        worker processes, if several serve the app (defaults to "write_feed.jsonl" next
+        to the write-ahead log)
+    WRITE_FEED_MAX_BYTES (int): The size past which the write feed is emptied, the
+        workers then dropping their cached query results (defaults to 16777216)
+    BULK_LOAD_CHUNK_ROWS (int): The number of rows the bulk loader reads, validates and
+        upserts at once (defaults to 5000)
+    ANNUAL_TRAINING_BUDGET_USD (float): The default annual training budget per employee
+        (defaults to 3500)
+    TRAINING_BUDGET_OVERRIDES (str): Comma-separated annual training budgets overriding
+        the default per employee email or department, e.g. "Data=5000,jane.doe@amazincorp.com=4000"
+    BUDGET_LEDGER_REFRESH_SECONDS (float): How often the training budget ledger is rebuilt
+        from the tables to pick up the trainings registered by other worker processes
+        and instances, or loaded outside of the agent (defaults to 60)
+    SKILL_INDEX_REFRESH_SECONDS (float): How often the skill index is rebuilt from the
+        tables to pick up changes made outside of the agent (defaults to 300)
+    PROJECT_STATUS_WEIGHTS (str): Comma-separated weights of the project statuses in
+        skill gap scores (defaults to "Active=1,In Progress=0.8,Planning=0.5,Completed=0")
+    INTENT_ROUTER_ENABLED (bool): Whether confidently classified messages are routed to
+        the sub-agents locally, without the LLM router (defaults to "true")
+    INTENT_ROUTER_MIN_CONFIDENCE (float): The confidence needed to route a message
+        locally (defaults to 0.6)
+    COMPANY_INFORMATION_BACKEND (str): How the agents search the company documents,
+        "vertex_ai_search" or "local_index" (defaults to "local_index" with the local
+        data backend, "vertex_ai_search" otherwise)
+    COMPANY_DOCUMENTS_DIR (str): The directory of the company PDFs indexed by the local
+        document index (defaults to "input_data/vertex_ai_search")
+    DOCUMENT_INDEX_DIR (str): The directory of the local document index, built on first
+        use if missing (defaults to "document_index" in the repository root)
+    DOCUMENT_INDEX_CHECK_SECONDS (float): How often the workers check whether the local
+        document index was rebuilt, reloading it then (defaults to 60)
+    DOCUMENT_SYNC_MAX_CONCURRENCY (int): The maximum number of PDFs uploaded or deleted
+        at once when syncing the Vertex AI Search data store (defaults to 8)
+    DOCUMENT_SYNC_POLL_SECONDS (float): How often the long-running operations of the
+        data store are polled when syncing it (defaults to 2)
+    ANSWER_CACHE_MAX_ENTRIES (int): The maximum number of cached answers per agent to
+        questions about the company documents, 0 disables the answer cache (defaults to 256)
+    ANSWER_CACHE_TTL_SECONDS (float): How long answers are cached (defaults to 3600)
+    ANSWER_CACHE_MIN_QUESTION_WORDS (int): The number of words a question needs for its
+        answer to be cached, shorter questions being too ambiguous (defaults to 5)
+    ANSWER_CACHE_VERSION_CHECK_SECONDS (float): How often the version of the company
+        documents, stored with the documents, is checked for changes invalidating the
+        cached answers (defaults to 60)
+    CONTEXT_PREFETCH_ENABLED (bool): Whether the context of the skills agent is fetched
+        concurrently before its first LLM call (defaults to "true")
+    CONTEXT_PREFETCH_TTL_SECONDS (float): How long the prefetched context is reused by
+        the next invocations of the skills agent for the same employee (defaults to 300)
+    TRAINING_CATALOG_PATH (str): The path of the persisted web search results of the
+        training catalog (defaults to "training_catalog.json" in the repository root)
+    TRAINING_CATALOG_MIN_RESULTS (int): The number of catalog offerings needed to
+        answer a training request without a web search (defaults to 3)
+    TRAINING_SEARCH_REFRESH_SECONDS (float): The age after which cached web search
+        results are refreshed in the background (defaults to 86400)
+    TRAINING_SEARCH_CACHE_TTL_SECONDS (float): The age after which cached web search
+        results are no longer served (defaults to 604800)
+    TOOL_MEMO_ENABLED (bool): Whether tool results are memoized per session (defaults
+        to "true")
+    TOOL_MEMO_DEFAULT_TTL_SECONDS (float): How long tool results are memoized (defaults
+        to 300)
+    TOOL_MEMO_TTL_SECONDS (str): Comma-separated per-tool TTLs of memoized results
+        overriding the default, e.g. "get_employee_profile=600,CompanyInformationAgent=3600"
+    TOOL_MEMO_EXCLUDED_TOOLS (str): Comma-separated tools never memoized (defaults to
+        "transfer_to_agent")
+    TOOL_MEMO_WRITE_TOOLS (str): Comma-separated tools whose calls drop the memoized
+        results of the session (defaults to "register_new_training")
+    MODEL_CALL_POLICY_ENABLED (bool): Whether the LLM calls of the agents follow the
+        model call policy below, i.e. deadlines, hedging, retries and fallback (defaults
+        to "true")
+    MODEL_CALL_DEADLINE_SECONDS (float): The latency budget of an LLM call of an agent,
+        retries and hedged requests included (defaults to 30)
+    MODEL_CALL_DEADLINES (str): Comma-separated per-agent latency budgets overriding the
+        default, e.g. "IntentDetectionAgent=10"
+    MODEL_CALL_MAX_RETRIES (int): The maximum number of retries of a failed LLM call
+        (defaults to 2)
+    MODEL_CALL_HEDGING_ENABLED (bool): Whether a duplicate request is sent when an LLM
+        call takes longer than the observed p95 latency of the agent (defaults to "true")
+    MODEL_CALL_HEDGE_MIN_DELAY_SECONDS (float): The minimum delay before a duplicate
+        request is sent (defaults to 1)
+    MODEL_CALL_HEDGE_MAX_SHARE (float): The maximum share of the LLM calls of an agent
+        hedged with a duplicate request, each of them being billed (defaults to 0.1)
+    FALLBACK_MODEL_NAME (str): The faster model called once the latency budget or the
+        retries of an LLM call are exhausted, empty to disable (defaults to
+        "gemini-2.0-flash-lite")
+    TOOL_OUTPUT_SHAPING_ENABLED (bool): Whether tool results are projected, capped and
+        filtered per agent before they reach the LLM context (defaults to "true")
+    TOOL_OUTPUT_MAX_TEXT_CHARS (int): The length long text fields of tool results are
+        summarized to (defaults to 200)
+    TOOL_OUTPUT_PROJECT_STATUSES (str): Comma-separated project statuses kept in the
+        project portfolio given to the skills agent, empty to keep all projects
+        (defaults to "Active,In Progress")
+    TOOL_OUTPUT_CURRENT_YEAR_TRAININGS_ONLY (bool): Whether the training history given
+        to the training history agent only contains the trainings of the current year
+        (defaults to "false")
+    SESSION_DB_URL (str): The SQLAlchemy URL of the session database, shared by the
+        workers, empty to keep the sessions in memory (defaults to "sqlite:///sessions.db"
+        in the repository root)
+    SESSION_MAX_EVENTS (int): The number of events of a session triggering the
+        compaction of its oldest invocations into a summary (defaults to 100)
+    SESSION_MAX_BYTES (int): The content bytes of a session triggering its compaction
+        (defaults to 500000)
+    SESSION_KEEP_RECENT_EVENTS (int): The minimum number of recent events kept
+        uncompacted (defaults to 30)
+    SESSION_SUMMARY_MAX_CHARS (int): The maximum length of the summary of the compacted
+        events (defaults to 4000)
+    SESSION_MAX_SESSIONS (int): The number of sessions kept, the least recently active
+        ones being deleted (defaults to 10000)
+    SESSION_IDLE_TTL_SECONDS (float): How long idle sessions are kept (defaults to 86400)
+    SESSION_EVICTION_INTERVAL_SECONDS (float): How often idle sessions are looked for
+        (defaults to 60)
+    PROMPT_HISTORY_MAX_CHARS (int): The maximum length of the conversation history sent
+        to the model before the current turn, 0 for no limit (defaults to 20000)
+    SERVER_WORKERS (int): The number of worker processes serving the app in the container
+        or when `main.py` is run, 0 for one per CPU core (defaults to 0)
+    WARMUP_ENABLED (bool): Whether each worker process warms up its clients, indexes
+        and caches before reporting ready (defaults to "true")
+    WARMUP_RETRY_SECONDS (float): How long to wait before retrying a failed warm-up
+        (defaults to 10)
 
 Example:
     ```python
@@ -26,6 +170,24 @@ Example:
 
 import os
 from dataclasses import dataclass
+from typing import Dict, FrozenSet, List
+
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _parse_float_mapping(value: str) -> Dict[str, float]:
+    """Parse a comma-separated list of key=value pairs with float values."""
+    mapping = {}
+    for item in value.split(","):
+        if item.strip():
+            key, number = item.rsplit("=", 1)
+            mapping[key.strip()] = float(number)
+    return mapping
+
+
+def _parse_names(value: str) -> FrozenSet[str]:
+    """Parse a comma-separated list of names."""
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
 
 
 @dataclass
@@ -43,6 +205,77 @@ class Config:
         vertex_ai_search_data_store_bucket (str): GCS bucket for Vertex AI Search
         model_name (str): Name of the LLM model to use
         vertex_ai_staging_bucket (str): GCS bucket for Vertex AI staging
+        data_backend (str): Data backend to use, "bigquery" or "local"
+        local_data_dir (str): Directory of the CSV files loaded by the local data backend
+        local_database_path (str): SQLite database path of the local data backend
+        bigquery_max_concurrency (int): Size of the thread pool running async data backend calls
+        bigquery_timeout_seconds (float): Timeout of a single data backend call in seconds
+        query_cache_max_entries (int): Maximum number of cached query results
+        query_cache_ttl_seconds (str): Comma-separated per-table TTLs of cached query results
+        batch_loader_window_ms (float): Collection window of batched email lookups in ms
+        batch_loader_max_batch_size (int): Maximum number of emails per batched query
+        write_ahead_log_path (str): Path of the write-ahead log of accepted rows
+        write_buffer_max_rows (int): Number of buffered rows triggering a flush
+        write_buffer_flush_interval_seconds (float): How often buffered rows are flushed
+        write_max_attempts (int): Attempts at writing a row before it is dead-lettered
+        write_feed_path (str): Path of the feed sharing the written rows between workers
+        write_feed_max_bytes (int): Size past which the write feed is emptied
+        bulk_load_chunk_rows (int): Number of rows the bulk loader upserts at once
+        annual_training_budget_usd (float): Default annual training budget per employee
+        training_budget_overrides (str): Comma-separated per-email or per-department budgets
+        budget_ledger_refresh_seconds (float): How often the budget ledger is rebuilt
+        skill_index_refresh_seconds (float): How often the skill index is rebuilt
+        project_status_weights (str): Comma-separated weights of the project statuses
+        intent_router_enabled (bool): Whether messages are routed locally when possible
+        intent_router_min_confidence (float): Confidence needed to route a message locally
+        company_information_backend (str): Company document search, "vertex_ai_search"
+            or "local_index"
+        company_documents_dir (str): Directory of the PDFs indexed by the local index
+        document_index_dir (str): Directory of the local document index
+        document_index_check_seconds (float): How often a rebuilt local index is checked
+        document_sync_max_concurrency (int): Concurrent PDF uploads or deletions of a sync
+        document_sync_poll_seconds (float): Polling interval of the data store operations
+        answer_cache_max_entries (int): Maximum number of cached answers per agent
+        answer_cache_ttl_seconds (float): How long answers are cached
+        answer_cache_min_question_words (int): Words a question needs to be cached
+        answer_cache_version_check_seconds (float): How often the version of the
+            company documents is checked
+        context_prefetch_enabled (bool): Whether the skills agent's context is prefetched
+        context_prefetch_ttl_seconds (float): How long the prefetched context is reused
+        training_catalog_path (str): Path of the persisted training catalog web searches
+        training_catalog_min_results (int): Offerings needed to skip the web search
+        training_search_refresh_seconds (float): Age triggering a background refresh
+        training_search_cache_ttl_seconds (float): Age after which searches expire
+        tool_memo_enabled (bool): Whether tool results are memoized per session
+        tool_memo_default_ttl_seconds (float): How long tool results are memoized
+        tool_memo_ttl_seconds (str): Comma-separated per-tool TTLs of memoized results
+        tool_memo_excluded_tools (str): Comma-separated tools never memoized
+        tool_memo_write_tools (str): Comma-separated tools invalidating memoized results
+        model_call_policy_enabled (bool): Whether LLM calls follow the model call policy
+        model_call_deadline_seconds (float): Latency budget of an LLM call
+        model_call_deadlines (str): Comma-separated per-agent latency budgets
+        model_call_max_retries (int): Maximum number of retries of a failed LLM call
+        model_call_hedging_enabled (bool): Whether slow LLM calls are hedged
+        model_call_hedge_min_delay_seconds (float): Minimum delay before hedging
+        model_call_hedge_max_share (float): Maximum share of the calls hedged per agent
+        fallback_model_name (str): Faster model called once the budget is exhausted
+        tool_output_shaping_enabled (bool): Whether tool results are shaped per agent
+        tool_output_max_text_chars (int): Length long text fields are summarized to
+        tool_output_project_statuses (str): Comma-separated project statuses kept
+        tool_output_current_year_trainings_only (bool): Whether only the trainings of
+            the current year are kept in the training history
+        session_db_url (str): SQLAlchemy URL of the session database
+        session_max_events (int): Events of a session triggering its compaction
+        session_max_bytes (int): Content bytes of a session triggering its compaction
+        session_keep_recent_events (int): Recent events kept uncompacted
+        session_summary_max_chars (int): Maximum length of the summary of a session
+        session_max_sessions (int): Number of sessions kept
+        session_idle_ttl_seconds (float): How long idle sessions are kept
+        session_eviction_interval_seconds (float): How often idle sessions are evicted
+        prompt_history_max_chars (int): Maximum length of the history sent to the model
+        server_workers (int): Number of worker processes, 0 for one per CPU core
+        warmup_enabled (bool): Whether the worker processes warm up before serving
+        warmup_retry_seconds (float): Delay before retrying a failed warm-up
     """
 
     # Google Cloud Project configuration
@@ -71,6 +304,300 @@ class Config:
     # Vertex AI staging bucket
     vertex_ai_staging_bucket: str = os.getenv("VERTEX_AI_STAGING_BUCKET")
 
+    # Data backend configuration
+    data_backend: str = os.getenv("DATA_BACKEND", "bigquery")
+    local_data_dir: str = os.getenv(
+        "LOCAL_DATA_DIR", os.path.join(_REPOSITORY_ROOT, "input_data", "bigquery")
+    )
+    local_database_path: str = os.getenv("LOCAL_DATABASE_PATH", ":memory:")
+    bigquery_max_concurrency: int = int(os.getenv("BIGQUERY_MAX_CONCURRENCY", "8"))
+    bigquery_timeout_seconds: float = float(os.getenv("BIGQUERY_TIMEOUT_SECONDS", "30"))
+
+    # Query cache configuration
+    query_cache_max_entries: int = int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024"))
+    query_cache_ttl_seconds: str = os.getenv(
+        "QUERY_CACHE_TTL_SECONDS",
+        "employee_profiles=300,employee_trainings=60,project_portfolio=600",
+    )
+
+    # Batched email lookup configuration
+    batch_loader_window_ms: float = float(os.getenv("BATCH_LOADER_WINDOW_MS", "5"))
+    batch_loader_max_batch_size: int = int(
+        os.getenv("BATCH_LOADER_MAX_BATCH_SIZE", "100")
+    )
+
+    # Buffered write pipeline configuration
+    write_ahead_log_path: str = os.getenv(
+        "WRITE_AHEAD_LOG_PATH", os.path.join(_REPOSITORY_ROOT, "write_ahead_log.jsonl")
+    )
+    write_buffer_max_rows: int = int(os.getenv("WRITE_BUFFER_MAX_ROWS", "500"))
+    write_buffer_flush_interval_seconds: float = float(
+        os.getenv("WRITE_BUFFER_FLUSH_INTERVAL_SECONDS", "1")
+    )
+    write_max_attempts: int = int(os.getenv("WRITE_MAX_ATTEMPTS", "10"))
+    write_feed_path: str = os.getenv(
+        "WRITE_FEED_PATH",
+        os.path.join(
+            os.path.dirname(os.path.abspath(write_ahead_log_path)), "write_feed.jsonl"
+        ),
+    )
+    write_feed_max_bytes: int = int(
+        os.getenv("WRITE_FEED_MAX_BYTES", str(16 * 1024 * 1024))
+    )
+
+    # Bulk loader configuration
+    bulk_load_chunk_rows: int = int(os.getenv("BULK_LOAD_CHUNK_ROWS", "5000"))
+
+    # Training budget configuration
+    annual_training_budget_usd: float = float(
+        os.getenv("ANNUAL_TRAINING_BUDGET_USD", "3500")
+    )
+    training_budget_overrides: str = os.getenv("TRAINING_BUDGET_OVERRIDES", "")
+    budget_ledger_refresh_seconds: float = float(
+        os.getenv("BUDGET_LEDGER_REFRESH_SECONDS", "60")
+    )
+
+    # Skill index configuration
+    skill_index_refresh_seconds: float = float(
+        os.getenv("SKILL_INDEX_REFRESH_SECONDS", "300")
+    )
+    project_status_weights: str = os.getenv(
+        "PROJECT_STATUS_WEIGHTS", "Active=1,In Progress=0.8,Planning=0.5,Completed=0"
+    )
+
+    # Local intent router configuration
+    intent_router_enabled: bool = (
+        os.getenv("INTENT_ROUTER_ENABLED", "true").lower() == "true"
+    )
+    intent_router_min_confidence: float = float(
+        os.getenv("INTENT_ROUTER_MIN_CONFIDENCE", "0.6")
+    )
+
+    # Company document search configuration
+    # The local data backend runs without Google Cloud, so it searches the documents
+    # locally too by default
+    company_information_backend: str = os.getenv(
+        "COMPANY_INFORMATION_BACKEND",
+        "local_index" if data_backend == "local" else "vertex_ai_search",
+    )
+    company_documents_dir: str = os.getenv(
+        "COMPANY_DOCUMENTS_DIR",
+        os.path.join(_REPOSITORY_ROOT, "input_data", "vertex_ai_search"),
+    )
+    document_index_dir: str = os.getenv(
+        "DOCUMENT_INDEX_DIR", os.path.join(_REPOSITORY_ROOT, "document_index")
+    )
+    document_index_check_seconds: float = float(
+        os.getenv("DOCUMENT_INDEX_CHECK_SECONDS", "60")
+    )
+
+    # Document sync configuration
+    document_sync_max_concurrency: int = int(
+        os.getenv("DOCUMENT_SYNC_MAX_CONCURRENCY", "8")
+    )
+    document_sync_poll_seconds: float = float(
+        os.getenv("DOCUMENT_SYNC_POLL_SECONDS", "2")
+    )
+
+    # Answer cache configuration
+    answer_cache_max_entries: int = int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "256"))
+    answer_cache_ttl_seconds: float = float(
+        os.getenv("ANSWER_CACHE_TTL_SECONDS", "3600")
+    )
+    answer_cache_min_question_words: int = int(
+        os.getenv("ANSWER_CACHE_MIN_QUESTION_WORDS", "5")
+    )
+    answer_cache_version_check_seconds: float = float(
+        os.getenv("ANSWER_CACHE_VERSION_CHECK_SECONDS", "60")
+    )
+
+    # Context prefetch configuration
+    context_prefetch_enabled: bool = (
+        os.getenv("CONTEXT_PREFETCH_ENABLED", "true").lower() == "true"
+    )
+    context_prefetch_ttl_seconds: float = float(
+        os.getenv("CONTEXT_PREFETCH_TTL_SECONDS", "300")
+    )
+
+    # Training catalog configuration
+    training_catalog_path: str = os.getenv(
+        "TRAINING_CATALOG_PATH", os.path.join(_REPOSITORY_ROOT, "training_catalog.json")
+    )
+    training_catalog_min_results: int = int(
+        os.getenv("TRAINING_CATALOG_MIN_RESULTS", "3")
+    )
+    training_search_refresh_seconds: float = float(
+        os.getenv("TRAINING_SEARCH_REFRESH_SECONDS", "86400")
+    )
+    training_search_cache_ttl_seconds: float = float(
+        os.getenv("TRAINING_SEARCH_CACHE_TTL_SECONDS", "604800")
+    )
+
+    # Tool memoization configuration
+    tool_memo_enabled: bool = os.getenv("TOOL_MEMO_ENABLED", "true").lower() == "true"
+    tool_memo_default_ttl_seconds: float = float(
+        os.getenv("TOOL_MEMO_DEFAULT_TTL_SECONDS", "300")
+    )
+    tool_memo_ttl_seconds: str = os.getenv(
+        "TOOL_MEMO_TTL_SECONDS",
+        "get_employee_profile=600,get_project_portfolio=600,"
+        "CompanyInformationAgent=3600,search_company_documents=3600",
+    )
+    tool_memo_excluded_tools: str = os.getenv(
+        "TOOL_MEMO_EXCLUDED_TOOLS", "transfer_to_agent"
+    )
+    tool_memo_write_tools: str = os.getenv(
+        "TOOL_MEMO_WRITE_TOOLS", "register_new_training"
+    )
+
+    # Model call policy configuration
+    model_call_policy_enabled: bool = (
+        os.getenv("MODEL_CALL_POLICY_ENABLED", "true").lower() == "true"
+    )
+    model_call_deadline_seconds: float = float(
+        os.getenv("MODEL_CALL_DEADLINE_SECONDS", "30")
+    )
+    model_call_deadlines: str = os.getenv(
+        "MODEL_CALL_DEADLINES", "IntentDetectionAgent=10"
+    )
+    model_call_max_retries: int = int(os.getenv("MODEL_CALL_MAX_RETRIES", "2"))
+    model_call_hedging_enabled: bool = (
+        os.getenv("MODEL_CALL_HEDGING_ENABLED", "true").lower() == "true"
+    )
+    model_call_hedge_min_delay_seconds: float = float(
+        os.getenv("MODEL_CALL_HEDGE_MIN_DELAY_SECONDS", "1")
+    )
+    model_call_hedge_max_share: float = float(
+        os.getenv("MODEL_CALL_HEDGE_MAX_SHARE", "0.1")
+    )
+    fallback_model_name: str = os.getenv("FALLBACK_MODEL_NAME", "gemini-2.0-flash-lite")
+
+    # Tool output shaping configuration
+    tool_output_shaping_enabled: bool = (
+        os.getenv("TOOL_OUTPUT_SHAPING_ENABLED", "true").lower() == "true"
+    )
+    tool_output_max_text_chars: int = int(
+        os.getenv("TOOL_OUTPUT_MAX_TEXT_CHARS", "200")
+    )
+    tool_output_project_statuses: str = os.getenv(
+        "TOOL_OUTPUT_PROJECT_STATUSES", "Active,In Progress"
+    )
+    tool_output_current_year_trainings_only: bool = (
+        os.getenv("TOOL_OUTPUT_CURRENT_YEAR_TRAININGS_ONLY", "false").lower() == "true"
+    )
+
+    # Session store configuration
+    session_db_url: str = os.getenv(
+        "SESSION_DB_URL", "sqlite:///" + os.path.join(_REPOSITORY_ROOT, "sessions.db")
+    )
+    session_max_events: int = int(os.getenv("SESSION_MAX_EVENTS", "100"))
+    session_max_bytes: int = int(os.getenv("SESSION_MAX_BYTES", "500000"))
+    session_keep_recent_events: int = int(os.getenv("SESSION_KEEP_RECENT_EVENTS", "30"))
+    session_summary_max_chars: int = int(os.getenv("SESSION_SUMMARY_MAX_CHARS", "4000"))
+    session_max_sessions: int = int(os.getenv("SESSION_MAX_SESSIONS", "10000"))
+    session_idle_ttl_seconds: float = float(
+        os.getenv("SESSION_IDLE_TTL_SECONDS", "86400")
+    )
+    session_eviction_interval_seconds: float = float(
+        os.getenv("SESSION_EVICTION_INTERVAL_SECONDS", "60")
+    )
+    prompt_history_max_chars: int = int(os.getenv("PROMPT_HISTORY_MAX_CHARS", "20000"))
+
+    # Serving configuration
+    server_workers: int = int(os.getenv("SERVER_WORKERS", "0"))
+    warmup_enabled: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    warmup_retry_seconds: float = float(os.getenv("WARMUP_RETRY_SECONDS", "10"))
+
+    @property
+    def query_cache_ttls(self) -> Dict[str, float]:
+        """Parse the per-table time-to-live of cached query results.
+
+        Returns:
+            Dict[str, float]: Mapping of table IDs to TTLs in seconds
+        """
+        return _parse_float_mapping(self.query_cache_ttl_seconds)
+
+    @property
+    def training_budget_overrides_usd(self) -> Dict[str, float]:
+        """Parse the annual training budgets overriding the default.
+
+        Returns:
+            Dict[str, float]: Mapping of employee emails or departments to budgets in USD
+        """
+        return _parse_float_mapping(self.training_budget_overrides)
+
+    @property
+    def project_status_weight_values(self) -> Dict[str, float]:
+        """Parse the weights of the project statuses in skill gap scores.
+
+        Returns:
+            Dict[str, float]: Mapping of project statuses to weights
+        """
+        return _parse_float_mapping(self.project_status_weights)
+
+    @property
+    def tool_memo_ttls(self) -> Dict[str, float]:
+        """Parse the per-tool time-to-live of memoized tool results.
+
+        Returns:
+            Dict[str, float]: Mapping of tool names to TTLs in seconds
+        """
+        return _parse_float_mapping(self.tool_memo_ttl_seconds)
+
+    @property
+    def tool_memo_excluded_tool_names(self) -> FrozenSet[str]:
+        """Parse the names of the tools never memoized.
+
+        Returns:
+            FrozenSet[str]: The tool names
+        """
+        return _parse_names(self.tool_memo_excluded_tools)
+
+    @property
+    def tool_memo_write_tool_names(self) -> FrozenSet[str]:
+        """Parse the names of the tools invalidating the memoized tool results.
+
+        Returns:
+            FrozenSet[str]: The tool names
+        """
+        return _parse_names(self.tool_memo_write_tools)
+
+    @property
+    def model_call_deadlines_by_agent(self) -> Dict[str, float]:
+        """Parse the per-agent latency budgets of LLM calls.
+
+        Returns:
+            Dict[str, float]: Mapping of agent names to latency budgets in seconds
+        """
+        return _parse_float_mapping(self.model_call_deadlines)
+
+    @property
+    def tool_output_project_status_names(self) -> FrozenSet[str]:
+        """Parse the project statuses kept in the project portfolio of the skills agent.
+
+        Returns:
+            FrozenSet[str]: The project statuses, empty to keep all projects
+        """
+        return _parse_names(self.tool_output_project_statuses)
+
+    @property
+    def server_worker_count(self) -> int:
+        """Get the number of worker processes serving the app.
+
+        Returns:
+            int: SERVER_WORKERS, or the number of CPU cores if it is 0
+        """
+        return self.server_workers or os.cpu_count() or 1
+
+    @property
+    def write_feed_enabled(self) -> bool:
+        """Check whether the written rows are shared between worker processes.
+
+        Returns:
+            bool: True if several worker processes serve the app
+        """
+        return self.server_worker_count > 1
+
     @property
     def is_valid(self) -> bool:
         """Check if all required configuration values are set.
@@ -78,12 +605,34 @@ class Config:
         Returns:
             bool: True if all required values are set, False otherwise.
         """
-        return bool(
-            self.google_cloud_project
-            and self.bigquery_dataset_id
-            and self.vertex_ai_search_data_store_id
-            and self.model_name
-        )
+        return not self.missing_variables
+
+    @property
+    def missing_variables(self) -> List[str]:
+        """Get the required environment variables that are not set.
+
+        The Google Cloud project and the Vertex AI Search data store are only required
+        by the backends using them, so that the local backends run without them.
+
+        Returns:
+            List[str]: The names of the missing environment variables
+        """
+        missing = []
+        if not self.google_cloud_project and (
+            self.data_backend == "bigquery"
+            or self.company_information_backend == "vertex_ai_search"
+        ):
+            missing.append("GOOGLE_CLOUD_PROJECT")
+        if not self.bigquery_dataset_id:
+            missing.append("BIGQUERY_DATASET_ID")
+        if (
+            not self.vertex_ai_search_data_store_id
+            and self.company_information_backend == "vertex_ai_search"
+        ):
+            missing.append("VERTEX_AI_SEARCH_DATA_STORE_ID")
+        if not self.model_name:
+            missing.append("MODEL_NAME")
+        return missing
 
     def validate(self) -> None:
         """Validate the configuration and raise an error if invalid.
@@ -92,21 +641,24 @@ class Config:
         if any required values are missing.
 
         Raises:
-            ValueError: If any required configuration values are missing.
+            ValueError: If any required configuration values are missing or invalid.
         """
         if not self.is_valid:
-            missing = []
-            if not self.google_cloud_project:
-                missing.append("GOOGLE_CLOUD_PROJECT")
-            if not self.bigquery_dataset_id:
-                missing.append("BIGQUERY_DATASET_ID")
-            if not self.vertex_ai_search_data_store_id:
-                missing.append("VERTEX_AI_SEARCH_DATA_STORE_ID")
-            if not self.model_name:
-                missing.append("MODEL_NAME")
+            raise ValueError(
+                "Missing required environment variables: "
+                f"{', '.join(self.missing_variables)}"
+            )
+
+        if self.data_backend not in ("bigquery", "local"):
+            raise ValueError(
+                f"Invalid DATA_BACKEND: {self.data_backend} (expected 'bigquery' or 'local')"
+            )
 
+        if self.company_information_backend not in ("vertex_ai_search", "local_index"):
             raise ValueError(
-                f"Missing required environment variables: {', '.join(missing)}"
+                "Invalid COMPANY_INFORMATION_BACKEND: "
+                f"{self.company_information_backend} "
+                "(expected 'vertex_ai_search' or 'local_index')"
             )
 
 
@@ -2,17 +2,20 @@
 Vertex AI Search Data Store Creation and Import Script.
 
 This script provides functionality to:
-1. Create a new Vertex AI Search data store
+1. Create a new Vertex AI Search data store, unless it already exists
 2. Import documents from Google Cloud Storage into the data store
+3. Give the company documents a new version in the bucket, invalidating the answers
+   cached by the agents (see utils.answer_cache)
 
 The script uses the Discovery Engine API to create and manage search data stores.
 It's designed to work with PDF documents stored in a GCS bucket, making them
-searchable through Vertex AI Search.
+searchable through Vertex AI Search. To update the documents afterwards, prefer
+`sync_vertex_ai_search_documents.py`, which only uploads and imports the changed PDFs.
 
 Example:
     ```bash
     # Run the script with required configuration
-    python create_vertex_ai_search_data_store.py
+    python -m adk_hackathon_professional_development_agent.create_vertex_ai_search_data_store
     ```
 
 Note:
@@ -21,11 +24,14 @@ Note:
 """
 
 import logging
+from typing import Optional
 
 from google.api_core.client_options import ClientOptions
+from google.api_core.exceptions import AlreadyExists
 from google.cloud import discoveryengine
 
-from config import Config
+from .config import config
+from .utils.document_sync import GcsDocumentStorage, stamp_documents_version
 
 # Configure logging
 logging.basicConfig(
@@ -37,12 +43,12 @@ logging.basicConfig(
 
 def create_data_store(
     client_options: ClientOptions, project_id: str, location: str, data_store_id: str
-) -> str:
+) -> Optional[str]:
     """Create a new Vertex AI Search data store.
 
     This function creates a new data store in Vertex AI Search with specified
     configuration settings. The data store is configured for generic content
-    and search functionality.
+    and search functionality. An existing data store is left unchanged.
 
     Args:
         client_options (ClientOptions): Configuration options for the API client
@@ -51,7 +57,8 @@ def create_data_store(
         data_store_id (str): Unique identifier for the new data store
 
     Returns:
-        str: The operation name for the create data store request
+        Optional[str]: The operation name for the create data store request, None if
+            the data store already exists
 
     Raises:
         Exception: If the data store creation fails
@@ -88,7 +95,11 @@ def create_data_store(
     logging.info(f"Request: {request}")
 
     # Make the request
-    operation = client.create_data_store(request=request)
+    try:
+        operation = client.create_data_store(request=request)
+    except AlreadyExists:
+        logging.info(f"Data store {data_store_id} already exists")
+        return None
 
     logging.info(f"Waiting for operation to complete: {operation.operation.name}")
     response = operation.result()
@@ -165,7 +176,7 @@ def import_gcs_data_into_data_store(
 
 
 if __name__ == "__main__":
-    location = Config.vertex_ai_search_data_store_location
+    location = config.vertex_ai_search_data_store_location
     client_options = (
         ClientOptions(api_endpoint=f"{location}-discoveryengine.googleapis.com")
         if location != "global"
@@ -174,16 +185,24 @@ if __name__ == "__main__":
     # Create data store
     create_data_store(
         client_options=client_options,
-        project_id=Config.google_cloud_project,
+        project_id=config.google_cloud_project,
         location=location,
-        data_store_id=Config.vertex_ai_search_data_store_id,
+        data_store_id=config.vertex_ai_search_data_store_id,
     )
 
     # Import data from GCS
     import_gcs_data_into_data_store(
         client_options=client_options,
-        project_id=Config.google_cloud_project,
+        project_id=config.google_cloud_project,
         location=location,
-        data_store_id=Config.vertex_ai_search_data_store_id,
-        gcs_bucket_name=Config.vertex_ai_search_data_store_bucket,
+        data_store_id=config.vertex_ai_search_data_store_id,
+        gcs_bucket_name=config.vertex_ai_search_data_store_bucket,
+    )
+
+    # Invalidate the answers cached from the previous documents
+    stamp_documents_version(
+        GcsDocumentStorage(
+            config.vertex_ai_search_data_store_bucket,
+            project_id=config.google_cloud_project,
+        )
     )
@@ -0,0 +1,94 @@
+"""
+BigQuery Data Load Script.
+
+This script loads the pipe-delimited CSV files under `input_data/bigquery`, or an export
+of the HR systems as `<table_id>.csv`, `<table_id>.ndjson` or `<table_id>.jsonl` files,
+into the tables of the data backend (see `utils.bulk_loader`). The files are validated
+against the declared table schemas and the tables are loaded in parallel. Only the rows
+that are new or changed since the previous load are written, so it can be run on every
+sync of the HR systems.
+
+With the local data backend, LOCAL_DATABASE_PATH must point to a database file shared
+with the agents.
+
+Example:
+    ```bash
+    # Load input_data/bigquery into BigQuery
+    python -m adk_hackathon_professional_development_agent.load_bigquery_data
+
+    # Sync an HR export into the local database, deleting the employees who left
+    LOCAL_DATABASE_PATH=/tmp/amazincorp.db \\
+    python -m adk_hackathon_professional_development_agent.load_bigquery_data \\
+        --backend local --data-dir /exports/hr --tables employee_profiles --delete-missing
+    ```
+"""
+
+import argparse
+import logging
+import sys
+
+from .config import config
+from .utils.bulk_loader import find_source_files, load_tables
+from .utils.data_backends import create_backend
+from .utils.table_schemas import TABLE_SCHEMAS
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load CSV or NDJSON files into the tables of the data backend."
+    )
+    parser.add_argument("--data-dir", default=config.local_data_dir)
+    parser.add_argument(
+        "--tables", nargs="+", choices=list(TABLE_SCHEMAS), default=list(TABLE_SCHEMAS)
+    )
+    parser.add_argument(
+        "--backend", choices=["bigquery", "local"], default=config.data_backend
+    )
+    parser.add_argument("--chunk-rows", type=int, default=config.bulk_load_chunk_rows)
+    parser.add_argument(
+        "--delete-missing",
+        action="store_true",
+        help="Delete the rows loaded before but missing from the files",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Upsert every row, even the unchanged ones",
+    )
+    args = parser.parse_args()
+
+    if args.backend == "local" and config.local_database_path == ":memory:":
+        parser.error("LOCAL_DATABASE_PATH must be a file to load the local backend")
+    sources = find_source_files(args.data_dir, args.tables)
+    if not sources:
+        parser.error(f"No file to load found in {args.data_dir}")
+
+    backend = create_backend(
+        args.backend,
+        project_id=config.google_cloud_project,
+        local_data_dir=args.data_dir,
+        local_database_path=config.local_database_path,
+        timeout=config.bigquery_timeout_seconds,
+    )
+    results = load_tables(
+        backend,
+        config.bigquery_dataset_id,
+        sources,
+        chunk_rows=args.chunk_rows,
+        delete_missing=args.delete_missing,
+        force=args.force,
+    )
+    for result in results.values():
+        print(
+            f"{result.table_id:<20} {result.rows:>8} rows  {result.inserted:>8} inserted  "
+            f"{result.updated:>8} updated  {result.unchanged:>8} unchanged  "
+            f"{result.deleted:>8} deleted  {result.seconds:>8}s"
+            + (f"  FAILED: {result.error}" if result.error else "")
+        )
+    if any(result.error for result in results.values()):
+        sys.exit(1)
@@ -0,0 +1,84 @@
+"""
+Vertex AI Search Document Sync Script.
+
+This script syncs the Vertex AI Search data store with the company PDFs under
+`input_data/vertex_ai_search` (see `utils.document_sync`). The data store is created if
+it does not exist yet, and only the new and changed PDFs are uploaded to the
+VERTEX_AI_SEARCH_DATA_STORE_BUCKET bucket and imported, while the removed ones are
+deleted. Running it again without changes does nothing. When the documents changed, they
+are given a new version in the bucket, invalidating the cached answers of the agents.
+
+With --local-dir, the bucket and the data store are replaced by local stand-ins under
+that directory, e.g. to try a sync offline.
+
+Example:
+    ```bash
+    # Sync the data store with input_data/vertex_ai_search
+    python -m adk_hackathon_professional_development_agent.sync_vertex_ai_search_documents
+
+    # Also delete the documents of a full GCS import made before the first sync
+    python -m adk_hackathon_professional_development_agent.sync_vertex_ai_search_documents \\
+        --prune-unmanaged
+    ```
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+
+from .config import config
+from .utils.document_sync import (
+    DiscoveryEngineDataStore,
+    GcsDocumentStorage,
+    LocalDataStore,
+    LocalDocumentStorage,
+    sync_documents,
+)
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sync the Vertex AI Search data store with the company PDFs."
+    )
+    parser.add_argument("--pdf-dir", default=config.company_documents_dir)
+    parser.add_argument(
+        "--prune-unmanaged",
+        action="store_true",
+        help="Delete the documents of the data store not imported by a sync",
+    )
+    parser.add_argument(
+        "--local-dir",
+        help="Directory of local stand-ins for the bucket and the data store",
+    )
+    args = parser.parse_args()
+
+    if args.local_dir:
+        storage = LocalDocumentStorage(os.path.join(args.local_dir, "bucket"))
+        data_store = LocalDataStore(os.path.join(args.local_dir, "data_store.json"))
+    else:
+        storage = GcsDocumentStorage(
+            config.vertex_ai_search_data_store_bucket,
+            project_id=config.google_cloud_project,
+        )
+        data_store = DiscoveryEngineDataStore(
+            project_id=config.google_cloud_project,
+            location=config.vertex_ai_search_data_store_location,
+            data_store_id=config.vertex_ai_search_data_store_id,
+        )
+
+    asyncio.run(
+        sync_documents(
+            args.pdf_dir,
+            storage,
+            data_store,
+            max_concurrency=config.document_sync_max_concurrency,
+            poll_seconds=config.document_sync_poll_seconds,
+            prune_unmanaged=args.prune_unmanaged,
+        )
+    )
@@ -0,0 +1,59 @@
+"""
+Company Documents Search Tool for Professional Development System.
+
+This tool searches the local index of the company documents, i.e. the professional
+development policy and the company profile, and returns the most relevant passages.
+Unlike the company_information_tool, it does not call a nested agent or a remote
+search service, so the passages are returned in milliseconds.
+
+The tool is used instead of the company_information_tool when
+COMPANY_INFORMATION_BACKEND is "local_index".
+
+Example:
+    ```python
+    from tools.company_documents_search_tool import company_documents_search_tool
+
+    # Search the company documents
+    passages = company_documents_search_tool.invoke("annual training budget")
+    # Returns: [
+    #     {
+    #         "source": "Awesome Company Training and Development Policy.pdf",
+    #         "page": 3,
+    #         "text": "...",
+    #         "score": 0.912
+    #     },
+    #     ...
+    # ]
+    ```
+"""
+
+import asyncio
+import logging
+
+from google.adk.tools import FunctionTool
+
+from ..utils.document_index import get_document_index
+
+
+async def search_company_documents(query: str, top_k: int = 5) -> list[dict]:
+    """Search the company documents, e.g. the professional development policy.
+
+    Args:
+        query (str): What to look for, e.g. "training budget approval process"
+        top_k (int, optional): The number of passages to return
+
+    Returns:
+        list[dict]: The most relevant passages, most relevant first, containing:
+            - source (str): File name of the document
+            - page (int): Page the passage starts on
+            - text (str): Text of the passage
+            - score (float): Relevance of the passage, between 0 and 1
+    """
+    logging.info(f"Searching company documents for '{query}'...")
+
+    # The index is only built and loaded from disk on first use
+    index = await asyncio.to_thread(get_document_index)
+    return index.search(query, top_k=top_k)
+
+
+company_documents_search_tool = FunctionTool(func=search_company_documents)
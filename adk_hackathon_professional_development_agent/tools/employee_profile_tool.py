@@ -27,11 +27,11 @@ Example:
 
 import logging
 from google.adk.tools import FunctionTool
-from google.cloud import bigquery
-from ..utils.bigquery_operations import query_single_row, get_table_ref
+from ..utils.arrow_results import split_list_column, to_records
+from ..utils.employee_loaders import employee_profile_loader
 
 
-def get_employee_profile(email: str) -> dict:
+async def get_employee_profile(email: str) -> dict:
     """Retrieve an employee's profile information from BigQuery.
 
     This function fetches employee data including their name, department,
@@ -56,27 +56,12 @@ def get_employee_profile(email: str) -> dict:
     """
     logging.info(f"Getting employee profile for {email}...")
 
-    query = """
-        SELECT 
-            name,
-            email,
-            department,
-            role,
-            skills
-        FROM `{table_ref}`
-        WHERE email = @email
-    """.format(
-        table_ref=get_table_ref("employee_profiles")
-    )
+    # Concurrent lookups of different employees are batched into a single query
+    profiles = await employee_profile_loader.load(email)
 
-    params = [bigquery.ScalarQueryParameter("email", "STRING", email)]
-
-    row = query_single_row(query, params)
-
-    if row:
+    if profiles.num_rows:
         # Convert skills string to list
-        row["skills"] = [skill.strip() for skill in row["skills"].split(",")]
-        return row
+        return to_records(split_list_column(profiles, "skills"))[0]
 
     logging.warning(f"No profile found for email: {email}")
     return None
@@ -25,15 +25,15 @@ Example:
 
 import logging
 
-from google.cloud import bigquery
 from google.adk.tools import LongRunningFunctionTool
 
-from ..utils.bigquery_operations import query_multiple_rows, get_table_ref
+from ..utils.arrow_results import format_date_column, to_records
+from ..utils.employee_loaders import employee_trainings_loader
 
 
 # Instead of directly querying the BigQuery table, we could use MCP Toolbox for Databases.
 # Sample for BigQuery here: https://googleapis.github.io/genai-toolbox/samples/bigquery/mcp_quickstart/
-def get_employee_training_history(email: str) -> list[dict]:
+async def get_employee_training_history(email: str) -> list[dict]:
     """Retrieve an employee's training history from BigQuery.
 
     This function fetches all training records for a specific employee,
@@ -57,30 +57,11 @@ def get_employee_training_history(email: str) -> list[dict]:
     """
     logging.info(f"Getting employee training history for {email}...")
 
-    query = """
-        SELECT 
-            name,
-            email,
-            description,
-            skills,
-            date,
-            cost_usd,
-            url
-        FROM `{table_ref}`
-        WHERE email = @email
-    """.format(
-        table_ref=get_table_ref("employee_trainings")
-    )
-
-    params = [bigquery.ScalarQueryParameter("email", "STRING", email)]
-
-    results = query_multiple_rows(query, params)
-
-    # Format dates in the results
-    for row in results:
-        row["date"] = row["date"].strftime("%Y-%m-%d")
-
-    return results
+    # Concurrent lookups of different employees are batched into a single query
+    trainings = await employee_trainings_loader.load(email)
+
+    # Format dates column-wise, then convert to records in a single pass
+    return to_records(format_date_column(trainings, "date"))
 
 
 employee_training_history_tool = LongRunningFunctionTool(
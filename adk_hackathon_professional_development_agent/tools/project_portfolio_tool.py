@@ -25,12 +25,13 @@ Example:
 
 import logging
 from google.adk.tools import LongRunningFunctionTool
-from ..utils.bigquery_operations import query_multiple_rows, get_table_ref
+from ..utils.arrow_results import to_records
+from ..utils.bigquery_operations import query_arrow_async, get_table_ref
 
 
 # Instead of directly querying the BigQuery table, we could use MCP Toolbox for Databases.
 # Sample for BigQuery here: https://googleapis.github.io/genai-toolbox/samples/bigquery/mcp_quickstart/
-def get_project_portfolio() -> list[dict]:
+async def get_project_portfolio() -> list[dict]:
     """Retrieve the company's project portfolio from BigQuery.
 
     This function fetches all projects and their details, including:
@@ -68,7 +69,7 @@ def get_project_portfolio() -> list[dict]:
         table_ref=get_table_ref("project_portfolio")
     )
 
-    return query_multiple_rows(query)
+    return to_records(await query_arrow_async(query))
 
 
 project_portfolio_tool = LongRunningFunctionTool(func=get_project_portfolio)
@@ -0,0 +1,62 @@
+"""
+Project Skill Gaps Tool for Professional Development System.
+
+This tool finds the active projects needing skills an employee lacks. It answers from
+the precomputed skill index, which canonicalizes skill spellings (e.g. "GCP" and
+"Google Cloud Platform") across the employee profiles and the project portfolio, so
+the agent does not have to match the raw skill lists itself.
+
+The tool helps:
+- Identify the skills to develop to join active projects
+- Prioritize the projects an employee is closest to being staffed on
+- Ground training recommendations in actual project needs
+
+Example:
+    ```python
+    from tools.project_skill_gaps_tool import project_skill_gaps_tool
+
+    # Get the active projects needing skills an employee lacks
+    gaps = project_skill_gaps_tool.invoke("john.doe@amazincorp.com")
+    # Returns: [
+    #     {
+    #         "project": "AI-Powered Analytics Platform",
+    #         "status": "In Progress",
+    #         "missing_skills": ["BigQuery", "Cloud Run", "React", ...],
+    #         "matching_skills": ["Python"]
+    #     },
+    #     ...
+    # ]
+    ```
+"""
+
+import logging
+from google.adk.tools import FunctionTool
+from ..utils.skill_index import get_skill_index_async
+
+
+async def get_project_skill_gaps(email: str) -> list[dict]:
+    """Find the active projects needing skills an employee lacks.
+
+    Projects are considered active if their status is Active, In Progress or Planning.
+    Projects sharing the most skills with the employee come first.
+
+    Args:
+        email (str): The email address of the employee
+
+    Returns:
+        list[dict]: One entry per active project with missing skills, containing:
+            - project (str): Project name
+            - status (str): Project status
+            - missing_skills (List[str]): Skills needed by the project the employee lacks
+            - matching_skills (List[str]): Skills needed by the project the employee has
+
+    Raises:
+        Exception: If there's an error querying the database
+    """
+    logging.info(f"Getting project skill gaps for {email}...")
+
+    index = await get_skill_index_async()
+    return index.project_skill_gaps(email)
+
+
+project_skill_gaps_tool = FunctionTool(func=get_project_skill_gaps)
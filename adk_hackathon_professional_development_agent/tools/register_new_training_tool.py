@@ -34,14 +34,16 @@ Note:
     processes have been completed.
 """
 
+import datetime
 import logging
 from google.adk.tools import LongRunningFunctionTool
-from ..utils.bigquery_operations import insert_json_row
+from ..utils.bigquery_operations import insert_json_row_async
+from ..utils.budget_ledger import get_budget_ledger_async
 
 
 # Instead of directly querying the BigQuery table, we could use MCP Toolbox for Databases.
 # Sample for BigQuery here: https://googleapis.github.io/genai-toolbox/samples/bigquery/mcp_quickstart/
-def register_new_training(
+async def register_new_training(
     email: str,
     name: str,
     description: str,
@@ -49,11 +51,13 @@ def register_new_training(
     date: str,
     cost_usd: float,
     url: str,
-) -> None:
+) -> dict:
     """Register a new training course for an employee.
 
     This function creates a new training record in the database with
-    all the relevant course information.
+    all the relevant course information. The registration is acknowledged
+    as soon as it is durably accepted, and written to the database in the
+    background.
 
     Args:
         email (str): Employee's email address
@@ -64,23 +68,49 @@ def register_new_training(
         cost_usd (float): Course cost in USD
         url (str): Course URL or registration link
 
+    Returns:
+        dict: The registration acknowledgement with the following structure:
+            - status (str): "accepted"
+            - registration_id (str): Unique ID of the registration
+
     Raises:
+        ValueError: If the date is not in YYYY-MM-DD format
         Exception: If there's an error inserting the record
     """
     logging.info(f"Registering new training for {email}...")
 
+    # Rejected before the row is accepted, as accepted rows cannot be withdrawn
+    try:
+        training_date = datetime.date.fromisoformat(date)
+    except ValueError:
+        raise ValueError(
+            f"Invalid training date {date!r}, expected YYYY-MM-DD"
+        ) from None
+
     training_data = {
         "email": email,
         "name": name,
         "description": description,
         "skills": skills,
-        "date": date,
+        "date": training_date.isoformat(),
         "cost_usd": cost_usd,
         "url": url,
     }
 
-    insert_json_row("employee_trainings", training_data)
-    logging.info("Training registration completed successfully")
+    # Record the cost before the row is submitted: a rebuild of the ledger finding the
+    # written row then drops it from the pending trainings, so it is not counted twice
+    ledger = await get_budget_ledger_async()
+    ledger.record(training_data)
+    try:
+        registration_id = await insert_json_row_async(
+            "employee_trainings", training_data
+        )
+    except Exception:
+        ledger.discard(training_data)
+        raise
+    logging.info(f"Training registration {registration_id} accepted successfully")
+
+    return {"status": "accepted", "registration_id": registration_id}
 
 
 # Create the tool instance
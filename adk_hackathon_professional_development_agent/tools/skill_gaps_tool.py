@@ -0,0 +1,58 @@
+"""
+Skill Gaps Tool for Professional Development System.
+
+This tool returns the top skill gaps of an employee, scored by the vectorized skill gap
+engine against the whole project portfolio. Each gap is a skill the employee lacks,
+scored by how many projects need it, how active these projects are and how close the
+employee already is to being staffed on them.
+
+The tool helps:
+- Prioritize the skills an employee should develop next
+- Keep the full profile and project portfolio out of the conversation
+- Give deterministic, reproducible recommendations
+
+Example:
+    ```python
+    from tools.skill_gaps_tool import skill_gaps_tool
+
+    # Get the top 3 skill gaps of an employee
+    gaps = skill_gaps_tool.invoke("john.doe@amazincorp.com", 3)
+    # Returns: [
+    #     {
+    #         "skill": "BigQuery",
+    #         "score": 0.412,
+    #         "projects": ["Enterprise Data Warehouse Migration", ...]
+    #     },
+    #     ...
+    # ]
+    ```
+"""
+
+import logging
+from google.adk.tools import FunctionTool
+from ..utils.skill_gap_engine import get_skill_gap_engine_async
+
+
+async def get_top_skill_gaps(email: str, top_k: int = 5) -> list[dict]:
+    """Get the top skill gaps of an employee against the project portfolio.
+
+    Args:
+        email (str): The email address of the employee
+        top_k (int): The number of skill gaps to return
+
+    Returns:
+        list[dict]: The skill gaps, highest score first, each containing:
+            - skill (str): A skill the employee lacks
+            - score (float): Gap score between 0 and 1, weighted by project status
+            - projects (List[str]): Projects needing the skill, most relevant first
+
+    Raises:
+        Exception: If there's an error querying the database
+    """
+    logging.info(f"Getting top {top_k} skill gaps for {email}...")
+
+    engine = await get_skill_gap_engine_async()
+    return engine.top_gaps(email, top_k=top_k)
+
+
+skill_gaps_tool = FunctionTool(func=get_top_skill_gaps)
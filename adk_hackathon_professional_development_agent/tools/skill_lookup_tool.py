@@ -0,0 +1,67 @@
+"""
+Skill Lookup Tool for Professional Development System.
+
+This tool looks up skills in the precomputed skill index. For each requested skill,
+in any known spelling (e.g. "GCP" for "Google Cloud Platform"), it returns the
+canonical skill name together with the employees having it, the projects needing it
+and the past trainings covering it.
+
+The tool helps:
+- Find colleagues who can mentor an employee on a skill
+- Find the projects where a skill is in demand
+- Find trainings other employees took to learn a skill
+
+Example:
+    ```python
+    from tools.skill_lookup_tool import skill_lookup_tool
+
+    # Look up skills
+    skills = skill_lookup_tool.invoke(["GCP", "Kubernetes"])
+    # Returns: [
+    #     {
+    #         "skill": "Google Cloud Platform",
+    #         "employees": ["jane.doe@amazincorp.com", ...],
+    #         "projects": ["Enterprise Data Warehouse Migration", ...],
+    #         "trainings": ["Professional Cloud Architect", ...]
+    #     },
+    #     ...
+    # ]
+    ```
+"""
+
+import logging
+from google.adk.tools import FunctionTool
+from ..utils.skill_index import canonicalize_skill, get_skill_index_async
+
+
+async def look_up_skills(skills: list[str]) -> list[dict]:
+    """Look up the employees, projects and trainings related to skills.
+
+    Args:
+        skills (list[str]): The skills to look up, in any spelling
+
+    Returns:
+        list[dict]: One entry per skill, containing:
+            - skill (str): Canonical skill name
+            - employees (List[str]): Emails of the employees having the skill
+            - projects (List[str]): Names of the projects needing the skill
+            - trainings (List[str]): Names of the trainings covering the skill
+
+    Raises:
+        Exception: If there's an error querying the database
+    """
+    logging.info(f"Looking up skills {skills}...")
+
+    index = await get_skill_index_async()
+    return [
+        {
+            "skill": canonicalize_skill(skill),
+            "employees": index.employees_with_skill(skill),
+            "projects": index.projects_needing_skill(skill),
+            "trainings": index.trainings_covering_skill(skill),
+        }
+        for skill in skills
+    ]
+
+
+skill_lookup_tool = FunctionTool(func=look_up_skills)
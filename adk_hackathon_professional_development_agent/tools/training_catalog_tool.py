@@ -0,0 +1,195 @@
+"""
+Training Catalog Tool for Professional Development System.
+
+This tool finds training opportunities for skills in the local training catalog (see
+`utils.training_catalog`) before falling back to a live web search. Requests are
+answered, in order, from:
+1. The cached web search results of the same skill set, refreshed in the background
+   once older than TRAINING_SEARCH_REFRESH_SECONDS
+2. The catalog offerings, if at least TRAINING_CATALOG_MIN_RESULTS of them cover the
+   skills within the budget
+3. A web search by the TrainingFinderAgent, whose results are added to the catalog and
+   cached for the skill set
+
+Example:
+    ```python
+    from tools.training_catalog_tool import training_catalog_tool
+
+    # Find trainings
+    trainings = training_catalog_tool.invoke(["BigQuery", "Vertex AI"], 500)
+    # Returns: {
+    #     "source": "catalog",
+    #     "trainings": [
+    #         {
+    #             "name": "Data Engineering on Google Cloud",
+    #             "description": "...",
+    #             "skills": ["BigQuery", "Google Cloud Platform"],
+    #             "date": "2024-03-10",
+    #             "cost_usd": 399.0,
+    #             "url": "https://...",
+    #             "source": "employee_trainings"
+    #         },
+    #         ...
+    #     ]
+    # }
+    ```
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.runners import InMemoryRunner
+from google.adk.tools import FunctionTool
+from google.genai import types
+
+from ..agents.training_finder_agent import training_finder_agent
+from ..config import config
+from ..utils.metrics import registry
+from ..utils.training_catalog import get_training_catalog_async, skill_set_key
+
+WEB_SEARCH_REQUEST = (
+    "Find training opportunities covering the skills: {skills}. "
+    "Return only a JSON list of objects with the keys name, description, skills "
+    "(list of strings), date (YYYY-MM-DD, when the training can be started), "
+    "cost_usd (number) and url."
+)
+
+_lookups = registry.counter(
+    "training_catalog_lookups_total",
+    "Number of training lookups, by source (cached_search, catalog or web_search)",
+    ["source"],
+)
+
+# Background refreshes by skill set key, keeping a reference to the running tasks
+_refresh_tasks: Dict[str, asyncio.Task] = {}
+
+
+def _parse_offerings(text: str) -> Optional[List[Dict[str, Any]]]:
+    """Parse the JSON list of offerings out of the answer of the TrainingFinderAgent."""
+    start, end = text.find("["), text.rfind("]")
+    if start < 0 or end < start:
+        return None
+    try:
+        offerings = json.loads(text[start : end + 1])
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(offerings, list):
+        return None
+    return [offering for offering in offerings if isinstance(offering, dict)]
+
+
+async def search_trainings_on_web(
+    skills: List[str],
+) -> Tuple[Optional[List[Dict[str, Any]]], str]:
+    """Search the web for trainings with the TrainingFinderAgent.
+
+    Args:
+        skills (List[str]): The skills the trainings should cover
+
+    Returns:
+        Tuple[Optional[List[Dict[str, Any]]], str]: The offerings found, or None if the
+            answer could not be parsed, and the answer of the agent
+    """
+    runner = InMemoryRunner(agent=training_finder_agent, app_name="TrainingCatalog")
+    session = await runner.session_service.create_session(
+        app_name=runner.app_name,
+        user_id="training_catalog",
+    )
+    message = types.Content(
+        role="user",
+        parts=[types.Part(text=WEB_SEARCH_REQUEST.format(skills=", ".join(skills)))],
+    )
+
+    answer = ""
+    async for event in runner.run_async(
+        user_id=session.user_id, session_id=session.id, new_message=message
+    ):
+        if event.content and event.content.parts:
+            text = "\n".join(part.text for part in event.content.parts if part.text)
+            answer = text or answer
+    return _parse_offerings(answer), answer
+
+
+async def _search_and_cache(skills: List[str]) -> Tuple[bool, str]:
+    offerings, answer = await search_trainings_on_web(skills)
+    if offerings is None:
+        logging.warning(f"Could not parse the web search results for {skills}")
+        return False, answer
+    catalog = await get_training_catalog_async()
+    catalog.store_search(skills, offerings)
+    await asyncio.to_thread(catalog.save, config.training_catalog_path)
+    return True, answer
+
+
+def _refresh_in_background(skills: List[str]) -> None:
+    key = skill_set_key(skills)
+    if key in _refresh_tasks:
+        return
+    task = asyncio.create_task(_search_and_cache(skills))
+    _refresh_tasks[key] = task
+
+    def _done(task: asyncio.Task) -> None:
+        _refresh_tasks.pop(key, None)
+        if not task.cancelled() and task.exception():
+            logging.error(
+                f"Could not refresh the trainings of {skills}: {task.exception()}"
+            )
+
+    task.add_done_callback(_done)
+
+
+async def find_trainings(
+    skills: list[str], max_cost_usd: Optional[float] = None
+) -> dict:
+    """Find training opportunities covering skills, within a budget.
+
+    Args:
+        skills (list[str]): The skills the trainings should cover, e.g. ["BigQuery"]
+        max_cost_usd (float, optional): The maximum cost of a training in USD
+
+    Returns:
+        dict: The trainings found, containing:
+            - source (str): Where the trainings come from, "cached_search", "catalog"
+              or "web_search"
+            - trainings (List[dict]): The trainings, each with its name, description,
+              skills, date when it can be started, cost in USD and URL
+            - web_search_results (str): The raw web search results, only if they
+              could not be parsed into trainings
+    """
+    logging.info(f"Finding trainings for {skills} up to {max_cost_usd} USD...")
+
+    catalog = await get_training_catalog_async()
+    cached = catalog.cached_search(skills, max_cost_usd)
+    if cached is not None:
+        offerings, needs_refresh = cached
+        if needs_refresh:
+            _refresh_in_background(skills)
+        if offerings:
+            _lookups.inc(source="cached_search")
+            return {"source": "cached_search", "trainings": offerings}
+
+    offerings = catalog.find(skills, max_cost_usd)
+    if len(offerings) >= config.training_catalog_min_results:
+        _lookups.inc(source="catalog")
+        return {"source": "catalog", "trainings": offerings}
+
+    _lookups.inc(source="web_search")
+    parsed, answer = await _search_and_cache(skills)
+    if not parsed:
+        return {
+            "source": "web_search",
+            "trainings": offerings,
+            "web_search_results": answer,
+        }
+    cached = catalog.cached_search(skills, max_cost_usd)
+    found = cached[0] if cached else []
+    urls = {offering["url"] for offering in found}
+    return {
+        "source": "web_search",
+        "trainings": found + [o for o in offerings if o["url"] not in urls],
+    }
+
+
+training_catalog_tool = FunctionTool(func=find_trainings)
@@ -0,0 +1,356 @@
+"""
+Answer Cache Module.
+
+This module provides the answer cache of the agents answering questions about the
+company documents, i.e. the ProfessionalDevelopmentPolicyAgent and the
+CompanyInformationAgent. Their answers only depend on the question and on the
+documents, not on the employee asking, and the same questions are asked over and over,
+e.g. "What is the annual training budget?" and "what is the annual training budget".
+
+Questions are normalized by lowercasing them and dropping email addresses and
+punctuation, and a question is only answered from the cache if its normalized form is
+exactly the one of a cached question. Similar questions are not matched, as a single
+word changes the answer, e.g. "Is a conference covered by the policy?" and "Is travel to
+a conference covered by the policy?".
+
+Follow-up questions depend on their conversation, so answers are also keyed by a digest
+of the conversation the agent is given before the question, i.e. the contents of its
+LLM request. A question asked first, or composed by a calling agent running the agent
+as a tool, shares its answer with every session asking it first, while a follow-up
+question, e.g. a policy question asked after a budget question, only shares its answer
+with conversations identical up to the question. Questions of fewer than
+ANSWER_CACHE_MIN_QUESTION_WORDS words, e.g. "What about for managers?", are never
+cached.
+
+Cached answers are:
+- Scoped per agent
+- Evicted least recently used first once ANSWER_CACHE_MAX_ENTRIES are cached
+- Expired after ANSWER_CACHE_TTL_SECONDS
+- Invalidated when the company documents change, i.e. when the version stored with the
+  documents is rewritten by `create_vertex_ai_search_data_store.py`,
+  `sync_vertex_ai_search_documents.py` or `build_document_index.py` (see
+  `utils.document_sync.stamp_documents_version`). The version is read at most once per
+  ANSWER_CACHE_VERSION_CHECK_SECONDS, so every worker of every instance sees the change.
+
+The `use_cached_answer` and `cache_answer` functions are registered as before model
+and after model callbacks on the agents. The cache key of the question is kept in the
+session state between the two, as the agent may call tools before answering.
+
+Example:
+    ```python
+    from utils.answer_cache import AnswerCache
+
+    cache = AnswerCache(max_entries=256, ttl_seconds=3600, version_check_seconds=60)
+    cache.put("ProfessionalDevelopmentPolicyAgent", "What is the annual budget?", "...")
+    answer = cache.get("ProfessionalDevelopmentPolicyAgent", "what is the annual budget")
+
+    # A follow-up question, keyed by the conversation before it
+    context = conversation_digest(llm_request.contents[:question_index])
+    cache.put("ProfessionalDevelopmentPolicyAgent", "What is the annual budget?", "...", context)
+    ```
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from ..config import config
+from .document_sync import get_documents_storage
+from .intent_router import EMAIL_PATTERN
+from .metrics import registry
+
+# Session state key prefix of the cache key of the question being answered, per agent
+CACHE_KEY_STATE_PREFIX = "answer_cache_key:"
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+_lookups = registry.counter(
+    "answer_cache_lookups_total",
+    "Number of answer cache lookups, by agent and result (hit or miss)",
+    ["agent", "result"],
+)
+
+
+def normalize_question(question: str) -> str:
+    """Normalize a question into the key it is cached by.
+
+    Args:
+        question (str): The question
+
+    Returns:
+        str: The space-separated lowercase words of the question, without emails and
+            punctuation
+    """
+    return " ".join(_WORD_PATTERN.findall(EMAIL_PATTERN.sub(" ", question).lower()))
+
+
+def conversation_digest(contents: List[types.Content]) -> str:
+    """Digest the conversation an agent is given before a question.
+
+    Args:
+        contents (List[types.Content]): The contents of the LLM request before the
+            question
+
+    Returns:
+        str: The SHA-256 hex digest of the contents, or an empty string if there are none
+    """
+    if not contents:
+        return ""
+    digest = hashlib.sha256()
+    for content in contents:
+        digest.update(content.model_dump_json(exclude_none=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def read_documents_version() -> Optional[str]:
+    """Read the version of the company documents searched by the agents.
+
+    Returns:
+        Optional[str]: The version stored with the documents, or None if the documents
+            were never versioned
+    """
+    return get_documents_storage().read_version()
+
+
+class AnswerCache:
+    """Size-bounded, expiring cache of answers looked up by normalized question.
+
+    Args:
+        max_entries (int): The maximum number of cached answers per agent
+        ttl_seconds (float): How long answers are cached
+        version_check_seconds (float): How often the version of the company documents
+            is checked
+    """
+
+    def __init__(
+        self, max_entries: int, ttl_seconds: float, version_check_seconds: float
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version_check_seconds = version_check_seconds
+        # Per agent: (conversation digest, normalized question) -> (answer, cached at)
+        self._entries: Dict[str, OrderedDict] = {}
+        self._version: Optional[str] = None
+        self._version_checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def documents_version(self) -> Optional[str]:
+        """The last recorded version of the company documents."""
+        return self._version
+
+    @property
+    def version_is_stale(self) -> bool:
+        """Whether the version of the company documents is due for a check."""
+        return (
+            self._version_checked_at is None
+            or time.monotonic() - self._version_checked_at > self.version_check_seconds
+        )
+
+    def set_documents_version(self, version: Optional[str]) -> None:
+        """Record the current version of the company documents.
+
+        The cached answers are dropped if the version changed.
+
+        Args:
+            version (Optional[str]): The version of the company documents
+        """
+        with self._lock:
+            if version != self._version:
+                if self._entries:
+                    logging.info("Company documents changed, clearing the answer cache")
+                self._entries.clear()
+                self._version = version
+            self._version_checked_at = time.monotonic()
+
+    def get(self, agent_name: str, question: str, context: str = "") -> Optional[str]:
+        """Get the cached answer of a question.
+
+        Args:
+            agent_name (str): The name of the agent answering the question
+            question (str): The question
+            context (str, optional): The digest of the conversation before the question,
+                empty if the question is asked first
+
+        Returns:
+            Optional[str]: The cached answer, or None if the question is not cached
+        """
+        question = normalize_question(question)
+        key = (context, question)
+        with self._lock:
+            entries = self._entries.get(agent_name)
+            if not question or not entries or key not in entries:
+                return None
+            answer, cached_at = entries[key]
+            if time.monotonic() - cached_at > self.ttl_seconds:
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return answer
+
+    def put(
+        self, agent_name: str, question: str, answer: str, context: str = ""
+    ) -> None:
+        """Cache the answer to a question.
+
+        Args:
+            agent_name (str): The name of the agent answering the question
+            question (str): The question
+            answer (str): The answer
+            context (str, optional): The digest of the conversation before the question,
+                empty if the question is asked first
+        """
+        question = normalize_question(question)
+        if not question or not answer:
+            return
+        key = (context, question)
+        with self._lock:
+            entries = self._entries.setdefault(agent_name, OrderedDict())
+            entries[key] = (answer, time.monotonic())
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached answers."""
+        with self._lock:
+            self._entries.clear()
+
+
+answer_cache = AnswerCache(
+    max_entries=config.answer_cache_max_entries,
+    ttl_seconds=config.answer_cache_ttl_seconds,
+    version_check_seconds=config.answer_cache_version_check_seconds,
+)
+
+
+async def _check_documents_version() -> None:
+    if not answer_cache.version_is_stale:
+        return
+    try:
+        version = await asyncio.to_thread(read_documents_version)
+    except Exception as e:
+        # Checked again after ANSWER_CACHE_VERSION_CHECK_SECONDS
+        logging.warning(f"Error reading the company documents version: {str(e)}")
+        version = answer_cache.documents_version
+    answer_cache.set_documents_version(version)
+
+
+def _question_index(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[int]:
+    """Find the question in the request, unless the agent already called tools on it."""
+    content = callback_context.user_content
+    if not content or not content.parts:
+        return None
+    question = "".join(part.text for part in content.parts if part.text)
+    if (
+        len(normalize_question(question).split())
+        < config.answer_cache_min_question_words
+    ):
+        return None
+    for index in range(len(llm_request.contents) - 1, -1, -1):
+        if llm_request.contents[index] == content:
+            break
+    else:
+        return None
+    if any(
+        part.function_call or part.function_response
+        for later_content in llm_request.contents[index + 1 :]
+        for part in later_content.parts or []
+    ):
+        return None
+    return index
+
+
+async def use_cached_answer(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before model callback answering questions from the answer cache.
+
+    Args:
+        callback_context (CallbackContext): The context of the agent
+        llm_request (LlmRequest): The request to the LLM
+
+    Returns:
+        Optional[LlmResponse]: The cached answer, skipping the LLM, or None to call it
+    """
+    if not config.answer_cache_max_entries:
+        return None
+    index = _question_index(callback_context, llm_request)
+    if index is None:
+        return None
+
+    question = "".join(
+        part.text for part in llm_request.contents[index].parts if part.text
+    )
+    context = conversation_digest(llm_request.contents[:index])
+    # Kept for cache_answer, called after the tool calls of the agent if any
+    callback_context.state[CACHE_KEY_STATE_PREFIX + callback_context.agent_name] = {
+        "invocation_id": callback_context.invocation_id,
+        "question": question,
+        "context": context,
+    }
+
+    await _check_documents_version()
+    answer = answer_cache.get(callback_context.agent_name, question, context)
+    _lookups.inc(
+        agent=callback_context.agent_name, result="miss" if answer is None else "hit"
+    )
+    if answer is None:
+        return None
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=answer)])
+    )
+
+
+async def cache_answer(
+    callback_context: CallbackContext, llm_response: LlmResponse
+) -> Optional[LlmResponse]:
+    """After model callback caching the final answer of the agent.
+
+    Responses calling tools and partial streamed responses are not cached.
+
+    Args:
+        callback_context (CallbackContext): The context of the agent
+        llm_response (LlmResponse): The response of the LLM
+
+    Returns:
+        Optional[LlmResponse]: Always None, keeping the response unchanged
+    """
+    content = llm_response.content
+    if (
+        not config.answer_cache_max_entries
+        or llm_response.partial
+        or llm_response.error_code
+        or not content
+        or not content.parts
+        or any(part.function_call for part in content.parts)
+    ):
+        return None
+    cache_key = callback_context.state.get(
+        CACHE_KEY_STATE_PREFIX + callback_context.agent_name
+    )
+    if not cache_key or cache_key["invocation_id"] != callback_context.invocation_id:
+        return None
+
+    answer = "".join(
+        part.text for part in content.parts if part.text and not part.thought
+    )
+    await _check_documents_version()
+    answer_cache.put(
+        callback_context.agent_name,
+        cache_key["question"],
+        answer,
+        cache_key["context"],
+    )
+    return None
@@ -0,0 +1,114 @@
+"""
+Arrow Results Module.
+
+This module provides the columnar helpers used with the Arrow result mode of the
+BigQuery operations utility module (`query_arrow`). Instead of materializing a
+dictionary per row and post-processing the rows one by one in Python, query results
+are kept as Apache Arrow tables, transformed column by column with vectorized
+`pyarrow.compute` kernels, and converted to JSON-serializable records in a single pass
+right before they are returned by a tool.
+
+Arrow tables are immutable, so they can be shared between the query cache and its
+callers without the defensive copies needed for row dictionaries.
+
+Example:
+    ```python
+    from utils.arrow_results import format_date_column, split_list_column, to_records
+    from utils.bigquery_operations import query_arrow
+
+    trainings = query_arrow("SELECT * FROM `project.dataset.employee_trainings`")
+    trainings = format_date_column(trainings, "date")
+    trainings = split_list_column(trainings, "skills")
+    records = to_records(trainings)
+    ```
+"""
+
+import copy
+from typing import Any, Dict, List, TypeVar
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+T = TypeVar("T")
+
+
+def copy_result(value: T) -> T:
+    """Copy a query result before handing it out to a caller.
+
+    Row dictionaries are post-processed in place by callers and are deep copied, while
+    immutable Arrow tables are returned as is.
+
+    Args:
+        value (T): The query result
+
+    Returns:
+        T: A copy of the result, or the result itself if it is immutable
+    """
+    if isinstance(value, (pa.Table, pa.RecordBatch)):
+        return value
+    return copy.deepcopy(value)
+
+
+def filter_equal(table: pa.Table, column: str, value: Any) -> pa.Table:
+    """Select the rows of a table whose column equals a value.
+
+    Args:
+        table (pa.Table): The table to filter
+        column (str): The name of the column to compare
+        value (Any): The value to match
+
+    Returns:
+        pa.Table: The matching rows
+    """
+    return table.filter(pc.equal(table[column], value))
+
+
+def format_date_column(
+    table: pa.Table, column: str, date_format: str = "%Y-%m-%d"
+) -> pa.Table:
+    """Format a DATE or TIMESTAMP column as strings.
+
+    Args:
+        table (pa.Table): The table holding the column
+        column (str): The name of the column to format
+        date_format (str, optional): The strftime format
+
+    Returns:
+        pa.Table: The table with the column replaced by its formatted values
+    """
+    index = table.schema.get_field_index(column)
+    return table.set_column(
+        index, column, pc.strftime(table[column], format=date_format)
+    )
+
+
+def split_list_column(table: pa.Table, column: str, separator: str = ",") -> pa.Table:
+    """Split a column of separated values, e.g. "SQL, Python", into lists of strings.
+
+    Surrounding whitespace is stripped from every value.
+
+    Args:
+        table (pa.Table): The table holding the column
+        column (str): The name of the column to split
+        separator (str, optional): The separator between values
+
+    Returns:
+        pa.Table: The table with the column replaced by lists of values
+    """
+    lists = pc.split_pattern(table[column].combine_chunks(), pattern=separator)
+    values = pc.utf8_trim_whitespace(lists.values)
+    trimmed = pa.ListArray.from_arrays(lists.offsets, values, mask=lists.is_null())
+    index = table.schema.get_field_index(column)
+    return table.set_column(index, column, trimmed)
+
+
+def to_records(table: pa.Table) -> List[Dict[str, Any]]:
+    """Convert a table to JSON-serializable records in a single pass.
+
+    Args:
+        table (pa.Table): The table to convert
+
+    Returns:
+        List[Dict[str, Any]]: One dictionary per row
+    """
+    return table.to_pylist()
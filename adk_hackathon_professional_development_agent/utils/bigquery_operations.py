@@ -5,13 +5,67 @@ This module provides a set of utility functions for interacting with Google BigQ
 specifically tailored for the professional development system's data needs. It handles
 common operations like querying employee profiles, training history, and project data.
 
-The module uses the Google Cloud BigQuery client library and provides error handling
-and logging for all database operations.
+Queries are executed by a pluggable data backend (see `utils.data_backends`), selected by
+the DATA_BACKEND configuration value: "bigquery" runs them against Google BigQuery, while
+"local" runs them against an embedded SQLite database loaded from `input_data/bigquery`.
+The backend is created on first use. The module provides error handling and logging for
+all database operations.
+
+Query results are cached in a shared read-through QueryCache (see `utils.query_cache`)
+with LRU eviction and per-table TTLs. Inserting a row evicts only the cached queries
+that may include it, e.g. registering a training for an employee evicts that employee's
+training history and remaining budget, but no other employee's. Concurrent identical
+queries that miss the cache share a single backend job.
+
+Inserted rows go through a buffered write pipeline (see `utils.write_pipeline`): they
+are recorded in a local write-ahead log, acknowledged immediately with a registration ID
+and written in micro-batches in the background. The cache entries affected by a row are
+evicted when the row is accepted and again once it is written, and the listeners
+registered with add_write_listener are notified, so derived in-memory structures can be
+updated incrementally. The listeners registered with add_dead_letter_listener are
+notified of the rows given up on after failing every write attempt. The buffered rows
+are merged into the results of the queries reading their tables (see
+`utils.buffered_reads`), so that a row can be read back as soon as it is accepted; the
+other queries missing the cache first write the buffered rows of the tables they read.
+
+When several worker processes serve the app, each worker writes its accepted rows
+before acknowledging them, and shares the written rows with the other workers of the
+host through a write feed (see `utils.write_feed`). Every worker applies the rows
+written by the others, evicting its cached queries and notifying its write listeners,
+before answering a query, so the next turn of a conversation sees the rows written in
+the previous one whichever worker serves it.
+
+Large results can be fetched as Apache Arrow tables with query_arrow (through the
+BigQuery Storage Read API on BigQuery) and transformed column by column with the
+helpers of `utils.arrow_results`, instead of materializing a dictionary per row.
+
+Every call is instrumented (see `utils.metrics`): wall time, thread pool queue time,
+bytes processed, slot milliseconds, cache hits and row counts are recorded, tagged with
+the operation and with the tool and agent that caused the call.
+
+Every operation also has an async variant for use inside the event loop of the FastAPI
+app served by `main.py`. The async variants run the blocking operation on a bounded
+thread pool (BIGQUERY_MAX_CONCURRENCY workers) and give up after BIGQUERY_TIMEOUT_SECONDS,
+so a slow query never stalls other concurrent sessions.
 
 Functions:
+    get_backend: Get the data backend, creating it on first use
+    set_backend: Replace the data backend, e.g. in tests
+    get_table_ref: Get a fully qualified table reference
+    get_query_cache: Get the shared query cache, e.g. to read its hit/miss counters
     query_single_row: Execute a query expecting a single row result
     query_multiple_rows: Execute a query expecting multiple row results
+    query_arrow: Execute a query returning its result as an Arrow table
     insert_json_row: Insert a new row of JSON data into a specified table
+    flush_writes: Write all rows accepted by insert_json_row to the data backend
+    open_connections: Create the data backend, the thread pool and the write pipeline
+    add_write_listener: Register a callback notified of the rows written to a table
+    add_dead_letter_listener: Register a callback notified of the rows given up on
+    apply_shared_writes: Apply the rows written by the other worker processes
+    query_single_row_async: Async variant of query_single_row
+    query_multiple_rows_async: Async variant of query_multiple_rows
+    query_arrow_async: Async variant of query_arrow
+    insert_json_row_async: Async variant of insert_json_row
 
 Example:
     ```python
@@ -27,25 +81,240 @@ Example:
     trainings = query_multiple_rows(
         "SELECT * FROM `project.dataset.employee_trainings`"
     )
+
+    # Query without blocking the event loop
+    trainings = await query_multiple_rows_async(
+        "SELECT * FROM `project.dataset.employee_trainings`"
+    )
     ```
 """
 
+import asyncio
+import atexit
+import contextlib
+import contextvars
+import functools
 import logging
-import io
-import json
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import pyarrow as pa
 
-from google.cloud import bigquery
 from ..config import config
+from .buffered_reads import can_merge_buffered_rows, merge_buffered_rows
+from .data_backends import (
+    DataBackend,
+    QueryStatistics,
+    create_backend,
+    get_referenced_tables,
+)
+from .metrics import get_tool_call_labels, registry
+from .query_cache import QueryCache
+from .request_coalescing import SingleFlight
+from .write_feed import WriteFeed
+from .write_pipeline import BufferedWriter, claim_log_path
 
 # Instead of directly querying the BigQuery table, we could use MCP Toolbox for Databases.
 # Sample for BigQuery here: https://googleapis.github.io/genai-toolbox/samples/bigquery/mcp_quickstart/
 
-# Initialize BigQuery client
-_client = bigquery.Client(project=config.google_cloud_project)
-_project_id = _client.project
+# The data backend is created lazily so that importing this module does not open clients
+_backend: Optional[DataBackend] = None
+_backend_lock = threading.Lock()
 _dataset_id = config.bigquery_dataset_id
 
+# Shared read-through cache of query results
+_query_cache = QueryCache(
+    max_entries=config.query_cache_max_entries,
+    ttl_seconds=config.query_cache_ttls,
+)
+
+# Deduplicates concurrent identical queries missing the cache
+_single_flight = SingleFlight()
+
+# Buffered write pipeline of insert_json_row, created on first use
+_writer: Optional[BufferedWriter] = None
+
+# Callbacks notified of the rows written to the data backend
+_write_listeners: List[Callable[[str, List[Dict[str, Any]]], None]] = []
+
+# Rows written by the worker processes of the host, if several serve the app
+_write_feed: Optional[WriteFeed] = None
+
+# Callbacks notified of the rows moved to the dead-letter log
+_dead_letter_listeners: List[Callable[[str, Dict[str, Any]], None]] = []
+
+# Bounded thread pool running the blocking operations of the async variants
+_executor: Optional[ThreadPoolExecutor] = None
+
+# Time the current call waited for a worker thread of the pool
+_queue_seconds: contextvars.ContextVar[float] = contextvars.ContextVar(
+    "queue_seconds", default=0.0
+)
+
+# Per-call instrumentation, tagged with the operation and the calling tool and agent
+_METRIC_LABELS = ["operation", "tool", "agent"]
+_call_duration = registry.histogram(
+    "bigquery_call_duration_seconds",
+    "Wall time of data backend calls.",
+    _METRIC_LABELS,
+)
+_call_queue_duration = registry.histogram(
+    "bigquery_call_queue_seconds",
+    "Time data backend calls waited for a worker thread.",
+    _METRIC_LABELS,
+)
+_call_rows = registry.histogram(
+    "bigquery_call_rows",
+    "Rows returned or written per data backend call.",
+    _METRIC_LABELS,
+    buckets=(0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000),
+)
+_call_errors = registry.counter(
+    "bigquery_call_errors_total", "Failed data backend calls.", _METRIC_LABELS
+)
+_bytes_processed = registry.counter(
+    "bigquery_bytes_processed_total",
+    "Bytes processed by data backend queries.",
+    _METRIC_LABELS,
+)
+_slot_millis = registry.counter(
+    "bigquery_slot_millis_total",
+    "Slot milliseconds consumed by data backend queries.",
+    _METRIC_LABELS,
+)
+_cache_hits = registry.counter(
+    "bigquery_cache_hits_total",
+    "Data backend calls answered from a cache, by cache.",
+    _METRIC_LABELS + ["cache"],
+)
+
+
+class _CallRecord:
+    """Measurements of a single data backend call."""
+
+    def __init__(self):
+        self.rows = 0
+        self.statistics = QueryStatistics()
+        self.cache: Optional[str] = None
+
+
+@contextlib.contextmanager
+def _instrumented(operation: str) -> Iterator[_CallRecord]:
+    """Record the metrics of a data backend call."""
+    labels = {"operation": operation, **get_tool_call_labels()}
+    record = _CallRecord()
+    started = time.perf_counter()
+    try:
+        yield record
+    except Exception:
+        _call_errors.inc(**labels)
+        raise
+    finally:
+        _call_duration.observe(time.perf_counter() - started, **labels)
+        _call_queue_duration.observe(_queue_seconds.get(), **labels)
+        _call_rows.observe(record.rows, **labels)
+        _bytes_processed.inc(record.statistics.total_bytes_processed, **labels)
+        _slot_millis.inc(record.statistics.slot_millis, **labels)
+        if record.cache:
+            _cache_hits.inc(cache=record.cache, **labels)
+
+
+def get_backend() -> DataBackend:
+    """Get the configured data backend, creating it on first use.
+
+    Returns:
+        DataBackend: The data backend used by all operations in this module
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                _backend = create_backend(
+                    config.data_backend,
+                    project_id=config.google_cloud_project,
+                    local_data_dir=config.local_data_dir,
+                    local_database_path=config.local_database_path,
+                    timeout=config.bigquery_timeout_seconds,
+                )
+    return _backend
+
+
+def set_backend(backend: Optional[DataBackend]) -> None:
+    """Replace the data backend used by all operations in this module.
+
+    Args:
+        backend (Optional[DataBackend]): The data backend to use, or None to create
+            the configured backend again on next use
+    """
+    global _backend
+    with _backend_lock:
+        _backend = backend
+    _query_cache.clear()
+
+
+def get_query_cache() -> QueryCache:
+    """Get the shared cache of query results.
+
+    Returns:
+        QueryCache: The query cache used by query_single_row and query_multiple_rows
+    """
+    return _query_cache
+
+
+def _cached_query(
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    record: Optional[_CallRecord] = None,
+    result_format: str = "rows",
+) -> Union[List[Dict[str, Any]], pa.Table]:
+    """Execute a query through the shared query cache.
+
+    On a cache miss, concurrent identical queries share a single backend job.
+    The result is a list of dictionaries, or an Arrow table if result_format is "arrow".
+    """
+    record = record or _CallRecord()
+    apply_shared_writes()
+    key = _query_cache.make_key(query, params, result_format)
+    if _query_cache.enabled:
+        hit, result = _query_cache.get(key)
+        if hit:
+            record.rows, record.cache = len(result), "query_cache"
+            return result
+
+    def run_query() -> Union[List[Dict[str, Any]], pa.Table]:
+        # Read the rows accepted but still buffered too
+        tables = get_referenced_tables(query)
+        unwritten_rows = _writer.unwritten_rows(tables) if _writer is not None else []
+        if unwritten_rows and not can_merge_buffered_rows(query):
+            _writer.flush()
+            unwritten_rows = []
+        backend = get_backend()
+        if result_format == "arrow":
+            result, record.statistics = backend.query_arrow_with_statistics(
+                query, params
+            )
+        else:
+            result, record.statistics = backend.query_with_statistics(query, params)
+        if record.statistics.cache_hit:
+            record.cache = "backend"
+        if unwritten_rows:
+            # Rows written while querying were read, or are still unwritten. Not
+            # cached, as a buffered row may still be dead-lettered.
+            rows_by_id = {
+                registration_id: (table_id, row)
+                for registration_id, table_id, row in unwritten_rows
+                + _writer.unwritten_rows(tables)
+            }
+            return merge_buffered_rows(query, params, result, list(rows_by_id.values()))
+        _query_cache.put(key, result, query, params)
+        return result
+
+    result = _single_flight.do(key, run_query)
+    record.rows = len(result)
+    return result
+
 
 def get_table_ref(table_id: str) -> str:
     """Get fully qualified BigQuery table reference.
@@ -56,7 +325,7 @@ def get_table_ref(table_id: str) -> str:
     Returns:
         str: Fully qualified table reference in format 'project.dataset.table'
     """
-    return f"{_project_id}.{_dataset_id}.{table_id}"
+    return f"{get_backend().project_id}.{_dataset_id}.{table_id}"
 
 
 def query_single_row(
@@ -78,11 +347,9 @@ def query_single_row(
         Exception: If the query execution fails
     """
     try:
-        job_config = bigquery.QueryJobConfig(query_parameters=params or [])
-        query_job = _client.query(query, job_config=job_config)
-        results = query_job.result()
-        row = next(iter(results), None)
-        return dict(row) if row else None
+        with _instrumented("query_single_row") as record:
+            rows = _cached_query(query, params, record)
+        return rows[0] if rows else None
     except Exception as e:
         logging.error(f"Error executing single row query: {str(e)}")
         raise
@@ -107,40 +374,342 @@ def query_multiple_rows(
         Exception: If the query execution fails
     """
     try:
-        job_config = bigquery.QueryJobConfig(query_parameters=params or [])
-        query_job = _client.query(query, job_config=job_config)
-        results = query_job.result()
-        return [dict(row) for row in results]
+        with _instrumented("query_multiple_rows") as record:
+            return _cached_query(query, params, record)
     except Exception as e:
         logging.error(f"Error executing multiple row query: {str(e)}")
         raise
 
 
-def insert_json_row(table_id: str, row_data: Dict[str, Any]) -> None:
+def query_arrow(query: str, params: Optional[List[Dict[str, Any]]] = None) -> pa.Table:
+    """Execute a BigQuery query returning its result as an Arrow table.
+
+    This function is designed for large results, such as training histories or the
+    project portfolio, which are then transformed column by column (see
+    `utils.arrow_results`) and converted to records in a single pass.
+
+    Args:
+        query (str): The SQL query to execute
+        params (List[Dict[str, Any]], optional): Query parameters for safe SQL execution
+
+    Returns:
+        pa.Table: The query result
+
+    Raises:
+        Exception: If the query execution fails
+    """
+    try:
+        with _instrumented("query_arrow") as record:
+            return _cached_query(query, params, record, result_format="arrow")
+    except Exception as e:
+        logging.error(f"Error executing arrow query: {str(e)}")
+        raise
+
+
+def _write_rows(table_id: str, rows: List[Dict[str, Any]], row_ids: List[str]) -> None:
+    """Write a micro-batch of buffered rows to the data backend."""
+    with _instrumented("insert_rows") as record:
+        get_backend().insert_rows(get_table_ref(table_id), rows, row_ids)
+        record.rows = len(rows)
+
+
+def _apply_written_rows(table_id: str, rows: List[Dict[str, Any]]) -> None:
+    """Evict the cached queries affected by written rows, and notify the listeners."""
+    for row in rows:
+        _query_cache.invalidate(table_id, row)
+    for listener in list(_write_listeners):
+        try:
+            listener(table_id, rows)
+        except Exception as e:
+            logging.error(f"Error notifying write listener {listener!r}: {str(e)}")
+
+
+def _on_rows_written(table_id: str, rows: List[Dict[str, Any]]) -> None:
+    """Apply a written micro-batch, and share it with the other worker processes."""
+    _apply_written_rows(table_id, rows)
+    feed = _get_write_feed()
+    if feed is not None:
+        try:
+            feed.publish(table_id, rows)
+        except Exception as e:
+            logging.error(f"Error sharing written rows with the workers: {str(e)}")
+
+
+def _get_write_feed() -> Optional[WriteFeed]:
+    """Get the write feed shared by the worker processes, if several serve the app."""
+    global _write_feed
+    if _write_feed is None and config.write_feed_enabled:
+        with _backend_lock:
+            if _write_feed is None:
+                _write_feed = WriteFeed(
+                    config.write_feed_path, max_bytes=config.write_feed_max_bytes
+                )
+    return _write_feed
+
+
+def apply_shared_writes() -> None:
+    """Apply the rows written by the other worker processes of the host.
+
+    Their cached queries are evicted and the write listeners are notified, as for the
+    rows written by this process. Does nothing if a single worker serves the app.
+    """
+    feed = _get_write_feed()
+    if feed is None:
+        return
+    shared_rows = feed.poll()
+    if shared_rows is None:
+        logging.warning(
+            "Missed rows written by other workers, clearing the query cache"
+        )
+        _query_cache.clear()
+        return
+    rows_by_table: Dict[str, List[Dict[str, Any]]] = {}
+    for table_id, row in shared_rows:
+        rows_by_table.setdefault(table_id, []).append(row)
+    for table_id, rows in rows_by_table.items():
+        _apply_written_rows(table_id, rows)
+
+
+def add_write_listener(
+    listener: Callable[[str, List[Dict[str, Any]]], None],
+) -> None:
+    """Register a callback notified after rows are written to the data backend.
+
+    Args:
+        listener (Callable[[str, List[Dict[str, Any]]], None]): Called with the table ID
+            and the written rows of every micro-batch
+    """
+    if listener not in _write_listeners:
+        _write_listeners.append(listener)
+
+
+def _on_row_dead_lettered(table_id: str, row: Dict[str, Any]) -> None:
+    """Evict the cached queries of a row given up on, and notify the listeners."""
+    _query_cache.invalidate(table_id, row)
+    for listener in list(_dead_letter_listeners):
+        try:
+            listener(table_id, row)
+        except Exception as e:
+            logging.error(
+                f"Error notifying dead-letter listener {listener!r}: {str(e)}"
+            )
+
+
+def add_dead_letter_listener(
+    listener: Callable[[str, Dict[str, Any]], None],
+) -> None:
+    """Register a callback notified after a row is moved to the dead-letter log.
+
+    Args:
+        listener (Callable[[str, Dict[str, Any]], None]): Called with the table ID and
+            the row given up on after failing every write attempt
+    """
+    if listener not in _dead_letter_listeners:
+        _dead_letter_listeners.append(listener)
+
+
+def _get_writer() -> BufferedWriter:
+    """Get the buffered write pipeline, creating it on first use."""
+    global _writer
+    if _writer is None:
+        with _backend_lock:
+            if _writer is None:
+                _writer = BufferedWriter(
+                    write_rows=_write_rows,
+                    wal_path=claim_log_path(config.write_ahead_log_path),
+                    max_batch_size=config.write_buffer_max_rows,
+                    flush_interval_seconds=config.write_buffer_flush_interval_seconds,
+                    on_flush=_on_rows_written,
+                    max_attempts=config.write_max_attempts,
+                    on_dead_letter=_on_row_dead_lettered,
+                )
+                atexit.register(_writer.close)
+    return _writer
+
+
+def insert_json_row(table_id: str, row_data: Dict[str, Any]) -> str:
     """Insert a single row of JSON data into a BigQuery table.
 
     This function handles the insertion of new records, such as registering
-    new training entries or updating employee profiles.
+    new training entries or updating employee profiles. The row is durably
+    recorded in the write-ahead log and acknowledged immediately; it is
+    written to the data backend with the next micro-batch. When several worker
+    processes serve the app, the row is written before it is acknowledged instead,
+    and shared with the other workers.
 
     Args:
         table_id (str): The ID of the target table without project and dataset
         row_data (Dict[str, Any]): The data to insert as a dictionary
 
+    Returns:
+        str: The registration ID of the accepted row
+
     Raises:
-        Exception: If the insert operation fails
+        Exception: If the row cannot be recorded in the write-ahead log
     """
     try:
-        json_data = io.StringIO(json.dumps(row_data) + "\n")
-
-        job_config = bigquery.LoadJobConfig(
-            source_format=bigquery.SourceFormat.NEWLINE_DELIMITED_JSON,
-            write_disposition=bigquery.WriteDisposition.WRITE_APPEND,
-        )
-
-        load_job = _client.load_table_from_file(
-            json_data, get_table_ref(table_id), job_config=job_config
-        )
-        load_job.result()
+        with _instrumented("insert_json_row") as record:
+            registration_id = _get_writer().submit(table_id, row_data)
+            record.rows = 1
+        # Cached results no longer include every row of the table
+        _query_cache.invalidate(table_id, row_data)
+        if config.write_feed_enabled:
+            # The next turn of the conversation may be served by another worker
+            _get_writer().flush()
+        return registration_id
     except Exception as e:
         logging.error(f"Error inserting row: {str(e)}")
         raise
+
+
+def flush_writes() -> int:
+    """Write all rows accepted by insert_json_row to the data backend.
+
+    Returns:
+        int: The number of written rows
+    """
+    return _get_writer().flush() if _writer is not None else 0
+
+
+def open_connections() -> None:
+    """Create the data backend, the thread pool and the write pipeline ahead of use.
+
+    Creating the write pipeline also replays the rows left uncommitted in its
+    write-ahead log.
+    """
+    get_backend()
+    _get_executor()
+    _get_writer()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """Get the thread pool running the async operations, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _backend_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=config.bigquery_max_concurrency,
+                    thread_name_prefix="bigquery-operations",
+                )
+    return _executor
+
+
+async def _run_in_executor(
+    func: Callable[..., Any], *args: Any, timeout: Optional[float] = None
+) -> Any:
+    """Run a blocking operation on the bounded thread pool without blocking the event loop.
+
+    Args:
+        func (Callable[..., Any]): The blocking operation to run
+        *args (Any): Positional arguments passed to the operation
+        timeout (float, optional): Seconds to wait for the operation. Defaults to
+            the BIGQUERY_TIMEOUT_SECONDS configuration value.
+
+    Returns:
+        Any: The result of the operation
+
+    Raises:
+        asyncio.TimeoutError: If the operation does not finish in time
+    """
+    timeout = timeout or config.bigquery_timeout_seconds
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    submitted = time.perf_counter()
+
+    def run() -> Any:
+        _queue_seconds.set(time.perf_counter() - submitted)
+        return func(*args)
+
+    future = loop.run_in_executor(_get_executor(), functools.partial(context.run, run))
+    try:
+        return await asyncio.wait_for(future, timeout=timeout)
+    except asyncio.TimeoutError:
+        logging.error(f"{func.__name__} timed out after {timeout}s")
+        raise
+
+
+async def query_single_row_async(
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> Optional[Dict[str, Any]]:
+    """Async variant of query_single_row running on the bounded thread pool.
+
+    Args:
+        query (str): The SQL query to execute
+        params (List[Dict[str, Any]], optional): Query parameters for safe SQL execution
+        timeout (float, optional): Seconds to wait for the query
+
+    Returns:
+        Optional[Dict[str, Any]]: The first row as a dictionary, or None if no results
+
+    Raises:
+        asyncio.TimeoutError: If the query does not finish in time
+        Exception: If the query execution fails
+    """
+    return await _run_in_executor(query_single_row, query, params, timeout=timeout)
+
+
+async def query_multiple_rows_async(
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Async variant of query_multiple_rows running on the bounded thread pool.
+
+    Args:
+        query (str): The SQL query to execute
+        params (List[Dict[str, Any]], optional): Query parameters for safe SQL execution
+        timeout (float, optional): Seconds to wait for the query
+
+    Returns:
+        List[Dict[str, Any]]: List of rows as dictionaries
+
+    Raises:
+        asyncio.TimeoutError: If the query does not finish in time
+        Exception: If the query execution fails
+    """
+    return await _run_in_executor(query_multiple_rows, query, params, timeout=timeout)
+
+
+async def query_arrow_async(
+    query: str,
+    params: Optional[List[Dict[str, Any]]] = None,
+    timeout: Optional[float] = None,
+) -> pa.Table:
+    """Async variant of query_arrow running on the bounded thread pool.
+
+    Args:
+        query (str): The SQL query to execute
+        params (List[Dict[str, Any]], optional): Query parameters for safe SQL execution
+        timeout (float, optional): Seconds to wait for the query
+
+    Returns:
+        pa.Table: The query result
+
+    Raises:
+        asyncio.TimeoutError: If the query does not finish in time
+        Exception: If the query execution fails
+    """
+    return await _run_in_executor(query_arrow, query, params, timeout=timeout)
+
+
+async def insert_json_row_async(
+    table_id: str, row_data: Dict[str, Any], timeout: Optional[float] = None
+) -> str:
+    """Async variant of insert_json_row running on the bounded thread pool.
+
+    Args:
+        table_id (str): The ID of the target table without project and dataset
+        row_data (Dict[str, Any]): The data to insert as a dictionary
+        timeout (float, optional): Seconds to wait for the row to be accepted
+
+    Returns:
+        str: The registration ID of the accepted row
+
+    Raises:
+        asyncio.TimeoutError: If the row is not accepted in time
+        Exception: If the row cannot be recorded in the write-ahead log
+    """
+    return await _run_in_executor(insert_json_row, table_id, row_data, timeout=timeout)
@@ -0,0 +1,306 @@
+"""
+Budget Ledger Module.
+
+This module provides the training budget ledger used by the remaining training budget
+tool. Instead of summing an employee's whole training history on every call, the ledger
+holds the amount spent per (email, year), so budget checks become constant-time lookups
+scoped to the fiscal (calendar) year. The ledger is:
+- Built from the employee_trainings table on first use
+- Updated incrementally whenever a new training is registered. Registered trainings are
+  recorded before the row is submitted and counted as pending until a rebuild finds
+  them in the table, as they are written in the background. Trainings given up on by
+  the write pipeline are dropped from the pending ones. The trainings registered by the
+  other worker processes of the host are counted as soon as they are written.
+- Rebuilt every BUDGET_LEDGER_REFRESH_SECONDS to pick up the trainings registered by
+  the other worker processes and instances, and the rows loaded outside of the agent.
+  Only the first build blocks: later rebuilds run in a background thread, one at a
+  time, while the ledger keeps answering from its current state.
+
+The annual allowance defaults to ANNUAL_TRAINING_BUDGET_USD and can be overridden per
+employee email or per department through TRAINING_BUDGET_OVERRIDES.
+
+Example:
+    ```python
+    from utils.budget_ledger import get_budget_ledger_async
+
+    ledger = await get_budget_ledger_async()
+    remaining = ledger.remaining("john.doe@amazincorp.com", 2025)
+
+    # Before submitting a new training
+    ledger.record(
+        {
+            "email": "john.doe@amazincorp.com",
+            "name": "Advanced Python Programming",
+            "date": "2025-04-15",
+            "cost_usd": 299.99,
+        }
+    )
+    ```
+"""
+
+import asyncio
+import datetime
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from ..config import config
+from .bigquery_operations import (
+    add_dead_letter_listener,
+    add_write_listener,
+    apply_shared_writes,
+    get_table_ref,
+    query_multiple_rows,
+)
+
+
+def _to_year(date: Union[str, datetime.date]) -> int:
+    if isinstance(date, str):
+        return datetime.date.fromisoformat(date).year
+    return date.year
+
+
+def _training_key(training: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Get the key of a training row, as in TABLE_KEYS of `utils.table_schemas`."""
+    return (training["email"], training["name"], str(training["date"]))
+
+
+class BudgetLedger:
+    """Per-employee, per-year training spend and remaining budget.
+
+    Args:
+        default_allowance_usd (float): Annual training budget of every employee
+        allowance_overrides (Dict[str, float], optional): Annual training budgets
+            overriding the default, keyed by employee email or department. Email
+            overrides take precedence over department overrides.
+    """
+
+    def __init__(
+        self,
+        default_allowance_usd: float,
+        allowance_overrides: Optional[Dict[str, float]] = None,
+    ):
+        self.default_allowance_usd = default_allowance_usd
+        self.allowance_overrides = dict(allowance_overrides or {})
+        self._spent: Dict[Tuple[str, int], float] = defaultdict(float)
+        # Registered trainings not yet seen in the table, by training key
+        self._pending: Dict[Tuple[str, str, str], Tuple[str, int, float]] = {}
+        # Trainings counted by the last build, by training key
+        self._built_keys: Set[Tuple[str, str, str]] = set()
+        self._departments: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """bool: Whether the ledger was never built or is due for a refresh."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at >= config.budget_ledger_refresh_seconds
+        )
+
+    def build(
+        self,
+        trainings: Iterable[Dict[str, Any]],
+        departments: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Rebuild the ledger from the training history.
+
+        Registered trainings found in the history are no longer pending.
+
+        Args:
+            trainings (Iterable[Dict[str, Any]]): Rows with email, name, date and cost_usd
+            departments (Dict[str, str], optional): Department of each employee email
+        """
+        spent: Dict[Tuple[str, int], float] = defaultdict(float)
+        keys = set()
+        for training in trainings:
+            spent[(training["email"], _to_year(training["date"]))] += float(
+                training["cost_usd"] or 0.0
+            )
+            keys.add(_training_key(training))
+        with self._lock:
+            self._spent = spent
+            self._pending = {
+                key: cost for key, cost in self._pending.items() if key not in keys
+            }
+            self._built_keys = keys
+            self._departments = dict(departments or {})
+            self.built_at = time.monotonic()
+
+    def record(self, training: Dict[str, Any]) -> None:
+        """Record the cost of a newly registered training, pending until it is written.
+
+        Trainings already counted by the last build are ignored, e.g. a training
+        written by another worker process before the ledger was rebuilt.
+
+        Args:
+            training (Dict[str, Any]): The registered row, with email, name, date (as
+                YYYY-MM-DD if a string) and cost_usd
+        """
+        year = _to_year(training["date"])
+        key = _training_key(training)
+        with self._lock:
+            if key in self._built_keys:
+                return
+            self._pending[key] = (
+                training["email"],
+                year,
+                float(training["cost_usd"] or 0.0),
+            )
+
+    def discard(self, training: Dict[str, Any]) -> None:
+        """Stop counting a pending training that will not be written.
+
+        Args:
+            training (Dict[str, Any]): The registered row, with email, name and date
+        """
+        with self._lock:
+            self._pending.pop(_training_key(training), None)
+
+    def allowance(self, email: str) -> float:
+        """Get the annual training budget of an employee.
+
+        Args:
+            email (str): The email address of the employee
+
+        Returns:
+            float: The annual training budget in USD
+        """
+        if email in self.allowance_overrides:
+            return self.allowance_overrides[email]
+        department = self._departments.get(email)
+        return self.allowance_overrides.get(department, self.default_allowance_usd)
+
+    def spent(self, email: str, year: int) -> float:
+        """Get the amount an employee spent on trainings in a year.
+
+        Args:
+            email (str): The email address of the employee
+            year (int): The fiscal year
+
+        Returns:
+            float: The amount spent in USD
+        """
+        with self._lock:
+            return self._spent.get((email, year), 0.0) + sum(
+                cost
+                for pending_email, pending_year, cost in self._pending.values()
+                if (pending_email, pending_year) == (email, year)
+            )
+
+    def remaining(self, email: str, year: int) -> float:
+        """Get the remaining training budget of an employee in a year.
+
+        Args:
+            email (str): The email address of the employee
+            year (int): The fiscal year
+
+        Returns:
+            float: The remaining budget in USD
+        """
+        return self.allowance(email) - self.spent(email, year)
+
+
+_ledger: Optional[BudgetLedger] = None
+_ledger_lock = threading.Lock()
+# Serializes the rebuilds, so that an older snapshot never replaces a newer one
+_refresh_lock = threading.Lock()
+_refresh_thread: Optional[threading.Thread] = None
+
+
+def _build_ledger(ledger: BudgetLedger) -> None:
+    trainings = query_multiple_rows(
+        "SELECT email, name, date, cost_usd FROM `{table_ref}`".format(
+            table_ref=get_table_ref("employee_trainings")
+        )
+    )
+    profiles = query_multiple_rows(
+        "SELECT email, department FROM `{table_ref}`".format(
+            table_ref=get_table_ref("employee_profiles")
+        )
+    )
+    ledger.build(
+        trainings,
+        {profile["email"]: profile["department"] for profile in profiles},
+    )
+    logging.info(f"Built budget ledger from {len(trainings)} trainings")
+
+
+def _on_row_dead_lettered(table_id: str, row: Dict[str, Any]) -> None:
+    """Stop counting a registered training given up on by the write pipeline."""
+    if table_id == "employee_trainings" and _ledger is not None:
+        _ledger.discard(row)
+
+
+def _on_rows_written(table_id: str, rows: List[Dict[str, Any]]) -> None:
+    """Count the trainings written by the other worker processes until the next build."""
+    if table_id == "employee_trainings" and _ledger is not None:
+        for row in rows:
+            _ledger.record(row)
+
+
+def refresh_budget_ledger() -> None:
+    """Rebuild the shared budget ledger from the tables, if it was built already."""
+    with _refresh_lock:
+        if _ledger is not None:
+            _build_ledger(_ledger)
+
+
+def _refresh_in_background() -> None:
+    try:
+        refresh_budget_ledger()
+    except Exception as e:
+        # Retried on the next use of the stale ledger
+        logging.error(f"Error refreshing the budget ledger: {str(e)}")
+
+
+def get_budget_ledger() -> BudgetLedger:
+    """Get the shared budget ledger, building it from the tables on first use.
+
+    A stale ledger is returned as is, while it is rebuilt in a background thread.
+
+    Returns:
+        BudgetLedger: The shared budget ledger
+    """
+    global _ledger, _refresh_thread
+    apply_shared_writes()
+    with _ledger_lock:
+        if _ledger is None:
+            ledger = BudgetLedger(
+                default_allowance_usd=config.annual_training_budget_usd,
+                allowance_overrides=config.training_budget_overrides_usd,
+            )
+            with _refresh_lock:
+                _build_ledger(ledger)
+            add_dead_letter_listener(_on_row_dead_lettered)
+            add_write_listener(_on_rows_written)
+            _ledger = ledger
+        elif _ledger.is_stale and not (
+            _refresh_thread is not None and _refresh_thread.is_alive()
+        ):
+            _refresh_thread = threading.Thread(
+                target=_refresh_in_background, name="budget-ledger-refresh", daemon=True
+            )
+            _refresh_thread.start()
+    return _ledger
+
+
+async def get_budget_ledger_async() -> BudgetLedger:
+    """Async variant of get_budget_ledger building the ledger off the event loop.
+
+    Returns:
+        BudgetLedger: The shared budget ledger
+    """
+    if _ledger is not None:
+        return get_budget_ledger()
+    return await asyncio.to_thread(get_budget_ledger)
+
+
+def reset_budget_ledger() -> None:
+    """Drop the shared budget ledger, so it is rebuilt from the history on next use."""
+    global _ledger
+    with _ledger_lock:
+        _ledger = None
@@ -0,0 +1,193 @@
+"""
+Buffered Reads Module.
+
+This module merges the rows accepted by the write pipeline (see `utils.write_pipeline`)
+but not yet written into the results of the queries reading their tables, so that a
+registered training is read back as soon as it is accepted, without writing the
+buffered rows in the read path.
+
+Rows are merged into the results of the queries selecting columns of a single table,
+optionally filtered with `column = @param` or `column IN UNNEST(@params)` conditions
+joined with AND, i.e. the lookups made by the tools, the employee loaders and the
+in-memory indexes. The selected columns must include the key columns of the table (see
+`utils.table_schemas.TABLE_KEYS`): a buffered row whose key is already in the result was
+written in the meantime and is not merged again. The buffered rows cannot be merged
+into the results of other queries, e.g. aggregations or joins, which have to be run
+after writing them.
+
+Example:
+    ```python
+    from utils.buffered_reads import can_merge_buffered_rows, merge_buffered_rows
+
+    query = "SELECT * FROM `project.dataset.employee_trainings` WHERE email = @email"
+    if can_merge_buffered_rows(query):
+        rows = backend.query(query, params)
+        rows = merge_buffered_rows(query, params, rows, buffered_rows)
+    ```
+"""
+
+import datetime
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import pyarrow as pa
+
+from .data_backends import get_parameter_name_and_value
+from .table_schemas import TABLE_KEYS, TABLE_SCHEMAS
+
+_SELECT_PATTERN = re.compile(
+    r"^\s*SELECT\s+(?P<columns>\*|\w+(?:\s*,\s*\w+)*)\s+"
+    r"FROM\s+`(?:[\w-]+\.)*(?P<table_id>\w+)`"
+    r"(?:\s+WHERE\s+(?P<where>.+?))?\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+_CONDITION_PATTERN = re.compile(
+    r"^\s*(?P<column>\w+)\s*"
+    r"(?:=\s*@(?P<scalar>\w+)|IN\s+UNNEST\(\s*@(?P<array>\w+)\s*\))\s*$",
+    re.IGNORECASE,
+)
+_AND_PATTERN = re.compile(r"\s+AND\s+", re.IGNORECASE)
+
+
+@dataclass
+class _Select:
+    table_id: str
+    columns: List[str]
+    # (column, parameter name, whether the parameter is an array)
+    conditions: List[Tuple[str, str, bool]]
+
+
+def _parse_select(query: str) -> Optional[_Select]:
+    """Parse a query the buffered rows can be merged into, or return None."""
+    match = _SELECT_PATTERN.match(query)
+    if match is None or match.group("table_id") not in TABLE_KEYS:
+        return None
+    table_id = match.group("table_id")
+    schema_columns = [column for column, _ in TABLE_SCHEMAS[table_id]]
+    if match.group("columns") == "*":
+        columns = schema_columns
+    else:
+        columns = [column.strip() for column in match.group("columns").split(",")]
+    if not set(TABLE_KEYS[table_id]) <= set(columns) <= set(schema_columns):
+        return None
+
+    conditions = []
+    if match.group("where"):
+        for condition in _AND_PATTERN.split(match.group("where")):
+            condition_match = _CONDITION_PATTERN.match(condition)
+            if condition_match is None:
+                return None
+            array = condition_match.group("array")
+            conditions.append(
+                (
+                    condition_match.group("column"),
+                    array or condition_match.group("scalar"),
+                    array is not None,
+                )
+            )
+    return _Select(table_id, columns, conditions)
+
+
+def can_merge_buffered_rows(query: str) -> bool:
+    """Check whether the buffered rows can be merged into the results of a query.
+
+    Args:
+        query (str): The SQL query
+
+    Returns:
+        bool: True if the query selects the key columns of a single table, filtered
+            by equality with query parameters only
+    """
+    return _parse_select(query) is not None
+
+
+def _to_column_value(value: Any, column_type: str) -> Any:
+    """Convert a buffered row value to the type returned by the data backends."""
+    if value is None:
+        return None
+    if column_type == "DATE" and isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    if column_type == "FLOAT":
+        return float(value)
+    if column_type == "INTEGER":
+        return int(value)
+    return value
+
+
+def _row_key(row: Dict[str, Any], key_columns: List[str]) -> Tuple[str, ...]:
+    return tuple(str(row[column]) for column in key_columns)
+
+
+def merge_buffered_rows(
+    query: str,
+    params: Optional[List[Any]],
+    result: Union[List[Dict[str, Any]], pa.Table],
+    buffered_rows: List[Tuple[str, Dict[str, Any]]],
+) -> Union[List[Dict[str, Any]], pa.Table]:
+    """Merge the buffered rows matching a query into its result.
+
+    Args:
+        query (str): The SQL query, for which can_merge_buffered_rows is True
+        params (List[Any], optional): The query parameters
+        result (Union[List[Dict[str, Any]], pa.Table]): The rows returned by the data
+            backend, as dictionaries or as an Arrow table
+        buffered_rows (List[Tuple[str, Dict[str, Any]]]): The (table ID, row) pairs
+            accepted but not yet written
+
+    Returns:
+        Union[List[Dict[str, Any]], pa.Table]: The result followed by the matching
+            buffered rows not in it, in the format of the result
+
+    Raises:
+        ValueError: If the buffered rows cannot be merged into the query results
+    """
+    select = _parse_select(query)
+    if select is None:
+        raise ValueError(f"Cannot merge buffered rows into the results of: {query}")
+    param_values = dict(get_parameter_name_and_value(param) for param in params or [])
+    column_types = dict(TABLE_SCHEMAS[select.table_id])
+    key_columns = TABLE_KEYS[select.table_id]
+
+    if isinstance(result, pa.Table):
+        written_keys = set(
+            zip(
+                *(
+                    [str(value) for value in result.column(column).to_pylist()]
+                    for column in key_columns
+                )
+            )
+        )
+    else:
+        written_keys = {_row_key(row, key_columns) for row in result}
+
+    merged_rows = []
+    for table_id, row in buffered_rows:
+        if table_id != select.table_id:
+            continue
+        row = {
+            column: _to_column_value(row.get(column), column_types[column])
+            for column in column_types
+        }
+        if not all(
+            (
+                row[column] in param_values[name]
+                if array
+                else row[column] == param_values[name]
+            )
+            for column, name, array in select.conditions
+        ):
+            continue
+        key = _row_key(row, key_columns)
+        if key in written_keys:
+            continue
+        written_keys.add(key)
+        merged_rows.append({column: row[column] for column in select.columns})
+
+    if not merged_rows:
+        return result
+    if isinstance(result, pa.Table):
+        return pa.concat_tables(
+            [result, pa.Table.from_pylist(merged_rows, schema=result.schema)]
+        )
+    return result + merged_rows
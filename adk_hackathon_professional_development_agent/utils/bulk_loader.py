@@ -0,0 +1,403 @@
+"""
+Bulk Loader Module.
+
+This module loads the files under `input_data/bigquery`, or an export of the HR
+systems in the same format, into the tables of the data backend:
+
+- Files are read in chunks of BULK_LOAD_CHUNK_ROWS rows, either pipe-delimited CSV files
+  with a header (`<table_id>.csv`) or newline-delimited JSON files (`<table_id>.ndjson`
+  or `<table_id>.jsonl`), so that their size does not bound the memory used
+- Every row is validated against the declared schema of its table (see
+  `utils.table_schemas`): unknown or missing columns, values not matching the column
+  type, empty key columns and duplicate keys are reported with their file and line
+- The content hash of every row is compared to the hash stored when the row was last
+  loaded, in the row hashes table of the backend. Only new and changed rows are upserted
+  by their key (TABLE_KEYS), and unchanged rows are not written at all
+- Optionally, the rows loaded before but missing from the file are deleted
+- The tables are loaded in parallel, each in its own thread
+
+Chunks are upserted as they are read, so a file failing validation halfway leaves the
+rows of its earlier chunks loaded. Loading the corrected file resumes from there, as the
+already loaded rows are unchanged.
+
+Example:
+    ```python
+    from utils.bulk_loader import find_source_files, load_tables
+    from utils.data_backends import LocalBackend
+
+    backend = LocalBackend(data_dir="input_data/bigquery", database_path="local.db")
+    results = load_tables(backend, "amazincorp", find_source_files("input_data/bigquery"))
+    print(results["employee_profiles"].unchanged)
+    ```
+"""
+
+import csv
+import datetime
+import hashlib
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from google.cloud import bigquery
+
+from .data_backends import DataBackend
+from .table_schemas import (
+    CSV_DELIMITER,
+    ROW_HASHES_SCHEMA,
+    ROW_HASHES_TABLE_ID,
+    TABLE_KEYS,
+    TABLE_SCHEMAS,
+)
+
+# Extensions of the files loaded into a table, in order of preference
+SOURCE_EXTENSIONS = [".csv", ".ndjson", ".jsonl"]
+_ROW_HASH_KEYS = ["table_id", "row_key"]
+
+
+@dataclass
+class LoadResult:
+    """Outcome of the load of a table.
+
+    Attributes:
+        table_id (str): The ID of the loaded table
+        source_path (str): The path of the loaded file
+        rows (int): Number of rows read from the file
+        inserted (int): Number of rows with a new key
+        updated (int): Number of rows whose content changed
+        unchanged (int): Number of rows skipped, as their content did not change
+        deleted (int): Number of rows deleted as they are missing from the file
+        seconds (float): Duration of the load
+        error (str, optional): Why the load failed, None if it succeeded
+    """
+
+    table_id: str
+    source_path: str
+    rows: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+def find_source_files(
+    data_dir: str, table_ids: Optional[List[str]] = None
+) -> Dict[str, str]:
+    """Find the file to load into each table in a directory.
+
+    Args:
+        data_dir (str): The directory of the `<table_id>.csv`, `.ndjson` or `.jsonl` files
+        table_ids (List[str], optional): The tables to load, all declared tables if None
+
+    Returns:
+        Dict[str, str]: The path of the file to load, by table ID, for the tables with one
+    """
+    sources = {}
+    for table_id in table_ids or TABLE_SCHEMAS:
+        for extension in SOURCE_EXTENSIONS:
+            path = os.path.join(data_dir, f"{table_id}{extension}")
+            if os.path.exists(path):
+                sources[table_id] = path
+                break
+    return sources
+
+
+def convert_value(value: Any, column_type: str) -> Any:
+    """Convert a CSV or JSON value to the Python type of a column type.
+
+    Args:
+        value (Any): The value read from the file
+        column_type (str): The BigQuery type of the column
+
+    Returns:
+        Any: The converted value, None for empty values of non-STRING columns
+
+    Raises:
+        ValueError: If the value does not match the column type
+    """
+    if value is None or (value == "" and column_type != "STRING"):
+        return None
+    if column_type == "STRING":
+        if not isinstance(value, str):
+            raise ValueError(f"expected a string, got {value!r}")
+        return value
+    if isinstance(value, bool):
+        raise ValueError(f"expected a {column_type} value, got {value!r}")
+    if column_type == "FLOAT":
+        return float(value)
+    if column_type == "INTEGER":
+        if isinstance(value, float) and not value.is_integer():
+            raise ValueError(f"expected an integer, got {value!r}")
+        return int(value)
+    if column_type == "DATE":
+        return datetime.date.fromisoformat(value)
+    raise ValueError(f"unsupported column type {column_type}")
+
+
+def validate_row(
+    record: Dict[str, Any], table_id: str, location: str
+) -> Dict[str, Any]:
+    """Validate a record read from a file against the schema of its table.
+
+    Args:
+        record (Dict[str, Any]): The record read from the file
+        table_id (str): The ID of the table the record is loaded into
+        location (str): The file and line of the record, for error messages
+
+    Returns:
+        Dict[str, Any]: The row, with every column of the schema converted to its type
+
+    Raises:
+        ValueError: If the record does not match the schema of the table
+    """
+    schema = TABLE_SCHEMAS[table_id]
+    unknown = set(record) - {name for name, _ in schema}
+    if unknown:
+        raise ValueError(
+            f"{location}: unknown columns {sorted(map(str, unknown))} for {table_id}"
+        )
+    row = {}
+    for name, column_type in schema:
+        try:
+            row[name] = convert_value(record.get(name), column_type)
+        except (TypeError, ValueError) as error:
+            raise ValueError(f"{location}: invalid {name}: {error}") from None
+    for name in TABLE_KEYS[table_id]:
+        if row[name] in (None, ""):
+            raise ValueError(f"{location}: empty key column {name}")
+    return row
+
+
+def read_chunks(
+    path: str, table_id: str, chunk_rows: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Read and validate the rows of a CSV or NDJSON file in chunks.
+
+    Args:
+        path (str): The path of the file, whose extension tells its format
+        table_id (str): The ID of the table the rows are loaded into
+        chunk_rows (int): The maximum number of rows per chunk
+
+    Yields:
+        List[Dict[str, Any]]: The next chunk of validated rows
+
+    Raises:
+        ValueError: If a row or the header of a CSV file does not match the schema
+    """
+    is_csv = path.endswith(".csv")
+    with open(path, newline="" if is_csv else None, encoding="utf-8") as file:
+        if is_csv:
+            reader = csv.DictReader(file, delimiter=CSV_DELIMITER)
+            expected = [name for name, _ in TABLE_SCHEMAS[table_id]]
+            if sorted(reader.fieldnames or []) != sorted(expected):
+                raise ValueError(
+                    f"{path}:1: expected the columns {expected} for {table_id}, "
+                    f"got {reader.fieldnames}"
+                )
+            records = _read_csv_records(reader, path)
+        else:
+            records = _read_json_records(file, path)
+
+        chunk = []
+        for location, record in records:
+            chunk.append(validate_row(record, table_id, location))
+            if len(chunk) >= chunk_rows:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _read_csv_records(
+    reader: csv.DictReader, path: str
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for record in reader:
+        location = f"{path}:{reader.line_num}"
+        # DictReader stores missing fields as None and extra fields under the None key
+        if None in record or None in record.values():
+            raise ValueError(f"{location}: expected {len(reader.fieldnames)} fields")
+        yield location, record
+
+
+def _read_json_records(file: Any, path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        location = f"{path}:{line_number}"
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as error:
+            raise ValueError(f"{location}: invalid JSON: {error}") from None
+        if not isinstance(record, dict):
+            raise ValueError(f"{location}: expected a JSON object")
+        yield location, record
+
+
+def get_row_key(row: Dict[str, Any], table_id: str) -> str:
+    """Get the key identifying a row of a table, as a JSON array of its key columns."""
+    return json.dumps([row[name] for name in TABLE_KEYS[table_id]], default=str)
+
+
+def get_row_hash(row: Dict[str, Any], table_id: str) -> str:
+    """Get the hash of the content of a row of a table."""
+    canonical = json.dumps(
+        [row[name] for name, _ in TABLE_SCHEMAS[table_id]], default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def _get_stored_hashes(
+    backend: DataBackend, hashes_ref: str, table_id: str
+) -> Dict[str, str]:
+    rows = backend.query(
+        f"SELECT row_key, row_hash FROM `{hashes_ref}` WHERE table_id = @table_id",
+        [bigquery.ScalarQueryParameter("table_id", "STRING", table_id)],
+    )
+    return {row["row_key"]: row["row_hash"] for row in rows}
+
+
+def load_table(
+    backend: DataBackend,
+    dataset_id: str,
+    table_id: str,
+    source_path: str,
+    chunk_rows: int = 5000,
+    delete_missing: bool = False,
+    force: bool = False,
+) -> LoadResult:
+    """Load a file into a table, upserting only its new and changed rows.
+
+    Args:
+        backend (DataBackend): The data backend to load the table into
+        dataset_id (str): The dataset of the table
+        table_id (str): The ID of the table, one of TABLE_SCHEMAS
+        source_path (str): The path of the CSV or NDJSON file to load
+        chunk_rows (int, optional): The number of rows read and upserted at once
+        delete_missing (bool, optional): Whether to delete the rows loaded before but
+            missing from the file
+        force (bool, optional): Whether to upsert every row, even the unchanged ones,
+            e.g. to repair a table changed outside of the loader
+
+    Returns:
+        LoadResult: The outcome of the load
+
+    Raises:
+        ValueError: If the file does not match the schema of the table
+    """
+    started = time.perf_counter()
+    result = LoadResult(table_id=table_id, source_path=source_path)
+    table_ref = f"{backend.project_id}.{dataset_id}.{table_id}"
+    hashes_ref = f"{backend.project_id}.{dataset_id}.{ROW_HASHES_TABLE_ID}"
+    key_columns = TABLE_KEYS[table_id]
+
+    backend.create_table(table_ref, TABLE_SCHEMAS[table_id])
+    backend.create_table(hashes_ref, ROW_HASHES_SCHEMA)
+    stored_hashes = _get_stored_hashes(backend, hashes_ref, table_id)
+    seen_keys = set()
+
+    for chunk in read_chunks(source_path, table_id, chunk_rows):
+        changed_rows, changed_hashes = [], []
+        for row in chunk:
+            row_key = get_row_key(row, table_id)
+            if row_key in seen_keys:
+                raise ValueError(
+                    f"{source_path}: duplicate key {row_key} of the columns {key_columns}"
+                )
+            seen_keys.add(row_key)
+            row_hash = get_row_hash(row, table_id)
+            stored_hash = stored_hashes.get(row_key)
+            if stored_hash == row_hash and not force:
+                result.unchanged += 1
+                continue
+            if stored_hash is None:
+                result.inserted += 1
+            else:
+                result.updated += 1
+            changed_rows.append(row)
+            changed_hashes.append(
+                {"table_id": table_id, "row_key": row_key, "row_hash": row_hash}
+            )
+        if changed_rows:
+            backend.upsert_rows(table_ref, changed_rows, key_columns)
+            # The hashes are stored once the rows are, so a failed upsert is retried
+            backend.upsert_rows(hashes_ref, changed_hashes, _ROW_HASH_KEYS)
+        result.rows += len(chunk)
+
+    missing_keys = [key for key in stored_hashes if key not in seen_keys]
+    if delete_missing and missing_keys:
+        backend.delete_rows(
+            table_ref,
+            [dict(zip(key_columns, json.loads(key))) for key in missing_keys],
+            key_columns,
+        )
+        backend.delete_rows(
+            hashes_ref,
+            [{"table_id": table_id, "row_key": key} for key in missing_keys],
+            _ROW_HASH_KEYS,
+        )
+        result.deleted = len(missing_keys)
+
+    result.seconds = round(time.perf_counter() - started, 3)
+    logging.info(
+        f"Loaded {result.rows} rows into {table_id} in {result.seconds}s: "
+        f"{result.inserted} inserted, {result.updated} updated, "
+        f"{result.unchanged} unchanged, {result.deleted} deleted"
+    )
+    return result
+
+
+def load_tables(
+    backend: DataBackend,
+    dataset_id: str,
+    sources: Dict[str, str],
+    chunk_rows: int = 5000,
+    delete_missing: bool = False,
+    force: bool = False,
+) -> Dict[str, LoadResult]:
+    """Load files into their tables in parallel, see load_table.
+
+    A table failing to load does not stop the others: its result holds the error.
+
+    Args:
+        backend (DataBackend): The data backend to load the tables into
+        dataset_id (str): The dataset of the tables
+        sources (Dict[str, str]): The path of the file to load, by table ID
+        chunk_rows (int, optional): The number of rows read and upserted at once
+        delete_missing (bool, optional): Whether to delete the rows loaded before but
+            missing from the files
+        force (bool, optional): Whether to upsert every row, even the unchanged ones
+
+    Returns:
+        Dict[str, LoadResult]: The outcome of the load, by table ID
+    """
+
+    def load(table_id: str) -> LoadResult:
+        try:
+            return load_table(
+                backend,
+                dataset_id,
+                table_id,
+                sources[table_id],
+                chunk_rows=chunk_rows,
+                delete_missing=delete_missing,
+                force=force,
+            )
+        except Exception as error:
+            logging.exception(f"Loading {table_id} failed")
+            return LoadResult(
+                table_id=table_id,
+                source_path=sources[table_id],
+                error=f"{type(error).__name__}: {error}",
+            )
+
+    if not sources:
+        return {}
+    with ThreadPoolExecutor(
+        max_workers=len(sources), thread_name_prefix="bulk-load"
+    ) as executor:
+        return dict(zip(sources, executor.map(load, sources)))
@@ -0,0 +1,192 @@
+"""
+Context Prefetch Module.
+
+This module provides the prefetch stage of the CurrentOrFutureSkillsDevelopmentAgent.
+Left alone, the model calls the employee profile, company information, company policy
+and project portfolio tools one after another, one LLM turn each. Instead, the before
+agent callback created by `create_skills_context_prefetch` fetches all of them
+concurrently before the first LLM call, and writes them into the session state, from
+where they are inserted into the agent's instruction. The model then starts with the
+full context, and the latency of the stage is the one of the slowest source rather than
+their sum.
+
+The email of the employee is taken from the session state (`employee_email`, set by the
+intent router) or from the user message. Without an email, nothing is prefetched and
+the agent asks for it as before. Sources failing to load are left empty in the state,
+and the model falls back to calling their tools. A complete prefetch is reused by the
+next invocations of the agent in the session for the same employee, for
+CONTEXT_PREFETCH_TTL_SECONDS, instead of fetching every source again. The company
+information and policy do not depend on the employee: when another employee is asked
+about within the TTL, only the employee profile and the project portfolio are fetched
+again.
+
+The company information and policy are asked to the function passed by the agent
+module, e.g. a search of the local document index or a run of the company information
+agent, so that this module does not depend on the agents. The prefetched tool results
+are shaped for the agent like the results of its tool calls (see
+`utils.tool_output_shaping`).
+
+Attributes:
+    PREFETCHED_STATE_KEYS: The session state keys of the prefetched sources
+    PREFETCHED_FOR_STATE_KEY: The session state key of the email of the employee whose
+        context was prefetched
+    PREFETCHED_AT_STATE_KEY: The session state key of the time of the prefetch
+    PREFETCHED_COMPANY_AT_STATE_KEY: The session state key of the time of the prefetch
+        of the company information and policy
+
+Example:
+    ```python
+    from google.adk.agents import LlmAgent
+    from utils.context_prefetch import create_skills_context_prefetch
+
+    async def ask_company_information(request: str) -> str:
+        ...
+
+    agent = LlmAgent(
+        ...,
+        instruction="Employee profile: {prefetched_employee_profile?}",
+        before_agent_callback=[create_skills_context_prefetch(ask_company_information)],
+    )
+    ```
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from ..config import config
+from ..tools.employee_profile_tool import get_employee_profile
+from ..tools.project_portfolio_tool import get_project_portfolio
+from .intent_router import extract_email
+from .metrics import registry
+from .tool_output_shaping import shape_output
+
+COMPANY_INFORMATION_REQUEST = (
+    "Describe the company: its mission, vision, values, services and industries."
+)
+COMPANY_POLICY_REQUEST = (
+    "Describe the employee professional development company policy: the training "
+    "budget, the approval process, and the eligible trainings and certifications."
+)
+
+PREFETCHED_STATE_KEYS: Dict[str, str] = {
+    "employee_profile": "prefetched_employee_profile",
+    "company_information": "prefetched_company_information",
+    "company_policy": "prefetched_company_policy",
+    "project_portfolio": "prefetched_project_portfolio",
+}
+PREFETCHED_FOR_STATE_KEY = "prefetched_for"
+PREFETCHED_AT_STATE_KEY = "prefetched_at"
+PREFETCHED_COMPANY_AT_STATE_KEY = "prefetched_company_at"
+
+# Sources not depending on the employee, reused when only the employee changes
+COMPANY_SOURCES = ("company_information", "company_policy")
+
+# Sources whose results are shaped like the results of their tools
+PREFETCHED_TOOL_NAMES: Dict[str, str] = {
+    "employee_profile": "get_employee_profile",
+    "project_portfolio": "get_project_portfolio",
+}
+
+_prefetch_latency = registry.histogram(
+    "context_prefetch_seconds",
+    "Latency of the context prefetch stage, by source ('total' for the whole stage)",
+    ["source"],
+)
+
+
+async def _timed(source: str, awaitable: Awaitable[Any]) -> Any:
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        _prefetch_latency.observe(time.perf_counter() - started, source=source)
+
+
+def _employee_email(callback_context: CallbackContext) -> Optional[str]:
+    email = callback_context.state.get("employee_email")
+    content = callback_context.user_content
+    if content and content.parts:
+        email = (
+            extract_email(" ".join(p.text for p in content.parts if p.text)) or email
+        )
+    return email
+
+
+def create_skills_context_prefetch(
+    ask_company_information: Callable[[str], Awaitable[Any]],
+) -> Callable[[CallbackContext], Awaitable[Optional[types.Content]]]:
+    """Create the before agent callback fetching the context of the skills agent.
+
+    Args:
+        ask_company_information (Callable[[str], Awaitable[Any]]): Answers a request
+            about the company information or policy
+
+    Returns:
+        Callable[[CallbackContext], Awaitable[Optional[types.Content]]]: The before
+            agent callback, always returning None to run the agent with the prefetched
+            context in its session state
+    """
+
+    async def prefetch_skills_context(
+        callback_context: CallbackContext,
+    ) -> Optional[types.Content]:
+        if not config.context_prefetch_enabled:
+            return None
+        email = _employee_email(callback_context)
+        if email is None:
+            return None
+        state = callback_context.state
+        ttl_seconds = config.context_prefetch_ttl_seconds
+        # Prefetched by a previous invocation of the agent in the session
+        if (
+            state.get(PREFETCHED_FOR_STATE_KEY) == email
+            and time.time() - state.get(PREFETCHED_AT_STATE_KEY, 0) < ttl_seconds
+        ):
+            return None
+        state["employee_email"] = email
+
+        started = time.perf_counter()
+        sources = {
+            "employee_profile": get_employee_profile(email),
+            "project_portfolio": get_project_portfolio(),
+        }
+        if time.time() - state.get(PREFETCHED_COMPANY_AT_STATE_KEY, 0) >= ttl_seconds:
+            sources["company_information"] = ask_company_information(
+                COMPANY_INFORMATION_REQUEST
+            )
+            sources["company_policy"] = ask_company_information(COMPANY_POLICY_REQUEST)
+        results = await asyncio.gather(
+            *(_timed(source, awaitable) for source, awaitable in sources.items()),
+            return_exceptions=True,
+        )
+        _prefetch_latency.observe(time.perf_counter() - started, source="total")
+
+        failed = set()
+        for source, result in zip(sources, results):
+            if isinstance(result, BaseException):
+                logging.warning(f"Could not prefetch {source} for {email}: {result}")
+                failed.add(source)
+                result = ""
+            elif source in PREFETCHED_TOOL_NAMES:
+                result = shape_output(
+                    callback_context.agent_name, PREFETCHED_TOOL_NAMES[source], result
+                )
+            state[PREFETCHED_STATE_KEYS[source]] = (
+                result if isinstance(result, str) else json.dumps(result, default=str)
+            )
+        # A prefetch missing sources is retried by the next invocation
+        state[PREFETCHED_FOR_STATE_KEY] = email
+        state[PREFETCHED_AT_STATE_KEY] = 0 if failed else time.time()
+        if "company_information" in sources:
+            state[PREFETCHED_COMPANY_AT_STATE_KEY] = (
+                0 if failed.intersection(COMPANY_SOURCES) else time.time()
+            )
+        return None
+
+    return prefetch_skills_context
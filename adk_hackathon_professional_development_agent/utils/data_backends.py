@@ -0,0 +1,671 @@
+"""
+Data Backends Module.
+
+This module defines the pluggable data backend interface used by the BigQuery operations
+utility module, together with two implementations:
+
+- BigQueryBackend: Runs queries and streaming inserts against Google BigQuery (default)
+- LocalBackend: An embedded SQLite database bulk-loaded at startup from the pipe-delimited
+  CSV files under `input_data/bigquery`. It answers lookups in microseconds and does not
+  need any cloud dependency, which makes it suitable for dev, test and edge deployments.
+
+Queries are written in BigQuery Standard SQL by the tools. The local backend translates
+the small subset of BigQuery syntax used by the tools (backtick-quoted fully qualified
+table references, `@name` query parameters and `IN UNNEST(@array)` filters) to SQLite.
+
+Besides rows as dictionaries, every backend can return query results as Apache Arrow
+tables: BigQuery downloads them through the BigQuery Storage Read API, while the local
+backend builds them column by column from the SQLite cursor.
+
+For the bulk loader (see `utils.bulk_loader`), every backend can also create tables and
+upsert or delete rows by key: BigQuery stages the rows with a load job and merges them
+into the table, while the local backend replaces them in a transaction. BigQuery rejects
+a MERGE updating or deleting rows still in the streaming buffer of the table, i.e. rows
+streamed by the write pipeline in the last minutes (up to 90 minutes): the MERGE is
+retried with exponential backoff, and a StreamingBufferError is raised if the rows are
+still buffered after the last attempt, after which the load can be run again.
+
+Example:
+    ```python
+    from google.cloud import bigquery
+    from utils.data_backends import LocalBackend
+
+    backend = LocalBackend(data_dir="input_data/bigquery")
+    rows = backend.query(
+        "SELECT * FROM `local.amazincorp.employee_profiles` WHERE email = @email",
+        [bigquery.ScalarQueryParameter("email", "STRING", "john.doe@amazincorp.com")],
+    )
+    ```
+"""
+
+import csv
+import datetime
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
+
+import pyarrow as pa
+
+from .table_schemas import CSV_DELIMITER, TABLE_SCHEMAS
+
+if TYPE_CHECKING:
+    # Imported by the BigQuery backend only, as the client library is slow to import
+    from google.cloud import bigquery
+
+# Matches backtick-quoted table references, e.g. `project.dataset.table`
+_TABLE_REF_PATTERN = re.compile(r"`(?:[\w-]+\.)*(\w+)`")
+# Matches BigQuery array parameter filters, e.g. IN UNNEST(@emails)
+_UNNEST_PATTERN = re.compile(r"IN\s+UNNEST\(\s*@(\w+)\s*\)", re.IGNORECASE)
+# Part of the error of BigQuery DML statements over rows in the streaming buffer
+_STREAMING_BUFFER_ERROR = "in the streaming buffer"
+
+
+class StreamingBufferError(RuntimeError):
+    """Raised when rows to update or delete are still in the streaming buffer."""
+
+
+# Matches BigQuery named query parameters, e.g. @email
+_PARAMETER_PATTERN = re.compile(r"@(\w+)")
+
+_SQLITE_TYPES = {
+    "STRING": "TEXT",
+    "FLOAT": "REAL",
+    "INTEGER": "INTEGER",
+    "DATE": "DATE",
+}
+
+_ARROW_TYPES = {
+    "STRING": pa.string(),
+    "FLOAT": pa.float64(),
+    "INTEGER": pa.int64(),
+    "DATE": pa.date32(),
+}
+
+# Return DATE columns as datetime.date objects, like the BigQuery client library does
+sqlite3.register_adapter(datetime.date, lambda value: value.isoformat())
+sqlite3.register_converter(
+    "DATE", lambda value: datetime.date.fromisoformat(value.decode())
+)
+
+
+def get_referenced_tables(query: str) -> FrozenSet[str]:
+    """Get the IDs of the tables referenced by a query.
+
+    Args:
+        query (str): The SQL query with backtick-quoted table references
+
+    Returns:
+        FrozenSet[str]: The table IDs without project and dataset
+    """
+    return frozenset(_TABLE_REF_PATTERN.findall(query))
+
+
+def get_parameter_name_and_value(param: Any) -> Tuple[str, Any]:
+    """Get the name and value of a query parameter.
+
+    Args:
+        param (Any): A bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter or
+            a dictionary with "name" and "value" keys
+
+    Returns:
+        Tuple[str, Any]: The parameter name and its value (a list for array parameters)
+    """
+    if isinstance(param, dict):
+        return param["name"], param["value"]
+    # Array parameters have values, scalar parameters a value
+    if hasattr(param, "values"):
+        return param.name, list(param.values)
+    return param.name, param.value
+
+
+@dataclass
+class QueryStatistics:
+    """Cost statistics of a query job, as reported by the data backend.
+
+    Attributes:
+        total_bytes_processed (int): Bytes processed by the query
+        slot_millis (int): Slot milliseconds consumed by the query
+        cache_hit (bool): Whether the backend answered from its own result cache
+    """
+
+    total_bytes_processed: int = 0
+    slot_millis: int = 0
+    cache_hit: bool = False
+
+
+class DataBackend(ABC):
+    """Interface of the data backends used by the BigQuery operations utility module."""
+
+    @property
+    @abstractmethod
+    def project_id(self) -> str:
+        """str: The project ID used to build fully qualified table references."""
+
+    @abstractmethod
+    def query(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """Execute a query and return all result rows.
+
+        Args:
+            query (str): The SQL query to execute, in BigQuery Standard SQL
+            params (List[Any], optional): Query parameters for safe SQL execution
+
+        Returns:
+            List[Dict[str, Any]]: List of rows as dictionaries
+        """
+
+    def query_with_statistics(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], QueryStatistics]:
+        """Execute a query and return all result rows with the job statistics.
+
+        Backends without job statistics report empty statistics.
+
+        Args:
+            query (str): The SQL query to execute, in BigQuery Standard SQL
+            params (List[Any], optional): Query parameters for safe SQL execution
+
+        Returns:
+            Tuple[List[Dict[str, Any]], QueryStatistics]: The rows and the job statistics
+        """
+        return self.query(query, params), QueryStatistics()
+
+    def query_arrow_with_statistics(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[pa.Table, QueryStatistics]:
+        """Execute a query and return the result as an Arrow table with the job statistics.
+
+        Backends without a columnar result path convert the result rows.
+
+        Args:
+            query (str): The SQL query to execute, in BigQuery Standard SQL
+            params (List[Any], optional): Query parameters for safe SQL execution
+
+        Returns:
+            Tuple[pa.Table, QueryStatistics]: The result table and the job statistics
+        """
+        rows, statistics = self.query_with_statistics(query, params)
+        return pa.Table.from_pylist(rows), statistics
+
+    @abstractmethod
+    def insert_rows(
+        self,
+        table_ref: str,
+        rows: List[Dict[str, Any]],
+        row_ids: Optional[List[str]] = None,
+    ) -> None:
+        """Append rows to a table.
+
+        Args:
+            table_ref (str): Fully qualified table reference in format 'project.dataset.table'
+            rows (List[Dict[str, Any]]): The rows to insert as dictionaries
+            row_ids (List[str], optional): Unique IDs of the rows, used by backends
+                that deduplicate retried inserts
+        """
+
+    @abstractmethod
+    def create_table(self, table_ref: str, schema: List[Tuple[str, str]]) -> None:
+        """Create a table if it does not exist yet.
+
+        Args:
+            table_ref (str): Fully qualified table reference in format 'project.dataset.table'
+            schema (List[Tuple[str, str]]): The (column name, BigQuery type) columns
+        """
+
+    @abstractmethod
+    def upsert_rows(
+        self, table_ref: str, rows: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        """Insert rows into a table, replacing the rows with the same key.
+
+        Args:
+            table_ref (str): Fully qualified table reference in format 'project.dataset.table'
+            rows (List[Dict[str, Any]]): The rows to upsert as dictionaries
+            key_columns (List[str]): The columns identifying a row
+        """
+
+    @abstractmethod
+    def delete_rows(
+        self, table_ref: str, keys: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        """Delete the rows of a table with the given keys.
+
+        Args:
+            table_ref (str): Fully qualified table reference in format 'project.dataset.table'
+            keys (List[Dict[str, Any]]): The keys of the rows to delete, as dictionaries
+                of the key columns
+            key_columns (List[str]): The columns identifying a row
+        """
+
+
+class BigQueryBackend(DataBackend):
+    """Data backend running queries and streaming inserts against Google BigQuery.
+
+    Args:
+        project_id (str, optional): Google Cloud Project ID. Defaults to the project
+            inferred from the environment by the BigQuery client library.
+        timeout (float, optional): Seconds to wait for a query or an insert to finish
+        merge_max_attempts (int, optional): Attempts at merging rows into a table while
+            the rows to update or delete are in its streaming buffer
+        merge_retry_seconds (float, optional): Delay before the first retry of such a
+            merge, doubled after each attempt
+    """
+
+    def __init__(
+        self,
+        project_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+        merge_max_attempts: int = 4,
+        merge_retry_seconds: float = 30.0,
+    ):
+        from google.cloud import bigquery
+
+        self._client = bigquery.Client(project=project_id or None)
+        self._timeout = timeout
+        self._merge_max_attempts = merge_max_attempts
+        self._merge_retry_seconds = merge_retry_seconds
+
+    @property
+    def project_id(self) -> str:
+        return self._client.project
+
+    def query(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        return self.query_with_statistics(query, params)[0]
+
+    def _run_query(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple["bigquery.table.RowIterator", QueryStatistics]:
+        from google.cloud import bigquery
+
+        job_config = bigquery.QueryJobConfig(query_parameters=params or [])
+        query_job = self._client.query(query, job_config=job_config)
+        results = query_job.result(timeout=self._timeout)
+        return results, QueryStatistics(
+            total_bytes_processed=query_job.total_bytes_processed or 0,
+            slot_millis=query_job.slot_millis or 0,
+            cache_hit=bool(query_job.cache_hit),
+        )
+
+    def query_with_statistics(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[List[Dict[str, Any]], QueryStatistics]:
+        results, statistics = self._run_query(query, params)
+        return [dict(row) for row in results], statistics
+
+    def query_arrow_with_statistics(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[pa.Table, QueryStatistics]:
+        results, statistics = self._run_query(query, params)
+        # Downloads large results in parallel through the BigQuery Storage Read API,
+        # falling back to the REST API for small results
+        return results.to_arrow(create_bqstorage_client=True), statistics
+
+    def insert_rows(
+        self,
+        table_ref: str,
+        rows: List[Dict[str, Any]],
+        row_ids: Optional[List[str]] = None,
+    ) -> None:
+        # Streaming inserts avoid the latency and the daily quota of load jobs, and
+        # deduplicate rows retried with the same row ID
+        errors = self._client.insert_rows_json(
+            table_ref, rows, row_ids=row_ids, timeout=self._timeout
+        )
+        if errors:
+            raise RuntimeError(f"Streaming insert into {table_ref} failed: {errors}")
+
+    def create_table(self, table_ref: str, schema: List[Tuple[str, str]]) -> None:
+        from google.cloud import bigquery
+
+        table = bigquery.Table(
+            table_ref,
+            schema=[
+                bigquery.SchemaField(name, column_type) for name, column_type in schema
+            ],
+        )
+        self._client.create_table(table, exists_ok=True, timeout=self._timeout)
+
+    def upsert_rows(
+        self, table_ref: str, rows: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        columns = list(rows[0]) if rows else []
+        updates = ", ".join(
+            f"{name} = source.{name}" for name in columns if name not in key_columns
+        )
+        self._merge(
+            table_ref,
+            rows,
+            key_columns,
+            (f"WHEN MATCHED THEN UPDATE SET {updates} " if updates else "")
+            + f"WHEN NOT MATCHED THEN INSERT ({', '.join(columns)}) "
+            f"VALUES ({', '.join(f'source.{name}' for name in columns)})",
+        )
+
+    def delete_rows(
+        self, table_ref: str, keys: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        self._merge(table_ref, keys, key_columns, "WHEN MATCHED THEN DELETE")
+
+    def _merge(
+        self,
+        table_ref: str,
+        rows: List[Dict[str, Any]],
+        key_columns: List[str],
+        clauses: str,
+    ) -> None:
+        """Stage rows in a temporary table and merge them into a table by key.
+
+        Raises:
+            StreamingBufferError: If rows to update or delete are still in the streaming
+                buffer of the table after the last attempt
+        """
+        from google.api_core.exceptions import BadRequest
+        from google.cloud import bigquery
+
+        if not rows:
+            return
+        columns = set(rows[0])
+        schema = [
+            field
+            for field in self._client.get_table(table_ref, timeout=self._timeout).schema
+            if field.name in columns
+        ]
+        staging_ref = f"{table_ref}_staging_{uuid.uuid4().hex}"
+        try:
+            # Unlike streaming inserts, load jobs are free and their rows can be merged
+            # right away, instead of staying in the streaming buffer
+            self._client.load_table_from_json(
+                [_to_json_row(row) for row in rows],
+                staging_ref,
+                job_config=bigquery.LoadJobConfig(
+                    schema=schema, write_disposition="WRITE_TRUNCATE"
+                ),
+            ).result(timeout=self._timeout)
+            condition = " AND ".join(
+                f"target.{name} = source.{name}" for name in key_columns
+            )
+            statement = (
+                f"MERGE `{table_ref}` AS target USING `{staging_ref}` AS source "
+                f"ON {condition} {clauses}"
+            )
+            for attempt in range(1, self._merge_max_attempts + 1):
+                try:
+                    self._client.query(statement).result(timeout=self._timeout)
+                    break
+                except BadRequest as error:
+                    if _STREAMING_BUFFER_ERROR not in str(error):
+                        raise
+                    if attempt == self._merge_max_attempts:
+                        raise StreamingBufferError(
+                            f"Rows of {table_ref} to update or delete are still in its "
+                            f"streaming buffer after {attempt} attempts, load them "
+                            "again later"
+                        ) from error
+                    delay = self._merge_retry_seconds * 2 ** (attempt - 1)
+                    logging.warning(
+                        f"Rows of {table_ref} to update or delete are in its streaming "
+                        f"buffer (attempt {attempt}/{self._merge_max_attempts}), "
+                        f"retrying in {delay:g}s"
+                    )
+                    time.sleep(delay)
+        finally:
+            self._client.delete_table(
+                staging_ref, not_found_ok=True, timeout=self._timeout
+            )
+
+
+class LocalBackend(DataBackend):
+    """Embedded SQLite data backend loaded from the CSV files under `input_data/bigquery`.
+
+    Every table declared in TABLE_SCHEMAS is created on startup and, if empty, bulk-loaded
+    from the `<table_id>.csv` file found in the data directory. A single connection is
+    shared between threads and guarded by a lock. Upserted and deleted rows are looked up
+    through an index on the key columns, created on first use.
+
+    Args:
+        data_dir (str): Directory holding the pipe-delimited `<table_id>.csv` files
+        database_path (str, optional): Path of the SQLite database file. Defaults to
+            ":memory:", meaning the data is reloaded from the CSV files on every startup.
+        project_id (str, optional): Project ID used in fully qualified table references
+    """
+
+    def __init__(
+        self,
+        data_dir: str,
+        database_path: str = ":memory:",
+        project_id: str = "local",
+    ):
+        self._project_id = project_id or "local"
+        self._lock = threading.Lock()
+        self._schemas: Dict[str, List[Tuple[str, str]]] = dict(TABLE_SCHEMAS)
+        self._key_indexes = set()
+        self._connection = sqlite3.connect(
+            database_path,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES,
+        )
+        self._connection.row_factory = sqlite3.Row
+        self._load_tables(data_dir)
+
+    @property
+    def project_id(self) -> str:
+        return self._project_id
+
+    def _load_tables(self, data_dir: str) -> None:
+        """Create the declared tables and bulk-load the empty ones from CSV files."""
+        with self._lock, self._connection:
+            for table_id, schema in TABLE_SCHEMAS.items():
+                self._create_table(table_id, schema)
+
+                csv_path = os.path.join(data_dir, f"{table_id}.csv")
+                (row_count,) = self._connection.execute(
+                    f"SELECT COUNT(*) FROM {table_id}"
+                ).fetchone()
+                if row_count or not os.path.exists(csv_path):
+                    continue
+
+                with open(csv_path, newline="", encoding="utf-8") as csv_file:
+                    rows = list(csv.DictReader(csv_file, delimiter=CSV_DELIMITER))
+                self._insert(table_id, rows)
+                logging.info(f"Loaded {len(rows)} rows into local table {table_id}")
+
+    def _create_table(self, table_id: str, schema: List[Tuple[str, str]]) -> None:
+        columns = ", ".join(
+            f"{name} {_SQLITE_TYPES[column_type]}" for name, column_type in schema
+        )
+        self._connection.execute(f"CREATE TABLE IF NOT EXISTS {table_id} ({columns})")
+        self._schemas[table_id] = schema
+
+    def _insert(self, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """Insert rows into a table, converting values to the declared column types."""
+        schema = self._schemas[table_id]
+        placeholders = ", ".join("?" for _ in schema)
+        self._connection.executemany(
+            f"INSERT INTO {table_id} ({', '.join(name for name, _ in schema)}) "
+            f"VALUES ({placeholders})",
+            [
+                tuple(
+                    _to_sqlite_value(row.get(name), column_type)
+                    for name, column_type in schema
+                )
+                for row in rows
+            ],
+        )
+
+    @staticmethod
+    def translate_query(
+        query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Translate a BigQuery Standard SQL query and its parameters to SQLite.
+
+        Args:
+            query (str): The SQL query in BigQuery Standard SQL
+            params (List[Any], optional): The BigQuery query parameters
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The SQLite query and its named parameters
+        """
+        values = dict(get_parameter_name_and_value(param) for param in params or [])
+        sqlite_params = {}
+
+        def expand_array(match: re.Match) -> str:
+            name = match.group(1)
+            placeholders = []
+            for index, value in enumerate(values.pop(name)):
+                sqlite_params[f"{name}_{index}"] = value
+                placeholders.append(f":{name}_{index}")
+            return f"IN ({', '.join(placeholders)})"
+
+        query = _TABLE_REF_PATTERN.sub(r"\1", query)
+        query = _UNNEST_PATTERN.sub(expand_array, query)
+        query = _PARAMETER_PATTERN.sub(r":\1", query)
+        sqlite_params.update(values)
+        return query, sqlite_params
+
+    def query(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        sqlite_query, sqlite_params = self.translate_query(query, params)
+        with self._lock:
+            cursor = self._connection.execute(sqlite_query, sqlite_params)
+            return [dict(row) for row in cursor.fetchall()]
+
+    def query_arrow_with_statistics(
+        self, query: str, params: Optional[List[Any]] = None
+    ) -> Tuple[pa.Table, QueryStatistics]:
+        sqlite_query, sqlite_params = self.translate_query(query, params)
+        with self._lock:
+            cursor = self._connection.execute(sqlite_query, sqlite_params)
+            names = [description[0] for description in cursor.description]
+            rows = cursor.fetchall()
+
+        # Type the columns by the schemas of the queried tables, so that empty results
+        # keep their types
+        column_types = {
+            name: _ARROW_TYPES[column_type]
+            for table_id in get_referenced_tables(query)
+            for name, column_type in self._schemas.get(table_id, [])
+        }
+        columns = zip(*rows) if rows else [[] for _ in names]
+        table = pa.table(
+            {
+                name: pa.array(values, type=column_types.get(name))
+                for name, values in zip(names, columns)
+            }
+        )
+        return table, QueryStatistics()
+
+    def insert_rows(
+        self,
+        table_ref: str,
+        rows: List[Dict[str, Any]],
+        row_ids: Optional[List[str]] = None,
+    ) -> None:
+        with self._lock, self._connection:
+            self._insert(table_ref.split(".")[-1], rows)
+
+    def create_table(self, table_ref: str, schema: List[Tuple[str, str]]) -> None:
+        with self._lock, self._connection:
+            self._create_table(table_ref.split(".")[-1], schema)
+
+    def upsert_rows(
+        self, table_ref: str, rows: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        table_id = table_ref.split(".")[-1]
+        with self._lock, self._connection:
+            self._delete(table_id, rows, key_columns)
+            self._insert(table_id, rows)
+
+    def delete_rows(
+        self, table_ref: str, keys: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        with self._lock, self._connection:
+            self._delete(table_ref.split(".")[-1], keys, key_columns)
+
+    def _delete(
+        self, table_id: str, keys: List[Dict[str, Any]], key_columns: List[str]
+    ) -> None:
+        """Delete the rows with the given keys, through an index on the key columns."""
+        index = (table_id, tuple(key_columns))
+        if index not in self._key_indexes:
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table_id}_{'_'.join(key_columns)} "
+                f"ON {table_id} ({', '.join(key_columns)})"
+            )
+            self._key_indexes.add(index)
+        column_types = dict(self._schemas[table_id])
+        self._connection.executemany(
+            f"DELETE FROM {table_id} WHERE "
+            + " AND ".join(f"{name} = ?" for name in key_columns),
+            [
+                tuple(
+                    _to_sqlite_value(key[name], column_types[name])
+                    for name in key_columns
+                )
+                for key in keys
+            ],
+        )
+
+
+def _to_sqlite_value(value: Any, column_type: str) -> Any:
+    """Convert a CSV or JSON value to the Python type stored for a column type."""
+    if value is None or (value == "" and column_type != "STRING"):
+        return None
+    if column_type == "FLOAT":
+        return float(value)
+    if column_type == "INTEGER":
+        return int(value)
+    if column_type == "DATE" and isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+def _to_json_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert the DATE values of a row to ISO strings, for a JSON load job."""
+    return {
+        name: value.isoformat() if isinstance(value, datetime.date) else value
+        for name, value in row.items()
+    }
+
+
+def create_backend(
+    backend_name: str,
+    project_id: Optional[str] = None,
+    local_data_dir: Optional[str] = None,
+    local_database_path: str = ":memory:",
+    timeout: Optional[float] = None,
+) -> DataBackend:
+    """Create a data backend by name.
+
+    Args:
+        backend_name (str): Either "bigquery" or "local"
+        project_id (str, optional): Google Cloud Project ID
+        local_data_dir (str, optional): CSV directory used by the local backend
+        local_database_path (str, optional): SQLite database path used by the local backend
+        timeout (float, optional): Seconds to wait for a BigQuery job to finish
+
+    Returns:
+        DataBackend: The created data backend
+
+    Raises:
+        ValueError: If the backend name is not supported
+    """
+    if backend_name == "bigquery":
+        return BigQueryBackend(project_id=project_id, timeout=timeout)
+    if backend_name == "local":
+        return LocalBackend(
+            data_dir=local_data_dir,
+            database_path=local_database_path,
+            project_id=project_id,
+        )
+    raise ValueError(f"Unsupported data backend: {backend_name}")
@@ -0,0 +1,461 @@
+"""
+Document Index Module.
+
+This module provides the local search index over the company documents under
+`input_data/vertex_ai_search`, used instead of the Vertex AI Search data store and the
+nested company information agent when COMPANY_INFORMATION_BACKEND is "local_index".
+
+The index is built offline:
+- The text of every PDF page is extracted and normalized
+- The text of each document is split into overlapping passages of a few sentences'
+  worth of words, each remembering its source file and page
+- A BM25 inverted index is built over the passage terms, optionally together with
+  hashed-embedding vectors, i.e. signed feature hashing of the passage unigrams and
+  bigrams into a fixed number of dimensions
+
+The index is stored as a directory of NumPy arrays, which are memory-mapped on load, and
+a JSON file holding the passages and the vocabulary. A query only touches the postings
+of its own terms, so the top passages are returned in a fraction of a millisecond.
+
+Each build writes a new version of the index into its own subdirectory of the index
+directory, then atomically points the `CURRENT` file of the index directory to it. The
+files of a version are never rewritten, so a live index keeps searching the version it
+memory-mapped, and `get_document_index` reloads the shared index once it sees a new
+version, checking at most once per DOCUMENT_INDEX_CHECK_SECONDS. A missing index is
+built on first use under a lock shared by the worker processes, so only one of them
+builds it.
+
+Example:
+    ```python
+    from utils.document_index import build_index, DocumentIndex
+
+    build_index("input_data/vertex_ai_search", "document_index")
+    index = DocumentIndex.load("document_index")
+    passages = index.search("What is the annual training budget?", top_k=3)
+    ```
+"""
+
+import fcntl
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config import config
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[-/.][a-z0-9]+)*")
+
+_STOP_WORDS = frozenset(
+    "a about an and are as at be been by can could do does for from has have how i if "
+    "in into is it its me my of on or our so such than that the their them there these "
+    "they this to us was we what when where which who will with would you your".split()
+)
+
+_METADATA_FILE = "index.json"
+# File of the index directory naming the subdirectory of the current version
+_CURRENT_FILE = "CURRENT"
+_LOCK_FILE = "build.lock"
+_VERSION_PREFIX = "version-"
+_ARRAY_FILES = (
+    "term_offsets",
+    "posting_passages",
+    "posting_frequencies",
+    "passage_lengths",
+    "inverse_document_frequencies",
+    "vectors",
+)
+
+
+def normalize_text(text: str) -> str:
+    """Normalize extracted PDF text, e.g. ligatures and line breaks between words.
+
+    Args:
+        text (str): The extracted text
+
+    Returns:
+        str: The text with compatibility characters decomposed and whitespace collapsed
+    """
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a text into lowercase terms, ignoring stop words.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        List[str]: The terms of the text
+    """
+    return [
+        term
+        for term in _TOKEN_PATTERN.findall(normalize_text(text).lower())
+        if term not in _STOP_WORDS
+    ]
+
+
+def extract_pages(pdf_path: str) -> List[str]:
+    """Extract the normalized text of every page of a PDF.
+
+    Args:
+        pdf_path (str): The path of the PDF
+
+    Returns:
+        List[str]: The text of each page
+    """
+    from pypdf import PdfReader
+
+    return [
+        normalize_text(page.extract_text() or "") for page in PdfReader(pdf_path).pages
+    ]
+
+
+def chunk_document(
+    source: str, pages: List[str], passage_words: int = 120, overlap_words: int = 30
+) -> List[Dict[str, Any]]:
+    """Split a document into overlapping passages of words.
+
+    Passages run across page breaks, so that sections split over two pages are kept
+    together, and remember the page they start on.
+
+    Args:
+        source (str): The file name of the document
+        pages (List[str]): The text of each page
+        passage_words (int, optional): The number of words per passage
+        overlap_words (int, optional): The number of words shared by consecutive passages
+
+    Returns:
+        List[Dict[str, Any]]: The passages, each holding its source, page and text
+    """
+    words, word_pages = [], []
+    for page_number, text in enumerate(pages, start=1):
+        page_words = text.split()
+        words.extend(page_words)
+        word_pages.extend([page_number] * len(page_words))
+
+    stride = max(passage_words - overlap_words, 1)
+    passages = []
+    for start in range(0, max(len(words) - overlap_words, 1), stride):
+        text = " ".join(words[start : start + passage_words])
+        if text:
+            passages.append({"source": source, "page": word_pages[start], "text": text})
+    return passages
+
+
+def hash_embedding(terms: List[str], dimensions: int) -> np.ndarray:
+    """Embed terms and their bigrams with signed feature hashing.
+
+    Args:
+        terms (List[str]): The terms of a text
+        dimensions (int): The number of dimensions of the vector
+
+    Returns:
+        np.ndarray: The L2-normalized vector
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    features = terms + [f"{first} {second}" for first, second in zip(terms, terms[1:])]
+    for feature in features:
+        digest = zlib.crc32(feature.encode("utf-8"))
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def build_index(
+    pdf_dir: str,
+    index_dir: str,
+    passage_words: int = 120,
+    overlap_words: int = 30,
+    vector_dimensions: int = 256,
+) -> int:
+    """Build the search index of the PDFs of a directory and write it to disk.
+
+    Args:
+        pdf_dir (str): The directory holding the PDFs
+        index_dir (str): The directory the index is written to
+        passage_words (int, optional): The number of words per passage
+        overlap_words (int, optional): The number of words shared by consecutive passages
+        vector_dimensions (int, optional): The number of dimensions of the
+            hashed-embedding vectors, 0 disables them
+
+    Returns:
+        int: The number of indexed passages
+
+    Raises:
+        FileNotFoundError: If the directory does not hold any PDF
+    """
+    pdf_names = sorted(name for name in os.listdir(pdf_dir) if name.endswith(".pdf"))
+    if not pdf_names:
+        raise FileNotFoundError(f"No PDF found in {pdf_dir}")
+
+    passages = []
+    for name in pdf_names:
+        pages = extract_pages(os.path.join(pdf_dir, name))
+        passages.extend(chunk_document(name, pages, passage_words, overlap_words))
+    passage_terms = [tokenize(passage["text"]) for passage in passages]
+
+    # Inverted index in compressed sparse row layout: the postings of the term with
+    # ID t are posting_passages[term_offsets[t]:term_offsets[t + 1]]
+    vocabulary = sorted({term for terms in passage_terms for term in terms})
+    term_ids = {term: term_id for term_id, term in enumerate(vocabulary)}
+    postings: List[List[tuple]] = [[] for _ in vocabulary]
+    for passage_id, terms in enumerate(passage_terms):
+        for term, frequency in sorted(Counter(terms).items()):
+            postings[term_ids[term]].append((passage_id, frequency))
+
+    term_offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    term_offsets[1:] = np.cumsum([len(term_postings) for term_postings in postings])
+    flat_postings = [posting for term_postings in postings for posting in term_postings]
+    document_frequencies = np.diff(term_offsets).astype(np.float32)
+    passage_count = len(passages)
+
+    arrays = {
+        "term_offsets": term_offsets,
+        "posting_passages": np.array(
+            [passage_id for passage_id, _ in flat_postings], dtype=np.int32
+        ),
+        "posting_frequencies": np.array(
+            [frequency for _, frequency in flat_postings], dtype=np.float32
+        ),
+        "passage_lengths": np.array(
+            [len(terms) for terms in passage_terms], dtype=np.float32
+        ),
+        "inverse_document_frequencies": np.log(
+            1.0
+            + (passage_count - document_frequencies + 0.5)
+            / (document_frequencies + 0.5)
+        ).astype(np.float32),
+        "vectors": (
+            np.stack(
+                [hash_embedding(terms, vector_dimensions) for terms in passage_terms]
+            )
+            if vector_dimensions
+            else np.zeros((passage_count, 0), dtype=np.float32)
+        ),
+    }
+
+    os.makedirs(index_dir, exist_ok=True)
+    previous_version = read_index_version(index_dir)
+    version_dir = tempfile.mkdtemp(prefix=_VERSION_PREFIX, dir=index_dir)
+    for name, array in arrays.items():
+        np.save(os.path.join(version_dir, f"{name}.npy"), array)
+    with open(os.path.join(version_dir, _METADATA_FILE), "w", encoding="utf-8") as file:
+        json.dump({"passages": passages, "vocabulary": vocabulary}, file)
+    # mkdtemp creates the directory readable by its owner only
+    os.chmod(version_dir, 0o755)
+
+    version = os.path.basename(version_dir)
+    temporary_path = os.path.join(index_dir, f"{_CURRENT_FILE}.{os.getpid()}.tmp")
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        file.write(version)
+    os.replace(temporary_path, os.path.join(index_dir, _CURRENT_FILE))
+
+    # Older versions are deleted, keeping the replaced one for the processes about to
+    # load it. Deleting memory-mapped files leaves their mappings intact.
+    for name in os.listdir(index_dir):
+        if name.startswith(_VERSION_PREFIX) and name not in (version, previous_version):
+            shutil.rmtree(os.path.join(index_dir, name), ignore_errors=True)
+
+    logging.info(
+        f"Indexed {passage_count} passages of {len(pdf_names)} PDFs as {version}"
+    )
+    return passage_count
+
+
+def read_index_version(index_dir: str) -> Optional[str]:
+    """Read the current version of an index written by build_index.
+
+    Args:
+        index_dir (str): The directory of the index
+
+    Returns:
+        Optional[str]: The name of the subdirectory of the current version, or None if
+            the index was never built
+    """
+    try:
+        with open(os.path.join(index_dir, _CURRENT_FILE), encoding="utf-8") as file:
+            return file.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+class DocumentIndex:
+    """Hybrid BM25 and hashed-embedding search over an index written by build_index.
+
+    Args:
+        passages (List[Dict[str, Any]]): The indexed passages
+        vocabulary (List[str]): The indexed terms, ordered by term ID
+        arrays (Dict[str, np.ndarray]): The arrays of the index
+        k1 (float, optional): The BM25 term frequency saturation
+        b (float, optional): The BM25 passage length normalization
+        vector_weight (float, optional): The weight of the vector similarity in the
+            combined score, the BM25 score weighing the rest
+        version (Optional[str], optional): The version of the index on disk
+    """
+
+    def __init__(
+        self,
+        passages: List[Dict[str, Any]],
+        vocabulary: List[str],
+        arrays: Dict[str, np.ndarray],
+        k1: float = 1.2,
+        b: float = 0.75,
+        vector_weight: float = 0.3,
+        version: Optional[str] = None,
+    ):
+        self.passages = passages
+        self.version = version
+        self._term_ids = {term: term_id for term_id, term in enumerate(vocabulary)}
+        self._term_offsets = arrays["term_offsets"]
+        self._posting_passages = arrays["posting_passages"]
+        self._posting_frequencies = arrays["posting_frequencies"]
+        self._inverse_document_frequencies = arrays["inverse_document_frequencies"]
+        self._vectors = arrays["vectors"]
+        self.k1 = k1
+        self.vector_weight = vector_weight if self._vectors.shape[1] else 0.0
+
+        lengths = arrays["passage_lengths"]
+        # Per passage part of the BM25 denominator, precomputed once
+        self._length_norms = k1 * (1.0 - b + b * lengths / max(lengths.mean(), 1.0))
+
+    @classmethod
+    def load(cls, index_dir: str, **kwargs: Any) -> "DocumentIndex":
+        """Load the current version of an index written by build_index, memory-mapping
+        its arrays.
+
+        Args:
+            index_dir (str): The directory of the index
+            **kwargs: The scoring parameters of the index
+
+        Returns:
+            DocumentIndex: The loaded index
+
+        Raises:
+            FileNotFoundError: If the index was never built
+        """
+        version = read_index_version(index_dir)
+        if version is None:
+            raise FileNotFoundError(f"No document index built in {index_dir}")
+        version_dir = os.path.join(index_dir, version)
+        with open(os.path.join(version_dir, _METADATA_FILE), encoding="utf-8") as file:
+            metadata = json.load(file)
+        arrays = {
+            name: np.load(os.path.join(version_dir, f"{name}.npy"), mmap_mode="r")
+            for name in _ARRAY_FILES
+        }
+        return cls(
+            metadata["passages"],
+            metadata["vocabulary"],
+            arrays,
+            version=version,
+            **kwargs,
+        )
+
+    def _bm25_scores(self, terms: List[str]) -> np.ndarray:
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        for term in set(terms):
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                continue
+            start, end = self._term_offsets[term_id], self._term_offsets[term_id + 1]
+            passage_ids = self._posting_passages[start:end]
+            frequencies = self._posting_frequencies[start:end]
+            scores[passage_ids] += (
+                self._inverse_document_frequencies[term_id]
+                * frequencies
+                * (self.k1 + 1.0)
+                / (frequencies + self._length_norms[passage_ids])
+            )
+        return scores
+
+    def search(self, query: str, top_k: int = 5) -> List[Dict[str, Any]]:
+        """Find the passages most relevant to a query.
+
+        Args:
+            query (str): The query
+            top_k (int, optional): The number of passages to return
+
+        Returns:
+            List[Dict[str, Any]]: The passages, most relevant first, each holding its
+                source, page, text and score. Empty if no passage shares a term with
+                the query.
+        """
+        terms = tokenize(query)
+        scores = self._bm25_scores(terms)
+        if not scores.any():
+            return []
+
+        scores /= scores.max()
+        if self.vector_weight:
+            similarities = self._vectors @ hash_embedding(terms, self._vectors.shape[1])
+            scores = (1.0 - self.vector_weight) * scores + self.vector_weight * np.clip(
+                similarities, 0.0, None
+            )
+
+        candidates = np.flatnonzero(scores > 0)
+        # Highest score first, ties broken by passage order for deterministic rankings
+        ranked = candidates[np.lexsort((candidates, -scores[candidates]))][:top_k]
+        return [
+            {**self.passages[passage_id], "score": round(float(scores[passage_id]), 3)}
+            for passage_id in ranked
+        ]
+
+
+_index: Optional[DocumentIndex] = None
+_index_checked_at: Optional[float] = None
+_index_lock = threading.Lock()
+
+
+def _build_missing_index() -> None:
+    index_dir = config.document_index_dir
+    os.makedirs(index_dir, exist_ok=True)
+    # The worker processes warm up at once: the first one to take the lock builds the
+    # index, the others wait for it and load it
+    with open(os.path.join(index_dir, _LOCK_FILE), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if read_index_version(index_dir) is None:
+            build_index(config.company_documents_dir, index_dir)
+
+
+def get_document_index() -> DocumentIndex:
+    """Get the shared document index, building it first if it is not on disk yet.
+
+    The shared index is reloaded when a new version of the index was built, which is
+    checked at most once per DOCUMENT_INDEX_CHECK_SECONDS.
+
+    Returns:
+        DocumentIndex: The shared document index of DOCUMENT_INDEX_DIR
+    """
+    global _index, _index_checked_at
+    with _index_lock:
+        if (
+            _index is not None
+            and time.monotonic() - _index_checked_at
+            <= config.document_index_check_seconds
+        ):
+            return _index
+        version = read_index_version(config.document_index_dir)
+        if version is None:
+            _build_missing_index()
+        if _index is None or version != _index.version:
+            _index = DocumentIndex.load(config.document_index_dir)
+            logging.info(f"Loaded the document index {_index.version}")
+        _index_checked_at = time.monotonic()
+        return _index
+
+
+def reset_document_index() -> None:
+    """Drop the shared document index, loading it again on next use."""
+    global _index
+    with _index_lock:
+        _index = None
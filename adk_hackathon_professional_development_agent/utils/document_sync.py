@@ -0,0 +1,738 @@
+"""
+Document Sync Module.
+
+This module keeps the Vertex AI Search data store in sync with the company PDFs under
+`input_data/vertex_ai_search`, without re-importing every document on every run:
+
+1. The data store is created if it does not exist yet
+2. The SHA-256 hash of every PDF is compared to the hash recorded in the manifest of the
+   previous sync, stored next to the documents in the bucket
+3. The new and changed PDFs are uploaded in parallel and imported into the data store
+   under a document ID derived from their file name, in batches of
+   IMPORT_BATCH_SIZE documents, replacing the previous version of a changed document
+4. The documents whose PDF was removed are deleted from the data store and the bucket,
+   and, optionally, the documents of the data store the manifest does not know about,
+   e.g. imported by a full GCS import before the first sync
+5. The manifest is rewritten once every step succeeded, so a failed sync is resumed by
+   the next one, and the documents are given a new version, invalidating the answers
+   cached by the agents (see `utils.answer_cache`)
+
+The long-running operations of the data store are polled asynchronously, every
+poll_seconds, and their progress is reported to a callback.
+
+The storage and the data store are pluggable, like the data backends (see
+`utils.data_backends`): GcsDocumentStorage and DiscoveryEngineDataStore talk to Google
+Cloud Storage and the Discovery Engine API, while LocalDocumentStorage and
+LocalDataStore keep the documents in a local directory and JSON file, for tests and
+offline runs.
+
+Example:
+    ```python
+    from utils.document_sync import LocalDataStore, LocalDocumentStorage, sync_documents
+
+    result = await sync_documents(
+        "input_data/vertex_ai_search",
+        LocalDocumentStorage("/tmp/bucket"),
+        LocalDataStore("/tmp/data_store.json"),
+    )
+    print(result.uploaded, result.unchanged, result.deleted)
+    ```
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..config import config
+
+# Name of the manifest object, stored next to the documents
+MANIFEST_NAME = "_sync_manifest.json"
+# Name of the version object of the documents, rewritten whenever they change
+VERSION_NAME = "_documents_version"
+# Maximum number of documents of an inline import request of the Discovery Engine API
+IMPORT_BATCH_SIZE = 100
+PDF_MIME_TYPE = "application/pdf"
+
+# Called with the description of an operation, its processed and total item counts
+ProgressCallback = Callable[[str, int, int], None]
+
+
+def log_progress(description: str, processed: int, total: int) -> None:
+    """Report the progress of an operation in the log."""
+    if total:
+        logging.info(f"{description}: {processed}/{total}")
+    else:
+        logging.info(f"{description}: running")
+
+
+def get_document_id(file_name: str) -> str:
+    """Get the data store document ID of a PDF, derived from its file name.
+
+    IDs are stable across syncs, start with a letter and only contain lowercase
+    letters, digits and hyphens, as required by the Discovery Engine API.
+
+    Args:
+        file_name (str): The file name of the PDF
+
+    Returns:
+        str: The document ID, e.g. "doc-company-profile-mission-49213134c6cc" for
+            "Company Profile & Mission.pdf"
+    """
+    slug = re.sub(r"[^a-z0-9]+", "-", os.path.splitext(file_name)[0].lower())
+    digest = hashlib.sha256(file_name.encode("utf-8")).hexdigest()[:12]
+    return f"doc-{slug.strip('-')[:40]}-{digest}".replace("--", "-")
+
+
+def hash_file(path: str) -> str:
+    """Get the SHA-256 hash of the content of a file."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class SyncOperation(ABC):
+    """A long-running operation of a data store."""
+
+    @abstractmethod
+    def done(self) -> bool:
+        """Refresh the state of the operation, and tell whether it finished."""
+
+    def progress(self) -> Tuple[int, int]:
+        """Get the number of processed items and the total, (0, 0) if unknown."""
+        return 0, 0
+
+    def error(self) -> Optional[str]:
+        """Get why the finished operation failed, None if it succeeded."""
+        return None
+
+
+class DocumentStorage(ABC):
+    """Interface of the object storage the data store imports the documents from."""
+
+    @abstractmethod
+    def upload(self, path: str, name: str) -> str:
+        """Upload a file, replacing the object of the same name.
+
+        Args:
+            path (str): The path of the file
+            name (str): The name of the object
+
+        Returns:
+            str: The URI of the object, imported by the data store
+        """
+
+    @abstractmethod
+    def delete(self, name: str) -> None:
+        """Delete an object, if it exists."""
+
+    @abstractmethod
+    def read_manifest(self) -> Dict[str, Dict[str, str]]:
+        """Read the manifest of the previous sync, empty if there is none."""
+
+    @abstractmethod
+    def write_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        """Replace the manifest of the previous sync."""
+
+    @abstractmethod
+    def read_version(self) -> Optional[str]:
+        """Read the version of the documents, None if they were never versioned."""
+
+    @abstractmethod
+    def write_version(self, version: str) -> None:
+        """Replace the version of the documents."""
+
+
+class DataStore(ABC):
+    """Interface of the search data store the documents are imported into."""
+
+    @abstractmethod
+    def exists(self) -> bool:
+        """Tell whether the data store exists."""
+
+    @abstractmethod
+    def create(self) -> SyncOperation:
+        """Start creating the data store."""
+
+    @abstractmethod
+    def import_documents(self, documents: List[Tuple[str, str]]) -> SyncOperation:
+        """Start importing documents, replacing the documents with the same IDs.
+
+        Args:
+            documents (List[Tuple[str, str]]): The ID and the URI of every document
+
+        Returns:
+            SyncOperation: The import operation
+        """
+
+    @abstractmethod
+    def delete_document(self, document_id: str) -> None:
+        """Delete a document, if it exists."""
+
+    @abstractmethod
+    def list_document_ids(self) -> List[str]:
+        """List the IDs of the documents of the data store."""
+
+
+class GcsDocumentStorage(DocumentStorage):
+    """Document storage in a Google Cloud Storage bucket.
+
+    Args:
+        bucket_name (str): The name of the bucket
+        project_id (str, optional): Google Cloud Project ID
+    """
+
+    def __init__(self, bucket_name: str, project_id: Optional[str] = None):
+        from google.cloud import storage
+
+        self._bucket = storage.Client(project=project_id or None).bucket(bucket_name)
+
+    def upload(self, path: str, name: str) -> str:
+        self._bucket.blob(name).upload_from_filename(path, content_type=PDF_MIME_TYPE)
+        return f"gs://{self._bucket.name}/{name}"
+
+    def delete(self, name: str) -> None:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            self._bucket.blob(name).delete()
+        except NotFound:
+            pass
+
+    def read_manifest(self) -> Dict[str, Dict[str, str]]:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            return json.loads(self._bucket.blob(MANIFEST_NAME).download_as_text())
+        except NotFound:
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        self._bucket.blob(MANIFEST_NAME).upload_from_string(
+            json.dumps(manifest, indent=2, sort_keys=True),
+            content_type="application/json",
+        )
+
+    def read_version(self) -> Optional[str]:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            return self._bucket.blob(VERSION_NAME).download_as_text().strip()
+        except NotFound:
+            return None
+
+    def write_version(self, version: str) -> None:
+        self._bucket.blob(VERSION_NAME).upload_from_string(
+            version, content_type="text/plain"
+        )
+
+
+class LocalDocumentStorage(DocumentStorage):
+    """Document storage in a local directory, standing in for a bucket.
+
+    Args:
+        root_dir (str): The directory of the objects, created if missing
+    """
+
+    def __init__(self, root_dir: str):
+        self._root_dir = os.path.abspath(root_dir)
+        os.makedirs(self._root_dir, exist_ok=True)
+
+    def upload(self, path: str, name: str) -> str:
+        shutil.copyfile(path, os.path.join(self._root_dir, name))
+        return f"file://{os.path.join(self._root_dir, name)}"
+
+    def delete(self, name: str) -> None:
+        try:
+            os.remove(os.path.join(self._root_dir, name))
+        except FileNotFoundError:
+            pass
+
+    def read_manifest(self) -> Dict[str, Dict[str, str]]:
+        try:
+            with open(
+                os.path.join(self._root_dir, MANIFEST_NAME), encoding="utf-8"
+            ) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def write_manifest(self, manifest: Dict[str, Dict[str, str]]) -> None:
+        with open(
+            os.path.join(self._root_dir, MANIFEST_NAME), "w", encoding="utf-8"
+        ) as file:
+            json.dump(manifest, file, indent=2, sort_keys=True)
+
+    def read_version(self) -> Optional[str]:
+        try:
+            with open(
+                os.path.join(self._root_dir, VERSION_NAME), encoding="utf-8"
+            ) as file:
+                return file.read().strip()
+        except FileNotFoundError:
+            return None
+
+    def write_version(self, version: str) -> None:
+        with open(
+            os.path.join(self._root_dir, VERSION_NAME), "w", encoding="utf-8"
+        ) as file:
+            file.write(version)
+
+
+class _DiscoveryEngineOperation(SyncOperation):
+    """A long-running operation of the Discovery Engine API."""
+
+    def __init__(self, operation: Any):
+        self._operation = operation
+
+    def done(self) -> bool:
+        return self._operation.done()
+
+    def progress(self) -> Tuple[int, int]:
+        metadata = self._operation.metadata
+        total = getattr(metadata, "total_count", 0)
+        processed = getattr(metadata, "success_count", 0) + getattr(
+            metadata, "failure_count", 0
+        )
+        return processed, total
+
+    def error(self) -> Optional[str]:
+        exception = self._operation.exception()
+        if exception is not None:
+            return str(exception)
+        if getattr(self._operation.metadata, "failure_count", 0):
+            samples = [
+                sample.message for sample in self._operation.result().error_samples
+            ]
+            return (
+                f"{self._operation.metadata.failure_count} documents failed: {samples}"
+            )
+        return None
+
+
+class DiscoveryEngineDataStore(DataStore):
+    """Vertex AI Search data store, managed through the Discovery Engine API.
+
+    Args:
+        project_id (str): Google Cloud Project ID
+        location (str): Location of the data store, e.g. "global"
+        data_store_id (str): ID of the data store
+    """
+
+    def __init__(self, project_id: str, location: str, data_store_id: str):
+        from google.api_core.client_options import ClientOptions
+        from google.cloud import discoveryengine
+
+        self._discoveryengine = discoveryengine
+        client_options = (
+            ClientOptions(api_endpoint=f"{location}-discoveryengine.googleapis.com")
+            if location != "global"
+            else None
+        )
+        self._data_store_client = discoveryengine.DataStoreServiceClient(
+            client_options=client_options
+        )
+        self._document_client = discoveryengine.DocumentServiceClient(
+            client_options=client_options
+        )
+        self._project_id = project_id
+        self._location = location
+        self._data_store_id = data_store_id
+        self._branch = self._document_client.branch_path(
+            project=project_id,
+            location=location,
+            data_store=data_store_id,
+            branch="default_branch",
+        )
+
+    def exists(self) -> bool:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            self._data_store_client.get_data_store(
+                name=self._data_store_client.data_store_path(
+                    project=self._project_id,
+                    location=self._location,
+                    data_store=self._data_store_id,
+                )
+            )
+        except NotFound:
+            return False
+        return True
+
+    def create(self) -> SyncOperation:
+        discoveryengine = self._discoveryengine
+        operation = self._data_store_client.create_data_store(
+            request=discoveryengine.CreateDataStoreRequest(
+                parent=self._data_store_client.collection_path(
+                    project=self._project_id,
+                    location=self._location,
+                    collection="default_collection",
+                ),
+                data_store_id=self._data_store_id,
+                data_store=discoveryengine.DataStore(
+                    display_name=self._data_store_id,
+                    industry_vertical=discoveryengine.IndustryVertical.GENERIC,
+                    solution_types=[discoveryengine.SolutionType.SOLUTION_TYPE_SEARCH],
+                    content_config=discoveryengine.DataStore.ContentConfig.CONTENT_REQUIRED,
+                ),
+            )
+        )
+        return _DiscoveryEngineOperation(operation)
+
+    def import_documents(self, documents: List[Tuple[str, str]]) -> SyncOperation:
+        discoveryengine = self._discoveryengine
+        request = discoveryengine.ImportDocumentsRequest(
+            parent=self._branch,
+            inline_source=discoveryengine.ImportDocumentsRequest.InlineSource(
+                documents=[
+                    discoveryengine.Document(
+                        id=document_id,
+                        content=discoveryengine.Document.Content(
+                            uri=uri, mime_type=PDF_MIME_TYPE
+                        ),
+                    )
+                    for document_id, uri in documents
+                ]
+            ),
+            reconciliation_mode=discoveryengine.ImportDocumentsRequest.ReconciliationMode.INCREMENTAL,
+        )
+        return _DiscoveryEngineOperation(
+            self._document_client.import_documents(request=request)
+        )
+
+    def delete_document(self, document_id: str) -> None:
+        from google.api_core.exceptions import NotFound
+
+        try:
+            self._document_client.delete_document(
+                name=f"{self._branch}/documents/{document_id}"
+            )
+        except NotFound:
+            pass
+
+    def list_document_ids(self) -> List[str]:
+        return [
+            document.id
+            for document in self._document_client.list_documents(parent=self._branch)
+        ]
+
+
+class _LocalOperation(SyncOperation):
+    """Operation of the local data store, processing a share of its items per poll."""
+
+    def __init__(
+        self, items: List[Any], apply: Callable[[Any], Optional[str]], polls: int
+    ):
+        self._items = items
+        self._apply = apply
+        self._per_poll = max(1, -(-len(items) // max(1, polls)))
+        self._processed = 0
+        self._errors: List[str] = []
+        self._started = False
+
+    def done(self) -> bool:
+        # The first poll only reports the operation as running, like a remote operation
+        if not self._started:
+            self._started = True
+            return not self._items
+        for item in self._items[self._processed : self._processed + self._per_poll]:
+            error = self._apply(item)
+            if error:
+                self._errors.append(error)
+        self._processed = min(len(self._items), self._processed + self._per_poll)
+        return self._processed == len(self._items)
+
+    def progress(self) -> Tuple[int, int]:
+        return self._processed, len(self._items)
+
+    def error(self) -> Optional[str]:
+        if self._errors:
+            return f"{len(self._errors)} documents failed: {self._errors}"
+        return None
+
+
+class LocalDataStore(DataStore):
+    """Data store in a local JSON file, standing in for a Vertex AI Search data store.
+
+    Imported documents must have a `file://` URI of an existing file.
+
+    Args:
+        path (str): The path of the JSON file of the data store
+        polls_per_operation (int, optional): The number of polls after the first one an
+            operation takes to finish
+    """
+
+    def __init__(self, path: str, polls_per_operation: int = 2):
+        self._path = path
+        self._polls = polls_per_operation
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, str]]:
+        with open(self._path, encoding="utf-8") as file:
+            return json.load(file)["documents"]
+
+    def _write(self, documents: Dict[str, Dict[str, str]]) -> None:
+        with open(self._path, "w", encoding="utf-8") as file:
+            json.dump({"documents": documents}, file, indent=2, sort_keys=True)
+
+    def exists(self) -> bool:
+        return os.path.exists(self._path)
+
+    def create(self) -> SyncOperation:
+        def create_file(_: Any) -> None:
+            with self._lock:
+                if not self.exists():
+                    self._write({})
+
+        return _LocalOperation([self._path], create_file, self._polls)
+
+    def import_documents(self, documents: List[Tuple[str, str]]) -> SyncOperation:
+        def import_document(document: Tuple[str, str]) -> Optional[str]:
+            document_id, uri = document
+            path = uri[len("file://") :] if uri.startswith("file://") else ""
+            if not os.path.exists(path):
+                return f"{document_id}: {uri} not found"
+            with self._lock:
+                stored = self._read()
+                stored[document_id] = {"uri": uri, "sha256": hash_file(path)}
+                self._write(stored)
+            return None
+
+        return _LocalOperation(list(documents), import_document, self._polls)
+
+    def delete_document(self, document_id: str) -> None:
+        with self._lock:
+            stored = self._read()
+            if stored.pop(document_id, None) is not None:
+                self._write(stored)
+
+    def list_document_ids(self) -> List[str]:
+        with self._lock:
+            return sorted(self._read())
+
+
+@dataclass
+class SyncResult:
+    """Outcome of a sync of the documents.
+
+    Attributes:
+        created_data_store (bool): Whether the data store was created
+        uploaded (List[str]): File names of the new and changed PDFs
+        unchanged (List[str]): File names of the PDFs skipped as unchanged
+        deleted (List[str]): File names of the removed PDFs, or IDs of the deleted
+            documents unknown to the manifest
+        seconds (float): Duration of the sync
+    """
+
+    created_data_store: bool = False
+    uploaded: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """bool: Whether the documents of the data store changed."""
+        return bool(self.uploaded or self.deleted)
+
+
+def stamp_documents_version(storage: DocumentStorage) -> str:
+    """Give the documents a new version, invalidating the answers cached from them.
+
+    Args:
+        storage (DocumentStorage): The storage of the documents
+
+    Returns:
+        str: The new version
+    """
+    version = uuid.uuid4().hex
+    storage.write_version(version)
+    logging.info(f"Updated the version of the company documents to {version}")
+    return version
+
+
+def get_documents_storage() -> DocumentStorage:
+    """Get the storage holding the version of the documents searched by the agents.
+
+    Returns:
+        DocumentStorage: The bucket of the Vertex AI Search data store, or the
+            directory of the local document index when COMPANY_INFORMATION_BACKEND is
+            "local_index"
+    """
+    if config.company_information_backend == "local_index":
+        return LocalDocumentStorage(config.document_index_dir)
+    return GcsDocumentStorage(
+        config.vertex_ai_search_data_store_bucket,
+        project_id=config.google_cloud_project,
+    )
+
+
+async def wait_for_operation(
+    operation: SyncOperation,
+    description: str,
+    poll_seconds: float = 2.0,
+    on_progress: ProgressCallback = log_progress,
+) -> None:
+    """Poll a long-running operation until it finishes, reporting its progress.
+
+    Args:
+        operation (SyncOperation): The operation
+        description (str): What the operation does, for the progress reports
+        poll_seconds (float, optional): Seconds between two polls
+        on_progress (ProgressCallback, optional): Called after every poll
+
+    Raises:
+        RuntimeError: If the operation failed
+    """
+    while True:
+        done = await asyncio.to_thread(operation.done)
+        on_progress(description, *operation.progress())
+        if done:
+            break
+        await asyncio.sleep(poll_seconds)
+    error = await asyncio.to_thread(operation.error)
+    if error:
+        raise RuntimeError(f"{description} failed: {error}")
+
+
+async def sync_documents(
+    pdf_dir: str,
+    storage: DocumentStorage,
+    data_store: DataStore,
+    max_concurrency: int = 8,
+    poll_seconds: float = 2.0,
+    prune_unmanaged: bool = False,
+    on_progress: ProgressCallback = log_progress,
+) -> SyncResult:
+    """Sync the data store with the PDFs of a directory, transferring only the changes.
+
+    Args:
+        pdf_dir (str): The directory of the PDFs
+        storage (DocumentStorage): The storage the data store imports the PDFs from
+        data_store (DataStore): The data store, created if it does not exist
+        max_concurrency (int, optional): Maximum number of concurrent uploads or deletions
+        poll_seconds (float, optional): Seconds between two polls of an operation
+        prune_unmanaged (bool, optional): Whether to delete the documents of the data
+            store that the manifest does not know about
+        on_progress (ProgressCallback, optional): Called with the progress of the
+            operations
+
+    Returns:
+        SyncResult: The outcome of the sync
+
+    Raises:
+        RuntimeError: If an operation of the data store failed
+    """
+    started = time.perf_counter()
+    result = SyncResult()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(function: Callable, *args: Any) -> Any:
+        async with semaphore:
+            return await asyncio.to_thread(function, *args)
+
+    if not await asyncio.to_thread(data_store.exists):
+        await wait_for_operation(
+            await asyncio.to_thread(data_store.create),
+            "Creating the data store",
+            poll_seconds,
+            on_progress,
+        )
+        result.created_data_store = True
+
+    # A new data store has none of the documents of the manifest
+    manifest = (
+        {}
+        if result.created_data_store
+        else await asyncio.to_thread(storage.read_manifest)
+    )
+    file_names = sorted(
+        name for name in os.listdir(pdf_dir) if name.lower().endswith(".pdf")
+    )
+    hashes = await asyncio.gather(
+        *(run(hash_file, os.path.join(pdf_dir, name)) for name in file_names)
+    )
+
+    changed = []
+    for name, content_hash in zip(file_names, hashes):
+        if manifest.get(name, {}).get("sha256") == content_hash:
+            result.unchanged.append(name)
+        else:
+            changed.append((name, content_hash))
+
+    uris = await asyncio.gather(
+        *(run(storage.upload, os.path.join(pdf_dir, name), name) for name, _ in changed)
+    )
+    documents = [(get_document_id(name), uri) for (name, _), uri in zip(changed, uris)]
+    batches = [
+        documents[start : start + IMPORT_BATCH_SIZE]
+        for start in range(0, len(documents), IMPORT_BATCH_SIZE)
+    ]
+    operations = await asyncio.gather(
+        *(run(data_store.import_documents, batch) for batch in batches)
+    )
+    await asyncio.gather(
+        *(
+            wait_for_operation(
+                operation,
+                f"Importing documents (batch {index + 1}/{len(batches)})",
+                poll_seconds,
+                on_progress,
+            )
+            for index, operation in enumerate(operations)
+        )
+    )
+    for (name, content_hash), (document_id, uri) in zip(changed, documents):
+        manifest[name] = {
+            "sha256": content_hash,
+            "document_id": document_id,
+            "uri": uri,
+        }
+        result.uploaded.append(name)
+
+    removed = sorted(set(manifest) - set(file_names))
+    await asyncio.gather(
+        *(
+            run(data_store.delete_document, manifest[name]["document_id"])
+            for name in removed
+        ),
+        *(run(storage.delete, name) for name in removed),
+    )
+    for name in removed:
+        del manifest[name]
+        result.deleted.append(name)
+
+    if prune_unmanaged:
+        managed = {entry["document_id"] for entry in manifest.values()}
+        unmanaged = [
+            document_id
+            for document_id in await asyncio.to_thread(data_store.list_document_ids)
+            if document_id not in managed
+        ]
+        await asyncio.gather(
+            *(run(data_store.delete_document, document_id) for document_id in unmanaged)
+        )
+        result.deleted.extend(unmanaged)
+
+    if result.changed or result.created_data_store:
+        await asyncio.to_thread(storage.write_manifest, manifest)
+    if result.changed:
+        await asyncio.to_thread(stamp_documents_version, storage)
+    result.seconds = round(time.perf_counter() - started, 3)
+    logging.info(
+        f"Synced the documents in {result.seconds}s: {len(result.uploaded)} uploaded, "
+        f"{len(result.unchanged)} unchanged, {len(result.deleted)} deleted"
+    )
+    return result
@@ -0,0 +1,124 @@
+"""
+Employee Loaders Module.
+
+This module provides batch loaders for the per-employee lookups made by the tools.
+When many sessions ask about employees at once, the email lookups arriving within a
+short window (BATCH_LOADER_WINDOW_MS) are collected into a single
+`WHERE email IN UNNEST(@emails)` query instead of one `WHERE email = @email` job each.
+
+Results are fetched as Arrow tables (see `utils.arrow_results`), so tools can transform
+them column by column before converting them to records. The rows of every loaded email
+are also stored in the shared query cache under the
+single-email query, so later lookups of the same employee are answered from the cache
+and writes invalidate them like any other cached query.
+
+Attributes:
+    employee_profile_loader: Loads rows of the employee_profiles table by email
+    employee_trainings_loader: Loads rows of the employee_trainings table by email
+
+Example:
+    ```python
+    from utils.employee_loaders import employee_profile_loader
+
+    profiles = await employee_profile_loader.load("john.doe@amazincorp.com")
+    profile = to_records(profiles)[0] if profiles.num_rows else None
+    ```
+"""
+
+from typing import Dict, List
+
+import pyarrow as pa
+from google.cloud import bigquery
+
+from ..config import config
+from .arrow_results import filter_equal
+from .bigquery_operations import get_query_cache, get_table_ref, query_arrow_async
+from .request_coalescing import BatchLoader
+
+
+class EmailBatchLoader(BatchLoader[str, pa.Table]):
+    """Loads the rows of a table matching employee emails, batching concurrent lookups.
+
+    Args:
+        table_id (str): The ID of the table without project and dataset
+        columns (List[str]): The columns to select, including "email"
+        window_seconds (float, optional): How long to collect emails before querying
+        max_batch_size (int, optional): Maximum number of emails per query
+    """
+
+    def __init__(
+        self,
+        table_id: str,
+        columns: List[str],
+        window_seconds: float = 0.005,
+        max_batch_size: int = 100,
+    ):
+        super().__init__(
+            self._load_emails,
+            window_seconds=window_seconds,
+            max_batch_size=max_batch_size,
+        )
+        self.table_id = table_id
+        self.columns = columns
+
+    def _query(self, where_clause: str) -> str:
+        return "SELECT {columns} FROM `{table_ref}` WHERE {where_clause}".format(
+            columns=", ".join(self.columns),
+            table_ref=get_table_ref(self.table_id),
+            where_clause=where_clause,
+        )
+
+    async def load(self, email: str) -> pa.Table:
+        """Load the rows of an employee, from the query cache or as part of a batch.
+
+        Args:
+            email (str): The email address of the employee
+
+        Returns:
+            pa.Table: The rows matching the email
+        """
+        cache = get_query_cache()
+        if cache.enabled:
+            params = [bigquery.ScalarQueryParameter("email", "STRING", email)]
+            key = cache.make_key(self._query("email = @email"), params, "arrow")
+            hit, table = cache.get(key)
+            if hit:
+                return table
+        return await super().load(email)
+
+    async def _load_emails(self, emails: List[str]) -> Dict[str, pa.Table]:
+        """Query the rows of a batch of emails and cache them per email."""
+        table = await query_arrow_async(
+            self._query("email IN UNNEST(@emails)"),
+            [bigquery.ArrayQueryParameter("emails", "STRING", emails)],
+        )
+        tables_by_email = {
+            email: filter_equal(table, "email", email) for email in emails
+        }
+
+        cache = get_query_cache()
+        single_email_query = self._query("email = @email")
+        for email, email_table in tables_by_email.items():
+            params = [bigquery.ScalarQueryParameter("email", "STRING", email)]
+            cache.put(
+                cache.make_key(single_email_query, params, "arrow"),
+                email_table,
+                single_email_query,
+                params,
+            )
+        return tables_by_email
+
+
+employee_profile_loader = EmailBatchLoader(
+    "employee_profiles",
+    ["name", "email", "department", "role", "skills"],
+    window_seconds=config.batch_loader_window_ms / 1000,
+    max_batch_size=config.batch_loader_max_batch_size,
+)
+
+employee_trainings_loader = EmailBatchLoader(
+    "employee_trainings",
+    ["name", "email", "description", "skills", "date", "cost_usd", "url"],
+    window_seconds=config.batch_loader_window_ms / 1000,
+    max_batch_size=config.batch_loader_max_batch_size,
+)
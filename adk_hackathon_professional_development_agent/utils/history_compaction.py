@@ -0,0 +1,145 @@
+"""
+History Compaction Module.
+
+This module bounds the conversation history sent to the model on every turn. The
+session store keeps the stored history of a session bounded (see utils.session_store),
+but the events it keeps, such as the tool results and the skills development needs of
+the earlier turns, would still be sent to the model in full.
+
+The `compact_history` function is registered as before model callback on the agents.
+The current turn, from the latest user message on, is always sent unchanged. In the
+earlier turns:
+- The tool calls and tool results are dropped, both of the agent itself and of the
+  other agents, which the agent receives as context
+- Long messages are summarized to their first sentences
+- The oldest messages are dropped once the history exceeds PROMPT_HISTORY_MAX_CHARS
+
+Example:
+    ```python
+    from google.adk.agents import LlmAgent
+    from utils.history_compaction import compact_history
+
+    agent = LlmAgent(..., before_model_callback=[compact_history])
+    ```
+"""
+
+import re
+from typing import List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from ..config import config
+from .metrics import registry
+from .tool_output_shaping import summarize_text
+
+# Length the messages of the earlier turns are summarized to
+HISTORY_MESSAGE_MAX_CHARS = 1000
+# Text parts of the tool calls and results of other agents, see ADK's contents flow
+FOREIGN_CONTEXT = "For context:"
+_FOREIGN_TOOL_PART = re.compile(
+    r"^\[[^\]]+\] (called tool `[^`]+` with parameters|`[^`]+` tool returned result)"
+)
+
+_history_chars = registry.histogram(
+    "prompt_history_chars",
+    "Characters of the conversation history before the current turn, by agent and "
+    "stage (raw or compacted)",
+    ["agent", "stage"],
+    buckets=(0, 1000, 2500, 5000, 10000, 20000, 50000, 100000, 250000),
+)
+
+
+def _is_user_message(content: types.Content) -> bool:
+    """Check whether a content is a message of the user, rather than context."""
+    if content.role != "user" or not content.parts:
+        return False
+    texts = [part.text for part in content.parts if part.text]
+    return bool(texts) and texts[0] != FOREIGN_CONTEXT
+
+
+def _content_chars(content: types.Content) -> int:
+    return sum(
+        len(part.model_dump_json(exclude_none=True)) for part in content.parts or []
+    )
+
+
+def _compact_content(content: types.Content) -> Optional[types.Content]:
+    """Drop the tool calls and results of a content, and summarize its text."""
+    parts = []
+    for part in content.parts or []:
+        if not part.text or part.thought or _FOREIGN_TOOL_PART.match(part.text):
+            continue
+        parts.append(
+            types.Part(text=summarize_text(part.text, HISTORY_MESSAGE_MAX_CHARS))
+        )
+    if all(part.text == FOREIGN_CONTEXT for part in parts):
+        return None
+    return types.Content(role=content.role, parts=parts)
+
+
+def _current_turn_start(contents: List[types.Content]) -> int:
+    """Get the index of the latest message of the user, 0 if there is none."""
+    for index in range(len(contents) - 1, -1, -1):
+        if _is_user_message(contents[index]):
+            return index
+    return 0
+
+
+def compact_contents(
+    contents: List[types.Content], max_chars: int
+) -> List[types.Content]:
+    """Compact the turns before the current one of the contents of a request.
+
+    Args:
+        contents (List[types.Content]): The contents of the request
+        max_chars (int): The maximum length of the earlier turns, 0 for no limit
+
+    Returns:
+        List[types.Content]: The compacted earlier turns, followed by the current turn
+    """
+    current = _current_turn_start(contents)
+    history = [_compact_content(content) for content in contents[:current]]
+    history = [content for content in history if content is not None]
+    if max_chars:
+        length = sum(map(_content_chars, history))
+        while history and length > max_chars:
+            length -= _content_chars(history.pop(0))
+    # The history starts with a message of the user
+    while history and history[0].role != "user":
+        history.pop(0)
+    return history + contents[current:]
+
+
+def compact_history(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before model callback compacting the conversation history of the request.
+
+    Args:
+        callback_context (CallbackContext): The context of the calling agent
+        llm_request (LlmRequest): The request about to be sent to the LLM
+
+    Returns:
+        Optional[LlmResponse]: Always None, as the request is compacted in place
+    """
+    current = _current_turn_start(llm_request.contents)
+    if not current:
+        return None
+
+    current_turn = len(llm_request.contents) - current
+    contents = compact_contents(llm_request.contents, config.prompt_history_max_chars)
+    labels = {"agent": callback_context.agent_name}
+    _history_chars.observe(
+        sum(map(_content_chars, llm_request.contents[:current])),
+        stage="raw",
+        **labels,
+    )
+    _history_chars.observe(
+        sum(map(_content_chars, contents[: len(contents) - current_turn])),
+        stage="compacted",
+        **labels,
+    )
+    llm_request.contents = contents
+    return None
@@ -0,0 +1,401 @@
+"""
+Intent Router Module.
+
+This module provides the local pre-routing stage running in front of the
+IntentDetectionAgent. Without it, every user message pays a full LLM round trip just to
+decide which sub-agent to transfer to, before the sub-agent pays its own round trip.
+
+The router is a TF-IDF nearest-centroid classifier over word unigrams and bigrams,
+trained at startup on the hand-written examples of SEED_EXAMPLES only. The user messages
+of the evaluation sets under `tests/*.test.json` (labelled by their expected
+`transfer_to_agent` call) are held out, and only used to evaluate the router (see
+`benchmarks/intent_router_benchmark.py`). Emails are extracted with a regular expression.
+
+The `route_intent` before model callback of the IntentDetectionAgent transfers the
+message straight to the predicted sub-agent when:
+- The prediction confidence reaches INTENT_ROUTER_MIN_CONFIDENCE, and
+- The employee email is known, from the message or from an earlier turn, unless the
+  sub-agent does not need it (company policy questions)
+
+Otherwise, the message falls back to the LLM router, which e.g. asks for the email.
+The extracted email is stored in the session state under "employee_email".
+
+Attributes:
+    EMAIL_PATTERN: Regular expression matching email addresses
+    SEED_EXAMPLES: Hand-written training messages of each sub-agent
+    AGENTS_NOT_NEEDING_EMAIL: Sub-agents answering without the employee email
+
+Example:
+    ```python
+    from utils.intent_router import get_intent_router
+
+    router = get_intent_router()
+    agent_name, confidence = router.predict("How much training budget do I have left?")
+    ```
+"""
+
+import glob
+import json
+import logging
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from ..config import config
+from .metrics import registry
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+# Words carrying no intent, dropped before building unigrams and bigrams
+_STOP_WORDS = frozenset(
+    "a an and are am be by can could do does for from i in is it me my of on or our "
+    "please the their this to us we what which with would you your".split()
+)
+
+SEED_EXAMPLES: Dict[str, List[str]] = {
+    "CurrentOrFutureSkillsDevelopmentAgent": [
+        "What skills should I learn next?",
+        "How can I improve my current skills?",
+        "Which skills do I need for our upcoming projects?",
+        "What should I learn to grow my career?",
+        "Recommend a learning path for me",
+        "Which skills am I missing for the active projects?",
+        "Find me a training to improve my cloud skills",
+        "What courses would help me with our customers' projects?",
+        "How do I prepare for future projects?",
+        "Suggest trainings to develop my skills",
+        "What are my skill gaps?",
+        "Which technologies should I study to join new projects?",
+        "Help me plan my skills development",
+        "What should I focus on to become a better engineer?",
+        "Search for courses on Kubernetes that fit my profile",
+        "What trainings do you recommend for my role?",
+        "Which skills would help me serve our clients better?",
+        "What should I learn to support our current and new customers?",
+        "Which skills do our customers need from me?",
+        "How can I get better at what I do today?",
+        "How do I strengthen the skills I already have?",
+        "What should I study to be ready for future customer projects?",
+    ],
+    "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent": [
+        "How much training budget do I have left?",
+        "What is my remaining training budget?",
+        "Which trainings have I completed?",
+        "Show my training history",
+        "How much did I spend on trainings this year?",
+        "What courses did I take last year?",
+        "Can I still afford a training this year?",
+        "List my past trainings and their cost",
+        "How much money is left in my training budget?",
+        "What trainings did I attend so far?",
+        "Show me the courses I have already taken",
+        "How much of my budget have I used?",
+        "Do I have enough budget left for another course?",
+        "When did I take my last training?",
+        "How much is left of my learning budget?",
+        "What is left in my budget for courses?",
+        "How much can I still spend on training this year?",
+    ],
+    "ProfessionalDevelopmentPolicyAgent": [
+        "What does our professional development policy say?",
+        "Does the company policy allow language courses?",
+        "Is a conference covered by the training policy?",
+        "Does the company pay for certifications?",
+        "What are the rules for training reimbursement?",
+        "Am I allowed to take trainings during working hours?",
+        "What is the annual training budget according to the policy?",
+        "Are non technical courses allowed by the corporate policy?",
+        "Does our policy cover travel costs for conferences?",
+        "Is learning a foreign language allowed by the company?",
+        "What does the corporate policy say about study leave?",
+        "Are online courses eligible under the professional development policy?",
+        "Who has to approve a training according to the policy?",
+        "Can the company refund an MBA?",
+        "I would like to study Italian, is that covered by the company?",
+        "Does the corporate development policy support learning a new language?",
+        "Is a Spanish course allowed under our policy?",
+        "Will the company sponsor my language classes?",
+    ],
+    "TrainingRegistererAgent": [
+        "Register me for this training",
+        "Please sign me up for the course",
+        "I would like to enroll in the training you suggested",
+        "Book the first training for me",
+        "Register the chosen training",
+        "Yes, register me for it",
+        "Sign me up for the certification",
+        "Enroll me in the Kubernetes course",
+        "I want to register for the second course",
+        "Go ahead and book it",
+        "Please register this course for me",
+        "Reserve a seat for me in the workshop",
+    ],
+}
+
+AGENTS_NOT_NEEDING_EMAIL = frozenset({"ProfessionalDevelopmentPolicyAgent"})
+
+_routing_decisions = registry.counter(
+    "intent_router_decisions_total",
+    "Messages routed by the local intent router or passed to the LLM router.",
+    ["decision", "agent"],
+)
+_routing_latency = registry.histogram(
+    "intent_router_latency_seconds",
+    "Time spent by the local intent router per message.",
+)
+
+
+def extract_email(text: str) -> Optional[str]:
+    """Extract the first email address of a message.
+
+    Args:
+        text (str): The message
+
+    Returns:
+        Optional[str]: The lowercased email address, or None if there is none
+    """
+    match = EMAIL_PATTERN.search(text or "")
+    return match.group(0).rstrip(".").lower() if match else None
+
+
+def tokenize(text: str) -> List[str]:
+    """Split a message into lowercase word unigrams and bigrams, ignoring emails and stop words.
+
+    Args:
+        text (str): The message
+
+    Returns:
+        List[str]: The terms of the message
+    """
+    words = [
+        word
+        for word in _TOKEN_PATTERN.findall(EMAIL_PATTERN.sub(" ", text or "").lower())
+        if word not in _STOP_WORDS
+    ]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def load_eval_examples(eval_dir: str) -> List[Tuple[str, str]]:
+    """Load the user messages of the evaluation sets, labelled by their first transfer.
+
+    The router is not trained on them, so they measure how it routes unseen messages.
+
+    Args:
+        eval_dir (str): Directory holding the `*.test.json` evaluation sets
+
+    Returns:
+        List[Tuple[str, str]]: (message, agent name) pairs
+    """
+    examples = []
+    for path in sorted(glob.glob(os.path.join(eval_dir, "*.test.json"))):
+        with open(path, encoding="utf-8") as eval_file:
+            eval_set = json.load(eval_file)
+        for eval_case in eval_set.get("eval_cases", []):
+            for invocation in eval_case.get("conversation", []):
+                text = " ".join(
+                    part.get("text") or ""
+                    for part in invocation["user_content"].get("parts", [])
+                )
+                tool_uses = invocation.get("intermediate_data", {}).get("tool_uses", [])
+                transfers = [
+                    tool_use["args"]["agent_name"]
+                    for tool_use in tool_uses
+                    if tool_use["name"] == "transfer_to_agent"
+                ]
+                if text.strip() and transfers:
+                    examples.append((text, transfers[0]))
+    return examples
+
+
+class IntentRouter:
+    """TF-IDF nearest-centroid classifier of user messages into sub-agent names.
+
+    Args:
+        temperature (float, optional): Softmax temperature turning the cosine
+            similarities to the centroids into confidences. Lower is more decisive.
+    """
+
+    def __init__(self, temperature: float = 0.08):
+        self.temperature = temperature
+        self.labels: List[str] = []
+        self._vocabulary: Dict[str, int] = {}
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._centroids = np.zeros((0, 0), dtype=np.float32)
+
+    def _vectorize(self, texts: Iterable[str]) -> np.ndarray:
+        texts = list(texts)
+        vectors = np.zeros((len(texts), len(self._vocabulary)), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term, count in Counter(tokenize(text)).items():
+                column = self._vocabulary.get(term)
+                if column is not None:
+                    vectors[row, column] = 1.0 + math.log(count)
+        vectors *= self._idf
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-9)
+
+    def fit(self, examples: Iterable[Tuple[str, str]]) -> "IntentRouter":
+        """Train the router.
+
+        Args:
+            examples (Iterable[Tuple[str, str]]): (message, agent name) pairs
+
+        Returns:
+            IntentRouter: The trained router
+        """
+        examples = list(examples)
+        document_frequencies: Counter = Counter()
+        for text, _ in examples:
+            document_frequencies.update(set(tokenize(text)))
+        self._vocabulary = {
+            term: column for column, term in enumerate(sorted(document_frequencies))
+        }
+        self._idf = np.array(
+            [
+                math.log((1 + len(examples)) / (1 + document_frequencies[term])) + 1.0
+                for term in sorted(document_frequencies)
+            ],
+            dtype=np.float32,
+        )
+
+        vectors = self._vectorize(text for text, _ in examples)
+        rows_by_label = defaultdict(list)
+        for row, (_, label) in enumerate(examples):
+            rows_by_label[label].append(row)
+        self.labels = sorted(rows_by_label)
+        centroids = np.stack(
+            [vectors[rows_by_label[label]].mean(axis=0) for label in self.labels]
+        )
+        norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+        self._centroids = centroids / np.maximum(norms, 1e-9)
+        return self
+
+    def predict(self, text: str) -> Tuple[Optional[str], float]:
+        """Predict the sub-agent of a message.
+
+        Args:
+            text (str): The message
+
+        Returns:
+            Tuple[Optional[str], float]: The agent name and the confidence between 0
+                and 1, or (None, 0.0) if no known term occurs in the message
+        """
+        vector = self._vectorize([text])[0]
+        if not vector.any() or not self.labels:
+            return None, 0.0
+        similarities = self._centroids @ vector
+        scaled = np.exp((similarities - similarities.max()) / self.temperature)
+        probabilities = scaled / scaled.sum()
+        best = int(np.argmax(probabilities))
+        return self.labels[best], float(probabilities[best])
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_training_examples() -> List[Tuple[str, str]]:
+    """Get the seed examples the router is trained on.
+
+    Returns:
+        List[Tuple[str, str]]: (message, agent name) pairs
+    """
+    return [
+        (text, agent_name)
+        for agent_name, texts in SEED_EXAMPLES.items()
+        for text in texts
+    ]
+
+
+def get_intent_router() -> IntentRouter:
+    """Get the shared intent router, training it on first use.
+
+    Returns:
+        IntentRouter: The shared intent router
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                examples = get_training_examples()
+                _router = IntentRouter().fit(examples)
+                logging.info(f"Trained intent router on {len(examples)} examples")
+    return _router
+
+
+def _latest_user_text(llm_request: LlmRequest) -> Optional[str]:
+    """Get the text of the latest message if it is a user message, not a tool result."""
+    if not llm_request.contents:
+        return None
+    latest = llm_request.contents[-1]
+    if latest.role != "user" or not latest.parts:
+        return None
+    if any(part.function_response for part in latest.parts):
+        return None
+    return " ".join(part.text for part in latest.parts if part.text) or None
+
+
+def route_intent(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """Before model callback transferring confidently classified messages locally.
+
+    Args:
+        callback_context (CallbackContext): The context of the IntentDetectionAgent
+        llm_request (LlmRequest): The request about to be sent to the LLM router
+
+    Returns:
+        Optional[LlmResponse]: A `transfer_to_agent` call skipping the LLM router, or
+            None to let the LLM router decide
+    """
+    if not config.intent_router_enabled:
+        return None
+    text = _latest_user_text(llm_request)
+    if text is None:
+        return None
+
+    started = time.perf_counter()
+    email = extract_email(text)
+    if email:
+        callback_context.state["employee_email"] = email
+    else:
+        email = callback_context.state.get("employee_email")
+
+    agent_name, confidence = get_intent_router().predict(text)
+    routed = (
+        agent_name is not None
+        and confidence >= config.intent_router_min_confidence
+        and (email is not None or agent_name in AGENTS_NOT_NEEDING_EMAIL)
+    )
+    _routing_latency.observe(time.perf_counter() - started)
+    if not routed:
+        _routing_decisions.inc(decision="fallback", agent=agent_name or "")
+        return None
+
+    _routing_decisions.inc(decision="routed", agent=agent_name)
+    logging.info(
+        f"Routed message to {agent_name} locally (confidence {confidence:.2f})"
+    )
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="transfer_to_agent", args={"agent_name": agent_name}
+                    )
+                )
+            ],
+        )
+    )
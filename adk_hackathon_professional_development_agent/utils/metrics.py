@@ -0,0 +1,289 @@
+"""
+Metrics Module.
+
+This module provides a small in-process metrics registry with Prometheus-style counters
+and histograms, rendered in the Prometheus text exposition format by the `/metrics`
+endpoint mounted on the FastAPI app in `main.py`.
+
+It also tracks which tool and agent are currently running, so that metrics recorded
+deep inside the data access layer can be tagged with the tool call that caused them.
+The `label_tool_call` and `clear_tool_call_labels` functions are registered as
+before/after tool callbacks on the agents.
+
+Attributes:
+    registry: The metrics registry shared by the whole process
+
+Example:
+    ```python
+    from utils.metrics import registry
+
+    requests = registry.counter("requests_total", "Number of requests", ["agent"])
+    requests.inc(agent="IntentDetectionAgent")
+
+    latency = registry.histogram("latency_seconds", "Request latency", ["agent"])
+    latency.observe(0.42, agent="IntentDetectionAgent")
+
+    print(registry.render())
+    ```
+"""
+
+import contextvars
+import math
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+# Tool and agent of the tool call running in the current context
+_tool_call_labels: contextvars.ContextVar[Dict[str, str]] = contextvars.ContextVar(
+    "tool_call_labels", default={"tool": "", "agent": ""}
+)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], **extra: str) -> str:
+    pairs = list(zip(names, values)) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _label_values(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+
+    def _render_samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        return "\n".join(lines + self._render_samples())
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter with labels."""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str]):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        """Increase the counter of a label set.
+
+        Args:
+            amount (float, optional): The amount to add
+            **labels (Any): The label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Get the counter value of a label set."""
+        with self._lock:
+            return self._values.get(self._label_values(labels), 0.0)
+
+    def total(self) -> float:
+        """Get the sum of the counter values of all label sets."""
+        with self._lock:
+            return sum(self._values.values())
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(self.label_names, key)} {_format_number(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram(_Metric):
+    """A histogram of observed values with labels and cumulative buckets."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # Label values -> (bucket counts, sum, count)
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Record an observation for a label set.
+
+        Args:
+            value (float): The observed value
+            **labels (Any): The label values
+        """
+        key = self._label_values(labels)
+        with self._lock:
+            bucket_counts, total, count = self._values.get(
+                key, [[0] * len(self.buckets), 0.0, 0]
+            )
+            for index, upper_bound in enumerate(self.buckets):
+                if value <= upper_bound:
+                    bucket_counts[index] += 1
+            self._values[key] = [bucket_counts, total + value, count + 1]
+
+    def count(self, **labels: Any) -> int:
+        """Get the number of observations of a label set."""
+        with self._lock:
+            return self._values.get(self._label_values(labels), [None, 0.0, 0])[2]
+
+    def quantile(self, quantile: float, **labels: Any) -> Optional[float]:
+        """Estimate a quantile of a label set from the bucket upper bounds.
+
+        Args:
+            quantile (float): The quantile to estimate, between 0 and 1
+            **labels (Any): The label values
+
+        Returns:
+            Optional[float]: The upper bound of the bucket holding the quantile,
+                or None if nothing was observed
+        """
+        with self._lock:
+            values = self._values.get(self._label_values(labels))
+        if not values or not values[2]:
+            return None
+        bucket_counts, _, count = values
+        for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+            if bucket_count >= quantile * count:
+                return upper_bound
+        return math.inf
+
+    def _render_samples(self) -> List[str]:
+        with self._lock:
+            values = {key: list(value) for key, value in self._values.items()}
+        lines = []
+        for key, (bucket_counts, total, count) in sorted(values.items()):
+            for upper_bound, bucket_count in zip(self.buckets, bucket_counts):
+                labels = _format_labels(
+                    self.label_names, key, le=_format_number(upper_bound)
+                )
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_number(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds the metrics of the process and renders them for Prometheus."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+            return metric
+
+    def counter(
+        self, name: str, documentation: str, label_names: Sequence[str] = ()
+    ) -> Counter:
+        """Get or create a counter."""
+        return self._get_or_create(Counter, name, documentation, label_names)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._get_or_create(
+            Histogram, name, documentation, label_names, buckets=buckets
+        )
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: The rendered metrics
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def get_tool_call_labels() -> Dict[str, str]:
+    """Get the tool and agent of the tool call running in the current context.
+
+    Returns:
+        Dict[str, str]: The "tool" and "agent" labels, empty outside of tool calls
+    """
+    return _tool_call_labels.get()
+
+
+def label_tool_call(tool, args: Dict[str, Any], tool_context) -> None:
+    """Before tool callback tagging the metrics recorded by a tool call.
+
+    Args:
+        tool (BaseTool): The tool about to be called
+        args (Dict[str, Any]): The tool call arguments
+        tool_context (ToolContext): The context of the tool call
+    """
+    _tool_call_labels.set({"tool": tool.name, "agent": tool_context.agent_name})
+
+
+def clear_tool_call_labels(
+    tool, args: Dict[str, Any], tool_context, tool_response: Any
+) -> None:
+    """After tool callback removing the labels set by label_tool_call.
+
+    Args:
+        tool (BaseTool): The tool that was called
+        args (Dict[str, Any]): The tool call arguments
+        tool_context (ToolContext): The context of the tool call
+        tool_response (Any): The tool response
+    """
+    _tool_call_labels.set({"tool": "", "agent": ""})
@@ -0,0 +1,357 @@
+"""
+Model Call Policy Module.
+
+This module wraps the LLM of each agent into a `PolicyLlm`, which applies the model call
+policy of the configuration to every call, so that one slow or failing Gemini response
+does not hold the whole intent -> sub-agent -> tool chain:
+
+- Deadline: each call has a latency budget (MODEL_CALL_DEADLINE_SECONDS, per agent
+  MODEL_CALL_DEADLINES), covering its retries and hedged requests
+- Hedging: when the first response takes longer than the p95 latency observed for the
+  agent (at least MODEL_CALL_HEDGE_MIN_DELAY_SECONDS), a duplicate request is sent, and
+  whichever responds first is kept. Every hedged request is a second billed call, and
+  when the model slows down as a whole, hedging every slow call would double its load,
+  so the hedged requests of each agent are capped at MODEL_CALL_HEDGE_MAX_SHARE of its
+  calls: each call earns that share of a hedge, and bursts are capped at
+  MAX_HEDGE_TOKENS hedges
+- Retries: failed calls are retried up to MODEL_CALL_MAX_RETRIES times if the error is
+  transient, i.e. rate limiting, server errors and connection errors
+- Fallback: once the budget or the retries are exhausted, the call is made with the
+  faster FALLBACK_MODEL_NAME instead
+
+For streamed calls, the deadline and the hedging apply to the first chunk of the
+response, after which the rest of the winning stream is passed through.
+
+Example:
+    ```python
+    from google.adk.agents import LlmAgent
+    from utils.model_call_policy import get_model
+
+    agent = LlmAgent(name="IntentDetectionAgent", model=get_model("IntentDetectionAgent"))
+    ```
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque, Dict, List, Optional, Tuple, Union
+
+import httpx
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import errors
+from pydantic import PrivateAttr
+
+from ..config import config
+from .metrics import registry
+
+# Latency samples kept per agent, and needed before hedging, to estimate the p95
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+RETRY_BACKOFF_SECONDS = 0.2
+# Hedged requests an agent can send in a burst
+MAX_HEDGE_TOKENS = 10.0
+
+_call_latency = registry.histogram(
+    "model_call_seconds",
+    "Latency of the first response of LLM calls, by agent and model",
+    ["agent", "model"],
+)
+_outcomes = registry.counter(
+    "model_call_outcomes_total",
+    "Number of LLM calls, by agent and outcome (primary, hedge, retry, fallback or "
+    "failed)",
+    ["agent", "outcome"],
+)
+_hedges = registry.counter(
+    "model_call_hedges_total", "Number of hedged LLM requests sent", ["agent"]
+)
+_skipped_hedges = registry.counter(
+    "model_call_hedges_skipped_total",
+    "Number of hedged LLM requests not sent, the hedge budget of the agent being spent",
+    ["agent"],
+)
+
+
+class LatencyTracker:
+    """Keeps the recent LLM call latencies of each agent to estimate their p95, and the
+    budget of hedged requests the calls earned."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._hedge_tokens: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, agent_name: str, seconds: float) -> None:
+        """Record the latency of a call, which earns a share of a hedged request.
+
+        Args:
+            agent_name (str): The name of the agent calling the LLM
+            seconds (float): The latency of the first response
+        """
+        with self._lock:
+            self._latencies.setdefault(agent_name, deque(maxlen=self.window)).append(
+                seconds
+            )
+            self._hedge_tokens[agent_name] = min(
+                MAX_HEDGE_TOKENS,
+                self._hedge_tokens.get(agent_name, 0.0)
+                + config.model_call_hedge_max_share,
+            )
+
+    def try_hedge(self, agent_name: str) -> bool:
+        """Spend a hedged request of the budget of an agent.
+
+        Args:
+            agent_name (str): The name of the agent calling the LLM
+
+        Returns:
+            bool: True if the agent may send a hedged request, False if its budget is
+                spent
+        """
+        with self._lock:
+            tokens = self._hedge_tokens.get(agent_name, 0.0)
+            if tokens < 1.0:
+                return False
+            self._hedge_tokens[agent_name] = tokens - 1.0
+            return True
+
+    def p95(self, agent_name: str) -> Optional[float]:
+        """Get the p95 latency of an agent.
+
+        Args:
+            agent_name (str): The name of the agent calling the LLM
+
+        Returns:
+            Optional[float]: The p95 latency in seconds, or None if fewer than
+                MIN_LATENCY_SAMPLES calls were observed
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(agent_name, ()))
+        if len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))]
+
+    def clear(self) -> None:
+        """Drop all recorded latencies and hedge budgets."""
+        with self._lock:
+            self._latencies.clear()
+            self._hedge_tokens.clear()
+
+
+latency_tracker = LatencyTracker()
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether a failed LLM call may succeed when retried.
+
+    Args:
+        error (BaseException): The error of the call
+
+    Returns:
+        bool: True for rate limiting, server and connection errors
+    """
+    if isinstance(error, errors.APIError):
+        return error.code in RETRYABLE_STATUS_CODES
+    return isinstance(error, (ConnectionError, httpx.TransportError))
+
+
+def _copy_request(llm_request: LlmRequest) -> LlmRequest:
+    """Copy a request for a concurrent call, which may change its contents or config.
+
+    The tools are shared rather than copied, as they hold the agents and their state.
+    """
+    return llm_request.model_copy(
+        update={
+            "contents": list(llm_request.contents),
+            "config": llm_request.config and llm_request.config.model_copy(deep=True),
+        }
+    )
+
+
+async def _first_response(
+    llm: BaseLlm, llm_request: LlmRequest, stream: bool
+) -> Tuple[LlmResponse, AsyncGenerator[LlmResponse, None]]:
+    """Call an LLM and wait for the first response, returning the rest as a generator."""
+    responses = llm.generate_content_async(llm_request, stream=stream)
+    try:
+        return await responses.__anext__(), responses
+    except BaseException:
+        await responses.aclose()
+        raise
+
+
+async def _discard(task: asyncio.Task) -> None:
+    """Cancel a request, closing its response generator if it already responded."""
+    task.cancel()
+    try:
+        _, responses = await task
+    except BaseException:
+        return
+    await responses.aclose()
+
+
+class PolicyLlm(BaseLlm):
+    """LLM applying the deadline, hedging, retry and fallback policy of an agent.
+
+    Args:
+        model (str): The name of the primary model
+        agent_name (str): The name of the agent calling the LLM
+        fallback_model (str, optional): The name of the model called once the budget
+            or the retries are exhausted
+    """
+
+    agent_name: str
+    fallback_model: Optional[str] = None
+    _llms: Dict[str, BaseLlm] = PrivateAttr(default_factory=dict)
+
+    def _llm(self, model: str) -> BaseLlm:
+        if model not in self._llms:
+            self._llms[model] = LLMRegistry.new_llm(model)
+        return self._llms[model]
+
+    def open_clients(self) -> None:
+        """Create the primary and fallback LLMs and their API clients ahead of use."""
+        for model in filter(None, (self.model, self.fallback_model)):
+            # Gemini creates its API client, looking up the credentials, on first use
+            getattr(self._llm(model), "api_client", None)
+
+    def _deadline_seconds(self) -> float:
+        return config.model_call_deadlines_by_agent.get(
+            self.agent_name, config.model_call_deadline_seconds
+        )
+
+    def _hedge_delay_seconds(self) -> Optional[float]:
+        if not config.model_call_hedging_enabled:
+            return None
+        p95 = latency_tracker.p95(self.agent_name)
+        if p95 is None:
+            return None
+        return max(p95, config.model_call_hedge_min_delay_seconds)
+
+    async def _hedged_first_response(
+        self, llm_request: LlmRequest, stream: bool
+    ) -> Tuple[LlmResponse, AsyncGenerator[LlmResponse, None]]:
+        """Get the first response of the primary model, hedging slow requests."""
+        llm = self._llm(self.model)
+        started = time.perf_counter()
+        primary = asyncio.create_task(_first_response(llm, llm_request, stream))
+        tasks: List[asyncio.Task] = [primary]
+        try:
+            hedge_delay = self._hedge_delay_seconds()
+            if hedge_delay is not None:
+                done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+                if not done and not latency_tracker.try_hedge(self.agent_name):
+                    _skipped_hedges.inc(agent=self.agent_name)
+                elif not done:
+                    _hedges.inc(agent=self.agent_name)
+                    hedge_request = _copy_request(llm_request)
+                    tasks.append(
+                        asyncio.create_task(_first_response(llm, hedge_request, stream))
+                    )
+
+            error: Optional[BaseException] = None
+            # The other finished requests are discarded, as they are still in tasks
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.remove(task)
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    elapsed = time.perf_counter() - started
+                    _call_latency.observe(
+                        elapsed, agent=self.agent_name, model=self.model
+                    )
+                    latency_tracker.observe(self.agent_name, elapsed)
+                    _outcomes.inc(
+                        agent=self.agent_name,
+                        outcome="primary" if task is primary else "hedge",
+                    )
+                    return task.result()
+            raise error
+        finally:
+            for task in tasks:
+                await _discard(task)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._deadline_seconds()
+        error: BaseException = asyncio.TimeoutError()
+
+        for attempt in range(config.model_call_max_retries + 1):
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            if attempt:
+                _outcomes.inc(agent=self.agent_name, outcome="retry")
+            try:
+                first, responses = await asyncio.wait_for(
+                    self._hedged_first_response(llm_request, stream), remaining
+                )
+            except asyncio.TimeoutError as timeout:
+                logging.warning(
+                    f"LLM call of {self.agent_name} exceeded its "
+                    f"{self._deadline_seconds()}s budget"
+                )
+                error = timeout
+                break
+            except Exception as call_error:
+                if not is_retryable(call_error):
+                    _outcomes.inc(agent=self.agent_name, outcome="failed")
+                    raise
+                logging.warning(
+                    f"LLM call of {self.agent_name} failed (attempt {attempt + 1}): "
+                    f"{call_error}"
+                )
+                error = call_error
+                await asyncio.sleep(
+                    min(RETRY_BACKOFF_SECONDS * 2**attempt, deadline - loop.time())
+                )
+                continue
+
+            yield first
+            async for response in responses:
+                yield response
+            return
+
+        if not self.fallback_model or self.fallback_model == self.model:
+            _outcomes.inc(agent=self.agent_name, outcome="failed")
+            raise error
+
+        logging.warning(
+            f"Falling back to {self.fallback_model} for the LLM call of "
+            f"{self.agent_name}"
+        )
+        _outcomes.inc(agent=self.agent_name, outcome="fallback")
+        fallback_request = _copy_request(llm_request)
+        fallback_request.model = self.fallback_model
+        async for response in self._llm(self.fallback_model).generate_content_async(
+            fallback_request, stream=stream
+        ):
+            yield response
+
+
+def get_model(agent_name: str) -> Union[str, BaseLlm]:
+    """Get the model of an agent, following the model call policy.
+
+    Args:
+        agent_name (str): The name of the agent
+
+    Returns:
+        Union[str, BaseLlm]: The PolicyLlm of the agent, or the name of the model if
+            the policy is disabled
+    """
+    if not config.model_call_policy_enabled:
+        return config.model_name
+    return PolicyLlm(
+        model=config.model_name,
+        agent_name=agent_name,
+        fallback_model=config.fallback_model_name or None,
+    )
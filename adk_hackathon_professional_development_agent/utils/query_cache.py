@@ -0,0 +1,218 @@
+"""
+Query Cache Module.
+
+This module provides the read-through cache used by the BigQuery operations utility
+module. Employee profiles, training history and the project portfolio change rarely,
+while the agents ask for them on every turn, so caching query results saves a round trip
+to the data backend for most tool calls.
+
+The cache:
+- Is keyed by the query text together with its query parameter values and the result
+  format (rows as dictionaries, or Arrow tables)
+- Evicts the least recently used entry once it holds `max_entries` entries
+- Expires entries after a per-table time-to-live
+- Supports targeted invalidation: a write to a table evicts only the cached queries
+  whose parameters match the written row (e.g. only one employee's history and budget)
+- Counts hits, misses, evictions and invalidations
+
+Example:
+    ```python
+    from utils.query_cache import QueryCache
+
+    cache = QueryCache(max_entries=1024, ttl_seconds={"employee_profiles": 300})
+    key = cache.make_key(query, params)
+    hit, rows = cache.get(key)
+    if not hit:
+        rows = run_query(query, params)
+        cache.put(key, rows, query, params)
+
+    # A new training was registered for john.doe@amazincorp.com
+    cache.invalidate("employee_trainings", {"email": "john.doe@amazincorp.com"})
+    ```
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Tuple
+
+from .arrow_results import copy_result
+from .data_backends import get_parameter_name_and_value, get_referenced_tables
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    expires_at: float
+    tables: FrozenSet[str]
+    param_values: Dict[str, Any] = field(default_factory=dict)
+
+
+class QueryCache:
+    """Thread-safe LRU cache of query results with per-table TTLs.
+
+    Args:
+        max_entries (int): Maximum number of cached queries. 0 disables the cache.
+        ttl_seconds (Dict[str, float], optional): Time-to-live of the results of
+            queries referencing each table. Queries referencing several tables use
+            the shortest TTL.
+        default_ttl_seconds (float, optional): Time-to-live of the results of queries
+            referencing tables without a configured TTL
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: Optional[Dict[str, float]] = None,
+        default_ttl_seconds: float = 60.0,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = dict(ttl_seconds or {})
+        self.default_ttl_seconds = default_ttl_seconds
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Whether the cache stores any entries."""
+        return self.max_entries > 0
+
+    @staticmethod
+    def make_key(
+        query: str, params: Optional[List[Any]] = None, result_format: str = "rows"
+    ) -> Hashable:
+        """Build a cache key from a query and its parameter values.
+
+        Args:
+            query (str): The SQL query
+            params (List[Any], optional): The query parameters
+            result_format (str, optional): "rows" for lists of dictionaries, or
+                "arrow" for Arrow tables
+
+        Returns:
+            Hashable: The cache key
+        """
+        param_items = []
+        for param in params or []:
+            name, value = get_parameter_name_and_value(param)
+            if isinstance(value, list):
+                value = tuple(value)
+            param_items.append((name, value))
+        key = " ".join(query.split()), tuple(sorted(param_items))
+        return key if result_format == "rows" else key + (result_format,)
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Look up a cached query result.
+
+        Args:
+            key (Hashable): The cache key built by make_key
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found, and a copy of the cached result
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry.value
+        # Callers post-process rows in place, so never hand out the cached objects
+        return True, copy_result(value)
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        query: str,
+        params: Optional[List[Any]] = None,
+    ) -> None:
+        """Store a query result.
+
+        Args:
+            key (Hashable): The cache key built by make_key
+            value (Any): The query result
+            query (str): The SQL query, used to find the referenced tables
+            params (List[Any], optional): The query parameters, used for invalidation
+        """
+        if not self.enabled:
+            return
+        tables = get_referenced_tables(query)
+        ttl = min(
+            (self.ttl_seconds.get(table, self.default_ttl_seconds) for table in tables),
+            default=self.default_ttl_seconds,
+        )
+        entry = _CacheEntry(
+            value=copy_result(value),
+            expires_at=time.monotonic() + ttl,
+            tables=tables,
+            param_values=dict(
+                get_parameter_name_and_value(param) for param in params or []
+            ),
+        )
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, table_id: str, row: Optional[Dict[str, Any]] = None) -> int:
+        """Evict the cached queries that may be affected by a write to a table.
+
+        A cached query referencing the table is evicted unless one of its parameters
+        names a column of the written row and has a different value. For example,
+        writing a training row for one employee evicts that employee's training
+        history and budget queries, as well as unfiltered queries of the table,
+        but keeps the entries of every other employee.
+
+        Args:
+            table_id (str): The ID of the written table without project and dataset
+            row (Dict[str, Any], optional): The written row. If omitted, every cached
+                query referencing the table is evicted.
+
+        Returns:
+            int: The number of evicted entries
+        """
+        row = row or {}
+        with self._lock:
+            stale_keys = [
+                key
+                for key, entry in self._entries.items()
+                if table_id in entry.tables
+                and all(
+                    row[name] == value
+                    for name, value in entry.param_values.items()
+                    if name in row
+                )
+            ]
+            for key in stale_keys:
+                del self._entries[key]
+            self.invalidations += len(stale_keys)
+        return len(stale_keys)
+
+    def clear(self) -> None:
+        """Evict every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Dict[str, int]: The cache size and its hit, miss, eviction and invalidation counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
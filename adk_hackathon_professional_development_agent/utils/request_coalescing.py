@@ -0,0 +1,195 @@
+"""
+Request Coalescing Module.
+
+This module provides two building blocks that reduce the number of data backend jobs
+issued when many sessions ask for the same data at once:
+
+- SingleFlight: Deduplicates concurrent identical calls. The first caller runs the call,
+  while the others wait for its result instead of starting their own job.
+- BatchLoader: Implements the DataLoader pattern for asyncio. Keys requested within a
+  short window are collected and loaded with a single batched call.
+
+Example:
+    ```python
+    from utils.request_coalescing import BatchLoader, SingleFlight
+
+    single_flight = SingleFlight()
+    rows = single_flight.do(("SELECT ...", ()), lambda: run_query("SELECT ..."))
+
+    async def load_profiles(emails):
+        rows = await run_batched_query(emails)
+        return {row["email"]: row for row in rows}
+
+    profile_loader = BatchLoader(load_profiles, window_seconds=0.005)
+    profile = await profile_loader.load("john.doe@amazincorp.com")
+    ```
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    TypeVar,
+)
+
+from .arrow_results import copy_result
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight:
+    """Thread-safe deduplication of concurrent identical calls.
+
+    Every caller sharing a key while a call is in flight, including the one that ran
+    the call, receives its own deep copy of the result (or the exception), so callers
+    may post-process the result in place. Immutable Arrow tables are shared.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Hashable, Future] = {}
+        self.shared_calls = 0
+
+    def do(self, key: Hashable, func: Callable[[], V]) -> V:
+        """Run a call, or wait for the identical call already in flight.
+
+        Args:
+            key (Hashable): Identifies identical calls
+            func (Callable[[], V]): The call to run if none is in flight for the key
+
+        Returns:
+            V: The result of the call
+
+        Raises:
+            Exception: Any exception raised by the call
+        """
+        with self._lock:
+            future = self._in_flight.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.shared_calls += 1
+
+        if not is_leader:
+            return copy_result(future.result())
+
+        try:
+            result = func()
+            future.set_result(result)
+            return copy_result(result)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+
+class _Batch:
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.loop = loop
+        self.futures: Dict[Hashable, asyncio.Future] = {}
+
+
+class BatchLoader(Generic[K, V]):
+    """Collects keys requested within a short window and loads them in one batch.
+
+    Args:
+        batch_fn (Callable[[List[K]], Awaitable[Dict[K, V]]]): Loads a batch of unique
+            keys and returns their values. Keys missing from the result resolve to
+            `default`.
+        window_seconds (float, optional): How long to collect keys before loading them
+        max_batch_size (int, optional): Batches are dispatched early once they hold
+            this many unique keys
+        default (V, optional): Value returned for keys missing from a batch result
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        window_seconds: float = 0.005,
+        max_batch_size: int = 100,
+        default: Optional[V] = None,
+    ):
+        self._batch_fn = batch_fn
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.default = default
+        self._pending: Optional[_Batch] = None
+        self._tasks = set()
+        self.batches = 0
+        self.loads = 0
+
+    async def load(self, key: K) -> V:
+        """Load the value of a key as part of the next batch.
+
+        Args:
+            key (K): The key to load
+
+        Returns:
+            V: A copy of the loaded value, or `default` if the key was not found
+
+        Raises:
+            Exception: Any exception raised while loading the batch
+        """
+        loop = asyncio.get_running_loop()
+        batch = self._pending
+        if batch is None or batch.loop is not loop:
+            batch = self._pending = _Batch(loop)
+            loop.call_later(self.window_seconds, self._dispatch, batch)
+
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = loop.create_future()
+        self.loads += 1
+
+        if len(batch.futures) >= self.max_batch_size:
+            self._dispatch(batch)
+
+        # Shielded, so that a cancelled caller does not cancel the others sharing the key
+        return copy_result(await asyncio.shield(future))
+
+    def _dispatch(self, batch: _Batch) -> None:
+        """Start loading a batch, unless it was already dispatched."""
+        if self._pending is batch:
+            self._pending = None
+            self.batches += 1
+            task = batch.loop.create_task(self._load_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: _Batch) -> None:
+        """Load a batch and resolve the futures waiting for its keys."""
+        try:
+            values = await self._batch_fn(list(batch.futures))
+        except Exception as e:
+            for future in batch.futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        except BaseException:
+            # Cancelled, e.g. on shutdown: cancel the waiters instead of leaving them
+            # waiting forever
+            for future in batch.futures.values():
+                future.cancel()
+            raise
+
+        for key, future in batch.futures.items():
+            if not future.done():
+                future.set_result(values.get(key, self.default))
+
+    @property
+    def stats(self) -> Dict[str, Any]:
+        """Dict[str, Any]: The number of loads and of dispatched batches."""
+        return {"loads": self.loads, "batches": self.batches}
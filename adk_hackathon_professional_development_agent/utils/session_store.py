@@ -0,0 +1,352 @@
+"""
+Session Store Module.
+
+This module provides the durable, bounded session backend of the FastAPI app. ADK keeps
+every event of a session and sends the whole history to the model on every turn, so
+long conversations grow both the memory of the server and the prompts without limit.
+
+`BoundedSessionService` extends ADK's `DatabaseSessionService`, by default on a SQLite
+database in WAL mode (SESSION_DB_URL), which any number of workers on the host can
+share, and bounds it:
+- Per-session caps: once a session holds more than SESSION_MAX_EVENTS events or
+  SESSION_MAX_BYTES bytes of content, its oldest invocations are compacted into a
+  single summary event, keeping at least the last SESSION_KEEP_RECENT_EVENTS events
+  and never splitting an invocation, so function calls keep their responses
+- LRU eviction: sessions idle for longer than SESSION_IDLE_TTL_SECONDS, and the least
+  recently active sessions beyond SESSION_MAX_SESSIONS, are deleted, at most once per
+  SESSION_EVICTION_INTERVAL_SECONDS, in the background of the creation of a session
+
+Compaction and eviction query the database and serialize events, so they run in worker
+threads, keeping the event loop free for the other requests of the worker.
+
+The summary event holds the user messages and the agent answers of the compacted
+invocations, summarized to their first sentences, without the tool calls and results.
+It is authored by `SUMMARY_AUTHOR`, so the agents receive it as context.
+
+Example:
+    ```python
+    from utils.session_store import BoundedSessionService
+
+    session_service = BoundedSessionService(db_url="sqlite:///sessions.db")
+    await session_service.evict_idle_sessions()
+    ```
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import Any, List, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import Session
+from google.adk.sessions.database_session_service import (
+    DatabaseSessionService,
+    StorageEvent,
+    StorageSession,
+)
+from google.genai import types
+from sqlalchemy import delete, func
+from sqlalchemy import event as sqlalchemy_event
+
+from ..config import config
+from .metrics import registry
+from .tool_output_shaping import summarize_text
+
+SUMMARY_AUTHOR = "session_summary"
+SUMMARY_HEADER = "Summary of the earlier conversation:"
+# Length each message of the compacted invocations is summarized to
+SUMMARY_LINE_CHARS = 300
+
+_compactions = registry.counter(
+    "session_compactions_total", "Number of session histories compacted"
+)
+_compacted_events = registry.counter(
+    "session_compacted_events_total",
+    "Number of session events replaced by a summary event",
+)
+_evictions = registry.counter(
+    "session_evictions_total",
+    "Number of sessions deleted, by reason (idle or capacity)",
+    ["reason"],
+)
+
+
+def _set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+    """Enable WAL mode, and the foreign keys deleting the events of deleted sessions."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+def _log_eviction_error(task: asyncio.Task) -> None:
+    """Log the error of a background eviction, which nothing awaits."""
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Error evicting idle sessions: {str(task.exception())}")
+
+
+def _event_text(event: Event) -> str:
+    """Get the text of an event, without thoughts, tool calls and tool results."""
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(
+        part.text for part in event.content.parts if part.text and not part.thought
+    ).strip()
+
+
+def summarize_events(events: List[Event], max_chars: int) -> Optional[str]:
+    """Summarize events into the text of a summary event.
+
+    Args:
+        events (List[Event]): The events, oldest first, including earlier summaries
+        max_chars (int): The maximum length of the summary, keeping the latest lines
+
+    Returns:
+        Optional[str]: The summary, or None if the events have no messages
+    """
+    lines = []
+    for event in events:
+        text = _event_text(event)
+        if not text:
+            continue
+        if event.author == SUMMARY_AUTHOR:
+            lines.extend(
+                line for line in text.splitlines()[1:] if line.startswith("- ")
+            )
+            continue
+        text = " ".join(text.split())
+        lines.append(f"- {event.author}: {summarize_text(text, SUMMARY_LINE_CHARS)}")
+    if not lines:
+        return None
+
+    kept: List[str] = []
+    length = len(SUMMARY_HEADER)
+    for line in reversed(lines):
+        length += len(line) + 1
+        if length > max_chars and kept:
+            break
+        kept.append(line)
+    return "\n".join([SUMMARY_HEADER, *reversed(kept)])
+
+
+class BoundedSessionService(DatabaseSessionService):
+    """Database session service with per-session caps and LRU eviction of sessions.
+
+    Args:
+        db_url (str): The SQLAlchemy URL of the database
+        max_events (int, optional): The number of events of a session triggering its
+            compaction, SESSION_MAX_EVENTS if None
+        max_bytes (int, optional): The content bytes of a session triggering its
+            compaction, SESSION_MAX_BYTES if None
+        max_sessions (int, optional): The number of sessions kept, SESSION_MAX_SESSIONS
+            if None
+        idle_ttl_seconds (float, optional): How long idle sessions are kept,
+            SESSION_IDLE_TTL_SECONDS if None
+    """
+
+    def __init__(
+        self,
+        db_url: str,
+        max_events: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        **kwargs: Any,
+    ):
+        is_sqlite = db_url.startswith("sqlite")
+        if is_sqlite:
+            # Shared by the request threads, waiting for the locks of other workers
+            kwargs.setdefault(
+                "connect_args", {"check_same_thread": False, "timeout": 30}
+            )
+        super().__init__(db_url, **kwargs)
+        if is_sqlite:
+            sqlalchemy_event.listen(self.db_engine, "connect", _set_sqlite_pragmas)
+            # Reconnect the connections opened while creating the tables
+            self.db_engine.dispose()
+
+        self.max_events = max_events or config.session_max_events
+        self.max_bytes = max_bytes or config.session_max_bytes
+        self.max_sessions = max_sessions or config.session_max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds or config.session_idle_ttl_seconds
+        self._last_eviction = time.monotonic()
+        self._eviction_task: Optional[asyncio.Task] = None
+
+    async def create_session(self, **kwargs: Any) -> Session:
+        if (
+            time.monotonic() - self._last_eviction
+            >= config.session_eviction_interval_seconds
+            and (self._eviction_task is None or self._eviction_task.done())
+        ):
+            self._last_eviction = time.monotonic()
+            # Not delaying the session being created
+            self._eviction_task = asyncio.create_task(self.evict_idle_sessions())
+            self._eviction_task.add_done_callback(_log_eviction_error)
+        return await super().create_session(**kwargs)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        await super().append_event(session=session, event=event)
+        # Checked once per answer of an agent rather than on every tool call
+        if not event.partial and event.is_final_response():
+            await asyncio.to_thread(self.compact_session, session, event.invocation_id)
+        return event
+
+    def _is_over_caps(self, session: Session) -> bool:
+        # The session object holds the stored events, read at the start of the turn
+        if len(session.events) > self.max_events:
+            return True
+        size = sum(
+            len(event.content.model_dump_json(exclude_none=True))
+            for event in session.events
+            if event.content
+        )
+        return size > self.max_bytes
+
+    def compact_session(
+        self, session: Session, current_invocation_id: Optional[str] = None
+    ) -> int:
+        """Replace the oldest invocations of a session over its caps by a summary.
+
+        Both the stored events and the events of the session object are compacted.
+
+        Args:
+            session (Session): The session, holding its stored events
+            current_invocation_id (str, optional): The running invocation, never
+                compacted
+
+        Returns:
+            int: The number of events replaced by the summary event
+        """
+        if not self._is_over_caps(session):
+            return 0
+        events = session.events
+        # Keep the latest events, from the start of their oldest invocation
+        cut = max(0, len(events) - config.session_keep_recent_events)
+        while cut > 0 and events[cut].invocation_id == events[cut - 1].invocation_id:
+            cut -= 1
+        compacted = [
+            e for e in events[:cut] if e.invocation_id != current_invocation_id
+        ]
+        if len(compacted) < 2 and all(e.author == SUMMARY_AUTHOR for e in compacted):
+            return 0
+
+        summary = summarize_events(compacted, config.session_summary_max_chars)
+        summary_events = []
+        if summary is not None:
+            summary_events.append(
+                Event(
+                    invocation_id=compacted[-1].invocation_id,
+                    author=SUMMARY_AUTHOR,
+                    content=types.Content(
+                        role="model", parts=[types.Part(text=summary)]
+                    ),
+                    timestamp=compacted[-1].timestamp,
+                )
+            )
+        compacted_ids = {e.id for e in compacted}
+        with self.database_session_factory() as session_factory:
+            session_factory.execute(
+                delete(StorageEvent).where(
+                    StorageEvent.app_name == session.app_name,
+                    StorageEvent.user_id == session.user_id,
+                    StorageEvent.session_id == session.id,
+                    StorageEvent.id.in_(compacted_ids),
+                )
+            )
+            for summary_event in summary_events:
+                session_factory.add(StorageEvent.from_event(session, summary_event))
+            session_factory.commit()
+        session.events = summary_events + [
+            e for e in events if e.id not in compacted_ids
+        ]
+
+        logging.info(
+            f"Compacted {len(compacted)} events of session {session.id} into a summary"
+        )
+        _compactions.inc()
+        _compacted_events.inc(len(compacted))
+        return len(compacted)
+
+    async def evict_idle_sessions(self) -> int:
+        """Delete the idle sessions, and the least recently active ones over capacity.
+
+        The sessions are deleted in a worker thread, off the event loop.
+
+        Returns:
+            int: The number of sessions deleted
+        """
+        self._last_eviction = time.monotonic()
+        return await asyncio.to_thread(self._evict_idle_sessions)
+
+    def _evict_idle_sessions(self) -> int:
+        idle_before = datetime.datetime.fromtimestamp(
+            time.time() - self.idle_ttl_seconds
+        )
+        with self.database_session_factory() as session_factory:
+            last_events = (
+                session_factory.query(
+                    StorageEvent.app_name,
+                    StorageEvent.user_id,
+                    StorageEvent.session_id,
+                    func.max(StorageEvent.timestamp).label("last_event_time"),
+                )
+                .group_by(
+                    StorageEvent.app_name, StorageEvent.user_id, StorageEvent.session_id
+                )
+                .subquery()
+            )
+            rows = (
+                session_factory.query(
+                    StorageSession.app_name,
+                    StorageSession.user_id,
+                    StorageSession.id,
+                    StorageSession.update_time,
+                    last_events.c.last_event_time,
+                )
+                .outerjoin(
+                    last_events,
+                    (last_events.c.app_name == StorageSession.app_name)
+                    & (last_events.c.user_id == StorageSession.user_id)
+                    & (last_events.c.session_id == StorageSession.id),
+                )
+                .all()
+            )
+            # Most recently active first
+            sessions = sorted(
+                (
+                    (last_event_time or update_time, key)
+                    for *key, update_time, last_event_time in rows
+                ),
+                reverse=True,
+            )
+            evicted = {}
+            for rank, (last_active, key) in enumerate(sessions):
+                if last_active < idle_before:
+                    evicted[tuple(key)] = "idle"
+                elif rank >= self.max_sessions:
+                    evicted[tuple(key)] = "capacity"
+
+            for (app_name, user_id, session_id), reason in evicted.items():
+                # Deleted explicitly, as databases may not enforce the foreign keys
+                session_factory.execute(
+                    delete(StorageEvent).where(
+                        StorageEvent.app_name == app_name,
+                        StorageEvent.user_id == user_id,
+                        StorageEvent.session_id == session_id,
+                    )
+                )
+                session_factory.execute(
+                    delete(StorageSession).where(
+                        StorageSession.app_name == app_name,
+                        StorageSession.user_id == user_id,
+                        StorageSession.id == session_id,
+                    )
+                )
+                _evictions.inc(reason=reason)
+            session_factory.commit()
+
+        if evicted:
+            logging.info(f"Evicted {len(evicted)} sessions")
+        return len(evicted)
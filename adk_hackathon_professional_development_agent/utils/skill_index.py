@@ -0,0 +1,413 @@
+"""
+Skill Index Module.
+
+This module provides the normalized skill vocabulary and the in-memory skill index used
+by the skill tools. Skills are stored as comma-separated strings in three tables
+(`employee_profiles.skills`, `project_portfolio.skills_needed` and
+`employee_trainings.skills`), and the same skill is often spelled in different ways,
+e.g. "GCP", "Google Cloud" and "Google Cloud Platform".
+
+Every skill is canonicalized through SKILL_ALIASES, and an inverted index maps each
+canonical skill to the projects needing it, the employees having it and the trainings
+covering it. Questions such as "which active projects need skills this employee lacks"
+are then answered with a few set operations instead of letting the LLM match raw text.
+
+The index is built from the tables on first use and:
+- Updated incrementally with the rows written through the BigQuery operations utility
+  module, e.g. a newly registered training is added to the trainings of its skills
+- Rebuilt every SKILL_INDEX_REFRESH_SECONDS to pick up changes made outside of the agent
+
+Attributes:
+    SKILL_ALIASES: Mapping of lowercase skill spellings to their canonical name
+    ACTIVE_PROJECT_STATUSES: Statuses of the projects still needing staff
+
+Example:
+    ```python
+    from utils.skill_index import get_skill_index_async
+
+    index = await get_skill_index_async()
+    gaps = index.project_skill_gaps("john.doe@amazincorp.com")
+    experts = index.employees_with_skill("gcp")
+    ```
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from ..config import config
+from .arrow_results import split_list_column, to_records
+from .bigquery_operations import (
+    add_write_listener,
+    apply_shared_writes,
+    get_table_ref,
+    query_arrow,
+)
+
+SKILL_ALIASES: Dict[str, str] = {
+    "gcp": "Google Cloud Platform",
+    "google cloud": "Google Cloud Platform",
+    "google cloud platform": "Google Cloud Platform",
+    "aws": "AWS",
+    "amazon web services": "AWS",
+    "ml": "Machine Learning",
+    "machine learning": "Machine Learning",
+    "ai": "Artificial Intelligence",
+    "artificial intelligence": "Artificial Intelligence",
+    "k8s": "Kubernetes",
+    "kubernetes": "Kubernetes",
+    "gke": "Google Kubernetes Engine",
+    "google kubernetes engine": "Google Kubernetes Engine",
+    "bq": "BigQuery",
+    "bigquery": "BigQuery",
+    "pub/sub": "Cloud Pub/Sub",
+    "pubsub": "Cloud Pub/Sub",
+    "cloud pub/sub": "Cloud Pub/Sub",
+    "gcs": "Cloud Storage",
+    "google cloud storage": "Cloud Storage",
+    "cloud storage": "Cloud Storage",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "node.js": "Node.js",
+    "js": "JavaScript",
+    "javascript": "JavaScript",
+    "ts": "TypeScript",
+    "typescript": "TypeScript",
+    "reactjs": "React",
+    "react.js": "React",
+    "react": "React",
+    "ci/cd": "CI/CD",
+    "cicd": "CI/CD",
+    "ci-cd": "CI/CD",
+    "continuous integration": "CI/CD",
+    "data analysis": "Data Analytics",
+    "data analytics": "Data Analytics",
+    "tensorflow": "TensorFlow",
+    "vertex": "Vertex AI",
+    "vertex ai": "Vertex AI",
+    "adk": "Google ADK",
+    "agent development kit": "Google ADK",
+    "google adk": "Google ADK",
+    "jira": "JIRA",
+    "sql": "SQL",
+}
+
+ACTIVE_PROJECT_STATUSES = frozenset({"Active", "In Progress", "Planning"})
+
+
+def canonicalize_skill(skill: str) -> str:
+    """Get the canonical name of a skill.
+
+    Args:
+        skill (str): A skill name as spelled in the data or by the user
+
+    Returns:
+        str: The canonical skill name, or the trimmed skill name if it has no alias
+    """
+    normalized = " ".join(skill.split())
+    return SKILL_ALIASES.get(normalized.lower(), normalized)
+
+
+def normalize_project_status(status: Optional[str]) -> str:
+    """Get the canonical spelling of a project status.
+
+    Statuses are typed by hand in the project portfolio, e.g. "Active " with a trailing
+    space or "in progress", and would otherwise not match the known statuses.
+
+    Args:
+        status (Optional[str]): A project status as spelled in the data or the settings
+
+    Returns:
+        str: The trimmed status in title case, e.g. "In Progress"
+    """
+    return " ".join((status or "").split()).title()
+
+
+def canonicalize_skills(skills: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """Get the canonical names of a list of skills, dropping empty ones.
+
+    Args:
+        skills (Iterable[str], optional): Skill names as spelled in the data
+
+    Returns:
+        FrozenSet[str]: The canonical skill names
+    """
+    return frozenset(
+        canonicalize_skill(skill) for skill in skills or [] if skill.strip()
+    )
+
+
+def _skill_key(skill: str) -> str:
+    """Case-insensitive lookup key of a canonical skill."""
+    return canonicalize_skill(skill).lower()
+
+
+class SkillIndex:
+    """Inverted index from canonical skills to projects, employees and trainings.
+
+    Projects are identified by name, employees by email and trainings by name.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.employee_skills: Dict[str, Set[str]] = {}
+        self.project_skills: Dict[str, FrozenSet[str]] = {}
+        self.project_statuses: Dict[str, str] = {}
+        self.training_skills: Dict[str, FrozenSet[str]] = {}
+        self._projects_by_skill: Dict[str, Set[str]] = defaultdict(set)
+        self._employees_by_skill: Dict[str, Set[str]] = defaultdict(set)
+        self._trainings_by_skill: Dict[str, Set[str]] = defaultdict(set)
+        self.built_at: Optional[float] = None
+
+    @property
+    def is_stale(self) -> bool:
+        """bool: Whether the index was never built or is due for a refresh."""
+        return (
+            self.built_at is None
+            or time.monotonic() - self.built_at >= config.skill_index_refresh_seconds
+        )
+
+    def build(
+        self,
+        profiles: Iterable[Dict[str, Any]],
+        projects: Iterable[Dict[str, Any]],
+        trainings: Iterable[Dict[str, Any]],
+    ) -> None:
+        """Rebuild the index from the table rows, with skills split into lists.
+
+        Args:
+            profiles (Iterable[Dict[str, Any]]): Rows with email and skills
+            projects (Iterable[Dict[str, Any]]): Rows with name, status and skills_needed
+            trainings (Iterable[Dict[str, Any]]): Rows with name and skills
+        """
+        index = SkillIndex()
+        for profile in profiles:
+            index._add_employee_skills(profile["email"], profile["skills"])
+        for project in projects:
+            name = project["name"]
+            skills = canonicalize_skills(project["skills_needed"])
+            index.project_skills[name] = skills
+            index.project_statuses[name] = normalize_project_status(project["status"])
+            for skill in skills:
+                index._projects_by_skill[skill.lower()].add(name)
+        for training in trainings:
+            index._add_training(training)
+
+        with self._lock:
+            self.employee_skills = index.employee_skills
+            self.project_skills = index.project_skills
+            self.project_statuses = index.project_statuses
+            self.training_skills = index.training_skills
+            self._projects_by_skill = index._projects_by_skill
+            self._employees_by_skill = index._employees_by_skill
+            self._trainings_by_skill = index._trainings_by_skill
+            self.built_at = time.monotonic()
+
+    def _add_employee_skills(self, email: str, skills: Iterable[str]) -> None:
+        canonical_skills = canonicalize_skills(skills)
+        self.employee_skills.setdefault(email, set()).update(canonical_skills)
+        for skill in canonical_skills:
+            self._employees_by_skill[skill.lower()].add(email)
+
+    def _add_training(self, training: Dict[str, Any]) -> None:
+        skills = canonicalize_skills(training["skills"])
+        name = training["name"]
+        self.training_skills[name] = (
+            self.training_skills.get(name, frozenset()) | skills
+        )
+        for skill in skills:
+            self._trainings_by_skill[skill.lower()].add(name)
+
+    def add_trainings(self, trainings: Iterable[Dict[str, Any]]) -> None:
+        """Add newly registered trainings to the index.
+
+        Args:
+            trainings (Iterable[Dict[str, Any]]): Rows with name and skills, where skills
+                are comma-separated strings or lists
+        """
+        with self._lock:
+            for training in trainings:
+                skills = training.get("skills") or []
+                if isinstance(skills, str):
+                    skills = skills.split(",")
+                self._add_training({**training, "skills": skills})
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy the skills of every employee and project, e.g. to build a skill matrix.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The "employee_skills", "project_skills" and
+                "project_statuses" mappings
+        """
+        with self._lock:
+            return {
+                "employee_skills": {
+                    email: frozenset(skills)
+                    for email, skills in self.employee_skills.items()
+                },
+                "project_skills": dict(self.project_skills),
+                "project_statuses": dict(self.project_statuses),
+            }
+
+    def skills_of_employee(self, email: str) -> List[str]:
+        """Get the canonical skills of an employee.
+
+        Args:
+            email (str): The email address of the employee
+
+        Returns:
+            List[str]: The sorted canonical skills
+        """
+        with self._lock:
+            return sorted(self.employee_skills.get(email, set()))
+
+    def employees_with_skill(self, skill: str) -> List[str]:
+        """Get the employees having a skill.
+
+        Args:
+            skill (str): The skill, in any known spelling
+
+        Returns:
+            List[str]: The sorted employee emails
+        """
+        with self._lock:
+            return sorted(self._employees_by_skill.get(_skill_key(skill), set()))
+
+    def projects_needing_skill(self, skill: str) -> List[str]:
+        """Get the projects needing a skill.
+
+        Args:
+            skill (str): The skill, in any known spelling
+
+        Returns:
+            List[str]: The sorted project names
+        """
+        with self._lock:
+            return sorted(self._projects_by_skill.get(_skill_key(skill), set()))
+
+    def trainings_covering_skill(self, skill: str) -> List[str]:
+        """Get the trainings covering a skill.
+
+        Args:
+            skill (str): The skill, in any known spelling
+
+        Returns:
+            List[str]: The sorted training names
+        """
+        with self._lock:
+            return sorted(self._trainings_by_skill.get(_skill_key(skill), set()))
+
+    def project_skill_gaps(
+        self,
+        email: str,
+        statuses: FrozenSet[str] = ACTIVE_PROJECT_STATUSES,
+    ) -> List[Dict[str, Any]]:
+        """Get the projects needing skills an employee lacks.
+
+        Args:
+            email (str): The email address of the employee
+            statuses (FrozenSet[str], optional): Statuses of the projects to consider
+
+        Returns:
+            List[Dict[str, Any]]: One entry per project with missing skills, holding the
+                project name, status, missing skills and matching skills. Projects the
+                employee is the closest to staffing come first.
+        """
+        with self._lock:
+            employee_skills = {
+                skill.lower() for skill in self.employee_skills.get(email, set())
+            }
+            gaps = []
+            for name, skills in self.project_skills.items():
+                if self.project_statuses[name] not in statuses:
+                    continue
+                missing = sorted(s for s in skills if s.lower() not in employee_skills)
+                if missing:
+                    gaps.append(
+                        {
+                            "project": name,
+                            "status": self.project_statuses[name],
+                            "missing_skills": missing,
+                            "matching_skills": sorted(set(skills) - set(missing)),
+                        }
+                    )
+        return sorted(
+            gaps,
+            key=lambda gap: (-len(gap["matching_skills"]), len(gap["missing_skills"])),
+        )
+
+
+_index: Optional[SkillIndex] = None
+_index_lock = threading.Lock()
+
+
+def _query_rows(columns: str, table_id: str, skills_column: str) -> List[Dict]:
+    table = query_arrow(
+        "SELECT {columns} FROM `{table_ref}`".format(
+            columns=columns, table_ref=get_table_ref(table_id)
+        )
+    )
+    return to_records(split_list_column(table, skills_column))
+
+
+def _build_index(index: SkillIndex) -> None:
+    profiles = _query_rows("email, skills", "employee_profiles", "skills")
+    projects = _query_rows(
+        "name, status, skills_needed", "project_portfolio", "skills_needed"
+    )
+    trainings = _query_rows("name, skills", "employee_trainings", "skills")
+    index.build(profiles, projects, trainings)
+    logging.info(
+        f"Built skill index from {len(profiles)} employees, {len(projects)} projects "
+        f"and {len(trainings)} trainings"
+    )
+
+
+def _on_rows_written(table_id: str, rows: List[Dict[str, Any]]) -> None:
+    """Update the skill index with the rows written to the data backend."""
+    if _index is None:
+        return
+    if table_id == "employee_trainings":
+        _index.add_trainings(rows)
+    elif table_id in ("employee_profiles", "project_portfolio"):
+        # Rare changes, rebuild on next use
+        _index.built_at = None
+
+
+def get_skill_index() -> SkillIndex:
+    """Get the shared skill index, building or refreshing it from the tables if needed.
+
+    Returns:
+        SkillIndex: The shared skill index
+    """
+    global _index
+    apply_shared_writes()
+    with _index_lock:
+        if _index is None:
+            _index = SkillIndex()
+            add_write_listener(_on_rows_written)
+        if _index.is_stale:
+            _build_index(_index)
+    return _index
+
+
+async def get_skill_index_async() -> SkillIndex:
+    """Async variant of get_skill_index building the index off the event loop.
+
+    Returns:
+        SkillIndex: The shared skill index
+    """
+    apply_shared_writes()
+    if _index is not None and not _index.is_stale:
+        return _index
+    return await asyncio.to_thread(get_skill_index)
+
+
+def reset_skill_index() -> None:
+    """Drop the shared skill index, so it is rebuilt from the tables on next use."""
+    with _index_lock:
+        if _index is not None:
+            _index.built_at = None
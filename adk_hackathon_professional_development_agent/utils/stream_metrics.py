@@ -0,0 +1,176 @@
+"""
+Stream Metrics Module.
+
+This module measures the latency perceived by the users of the streaming endpoint of
+the app, i.e. ADK's `/run_sse`. With `"streaming": true` in the request, the endpoint
+streams the partial model output of whichever agent is active, as well as the function
+call and function response events of the tools it calls, as Server-Sent Events. Users
+then see the first words of an answer long before the whole agent chain has finished.
+
+The `StreamLatencyMiddleware` ASGI middleware watches the events streamed back for each
+request, and records per agent (the author of the events):
+- `stream_time_to_first_token_seconds`: the time from the request to the first text
+  streamed by the agent, i.e. the perceived latency
+- `stream_time_to_last_token_seconds`: the time from the request to the last text
+  streamed by the agent, i.e. the total latency up to its answer
+- `stream_events_total`: the number of events streamed, by type (text, tool_call or
+  tool_response)
+
+The histograms are also labeled with the streaming mode of the request ("sse" or
+"none"), so that the perceived latency of streamed and non-streamed turns can be
+compared.
+
+Example:
+    ```python
+    from google.adk.cli.fast_api import get_fast_api_app
+    from utils.stream_metrics import StreamLatencyMiddleware
+
+    app = get_fast_api_app(agents_dir=..., web=True)
+    app.add_middleware(StreamLatencyMiddleware)
+    ```
+"""
+
+import json
+import logging
+import time
+from typing import Any, Dict, Optional
+
+from .metrics import registry
+
+STREAM_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 7.5, 10.0, 15.0, 20.0, 30.0, 60.0)
+
+_time_to_first_token = registry.histogram(
+    "stream_time_to_first_token_seconds",
+    "Time from the request to the first text streamed by an agent, by agent and mode",
+    ["agent", "mode"],
+    buckets=STREAM_BUCKETS,
+)
+_time_to_last_token = registry.histogram(
+    "stream_time_to_last_token_seconds",
+    "Time from the request to the last text streamed by an agent, by agent and mode",
+    ["agent", "mode"],
+    buckets=STREAM_BUCKETS,
+)
+_events = registry.counter(
+    "stream_events_total",
+    "Number of events streamed, by agent and type (text, tool_call or tool_response)",
+    ["agent", "type"],
+)
+
+
+class TurnLatencyTracker:
+    """Tracks the events streamed back for one request.
+
+    Args:
+        started (float): The `time.perf_counter()` time the request was received at
+    """
+
+    def __init__(self, started: float):
+        self.started = started
+        self.mode = "none"
+        self._request_body = b""
+        self._buffer = b""
+        self._first_token: Dict[str, float] = {}
+        self._last_token: Dict[str, float] = {}
+        self._finished = False
+
+    def add_request_body(self, body: bytes) -> None:
+        """Read the streaming mode out of the request body, as it is received.
+
+        Args:
+            body (bytes): The next chunk of the request body
+        """
+        self._request_body += body
+        try:
+            request = json.loads(self._request_body)
+        except ValueError:
+            return
+        if isinstance(request, dict) and request.get("streaming"):
+            self.mode = "sse"
+
+    def feed(self, body: bytes, now: Optional[float] = None) -> None:
+        """Process the next chunk of the streamed response.
+
+        Args:
+            body (bytes): The chunk of the response body
+            now (float, optional): The `time.perf_counter()` time the chunk was sent at
+        """
+        now = time.perf_counter() if now is None else now
+        self._buffer += body
+        *messages, self._buffer = self._buffer.split(b"\n\n")
+        for message in messages:
+            for line in message.splitlines():
+                if line.startswith(b"data:"):
+                    self._handle_event(line[len(b"data:") :].strip(), now)
+
+    def _handle_event(self, data: bytes, now: float) -> None:
+        try:
+            event: Dict[str, Any] = json.loads(data)
+        except ValueError:
+            logging.warning(f"Could not parse the streamed event {data[:100]!r}")
+            return
+        author = event.get("author")
+        parts = (event.get("content") or {}).get("parts") or []
+        if not author or author == "user":
+            return
+
+        for part in parts:
+            if part.get("text") and not part.get("thought"):
+                _events.inc(agent=author, type="text")
+                self._first_token.setdefault(author, now)
+                self._last_token[author] = now
+            elif part.get("functionCall"):
+                _events.inc(agent=author, type="tool_call")
+            elif part.get("functionResponse"):
+                _events.inc(agent=author, type="tool_response")
+
+    def finish(self) -> None:
+        """Record the latencies of the agents once the response is complete."""
+        if self._finished:
+            return
+        self._finished = True
+        for agent, first_token in self._first_token.items():
+            _time_to_first_token.observe(
+                first_token - self.started, agent=agent, mode=self.mode
+            )
+            _time_to_last_token.observe(
+                self._last_token[agent] - self.started, agent=agent, mode=self.mode
+            )
+
+
+class StreamLatencyMiddleware:
+    """ASGI middleware recording the streaming latencies of the agents.
+
+    Args:
+        app: The ASGI app
+        path (str, optional): The path of the streaming endpoint
+    """
+
+    def __init__(self, app, path: str = "/run_sse"):
+        self.app = app
+        self.path = path
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http" or scope["path"] != self.path:
+            await self.app(scope, receive, send)
+            return
+
+        tracker = TurnLatencyTracker(time.perf_counter())
+
+        async def receive_request():
+            message = await receive()
+            if message["type"] == "http.request":
+                tracker.add_request_body(message.get("body", b""))
+            return message
+
+        async def send_response(message) -> None:
+            await send(message)
+            if message["type"] == "http.response.body":
+                tracker.feed(message.get("body", b""))
+                if not message.get("more_body"):
+                    tracker.finish()
+
+        try:
+            await self.app(scope, receive_request, send_response)
+        finally:
+            tracker.finish()
@@ -0,0 +1,70 @@
+"""
+Table Schemas Module.
+
+This module declares the schemas of the tables used by the professional development
+system. The schemas mirror the ones used to load the CSV files under
+`input_data/bigquery` into BigQuery (see the README), and are shared by every data
+backend so that the BigQuery and the local backends expose the same columns and types.
+
+Attributes:
+    TABLE_SCHEMAS: Mapping of table IDs to an ordered list of (column name, BigQuery type)
+    TABLE_KEYS: Mapping of table IDs to the columns identifying a row, used by the bulk
+        loader to upsert rows
+    ROW_HASHES_TABLE_ID: The table in which the bulk loader stores the content hash of
+        every loaded row, to skip unchanged rows on the next load
+    ROW_HASHES_SCHEMA: The schema of the row hashes table
+    CSV_DELIMITER: The field delimiter used by the CSV files under `input_data/bigquery`
+
+Example:
+    ```python
+    from utils.table_schemas import TABLE_SCHEMAS
+
+    for column_name, column_type in TABLE_SCHEMAS["employee_trainings"]:
+        print(column_name, column_type)
+    ```
+"""
+
+from typing import Dict, List, Tuple
+
+CSV_DELIMITER = "|"
+
+TABLE_SCHEMAS: Dict[str, List[Tuple[str, str]]] = {
+    "employee_profiles": [
+        ("name", "STRING"),
+        ("email", "STRING"),
+        ("department", "STRING"),
+        ("role", "STRING"),
+        ("skills", "STRING"),
+    ],
+    "employee_trainings": [
+        ("email", "STRING"),
+        ("name", "STRING"),
+        ("description", "STRING"),
+        ("skills", "STRING"),
+        ("date", "DATE"),
+        ("cost_usd", "FLOAT"),
+        ("url", "STRING"),
+    ],
+    "project_portfolio": [
+        ("name", "STRING"),
+        ("customer", "STRING"),
+        ("customer_profile", "STRING"),
+        ("customer_location", "STRING"),
+        ("description", "STRING"),
+        ("skills_needed", "STRING"),
+        ("status", "STRING"),
+    ],
+}
+
+TABLE_KEYS: Dict[str, List[str]] = {
+    "employee_profiles": ["email"],
+    "employee_trainings": ["email", "name", "date"],
+    "project_portfolio": ["name"],
+}
+
+ROW_HASHES_TABLE_ID = "row_hashes"
+ROW_HASHES_SCHEMA: List[Tuple[str, str]] = [
+    ("table_id", "STRING"),
+    ("row_key", "STRING"),
+    ("row_hash", "STRING"),
+]
@@ -0,0 +1,168 @@
+"""
+Tool Memoization Module.
+
+This module memoizes tool results per conversation. Within a session, the same tools are
+called again and again with identical arguments, e.g. the employee profile with the same
+email on every turn, or the company information tool for the policy on every skills
+question.
+
+The `use_memoized_result` and `memoize_result` functions are registered as before/after
+tool callbacks on the agents, which makes them work the same for every tool type, i.e.
+FunctionTool, LongRunningFunctionTool and AgentTool. Results are stored in the session
+state, so they follow the session across agents and session services, keyed by the
+tool name and a hash of the canonical JSON form of the arguments.
+
+- Results expire after a per-tool TTL (TOOL_MEMO_TTL_SECONDS, defaulting to
+  TOOL_MEMO_DEFAULT_TTL_SECONDS)
+- Tools listed in TOOL_MEMO_EXCLUDED_TOOLS are never memoized, e.g. `transfer_to_agent`,
+  whose effect is the transfer rather than its result
+- A call to a tool listed in TOOL_MEMO_WRITE_TOOLS, e.g. `register_new_training`, drops
+  all memoized results of the session
+- Empty results are not memoized, as they cannot be returned by a before tool callback
+
+The number of calls saved is counted per session in the `tool_memo_saved_calls` state
+key, and per tool by the `tool_memo_hits_total` metric.
+
+Example:
+    ```python
+    from google.adk.agents import LlmAgent
+    from utils.tool_memoization import memoize_result, use_memoized_result
+
+    agent = LlmAgent(
+        ...,
+        before_tool_callback=[use_memoized_result],
+        after_tool_callback=[memoize_result],
+    )
+    ```
+"""
+
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from google.adk.tools import BaseTool, ToolContext
+
+from ..config import config
+from .metrics import registry
+
+MEMO_STATE_KEY = "tool_memo"
+SAVED_CALLS_STATE_KEY = "tool_memo_saved_calls"
+
+_lookups = registry.counter(
+    "tool_memo_lookups_total",
+    "Number of memoized tool result lookups, by tool and result (hit or miss)",
+    ["tool", "result"],
+)
+_hits = registry.counter(
+    "tool_memo_hits_total", "Number of tool calls saved by memoization", ["tool"]
+)
+_invalidations = registry.counter(
+    "tool_memo_invalidations_total",
+    "Number of times the memoized results of a session were dropped by a write tool",
+    ["tool"],
+)
+
+# Function call IDs answered from the memo, so that their results are not re-stored
+_served_call_ids = set()
+_served_call_ids_lock = threading.Lock()
+
+
+def memo_key(tool_name: str, args: Dict[str, Any]) -> str:
+    """Get the memo key of a tool call.
+
+    Args:
+        tool_name (str): The name of the tool
+        args (Dict[str, Any]): The tool call arguments
+
+    Returns:
+        str: The tool name and the hash of the canonical JSON form of the arguments
+    """
+    canonical = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+    return f"{tool_name}:{hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]}"
+
+
+def _is_memoized(tool_name: str) -> bool:
+    return (
+        config.tool_memo_enabled
+        and tool_name not in config.tool_memo_excluded_tool_names
+        and tool_name not in config.tool_memo_write_tool_names
+    )
+
+
+def _ttl_seconds(tool_name: str) -> float:
+    return config.tool_memo_ttls.get(tool_name, config.tool_memo_default_ttl_seconds)
+
+
+def use_memoized_result(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext
+) -> Optional[Any]:
+    """Before tool callback answering repeated tool calls from the session state.
+
+    Args:
+        tool (BaseTool): The tool about to be called
+        args (Dict[str, Any]): The tool call arguments
+        tool_context (ToolContext): The context of the tool call
+
+    Returns:
+        Optional[Any]: The memoized result, skipping the tool call, or None to call
+            the tool
+    """
+    if not _is_memoized(tool.name):
+        return None
+
+    entry = (tool_context.state.get(MEMO_STATE_KEY) or {}).get(
+        memo_key(tool.name, args)
+    )
+    if entry is None or time.time() - entry["stored_at"] > _ttl_seconds(tool.name):
+        _lookups.inc(tool=tool.name, result="miss")
+        return None
+
+    _lookups.inc(tool=tool.name, result="hit")
+    _hits.inc(tool=tool.name)
+    tool_context.state[SAVED_CALLS_STATE_KEY] = (
+        tool_context.state.get(SAVED_CALLS_STATE_KEY, 0) + 1
+    )
+    if tool_context.function_call_id:
+        with _served_call_ids_lock:
+            _served_call_ids.add(tool_context.function_call_id)
+    return entry["result"]
+
+
+def memoize_result(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> None:
+    """After tool callback storing tool results in the session state.
+
+    Calls to write tools drop all memoized results of the session instead.
+
+    Args:
+        tool (BaseTool): The tool that was called
+        args (Dict[str, Any]): The tool call arguments
+        tool_context (ToolContext): The context of the tool call
+        tool_response (Any): The tool response
+    """
+    with _served_call_ids_lock:
+        if tool_context.function_call_id in _served_call_ids:
+            _served_call_ids.discard(tool_context.function_call_id)
+            return
+
+    if tool.name in config.tool_memo_write_tool_names:
+        if tool_context.state.get(MEMO_STATE_KEY):
+            tool_context.state[MEMO_STATE_KEY] = {}
+            _invalidations.inc(tool=tool.name)
+        return
+    if not _is_memoized(tool.name) or not tool_response:
+        return
+
+    now = time.time()
+    # Drop expired results while the memo is rewritten anyway
+    memo = {
+        key: entry
+        for key, entry in (tool_context.state.get(MEMO_STATE_KEY) or {}).items()
+        if now - entry["stored_at"] <= _ttl_seconds(key.rsplit(":", 1)[0])
+    }
+    memo[memo_key(tool.name, args)] = {"result": tool_response, "stored_at": now}
+    # State values are only recorded as changed when they are reassigned
+    tool_context.state[MEMO_STATE_KEY] = memo
@@ -0,0 +1,258 @@
+"""
+Tool Output Shaping Module.
+
+This module shapes the results of the data tools before they reach the LLM context.
+Tool results stay in the session history, and are sent again with every later model
+call of the session, so every column and every long description the model does not
+need inflates the input tokens and the latency of the rest of the conversation.
+
+Each agent gets its own output shape per tool, which can:
+- Project the rows onto the columns the agent needs
+- Summarize long text fields to their first sentences, within TOOL_OUTPUT_MAX_TEXT_CHARS
+- Normalize column values, e.g. the project statuses typed by hand with stray spaces
+- Filter the rows, e.g. only the projects with a status listed in
+  TOOL_OUTPUT_PROJECT_STATUSES, or the trainings of the current year with
+  TOOL_OUTPUT_CURRENT_YEAR_TRAININGS_ONLY
+
+Only the context of the agent is shaped: the tool, the query cache and the tool memo
+still work on the full results. The `shape_tool_result` function is registered as
+after tool callback on the agents, and must come last, as it replaces the tool
+response. The bytes and the estimated tokens saved per call are recorded in the
+`tool_output_bytes_saved` and `tool_output_tokens_saved` metrics.
+
+Example:
+    ```python
+    from google.adk.agents import LlmAgent
+    from utils.tool_output_shaping import shape_tool_result
+
+    agent = LlmAgent(
+        ...,
+        after_tool_callback=[memoize_result, clear_tool_call_labels, shape_tool_result],
+    )
+    ```
+"""
+
+import datetime
+import json
+import math
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from google.adk.tools import BaseTool, ToolContext
+
+from ..config import config
+from .metrics import registry
+from .skill_index import normalize_project_status
+
+# Rough number of characters per token of English text and JSON
+CHARS_PER_TOKEN = 4
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+
+_bytes_saved = registry.histogram(
+    "tool_output_bytes_saved",
+    "Bytes removed from a tool result by shaping, by agent and tool",
+    ["agent", "tool"],
+    buckets=(0, 100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 100000),
+)
+_tokens_saved = registry.histogram(
+    "tool_output_tokens_saved",
+    "Estimated tokens removed from a tool result by shaping, by agent and tool",
+    ["agent", "tool"],
+    buckets=(0, 25, 100, 250, 500, 1000, 2500, 5000, 10000, 25000),
+)
+_output_tokens = registry.counter(
+    "tool_output_tokens_total",
+    "Estimated tokens of the tool results, by agent, tool and stage (raw or shaped)",
+    ["agent", "tool", "stage"],
+)
+
+
+@dataclass(frozen=True)
+class OutputShape:
+    """How the rows of a tool result are shaped for an agent.
+
+    Attributes:
+        columns (Tuple[str, ...], optional): The columns kept, all if None
+        text_columns (Tuple[str, ...]): The columns summarized when too long
+        max_text_chars (int, optional): The length text columns are summarized to,
+            TOOL_OUTPUT_MAX_TEXT_CHARS if None
+        normalizers (Dict[str, Callable[[Any], Any]]): The function normalizing the
+            values of each column, applied before the rows are filtered
+        row_filter (Callable[[Dict[str, Any]], bool], optional): Whether a row is kept
+    """
+
+    columns: Optional[Tuple[str, ...]] = None
+    text_columns: Tuple[str, ...] = field(default_factory=tuple)
+    max_text_chars: Optional[int] = None
+    normalizers: Dict[str, Callable[[Any], Any]] = field(default_factory=dict)
+    row_filter: Optional[Callable[[Dict[str, Any]], bool]] = None
+
+
+def _has_kept_project_status(project: Dict[str, Any]) -> bool:
+    statuses = config.tool_output_project_status_names
+    return not statuses or project.get("status") in {
+        normalize_project_status(status) for status in statuses
+    }
+
+
+def _is_kept_training(training: Dict[str, Any]) -> bool:
+    if not config.tool_output_current_year_trainings_only:
+        return True
+    return str(training.get("date", "")).startswith(str(datetime.date.today().year))
+
+
+# (agent name, tool name) -> output shape
+OUTPUT_SHAPES: Dict[Tuple[str, str], OutputShape] = {
+    ("CurrentOrFutureSkillsDevelopmentAgent", "get_project_portfolio"): OutputShape(
+        columns=(
+            "name",
+            "customer",
+            "customer_profile",
+            "description",
+            "skills_needed",
+            "status",
+        ),
+        text_columns=("description",),
+        normalizers={"status": normalize_project_status},
+        row_filter=_has_kept_project_status,
+    ),
+    (
+        "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent",
+        "get_employee_training_history",
+    ): OutputShape(
+        columns=("name", "description", "skills", "date", "cost_usd"),
+        text_columns=("description",),
+        max_text_chars=100,
+        row_filter=_is_kept_training,
+    ),
+}
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens of a text.
+
+    Args:
+        text (str): The text
+
+    Returns:
+        int: The estimated number of tokens
+    """
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def summarize_text(text: str, max_chars: int) -> str:
+    """Summarize a text to its first sentences within a length.
+
+    Args:
+        text (str): The text
+        max_chars (int): The maximum length of the summary
+
+    Returns:
+        str: The first sentences of the text fitting within max_chars, or the first
+            sentence cut at a word boundary and ending with "..."
+    """
+    if len(text) <= max_chars:
+        return text
+    summary = ""
+    for sentence in _SENTENCE_END.split(text):
+        candidate = f"{summary} {sentence}" if summary else sentence
+        if len(candidate) > max_chars:
+            break
+        summary = candidate
+    if summary:
+        return summary
+    return text[: max_chars - 3].rsplit(" ", 1)[0].rstrip(",;:") + "..."
+
+
+def shape_rows(rows: List[Dict[str, Any]], shape: OutputShape) -> List[Dict[str, Any]]:
+    """Shape the rows of a tool result.
+
+    Args:
+        rows (List[Dict[str, Any]]): The rows
+        shape (OutputShape): The output shape
+
+    Returns:
+        List[Dict[str, Any]]: The normalized, filtered and projected rows, with their
+            long text columns summarized
+    """
+    max_chars = shape.max_text_chars or config.tool_output_max_text_chars
+    shaped = []
+    for row in rows:
+        if shape.normalizers:
+            row = {
+                column: (
+                    shape.normalizers[column](value)
+                    if column in shape.normalizers
+                    else value
+                )
+                for column, value in row.items()
+            }
+        if shape.row_filter is not None and not shape.row_filter(row):
+            continue
+        if shape.columns is not None:
+            row = {column: row[column] for column in shape.columns if column in row}
+        else:
+            row = dict(row)
+        for column in shape.text_columns:
+            if isinstance(row.get(column), str):
+                row[column] = summarize_text(row[column], max_chars)
+        shaped.append(row)
+    return shaped
+
+
+def shape_output(agent_name: str, tool_name: str, result: Any) -> Any:
+    """Shape a tool result for an agent, recording the bytes and tokens saved.
+
+    Args:
+        agent_name (str): The name of the agent receiving the result
+        tool_name (str): The name of the tool
+        result (Any): The tool result
+
+    Returns:
+        Any: The shaped result, or the result unchanged if the agent has no output
+            shape for the tool
+    """
+    shape = OUTPUT_SHAPES.get((agent_name, tool_name))
+    if not config.tool_output_shaping_enabled or shape is None:
+        return result
+    if not isinstance(result, list) or not all(isinstance(r, dict) for r in result):
+        return result
+
+    shaped = shape_rows(result, shape)
+    raw_text = json.dumps(result, default=str)
+    shaped_text = json.dumps(shaped, default=str)
+    raw_tokens, shaped_tokens = estimate_tokens(raw_text), estimate_tokens(shaped_text)
+    labels = {"agent": agent_name, "tool": tool_name}
+    _bytes_saved.observe(
+        len(raw_text.encode("utf-8")) - len(shaped_text.encode("utf-8")), **labels
+    )
+    _tokens_saved.observe(raw_tokens - shaped_tokens, **labels)
+    _output_tokens.inc(raw_tokens, stage="raw", **labels)
+    _output_tokens.inc(shaped_tokens, stage="shaped", **labels)
+    return shaped
+
+
+def shape_tool_result(
+    tool: BaseTool, args: Dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> Optional[Any]:
+    """After tool callback shaping the tool result for the calling agent.
+
+    Args:
+        tool (BaseTool): The tool that was called
+        args (Dict[str, Any]): The tool call arguments
+        tool_context (ToolContext): The context of the tool call
+        tool_response (Any): The tool response
+
+    Returns:
+        Optional[Any]: The shaped result under "result", replacing the tool response,
+            or None to keep the tool response unchanged
+    """
+    if (tool_context.agent_name, tool.name) not in OUTPUT_SHAPES:
+        return None
+    shaped = shape_output(tool_context.agent_name, tool.name, tool_response)
+    if shaped is tool_response:
+        return None
+    # Wrapped the way ADK wraps list results, also keeping filtered out results, as
+    # empty results of long running tools are not sent to the model
+    return {"result": shaped}
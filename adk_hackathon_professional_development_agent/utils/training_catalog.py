@@ -0,0 +1,369 @@
+"""
+Training Catalog Module.
+
+This module provides the local catalog of training offerings used to answer training
+requests without a live web search. The TrainingFinderAgent runs a Google search and an
+LLM summary for every request, while the same skills are searched over and over.
+
+The catalog keeps structured offerings, i.e. name, description, skills, start date, cost
+in USD and URL, collected from:
+- The `employee_trainings` table, loaded on first use and updated with every newly
+  registered training
+- Past web searches, cached per requested skill set
+
+Offerings are indexed by canonical skill (see `utils.skill_index`), each skill's
+offerings being kept sorted by cost, so that "trainings for these skills under this
+budget" requests are answered with a few lookups.
+
+Cached web search results:
+- Are served as long as they are younger than TRAINING_SEARCH_CACHE_TTL_SECONDS
+- Are due for a refresh in the background once older than
+  TRAINING_SEARCH_REFRESH_SECONDS, while still being served
+- Are persisted with the catalog at TRAINING_CATALOG_PATH, surviving restarts
+
+Example:
+    ```python
+    from utils.training_catalog import get_training_catalog_async
+
+    catalog = await get_training_catalog_async()
+    offerings = catalog.find(["BigQuery", "GCP"], max_cost_usd=500)
+    ```
+"""
+
+import asyncio
+import bisect
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..config import config
+from .arrow_results import format_date_column, split_list_column, to_records
+from .bigquery_operations import (
+    add_write_listener,
+    apply_shared_writes,
+    get_table_ref,
+    query_arrow,
+)
+from .skill_index import SKILL_ALIASES, canonicalize_skill, canonicalize_skills
+
+OFFERING_FIELDS = ("name", "description", "skills", "date", "cost_usd", "url")
+
+
+def skill_set_key(skills: Iterable[str]) -> str:
+    """Get the cache key of a set of skills, independent of their spelling and order.
+
+    Args:
+        skills (Iterable[str]): The skills
+
+    Returns:
+        str: The sorted, lowercase canonical skills joined by commas
+    """
+    return ",".join(sorted(skill.lower() for skill in canonicalize_skills(skills)))
+
+
+def _normalize_offering(offering: Dict[str, Any], source: str) -> Dict[str, Any]:
+    skills = offering.get("skills") or []
+    if isinstance(skills, str):
+        skills = skills.split(",")
+    cost = offering.get("cost_usd")
+    try:
+        cost = float(cost) if cost not in (None, "") else None
+    except (TypeError, ValueError):
+        cost = None
+    return {
+        "name": str(offering.get("name") or "").strip(),
+        "description": str(offering.get("description") or "").strip(),
+        "skills": sorted(canonicalize_skills(skills)),
+        "date": str(offering.get("date") or ""),
+        "cost_usd": cost,
+        "url": str(offering.get("url") or "").strip(),
+        "source": source,
+    }
+
+
+def _cost_or_infinity(offering: Dict[str, Any]) -> float:
+    """Cost of an offering, unknown costs sorting after every budget."""
+    cost = offering["cost_usd"]
+    return float("inf") if cost is None else cost
+
+
+class TrainingCatalog:
+    """Catalog of training offerings indexed by skill and cost, with a web search cache.
+
+    Args:
+        refresh_seconds (float): Age after which cached web searches are refreshed
+        ttl_seconds (float): Age after which cached web searches are no longer served
+    """
+
+    def __init__(self, refresh_seconds: float, ttl_seconds: float):
+        self.refresh_seconds = refresh_seconds
+        self.ttl_seconds = ttl_seconds
+        # Offering key (URL, or lowercase name without URL) -> offering
+        self.offerings: Dict[str, Dict[str, Any]] = {}
+        # Lowercase canonical skill -> (cost, offering key), sorted by cost
+        self._by_skill: Dict[str, List[Tuple[float, str]]] = defaultdict(list)
+        # Skill set key -> (offering keys, searched at as epoch seconds)
+        self._searches: Dict[str, Tuple[List[str], float]] = {}
+        self._skill_pattern: Optional[re.Pattern] = None
+        self._lock = threading.RLock()
+
+    def add_offerings(
+        self, offerings: Iterable[Dict[str, Any]], source: str
+    ) -> List[str]:
+        """Add offerings to the catalog, replacing offerings with the same URL or name.
+
+        Args:
+            offerings (Iterable[Dict[str, Any]]): Offerings with the OFFERING_FIELDS,
+                skills being a list or a comma-separated string
+            source (str): Where the offerings come from, e.g. "employee_trainings"
+
+        Returns:
+            List[str]: The keys of the added offerings
+        """
+        keys = []
+        with self._lock:
+            for offering in offerings:
+                offering = _normalize_offering(offering, source)
+                if not offering["name"]:
+                    continue
+                key = offering["url"] or offering["name"].lower()
+                if key in self.offerings:
+                    self._unindex(key)
+                self.offerings[key] = offering
+                entry = (_cost_or_infinity(offering), key)
+                for skill in offering["skills"]:
+                    bisect.insort(self._by_skill[skill.lower()], entry)
+                keys.append(key)
+            self._skill_pattern = None
+        return keys
+
+    def _unindex(self, key: str) -> None:
+        for skill in self.offerings[key]["skills"]:
+            entries = self._by_skill[skill.lower()]
+            entries[:] = [entry for entry in entries if entry[1] != key]
+
+    def find(
+        self,
+        skills: Iterable[str],
+        max_cost_usd: Optional[float] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """Find the offerings covering skills, within a budget.
+
+        Args:
+            skills (Iterable[str]): The skills, in any spelling
+            max_cost_usd (float, optional): The maximum cost of an offering
+            limit (int, optional): The maximum number of offerings to return
+
+        Returns:
+            List[Dict[str, Any]]: The offerings covering the most requested skills
+                first, the cheapest first among these
+        """
+        matches: Dict[str, int] = defaultdict(int)
+        with self._lock:
+            for skill in canonicalize_skills(skills):
+                entries = self._by_skill.get(skill.lower(), [])
+                if max_cost_usd is not None:
+                    cutoff = bisect.bisect_right(
+                        entries, max_cost_usd, key=lambda entry: entry[0]
+                    )
+                    entries = entries[:cutoff]
+                for _, key in entries:
+                    matches[key] += 1
+            ranked = sorted(
+                matches,
+                key=lambda key: (
+                    -matches[key],
+                    _cost_or_infinity(self.offerings[key]),
+                    self.offerings[key]["name"],
+                ),
+            )
+            return [dict(self.offerings[key]) for key in ranked[:limit]]
+
+    def store_search(
+        self,
+        skills: Iterable[str],
+        offerings: Iterable[Dict[str, Any]],
+        searched_at: Optional[float] = None,
+    ) -> None:
+        """Cache the offerings found by a web search for a skill set.
+
+        Args:
+            skills (Iterable[str]): The searched skills
+            offerings (Iterable[Dict[str, Any]]): The offerings found
+            searched_at (float, optional): When the search ran, as epoch seconds
+        """
+        with self._lock:
+            keys = self.add_offerings(offerings, source="web_search")
+            self._searches[skill_set_key(skills)] = (
+                keys,
+                time.time() if searched_at is None else searched_at,
+            )
+
+    def cached_search(
+        self, skills: Iterable[str], max_cost_usd: Optional[float] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], bool]]:
+        """Get the cached web search results of a skill set.
+
+        Args:
+            skills (Iterable[str]): The skills
+            max_cost_usd (float, optional): The maximum cost of an offering
+
+        Returns:
+            Optional[Tuple[List[Dict[str, Any]], bool]]: The cached offerings within the
+                budget, and whether the search is due for a refresh, or None if the
+                skill set was not searched within the TTL
+        """
+        with self._lock:
+            cached = self._searches.get(skill_set_key(skills))
+            if cached is None:
+                return None
+            keys, searched_at = cached
+            age = time.time() - searched_at
+            if age > self.ttl_seconds:
+                return None
+            offerings = [
+                dict(self.offerings[key])
+                for key in keys
+                if key in self.offerings
+                and (
+                    max_cost_usd is None
+                    or _cost_or_infinity(self.offerings[key]) <= max_cost_usd
+                )
+            ]
+            return offerings, age > self.refresh_seconds
+
+    def skills_in_text(self, text: str) -> List[str]:
+        """Find the catalog skills mentioned in a text, in any known spelling.
+
+        Args:
+            text (str): The text, e.g. a training request
+
+        Returns:
+            List[str]: The canonical skills mentioned
+        """
+        with self._lock:
+            if self._skill_pattern is None:
+                spellings = set(self._by_skill) | {
+                    alias
+                    for alias, skill in SKILL_ALIASES.items()
+                    if skill.lower() in self._by_skill
+                }
+                self._skill_pattern = re.compile(
+                    r"(?<![\w/.])("
+                    + "|".join(
+                        re.escape(spelling)
+                        for spelling in sorted(spellings, key=len, reverse=True)
+                    )
+                    + r")(?![\w/])"
+                    if spellings
+                    else r"(?!)"
+                )
+            pattern = self._skill_pattern
+        return sorted(
+            {canonicalize_skill(match) for match in pattern.findall(text.lower())}
+        )
+
+    def save(self, path: str) -> None:
+        """Persist the web search offerings and cached searches.
+
+        Args:
+            path (str): The path of the JSON file
+        """
+        with self._lock:
+            searches = {
+                skill_set: {
+                    "searched_at": searched_at,
+                    "offerings": [
+                        self.offerings[key] for key in keys if key in self.offerings
+                    ],
+                }
+                for skill_set, (keys, searched_at) in self._searches.items()
+            }
+        # Per process, as the worker processes of the host share the file
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as file:
+            json.dump({"searches": searches}, file)
+        os.replace(temporary_path, path)
+
+    def load(self, path: str) -> None:
+        """Load the web search offerings and cached searches persisted by save.
+
+        Args:
+            path (str): The path of the JSON file
+        """
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as file:
+            searches = json.load(file).get("searches", {})
+        for skill_set, search in searches.items():
+            self.store_search(
+                skill_set.split(","), search["offerings"], search["searched_at"]
+            )
+
+
+_catalog: Optional[TrainingCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def _on_rows_written(table_id: str, rows: List[Dict[str, Any]]) -> None:
+    """Add newly registered trainings to the catalog."""
+    if _catalog is not None and table_id == "employee_trainings":
+        _catalog.add_offerings(rows, source="employee_trainings")
+
+
+def get_training_catalog() -> TrainingCatalog:
+    """Get the shared training catalog, building it on first use.
+
+    Returns:
+        TrainingCatalog: The shared training catalog
+    """
+    global _catalog
+    apply_shared_writes()
+    with _catalog_lock:
+        if _catalog is None:
+            catalog = TrainingCatalog(
+                refresh_seconds=config.training_search_refresh_seconds,
+                ttl_seconds=config.training_search_cache_ttl_seconds,
+            )
+            table = query_arrow(
+                "SELECT {columns} FROM `{table_ref}`".format(
+                    columns=", ".join(OFFERING_FIELDS),
+                    table_ref=get_table_ref("employee_trainings"),
+                )
+            )
+            trainings = to_records(
+                split_list_column(format_date_column(table, "date"), "skills")
+            )
+            catalog.add_offerings(trainings, source="employee_trainings")
+            catalog.load(config.training_catalog_path)
+            logging.info(
+                f"Built training catalog of {len(catalog.offerings)} offerings"
+            )
+            add_write_listener(_on_rows_written)
+            _catalog = catalog
+        return _catalog
+
+
+async def get_training_catalog_async() -> TrainingCatalog:
+    """Async variant of get_training_catalog building the catalog off the event loop.
+
+    Returns:
+        TrainingCatalog: The shared training catalog
+    """
+    if _catalog is not None:
+        apply_shared_writes()
+        return _catalog
+    return await asyncio.to_thread(get_training_catalog)
+
+
+def reset_training_catalog() -> None:
+    """Drop the shared training catalog, so it is rebuilt on next use."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
@@ -0,0 +1,237 @@
+"""
+Warm-up Module.
+
+This module warms up a worker process of the FastAPI app before it reports ready, so
+that the first requests after a cold start do not pay for connection setup and cache
+misses:
+
+1. The data backend, its thread pool and the write pipeline are created
+2. Concurrently, a canary query is sent to the data backend, the skill index, the
+   training catalog, the intent router and the local document index are loaded, and
+   the API clients of the models of the agents are created
+
+The `warmup_lifespan` function is passed as lifespan to the FastAPI app. It warms up in
+the background, retrying every WARMUP_RETRY_SECONDS until every step succeeds, while
+the shared `readiness` state reports the progress to the readiness endpoint of
+`main.py`. The duration of each step is recorded in the `warmup_step_seconds` metric.
+
+Example:
+    ```python
+    from google.adk.cli.fast_api import get_fast_api_app
+    from utils.warmup import readiness, warmup_lifespan
+
+    app = get_fast_api_app(agents_dir=..., web=True, lifespan=warmup_lifespan)
+    ready = readiness.is_ready
+    ```
+"""
+
+import asyncio
+import contextlib
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from ..config import config
+from . import bigquery_operations
+from .document_index import get_document_index
+from .intent_router import get_intent_router
+from .metrics import registry
+from .model_call_policy import PolicyLlm
+from .skill_index import get_skill_index
+from .training_catalog import get_training_catalog
+
+CANARY_MESSAGE = "What is my remaining training budget?"
+
+_step_duration = registry.histogram(
+    "warmup_step_seconds", "Duration of the warm-up steps, by step", ["step"]
+)
+_step_failures = registry.counter(
+    "warmup_failures_total", "Number of failed warm-up steps, by step", ["step"]
+)
+
+WarmupStep = Tuple[str, Callable[[], Any]]
+
+
+class Readiness:
+    """Progress of the warm-up of the worker process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the progress, e.g. before warming up again."""
+        with self._lock:
+            self.status = "starting"
+            self.error: Optional[str] = None
+            self.step_seconds: Dict[str, float] = {}
+            self._started = time.monotonic()
+            self.warmup_seconds: Optional[float] = None
+
+    def step_done(self, step: str, seconds: float) -> None:
+        with self._lock:
+            self.step_seconds[step] = round(seconds, 3)
+
+    def set_ready(self) -> None:
+        with self._lock:
+            self.status = "ready"
+            self.error = None
+            self.warmup_seconds = round(time.monotonic() - self._started, 3)
+
+    def set_failed(self, error: str) -> None:
+        with self._lock:
+            self.status = "failed"
+            self.error = error
+
+    @property
+    def is_ready(self) -> bool:
+        """bool: Whether the warm-up is done."""
+        return self.status == "ready"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get the progress as the body of the readiness endpoint.
+
+        Returns:
+            Dict[str, Any]: The status ("starting", "ready" or "failed"), the duration
+                of the warm-up and of its completed steps, and the error of the last
+                failed attempt
+        """
+        with self._lock:
+            return {
+                "status": self.status,
+                "warmup_seconds": self.warmup_seconds,
+                "steps": dict(self.step_seconds),
+                "error": self.error,
+            }
+
+
+readiness = Readiness()
+
+
+def _canary_query() -> None:
+    bigquery_operations.query_multiple_rows(
+        "SELECT email FROM `{table_ref}` LIMIT 1".format(
+            table_ref=bigquery_operations.get_table_ref("employee_profiles")
+        )
+    )
+
+
+def _warm_intent_router() -> None:
+    get_intent_router().predict(CANARY_MESSAGE)
+
+
+def _open_model_clients() -> None:
+    # Imported here, as the agents import the modules of this package
+    from google.adk.tools.agent_tool import AgentTool
+
+    from ..agent import root_agent
+
+    agents, seen = [root_agent], set()
+    while agents:
+        agent = agents.pop()
+        if agent.name in seen:
+            continue
+        seen.add(agent.name)
+        if isinstance(getattr(agent, "model", None), PolicyLlm):
+            agent.model.open_clients()
+        agents.extend(agent.sub_agents)
+        agents.extend(
+            tool.agent
+            for tool in getattr(agent, "tools", [])
+            if isinstance(tool, AgentTool)
+        )
+
+
+def get_warmup_steps() -> Tuple[List[WarmupStep], List[WarmupStep]]:
+    """Get the warm-up steps of the configuration.
+
+    Returns:
+        Tuple[List[WarmupStep], List[WarmupStep]]: The (name, function) steps run
+            first, one after the other, and the steps run concurrently afterwards
+    """
+    concurrent_steps = [
+        ("canary_query", _canary_query),
+        ("skill_index", get_skill_index),
+        ("training_catalog", get_training_catalog),
+        ("model_clients", _open_model_clients),
+    ]
+    if config.intent_router_enabled:
+        concurrent_steps.append(("intent_router", _warm_intent_router))
+    if config.company_information_backend == "local_index":
+        concurrent_steps.append(("document_index", get_document_index))
+    return [("data_backend", bigquery_operations.open_connections)], concurrent_steps
+
+
+async def _run_step(step: WarmupStep) -> None:
+    name, function = step
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(function)
+    except Exception:
+        _step_failures.inc(step=name)
+        raise
+    seconds = time.perf_counter() - started
+    _step_duration.observe(seconds, step=name)
+    readiness.step_done(name, seconds)
+
+
+async def warm_up(
+    steps: Optional[Tuple[List[WarmupStep], List[WarmupStep]]] = None,
+) -> bool:
+    """Run the warm-up steps, updating the readiness state.
+
+    Args:
+        steps (Tuple[List[WarmupStep], List[WarmupStep]], optional): The sequential
+            and concurrent steps, those of get_warmup_steps if None
+
+    Returns:
+        bool: Whether every step succeeded
+    """
+    sequential_steps, concurrent_steps = steps or get_warmup_steps()
+    readiness.reset()
+    try:
+        for step in sequential_steps:
+            await _run_step(step)
+        await asyncio.gather(*(_run_step(step) for step in concurrent_steps))
+    except Exception as error:
+        logging.exception("Warm-up failed")
+        readiness.set_failed(f"{type(error).__name__}: {error}")
+        return False
+    readiness.set_ready()
+    logging.info(f"Warmed up in {readiness.warmup_seconds}s")
+    return True
+
+
+async def warm_up_until_ready(
+    steps: Optional[Tuple[List[WarmupStep], List[WarmupStep]]] = None,
+) -> None:
+    """Run the warm-up steps until they all succeed, every WARMUP_RETRY_SECONDS.
+
+    Args:
+        steps (Tuple[List[WarmupStep], List[WarmupStep]], optional): The sequential
+            and concurrent steps, those of get_warmup_steps if None
+    """
+    while not await warm_up(steps):
+        await asyncio.sleep(config.warmup_retry_seconds)
+
+
+@contextlib.asynccontextmanager
+async def warmup_lifespan(app: Any) -> AsyncIterator[None]:
+    """Lifespan of the FastAPI app warming up the worker process in the background.
+
+    Args:
+        app (Any): The FastAPI app
+    """
+    if not config.warmup_enabled:
+        readiness.set_ready()
+        yield
+        return
+
+    task = asyncio.create_task(warm_up_until_ready())
+    try:
+        yield
+    finally:
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
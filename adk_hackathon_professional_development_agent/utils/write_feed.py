@@ -0,0 +1,141 @@
+"""
+Write Feed Module.
+
+This module provides the write feed shared by the worker processes serving the app on
+a host. Each worker caches query results and keeps in-memory structures derived from
+the tables, e.g. the budget ledger, the skill index and the training catalog. A row
+written by one worker would otherwise only show up in the others once their caches
+expire or their structures are rebuilt, e.g. the training registered in one turn of a
+conversation would be missing from the remaining budget computed by the worker serving
+the next turn.
+
+The feed is an append-only JSON lines file next to the write-ahead logs, to which every
+worker appends the rows it wrote to the data backend. Before answering a query, each
+worker reads the rows appended by the others since its last read, with a single stat
+call when there are none, and applies them like its own writes. Appends are serialized
+with an exclusive lock on the file. Once the feed outgrows its maximum size, the next
+append empties it and increments the generation stored at its start, and workers
+noticing the new generation, having possibly missed rows, drop their cached query
+results instead.
+
+Example:
+    ```python
+    from utils.write_feed import WriteFeed
+
+    feed = WriteFeed("/var/lib/agent/write_feed.jsonl")
+    feed.publish("employee_trainings", [training_data])
+
+    # In another worker process
+    rows = feed.poll()
+    if rows is None:
+        ...  # Rows were missed, drop the cached results
+    for table_id, row in rows:
+        ...
+    ```
+"""
+
+import fcntl
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+# The feed starts with its generation, incremented whenever it is emptied
+_HEADER_FORMAT = "{:020d}\n"
+_HEADER_BYTES = len(_HEADER_FORMAT.format(0))
+
+
+class WriteFeed:
+    """Append-only JSON lines file sharing the written rows between worker processes.
+
+    Args:
+        path (str): Path of the feed file, shared by the worker processes
+        max_bytes (int, optional): The size past which the next append empties the feed
+    """
+
+    def __init__(self, path: str, max_bytes: int = 16 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a+b")
+        self._lock = threading.Lock()
+        fcntl.flock(self._file, fcntl.LOCK_EX)
+        try:
+            if os.fstat(self._file.fileno()).st_size == 0:
+                self._write_header(0)
+                self._file.flush()
+            self._generation = self._read_generation()
+            # Rows appended before this process started are already in the data backend
+            self._offset = os.fstat(self._file.fileno()).st_size
+        finally:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def _read_generation(self) -> Optional[int]:
+        header = os.pread(self._file.fileno(), _HEADER_BYTES, 0)
+        if len(header) < _HEADER_BYTES:
+            return None
+        return int(header)
+
+    def _write_header(self, generation: int) -> None:
+        self._file.write(_HEADER_FORMAT.format(generation).encode("utf-8"))
+
+    def publish(self, table_id: str, rows: List[Dict[str, Any]]) -> None:
+        """Append rows written to the data backend for the other worker processes.
+
+        Args:
+            table_id (str): The ID of the table without project and dataset
+            rows (List[Dict[str, Any]]): The written rows
+        """
+        lines = "".join(
+            json.dumps({"pid": os.getpid(), "table_id": table_id, "row": row}) + "\n"
+            for row in rows
+        )
+        with self._lock:
+            fcntl.flock(self._file, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._file.fileno()).st_size > self.max_bytes:
+                    generation = self._read_generation() or 0
+                    self._file.truncate(0)
+                    self._write_header(generation + 1)
+                self._file.write(lines.encode("utf-8"))
+                self._file.flush()
+            finally:
+                fcntl.flock(self._file, fcntl.LOCK_UN)
+
+    def poll(self) -> Optional[List[Tuple[str, Dict[str, Any]]]]:
+        """Read the rows appended by the other worker processes since the last poll.
+
+        Returns:
+            Optional[List[Tuple[str, Dict[str, Any]]]]: The (table ID, row) pairs, or
+                None if the feed was emptied since the last poll, so rows may have been
+                missed
+        """
+        with self._lock:
+            size = os.fstat(self._file.fileno()).st_size
+            if size == self._offset:
+                return []
+            generation = self._read_generation()
+            data = os.pread(
+                self._file.fileno(), max(size - self._offset, 0), self._offset
+            )
+            if generation is None:
+                # Being emptied, read on the next poll
+                return []
+            if generation != self._generation or self._read_generation() != generation:
+                self._generation = self._read_generation()
+                self._offset = _HEADER_BYTES
+                return None
+            # A line being appended is read on the next poll
+            complete = data[: data.rfind(b"\n") + 1]
+            self._offset += len(complete)
+
+        rows = []
+        for line in complete.decode("utf-8").splitlines():
+            record = json.loads(line)
+            if record["pid"] != os.getpid():
+                rows.append((record["table_id"], record["row"]))
+        return rows
+
+    def close(self) -> None:
+        """Close the feed file."""
+        self._file.close()
@@ -0,0 +1,417 @@
+"""
+Write Pipeline Module.
+
+This module provides the buffered write pipeline used by the BigQuery operations utility
+module. Starting a load job per registered training takes seconds and runs into the
+daily load-job quota, so rows are instead:
+
+1. Appended to a local append-only write-ahead log (WAL) and fsynced, which makes an
+   accepted row durable across crashes
+2. Acknowledged immediately with a registration ID
+3. Buffered and flushed in micro-batches, once the buffer holds `max_batch_size` rows
+   or every `flush_interval_seconds`, through the data backend (streaming inserts for
+   BigQuery)
+
+Once a batch is written, a commit record is appended to the WAL. On startup, rows
+appended but never committed are replayed. The registration ID is passed to the backend
+as the row's insert ID, so BigQuery deduplicates rows replayed after a crash.
+
+A batch that fails to be written is split in halves, down to single rows, so that the
+rows the backend rejects do not hold back the others. Failed rows are retried with
+exponential backoff, and moved to a dead-letter log next to the WAL after `max_attempts`
+attempts (`write_ahead_log.dead_letter.jsonl` for `write_ahead_log.jsonl`), from which
+they can be inspected and loaded again once fixed. The `on_dead_letter` callback is
+notified of each dead-lettered row, e.g. to stop counting it as accepted.
+
+When several worker processes serve the app, each one claims a WAL of its own with
+`claim_log_path`, so that no two processes append to or replay the same log. A worker
+replacing a crashed one claims the log it left behind and replays its rows.
+
+Example:
+    ```python
+    from utils.write_pipeline import BufferedWriter
+
+    writer = BufferedWriter(
+        write_rows=lambda table_id, rows, row_ids: backend.insert_rows(table_id, rows, row_ids),
+        wal_path="/var/lib/agent/writes.wal",
+    )
+    registration_id = writer.submit("employee_trainings", training_data)
+    writer.close()  # Flushes the remaining rows
+    ```
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple
+
+from .metrics import registry
+
+# (registration ID, table ID, row)
+_BufferedRow = Tuple[str, str, Dict[str, Any]]
+# Path of the first log -> claimed log path and its lock file, kept open until exit
+_claimed_logs: Dict[str, Tuple[str, IO]] = {}
+
+_dead_lettered_rows = registry.counter(
+    "write_rows_dead_lettered_total",
+    "Rows moved to the dead-letter log after failing every write attempt, by table",
+    ["table"],
+)
+
+
+def claim_log_path(path: str, max_logs: int = 64) -> str:
+    """Claim a write-ahead log path not used by another process.
+
+    The first log is `path` itself, the next ones are numbered, e.g.
+    "write_ahead_log.1.jsonl". A log stays claimed, through an exclusive lock on its
+    lock file, until the claiming process exits.
+
+    Args:
+        path (str): The path of the first log
+        max_logs (int, optional): The maximum number of logs
+
+    Returns:
+        str: The log path claimed by this process
+
+    Raises:
+        RuntimeError: If all the logs are claimed
+    """
+    if path in _claimed_logs:
+        return _claimed_logs[path][0]
+    root, extension = os.path.splitext(path)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    for number in range(max_logs):
+        log_path = f"{root}.{number}{extension}" if number else path
+        lock_file = open(f"{log_path}.lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            continue
+        _claimed_logs[path] = (log_path, lock_file)
+        return log_path
+    raise RuntimeError(f"All {max_logs} write-ahead logs of {path} are claimed")
+
+
+class WriteAheadLog:
+    """Append-only JSON lines log of accepted and committed rows.
+
+    Args:
+        path (str): Path of the log file
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _write(self, records: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, registration_id: str, table_id: str, row: Dict[str, Any]) -> None:
+        """Durably record an accepted row."""
+        self._write(
+            [{"op": "append", "id": registration_id, "table_id": table_id, "row": row}]
+        )
+
+    def commit(self, registration_ids: List[str]) -> None:
+        """Durably record that rows were written to the data backend."""
+        self._write([{"op": "commit", "ids": registration_ids}])
+
+    def pending(self) -> List[_BufferedRow]:
+        """Read the rows appended to the log but never committed.
+
+        Returns:
+            List[_BufferedRow]: The uncommitted rows in append order
+        """
+        appended: Dict[str, _BufferedRow] = {}
+        with open(self.path, encoding="utf-8") as log_file:
+            for line in log_file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn write at the end of the log, the row was never acknowledged
+                    logging.warning(
+                        f"Skipping corrupt write-ahead log record: {line!r}"
+                    )
+                    continue
+                if record["op"] == "append":
+                    appended[record["id"]] = (
+                        record["id"],
+                        record["table_id"],
+                        record["row"],
+                    )
+                else:
+                    for registration_id in record["ids"]:
+                        appended.pop(registration_id, None)
+        return list(appended.values())
+
+    def compact(self) -> List[_BufferedRow]:
+        """Rewrite the log keeping only the uncommitted rows.
+
+        Returns:
+            List[_BufferedRow]: The uncommitted rows in append order
+        """
+        pending = self.pending()
+        self._file.close()
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w", encoding="utf-8") as log_file:
+            for registration_id, table_id, row in pending:
+                record = {
+                    "op": "append",
+                    "id": registration_id,
+                    "table_id": table_id,
+                    "row": row,
+                }
+                log_file.write(json.dumps(record) + "\n")
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        os.replace(temporary_path, self.path)
+        self._file = open(self.path, "a", encoding="utf-8")
+        return pending
+
+    def truncate(self) -> None:
+        """Empty the log, once every appended row is committed."""
+        self._file.truncate(0)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BufferedWriter:
+    """Buffers rows in a write-ahead log and writes them in micro-batches.
+
+    Args:
+        write_rows (Callable[[str, List[Dict[str, Any]], List[str]], None]): Writes
+            a batch of rows, with their registration IDs, to a table
+        wal_path (str): Path of the write-ahead log file
+        max_batch_size (int, optional): Flush once the buffer holds this many rows
+        flush_interval_seconds (float, optional): Flush the buffer at least this often
+        on_flush (Callable[[str, List[Dict[str, Any]]], None], optional): Called with
+            the table ID and the rows after each successfully written batch
+        max_attempts (int, optional): Attempts at writing a row before it is moved to
+            the dead-letter log. The n-th retry waits flush_interval_seconds * 2^(n-1).
+        dead_letter_path (str, optional): Path of the dead-letter log, the WAL path
+            with a ".dead_letter" suffix by default
+        on_dead_letter (Callable[[str, Dict[str, Any]], None], optional): Called with
+            the table ID and the row after each row moved to the dead-letter log
+    """
+
+    def __init__(
+        self,
+        write_rows: Callable[[str, List[Dict[str, Any]], List[str]], None],
+        wal_path: str,
+        max_batch_size: int = 500,
+        flush_interval_seconds: float = 1.0,
+        on_flush: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+        max_attempts: int = 10,
+        dead_letter_path: Optional[str] = None,
+        on_dead_letter: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    ):
+        self._write_rows = write_rows
+        self._on_flush = on_flush
+        self._on_dead_letter = on_dead_letter
+        self.max_batch_size = max_batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.max_attempts = max_attempts
+        root, extension = os.path.splitext(wal_path)
+        self.dead_letter_path = dead_letter_path or f"{root}.dead_letter{extension}"
+
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wal = WriteAheadLog(wal_path)
+        self._buffer: List[_BufferedRow] = self._wal.compact()
+        # Rows taken from the buffer by the flush in progress
+        self._writing: List[_BufferedRow] = []
+        # Failed write attempts and monotonic retry time, by registration ID
+        self._attempts: Dict[str, int] = {}
+        self._retry_at: Dict[str, float] = {}
+        if self._buffer:
+            logging.info(
+                f"Replaying {len(self._buffer)} uncommitted rows from the write-ahead log"
+            )
+
+        self._flush_requested = threading.Event()
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="buffered-writer", daemon=True
+        )
+        self._thread.start()
+
+    def submit(self, table_id: str, row: Dict[str, Any]) -> str:
+        """Durably accept a row for writing.
+
+        Args:
+            table_id (str): The ID of the target table without project and dataset
+            row (Dict[str, Any]): The row to write
+
+        Returns:
+            str: The registration ID of the accepted row
+
+        Raises:
+            RuntimeError: If the writer is closed
+        """
+        if self._closed.is_set():
+            raise RuntimeError("The buffered writer is closed")
+        registration_id = str(uuid.uuid4())
+        with self._lock:
+            self._wal.append(registration_id, table_id, row)
+            self._buffer.append((registration_id, table_id, row))
+            if len(self._buffer) >= self.max_batch_size:
+                self._flush_requested.set()
+        return registration_id
+
+    @property
+    def pending_rows(self) -> int:
+        """int: The number of accepted rows not yet written."""
+        with self._lock:
+            return len(self._buffer)
+
+    def unwritten_rows(self, table_ids: Set[str]) -> List[_BufferedRow]:
+        """Get the accepted rows of tables not yet written, or being written.
+
+        Args:
+            table_ids (Set[str]): The IDs of the tables
+
+        Returns:
+            List[_BufferedRow]: The (registration ID, table ID, row) tuples
+        """
+        with self._lock:
+            return [
+                buffered_row
+                for buffered_row in self._writing + self._buffer
+                if buffered_row[1] in table_ids
+            ]
+
+    def flush(self) -> int:
+        """Write the buffered rows due for writing, one batch per table.
+
+        Failed batches are split to isolate the failing rows, which are kept in the
+        buffer and retried once their backoff elapsed, or moved to the dead-letter log
+        after max_attempts attempts.
+
+        Returns:
+            int: The number of written rows
+        """
+        with self._flush_lock:
+            now = time.monotonic()
+            with self._lock:
+                buffered, self._buffer = self._buffer, []
+                due = []
+                for buffered_row in buffered:
+                    if self._retry_at.get(buffered_row[0], 0.0) <= now:
+                        due.append(buffered_row)
+                    else:
+                        self._buffer.append(buffered_row)
+                self._writing = due
+
+            rows_by_table: Dict[str, List[_BufferedRow]] = {}
+            for buffered_row in due:
+                rows_by_table.setdefault(buffered_row[1], []).append(buffered_row)
+
+            written = 0
+            failed: List[_BufferedRow] = []
+            for table_id, table_rows in rows_by_table.items():
+                written += self._write_isolating_failures(table_id, table_rows, failed)
+
+            with self._lock:
+                self._buffer[:0] = failed
+                self._writing = []
+                if not self._buffer:
+                    # Every accepted row is committed, keep the log from growing
+                    self._wal.truncate()
+            return written
+
+    def _write_isolating_failures(
+        self, table_id: str, batch: List[_BufferedRow], failed: List[_BufferedRow]
+    ) -> int:
+        """Write a batch, splitting it in halves on failure down to single rows."""
+        registration_ids = [registration_id for registration_id, _, _ in batch]
+        rows = [row for _, _, row in batch]
+        try:
+            self._write_rows(table_id, rows, registration_ids)
+        except Exception as e:
+            if len(batch) == 1:
+                self._retry_or_dead_letter(batch[0], e, failed)
+                return 0
+            middle = len(batch) // 2
+            return self._write_isolating_failures(
+                table_id, batch[:middle], failed
+            ) + self._write_isolating_failures(table_id, batch[middle:], failed)
+
+        with self._lock:
+            self._wal.commit(registration_ids)
+            for registration_id in registration_ids:
+                self._attempts.pop(registration_id, None)
+                self._retry_at.pop(registration_id, None)
+        if self._on_flush:
+            self._on_flush(table_id, rows)
+        return len(rows)
+
+    def _retry_or_dead_letter(
+        self, buffered_row: _BufferedRow, error: Exception, failed: List[_BufferedRow]
+    ) -> None:
+        registration_id, table_id, row = buffered_row
+        attempts = self._attempts.get(registration_id, 0) + 1
+        if attempts < self.max_attempts:
+            delay = self.flush_interval_seconds * 2 ** (attempts - 1)
+            logging.warning(
+                f"Error writing row {registration_id} to {table_id} (attempt "
+                f"{attempts}/{self.max_attempts}), retrying in {delay:.0f}s: {str(error)}"
+            )
+            with self._lock:
+                self._attempts[registration_id] = attempts
+                self._retry_at[registration_id] = time.monotonic() + delay
+            failed.append(buffered_row)
+            return
+
+        logging.error(
+            f"Giving up writing row {registration_id} to {table_id} after {attempts} "
+            f"attempts, moving it to {self.dead_letter_path}: {str(error)}"
+        )
+        record = {
+            "id": registration_id,
+            "table_id": table_id,
+            "row": row,
+            "attempts": attempts,
+            "error": str(error),
+        }
+        with self._lock:
+            with open(self.dead_letter_path, "a", encoding="utf-8") as dead_letters:
+                dead_letters.write(json.dumps(record) + "\n")
+                dead_letters.flush()
+                os.fsync(dead_letters.fileno())
+            # Dead-lettered rows are not replayed
+            self._wal.commit([registration_id])
+            self._attempts.pop(registration_id, None)
+            self._retry_at.pop(registration_id, None)
+        _dead_lettered_rows.inc(table=table_id)
+        if self._on_dead_letter:
+            self._on_dead_letter(table_id, row)
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._flush_requested.wait(self.flush_interval_seconds)
+            self._flush_requested.clear()
+            if self.pending_rows:
+                self.flush()
+
+    def close(self) -> None:
+        """Stop the background flushing and write the remaining rows."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._flush_requested.set()
+        self._thread.join()
+        self.flush()
+        with self._lock:
+            self._wal.close()
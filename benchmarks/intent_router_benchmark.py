@@ -0,0 +1,105 @@
+"""
+Intent Router Benchmark.
+
+Measures the local intent router running in front of the IntentDetectionAgent:
+
+- Routing accuracy on its seed examples, measured with leave-one-out cross-validation:
+  each message is classified by a router trained on every other seed example
+- Routing accuracy on the user messages of the evaluation sets under
+  `tests/*.test.json`, held out from training
+- The share of messages routed locally at the configured confidence threshold, and the
+  precision of these local routing decisions, over both
+- The local routing latency per message
+- The latency saved per turn, estimated as the share of locally routed messages times
+  the latency of the LLM router round trip they skip (--llm-router-latency-ms)
+
+Usage:
+    ```bash
+    poetry run python benchmarks/intent_router_benchmark.py --llm-router-latency-ms 900
+    ```
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPOSITORY_ROOT))
+load_dotenv(REPOSITORY_ROOT / "adk_hackathon_professional_development_agent" / ".env")
+
+from adk_hackathon_professional_development_agent.config import config  # noqa: E402
+from adk_hackathon_professional_development_agent.utils.intent_router import (  # noqa: E402
+    IntentRouter,
+    get_training_examples,
+    load_eval_examples,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--llm-router-latency-ms",
+        type=float,
+        default=900.0,
+        help="Latency of an LLM router round trip skipped by local routing",
+    )
+    parser.add_argument(
+        "--min-confidence",
+        type=float,
+        default=config.intent_router_min_confidence,
+        help="Confidence needed to route a message locally",
+    )
+    args = parser.parse_args()
+
+    examples = get_training_examples()
+    eval_examples = load_eval_examples(str(REPOSITORY_ROOT / "tests"))
+    # (router, message, expected agent): every seed example is held out in turn
+    cases = [
+        (IntentRouter().fit(examples[:held_out] + examples[held_out + 1 :]), *example)
+        for held_out, example in enumerate(examples)
+    ]
+    router = IntentRouter().fit(examples)
+    cases += [(router, *example) for example in eval_examples]
+
+    correct = routed = routed_correct = 0
+    seed_correct = 0
+    latencies = []
+    for index, (router, text, expected) in enumerate(cases):
+        started = time.perf_counter()
+        predicted, confidence = router.predict(text)
+        latencies.append(time.perf_counter() - started)
+
+        correct += predicted == expected
+        if index < len(examples):
+            seed_correct += predicted == expected
+        if confidence >= args.min_confidence:
+            routed += 1
+            routed_correct += predicted == expected
+
+    eval_correct = correct - seed_correct
+    routed_share = routed / len(cases)
+    print(f"Seed examples:            {len(examples)}")
+    print(f"Accuracy (leave-one-out): {seed_correct / len(examples):.1%}")
+    print(f"Evaluation set messages:  {len(eval_examples)}")
+    print(f"Accuracy (held out):      {eval_correct / max(len(eval_examples), 1):.1%}")
+    print(
+        f"Routed locally:           {routed_share:.1%} "
+        f"(confidence >= {args.min_confidence})"
+    )
+    print(f"Local routing precision:  {routed_correct / max(routed, 1):.1%}")
+    print(
+        f"Local routing latency:    {statistics.median(latencies) * 1e6:.0f} us median, "
+        f"{max(latencies) * 1e6:.0f} us max"
+    )
+    print(
+        f"Latency saved per turn:   {routed_share * args.llm_router_latency_ms:.0f} ms "
+        f"(LLM router round trip of {args.llm_router_latency_ms:.0f} ms)"
+    )
+
+
+if __name__ == "__main__":
+    main()
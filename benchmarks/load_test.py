@@ -0,0 +1,421 @@
+"""
+Load Test Benchmark.
+
+Boots the FastAPI app of `main.py` offline and drives concurrent sessions through it,
+to measure the throughput and the latency of the whole agent chain. Gemini, BigQuery
+and Vertex AI Search are replaced by local stand-ins:
+
+- The replay stub model of `benchmarks/stub_model.py`, replaying the tool call
+  trajectories of `tests/*.test.json` with a fixed latency (--model-latency-ms), and
+  optionally a share of slow calls (--slow-call-share), also standing in for the
+  fallback model of the model call policy
+- The local data backend (DATA_BACKEND=local), loading the CSV files of `input_data`
+- The local document index (COMPANY_INFORMATION_BACKEND=local_index)
+
+Each line of the workload file (`benchmarks/requests.jsonl` by default) is a session,
+with a "name", a "user_id" and the "messages" sent one after another. Every session of
+the workload is replayed --repeat times, --concurrency sessions at a time, after an
+unmeasured warm-up round. Messages are sent to `/run_sse`, and each streamed event is
+attributed to its author agent for the time elapsed since the previous event.
+
+The report contains the p50/p95/p99 latency of the turns, the turns (requests) per
+second, the peak memory of the process, the time spent per agent and turn, and the
+hedged LLM requests of the model call policy, each a duplicate model call. With
+--check-baseline, the benchmark exits with an error if the latency, the throughput or
+the peak memory regressed by more than --tolerance against the stored baseline (`benchmarks/load_test_baseline.json`),
+which --update-baseline rewrites.
+
+Usage:
+    ```bash
+    poetry run python benchmarks/load_test.py --concurrency 8 --repeat 10
+    poetry run python benchmarks/load_test.py --check-baseline
+    ```
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import socket
+import statistics
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List
+
+from dotenv import load_dotenv
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+sys.path.insert(0, str(REPOSITORY_ROOT))
+load_dotenv(REPOSITORY_ROOT / "adk_hackathon_professional_development_agent" / ".env")
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from google.adk.models.registry import LLMRegistry  # noqa: E402
+from stub_model import STUB_MODEL_NAME, ReplayStubLlm, load_trajectories  # noqa: E402
+
+APP_NAME = "adk_hackathon_professional_development_agent"
+
+# Metrics compared to the baseline, and whether higher values are better
+BASELINE_METRICS = {
+    "latency_p50_ms": False,
+    "latency_p95_ms": False,
+    "latency_p99_ms": False,
+    "requests_per_second": True,
+    "peak_rss_mb": False,
+}
+
+
+def configure_stand_ins(args: argparse.Namespace) -> None:
+    """Point the configuration at the local stand-ins, before the app is imported."""
+    data_dir = tempfile.mkdtemp(prefix="load_test_")
+    os.environ["MODEL_NAME"] = STUB_MODEL_NAME
+    os.environ["FALLBACK_MODEL_NAME"] = f"{STUB_MODEL_NAME}-lite"
+    os.environ["DATA_BACKEND"] = "local"
+    os.environ["COMPANY_INFORMATION_BACKEND"] = "local_index"
+    os.environ.setdefault(
+        "WRITE_AHEAD_LOG_PATH", os.path.join(data_dir, "write_ahead_log.jsonl")
+    )
+    os.environ.setdefault(
+        "TRAINING_CATALOG_PATH", os.path.join(data_dir, "training_catalog.json")
+    )
+    os.environ.setdefault(
+        "SESSION_DB_URL", "sqlite:///" + os.path.join(data_dir, "sessions.db")
+    )
+
+    ReplayStubLlm.configure(
+        load_trajectories(str(REPOSITORY_ROOT / "tests" / "*.test.json")),
+        latency_seconds=args.model_latency_ms / 1000,
+        chunk_latency_seconds=args.chunk_latency_ms / 1000,
+        slow_call_share=args.slow_call_share,
+        slow_call_latency_seconds=args.slow_call_latency_ms / 1000,
+    )
+    LLMRegistry.register(ReplayStubLlm)
+
+
+def load_workload(path: str) -> List[Dict[str, Any]]:
+    """Load the sessions of a workload file.
+
+    Args:
+        path (str): The path of the JSON lines workload file
+
+    Returns:
+        List[Dict[str, Any]]: The sessions, each with a name, a user_id and messages
+    """
+    with open(path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+async def run_turn(
+    client: httpx.AsyncClient,
+    user_id: str,
+    session_id: str,
+    message: str,
+    streaming: bool,
+) -> Dict[str, Any]:
+    """Send a message and time the events streamed back.
+
+    Returns:
+        Dict[str, Any]: The "latency" of the turn in seconds, the "agents" times in
+            seconds, and whether the turn failed ("error")
+    """
+    request = {
+        "app_name": APP_NAME,
+        "user_id": user_id,
+        "session_id": session_id,
+        "streaming": streaming,
+        "new_message": {"role": "user", "parts": [{"text": message}]},
+    }
+    agents: Dict[str, float] = defaultdict(float)
+    error = False
+    answered = False
+    started = previous = time.perf_counter()
+    async with client.stream("POST", "/run_sse", json=request) as response:
+        error = response.status_code != 200
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            now = time.perf_counter()
+            event = json.loads(line[len("data:") :])
+            if "error" in event:
+                error = True
+                continue
+            author = event.get("author", "unknown")
+            agents[author] += now - previous
+            previous = now
+            parts = (event.get("content") or {}).get("parts") or []
+            answered = answered or any(part.get("text") for part in parts)
+    return {
+        "latency": time.perf_counter() - started,
+        "agents": dict(agents),
+        "error": error or not answered,
+    }
+
+
+async def run_session(
+    client: httpx.AsyncClient, session: Dict[str, Any], streaming: bool
+) -> List[Dict[str, Any]]:
+    """Create a session and send its messages one after another."""
+    user_id = session.get("user_id", "load_test_user")
+    response = await client.post(f"/apps/{APP_NAME}/users/{user_id}/sessions")
+    response.raise_for_status()
+    session_id = response.json()["id"]
+    return [
+        await run_turn(client, user_id, session_id, message, streaming)
+        for message in session["messages"]
+    ]
+
+
+async def run_workload(
+    base_url: str,
+    sessions: List[Dict[str, Any]],
+    concurrency: int,
+    streaming: bool,
+) -> List[Dict[str, Any]]:
+    """Run sessions concurrently, and collect their turns."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(session: Dict[str, Any]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await run_session(client, session, streaming)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=300) as client:
+        results = await asyncio.gather(*(run(session) for session in sessions))
+    return [turn for turns in results for turn in turns]
+
+
+def summarize(turns: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Summarize the turns of a run into the reported metrics."""
+    latencies = sorted(turn["latency"] * 1000 for turn in turns)
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    agent_times: Dict[str, float] = defaultdict(float)
+    for turn in turns:
+        for agent, seconds in turn["agents"].items():
+            agent_times[agent] += seconds
+    total_agent_time = sum(agent_times.values()) or 1.0
+    return {
+        "turns": len(turns),
+        "errors": sum(turn["error"] for turn in turns),
+        "latency_p50_ms": round(percentiles[49], 1),
+        "latency_p95_ms": round(percentiles[94], 1),
+        "latency_p99_ms": round(percentiles[98], 1),
+        "requests_per_second": round(len(turns) / elapsed, 2),
+        # ru_maxrss is in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024),
+        "agents": {
+            agent: {
+                "ms_per_turn": round(seconds * 1000 / len(turns), 1),
+                "share": round(seconds / total_agent_time, 3),
+            }
+            for agent, seconds in sorted(
+                agent_times.items(), key=lambda item: item[1], reverse=True
+            )
+        },
+    }
+
+
+def find_regressions(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compare a report to the baseline.
+
+    Args:
+        report (Dict[str, Any]): The report of the run
+        baseline (Dict[str, Any]): The stored baseline report
+        tolerance (float): The relative change allowed, e.g. 0.25 for 25%
+
+    Returns:
+        List[str]: A description of each metric that regressed
+    """
+    regressions = []
+    for metric, higher_is_better in BASELINE_METRICS.items():
+        value, expected = report[metric], baseline.get(metric)
+        if expected is None:
+            continue
+        if higher_is_better:
+            regressed = value < expected * (1 - tolerance)
+        else:
+            regressed = value > expected * (1 + tolerance)
+        if regressed:
+            regressions.append(f"{metric}: {value} (baseline {expected})")
+    if report["errors"] > baseline.get("errors", 0):
+        regressions.append(
+            f"errors: {report['errors']} (baseline {baseline['errors']})"
+        )
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    print(f"Turns:               {report['turns']} ({report['errors']} errors)")
+    print(
+        f"Latency:             {report['latency_p50_ms']} ms p50, "
+        f"{report['latency_p95_ms']} ms p95, {report['latency_p99_ms']} ms p99"
+    )
+    print(f"Requests per second: {report['requests_per_second']}")
+    print(f"Peak memory:         {report['peak_rss_mb']} MB")
+    print(f"Hedged requests:     {report['hedged_requests']}")
+    print(f"Warm-up:             {report['warmup_seconds']} s")
+    print("Time per agent and turn:")
+    for agent, times in report["agents"].items():
+        print(f"  {agent:<56} {times['ms_per_turn']:>8} ms ({times['share']:.0%})")
+
+
+async def wait_until_ready(base_url: str, timeout: float = 120.0) -> float:
+    """Wait for the readiness endpoint of the app, returning the warm-up duration."""
+    deadline = time.perf_counter() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while True:
+            response = await client.get("/ready")
+            if response.status_code == 200:
+                return response.json()["warmup_seconds"]
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"The app is not ready: {response.json()}")
+            await asyncio.sleep(0.1)
+
+
+async def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Boot the app, warm it up and run the workload against it."""
+    from main import app
+
+    from adk_hackathon_professional_development_agent.utils.metrics import registry
+
+    hedges = registry.counter(
+        "model_call_hedges_total", "Number of hedged LLM requests sent", ["agent"]
+    )
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    base_url = f"http://127.0.0.1:{port}"
+    workload = load_workload(args.workload)
+    try:
+        warmup_seconds = await wait_until_ready(base_url)
+        await run_workload(base_url, workload, args.concurrency, args.streaming)
+        sessions = workload * args.repeat
+        hedges_before = hedges.total()
+        started = time.perf_counter()
+        turns = await run_workload(base_url, sessions, args.concurrency, args.streaming)
+        elapsed = time.perf_counter() - started
+        hedged_requests = int(hedges.total() - hedges_before)
+    finally:
+        server.should_exit = True
+        await serving
+
+    report = summarize(turns, elapsed)
+    report["hedged_requests"] = hedged_requests
+    report["warmup_seconds"] = warmup_seconds
+    report["settings"] = {
+        "workload": Path(args.workload).name,
+        "concurrency": args.concurrency,
+        "repeat": args.repeat,
+        "streaming": args.streaming,
+        "model_latency_ms": args.model_latency_ms,
+        "slow_call_share": args.slow_call_share,
+        "slow_call_latency_ms": args.slow_call_latency_ms,
+    }
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--workload",
+        default=str(BENCHMARKS_DIR / "requests.jsonl"),
+        help="JSON lines file of the sessions to run",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=8, help="Number of concurrent sessions"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=10, help="Number of runs of the workload"
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Request partial model output (SSE streaming mode)",
+    )
+    parser.add_argument(
+        "--model-latency-ms",
+        type=float,
+        default=200.0,
+        help="Latency of the stub model until the first chunk of a response",
+    )
+    parser.add_argument(
+        "--chunk-latency-ms",
+        type=float,
+        default=20.0,
+        help="Latency of every further chunk of a streamed stub model response",
+    )
+    parser.add_argument(
+        "--slow-call-share",
+        type=float,
+        default=0.0,
+        help="Share of the stub model calls taking --slow-call-latency-ms",
+    )
+    parser.add_argument(
+        "--slow-call-latency-ms",
+        type=float,
+        default=5000.0,
+        help="Latency of the slow stub model calls until their first chunk",
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(BENCHMARKS_DIR / "load_test_baseline.json"),
+        help="Path of the stored baseline report",
+    )
+    parser.add_argument(
+        "--check-baseline",
+        action="store_true",
+        help="Fail if a metric regressed by more than --tolerance against the baseline",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store the report as baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative regression allowed against the baseline",
+    )
+    parser.add_argument("--output", help="Path to write the JSON report to")
+    args = parser.parse_args()
+
+    configure_stand_ins(args)
+    report = asyncio.run(benchmark(args))
+    print_report(report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    if args.check_baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("settings") != report["settings"]:
+            print("Warning: the baseline was recorded with different settings")
+        regressions = find_regressions(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Startup Benchmark.
+
+Measures the cold start of the agent package: for each target module, a fresh Python
+interpreter imports it with `python -X importtime`, and the benchmark reports
+
+- The cold start time (interpreter start and import) and the import time alone
+- The peak memory of the interpreter after the import
+- The number of imported modules, and which of the slow to import dependencies (ADK,
+  the Google Cloud client libraries, Vertex AI) were imported
+- The import time broken down by package, from the `-X importtime` output
+
+The targets go from the package itself, which should not import anything heavy, to the
+configuration and the data access utilities, the agents and the FastAPI app of
+`main.py`. Every target is imported --repeat times after an unmeasured run that
+compiles the bytecode, and the median run is reported.
+
+With --check-baseline, the benchmark exits with an error if a target imports a slow
+dependency it did not import in the stored baseline (`benchmarks/startup_baseline.json`),
+or if a metric regressed by more than --tolerance and by more than the noise floor of
+the metric. --update-baseline rewrites the baseline.
+
+Usage:
+    ```bash
+    poetry run python benchmarks/startup_benchmark.py
+    poetry run python benchmarks/startup_benchmark.py --check-baseline
+    ```
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+REPOSITORY_ROOT = Path(__file__).resolve().parent.parent
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+
+PACKAGE = "adk_hackathon_professional_development_agent"
+
+# Target name and module imported by the target
+TARGETS = {
+    "package": PACKAGE,
+    "config": f"{PACKAGE}.config",
+    "data_access": f"{PACKAGE}.utils.bigquery_operations",
+    "agents": f"{PACKAGE}.agent",
+    "app": "main",
+}
+
+# Dependencies taking a second or more to import, reported when a target imports them
+HEAVY_MODULES = [
+    "google.adk",
+    "google.cloud.aiplatform",
+    "google.cloud.bigquery",
+    "google.cloud.discoveryengine",
+    "google.genai",
+    "vertexai",
+]
+
+# Metrics compared to the baseline (lower is better), with the absolute change below
+# which a change is considered noise
+BASELINE_METRICS = {
+    "cold_start_ms": 50.0,
+    "import_ms": 50.0,
+    "peak_rss_mb": 5.0,
+    "modules": 20.0,
+}
+
+# Imports the target in the child interpreter, and prints its measurements as JSON
+_CHILD_SCRIPT = """
+import json, resource, sys, time
+started = time.perf_counter()
+import {module}
+import_ms = (time.perf_counter() - started) * 1000
+print(json.dumps({{
+    "import_ms": import_ms,
+    # ru_maxrss is in kilobytes on Linux
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "modules": len(sys.modules),
+    "heavy_modules": [name for name in {heavy_modules!r} if name in sys.modules],
+}}))
+"""
+
+
+def get_environment() -> Dict[str, str]:
+    """Get the environment of the child interpreters, configured for local stand-ins."""
+    environment = dict(os.environ)
+    # The configuration is validated on import, and needs these to be set
+    environment.setdefault("GOOGLE_CLOUD_PROJECT", "startup-benchmark")
+    environment.setdefault("VERTEX_AI_SEARCH_DATA_STORE_ID", "startup-benchmark")
+    environment["DATA_BACKEND"] = "local"
+    environment["PYTHONPATH"] = str(REPOSITORY_ROOT)
+    environment.pop("PYTHONPROFILEIMPORTTIME", None)
+    return environment
+
+
+def package_of(module: str) -> str:
+    """Get the package a module is reported under, e.g. "google.cloud.bigquery"."""
+    parts = module.split(".")
+    if parts[0] == "google":
+        depth = 3 if len(parts) > 1 and parts[1] == "cloud" else 2
+        return ".".join(parts[:depth])
+    if parts[0] == PACKAGE:
+        return ".".join(parts[:2])
+    return parts[0]
+
+
+def parse_importtime(output: str) -> List[Tuple[str, int, int]]:
+    """Parse the output of `python -X importtime`.
+
+    Args:
+        output (str): The standard error of the interpreter
+
+    Returns:
+        List[Tuple[str, int, int]]: The module, its self time and its cumulative time
+            in microseconds, for every imported module
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:") :].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue
+        imports.append(
+            (fields[2].strip(), int(fields[0].strip()), int(fields[1].strip()))
+        )
+    return imports
+
+
+def run_target(module: str, environment: Dict[str, str]) -> Dict[str, Any]:
+    """Import a module in a fresh interpreter, measuring its cold start."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            _CHILD_SCRIPT.format(module=module, heavy_modules=HEAVY_MODULES),
+        ],
+        cwd=REPOSITORY_ROOT,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+    cold_start_ms = (time.perf_counter() - started) * 1000
+    if result.returncode:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    run = json.loads(result.stdout.strip().splitlines()[-1])
+    run["cold_start_ms"] = cold_start_ms
+    run["imports"] = parse_importtime(result.stderr)
+    return run
+
+
+def summarize_target(runs: List[Dict[str, Any]], top: int) -> Dict[str, Any]:
+    """Summarize the runs of a target by its median run."""
+    runs = sorted(runs, key=lambda run: run["cold_start_ms"])
+    median = runs[len(runs) // 2]
+    package_times: Dict[str, int] = defaultdict(int)
+    for module, self_us, _ in median["imports"]:
+        package_times[package_of(module)] += self_us
+    return {
+        "cold_start_ms": round(statistics.median(r["cold_start_ms"] for r in runs), 1),
+        "import_ms": round(statistics.median(r["import_ms"] for r in runs), 1),
+        "peak_rss_mb": round(max(run["peak_rss_mb"] for run in runs), 1),
+        "modules": median["modules"],
+        "heavy_modules": median["heavy_modules"],
+        "packages": {
+            package: round(self_us / 1000, 1)
+            for package, self_us in sorted(
+                package_times.items(), key=lambda item: item[1], reverse=True
+            )[:top]
+        },
+    }
+
+
+def benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Import every target in fresh interpreters and summarize the measurements."""
+    environment = get_environment()
+    targets = {}
+    for name in args.targets:
+        module = TARGETS[name]
+        # Unmeasured, compiles the bytecode of the imported modules
+        run_target(module, environment)
+        runs = [run_target(module, environment) for _ in range(args.repeat)]
+        targets[name] = {"module": module, **summarize_target(runs, args.top)}
+    return {
+        "targets": targets,
+        "settings": {
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+        },
+    }
+
+
+def find_regressions(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Compare a report to the baseline.
+
+    Args:
+        report (Dict[str, Any]): The report of the run
+        baseline (Dict[str, Any]): The stored baseline report
+        tolerance (float): The relative change allowed, e.g. 0.25 for 25%
+
+    Returns:
+        List[str]: A description of each metric that regressed
+    """
+    regressions = []
+    for name, target in report["targets"].items():
+        expected_target = baseline.get("targets", {}).get(name)
+        if expected_target is None:
+            continue
+        for metric, noise_floor in BASELINE_METRICS.items():
+            value, expected = target[metric], expected_target.get(metric)
+            if expected is None:
+                continue
+            if value > expected * (1 + tolerance) and value - expected > noise_floor:
+                regressions.append(f"{name} {metric}: {value} (baseline {expected})")
+        added = set(target["heavy_modules"]) - set(expected_target["heavy_modules"])
+        if added:
+            regressions.append(f"{name} imports {', '.join(sorted(added))}")
+    return regressions
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    for name, target in report["targets"].items():
+        print(f"{name} ({target['module']})")
+        print(
+            f"  Cold start:  {target['cold_start_ms']} ms "
+            f"({target['import_ms']} ms importing)"
+        )
+        print(f"  Peak memory: {target['peak_rss_mb']} MB")
+        print(f"  Modules:     {target['modules']}")
+        print(f"  Heavy:       {', '.join(target['heavy_modules']) or '-'}")
+        print("  Import time by package:")
+        for package, milliseconds in target["packages"].items():
+            print(f"    {package:<58} {milliseconds:>8} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--targets",
+        nargs="+",
+        choices=list(TARGETS),
+        default=list(TARGETS),
+        help="Targets to import",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="Number of imports of each target"
+    )
+    parser.add_argument(
+        "--top", type=int, default=10, help="Number of packages in the breakdown"
+    )
+    parser.add_argument(
+        "--baseline",
+        default=str(BENCHMARKS_DIR / "startup_baseline.json"),
+        help="Path of the stored baseline report",
+    )
+    parser.add_argument(
+        "--check-baseline",
+        action="store_true",
+        help="Fail if a metric regressed by more than --tolerance against the baseline",
+    )
+    parser.add_argument(
+        "--update-baseline", action="store_true", help="Store the report as baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Relative regression allowed against the baseline",
+    )
+    args = parser.parse_args()
+
+    report = benchmark(args)
+    print_report(report)
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+    if args.check_baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        if baseline.get("settings") != report["settings"]:
+            print("Warning: the baseline was recorded with different settings")
+        regressions = find_regressions(report, baseline, args.tolerance)
+        if regressions:
+            print("Regressions against the baseline:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print("No regression against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Replay Stub Model.
+
+A deterministic stand-in for Gemini, replaying the tool call trajectories of the
+evaluation sets under `tests/*.test.json`. It lets the agents run offline, e.g. in the
+load tests of `benchmarks/load_test.py`, with a fixed, configurable model latency.
+
+For each LLM request, the stub:
+1. Finds the user message of the current turn, and the evaluation turn with the same
+   message
+2. Skips the tools of the trajectory already called in the turn, by any agent
+3. Calls the next tool of the trajectory if the current agent has it (or its alias, e.g.
+   `search_company_documents` for `CompanyInformationAgent` with the local document
+   index), and answers with the final response of the evaluation turn otherwise
+
+Messages without an evaluation turn, e.g. the requests of agents called as tools, are
+answered with a fixed text. When streaming, the answer is split into partial chunks.
+A share of the calls can be made slow (slow_call_share), e.g. to measure how the model
+call policy of `utils.model_call_policy` cuts the tail latency.
+
+Example:
+    ```python
+    from google.adk.models.registry import LLMRegistry
+    from stub_model import STUB_MODEL_NAME, ReplayStubLlm, load_trajectories
+
+    ReplayStubLlm.configure(load_trajectories("tests/*.test.json"), latency_seconds=0.2)
+    LLMRegistry.register(ReplayStubLlm)
+    os.environ["MODEL_NAME"] = STUB_MODEL_NAME  # Before importing the agents
+    ```
+"""
+
+import asyncio
+import glob
+import json
+import random
+import re
+from typing import Any, AsyncGenerator, Callable, ClassVar, Dict, List, Optional, Tuple
+
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.genai import types
+
+# Contains "gemini-2", which the built-in Google Search tool requires
+STUB_MODEL_NAME = "stub-replay-gemini-2"
+DEFAULT_ANSWER = "This is a stub answer."
+FOREIGN_TOOL_CALL_PATTERN = re.compile(r"\] called tool `([^`]+)`")
+
+# Tools of the trajectories -> (tool called instead, arguments conversion)
+TOOL_ALIASES: Dict[str, Tuple[str, Callable[[Dict[str, Any]], Dict[str, Any]]]] = {
+    "CompanyInformationAgent": (
+        "search_company_documents",
+        lambda args: {"query": args.get("request", "")},
+    ),
+}
+
+
+def load_trajectories(pattern: str) -> Dict[str, Dict[str, Any]]:
+    """Load the trajectories of the evaluation sets.
+
+    Args:
+        pattern (str): The glob pattern of the evaluation set files
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Per user message, the "tool_uses" (list of tool names
+            and arguments) and the "final_response" text of the evaluation turn
+    """
+    trajectories = {}
+    for path in sorted(glob.glob(pattern)):
+        with open(path, encoding="utf-8") as file:
+            eval_set = json.load(file)
+        for eval_case in eval_set["eval_cases"]:
+            for turn in eval_case["conversation"]:
+                message = "".join(
+                    part.get("text") or "" for part in turn["user_content"]["parts"]
+                )
+                final_response = turn.get("final_response") or {"parts": []}
+                trajectories[message.strip()] = {
+                    "tool_uses": turn["intermediate_data"]["tool_uses"],
+                    "final_response": "".join(
+                        part.get("text") or "" for part in final_response["parts"]
+                    ),
+                }
+    return trajectories
+
+
+def _is_user_message(content: types.Content) -> bool:
+    return (
+        content.role == "user"
+        and bool(content.parts)
+        and any(part.text for part in content.parts)
+        and content.parts[0].text != "For context:"
+    )
+
+
+def _current_turn(
+    contents: List[types.Content],
+) -> Tuple[Optional[str], List[str]]:
+    """Get the user message of the current turn and the tools called since."""
+    start = None
+    for index in range(len(contents) - 1, -1, -1):
+        if _is_user_message(contents[index]):
+            start = index
+            break
+    if start is None:
+        return None, []
+
+    message = "".join(part.text for part in contents[start].parts if part.text)
+    called = []
+    for content in contents[start + 1 :]:
+        for part in content.parts or []:
+            if part.function_call:
+                called.append(part.function_call.name)
+            elif part.text:
+                called.extend(FOREIGN_TOOL_CALL_PATTERN.findall(part.text))
+    return message.strip(), called
+
+
+class ReplayStubLlm(BaseLlm):
+    """Stub model replaying the tool call trajectories of the evaluation sets."""
+
+    trajectories: ClassVar[Dict[str, Dict[str, Any]]] = {}
+    latency_seconds: ClassVar[float] = 0.0
+    chunk_words: ClassVar[int] = 8
+    chunk_latency_seconds: ClassVar[float] = 0.0
+    slow_call_share: ClassVar[float] = 0.0
+    slow_call_latency_seconds: ClassVar[float] = 0.0
+    # Seeded, so that the same calls are slow from one run to the next
+    _random: ClassVar[random.Random] = random.Random(0)
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"stub-replay-.*"]
+
+    @classmethod
+    def configure(
+        cls,
+        trajectories: Dict[str, Dict[str, Any]],
+        latency_seconds: float = 0.0,
+        chunk_latency_seconds: float = 0.0,
+        slow_call_share: float = 0.0,
+        slow_call_latency_seconds: float = 0.0,
+    ) -> None:
+        """Set the trajectories replayed and the latency of the stub.
+
+        Args:
+            trajectories (Dict[str, Dict[str, Any]]): The trajectories, as returned by
+                load_trajectories
+            latency_seconds (float, optional): The latency of the first chunk of a
+                response
+            chunk_latency_seconds (float, optional): The latency of every further
+                chunk of a streamed response
+            slow_call_share (float, optional): The share of calls with the latency of
+                slow_call_latency_seconds instead of latency_seconds
+            slow_call_latency_seconds (float, optional): The latency of the first chunk
+                of the slow calls
+        """
+        cls.trajectories = trajectories
+        cls.latency_seconds = latency_seconds
+        cls.chunk_latency_seconds = chunk_latency_seconds
+        cls.slow_call_share = slow_call_share
+        cls.slow_call_latency_seconds = slow_call_latency_seconds
+        cls._random = random.Random(0)
+
+    def _next_step(self, llm_request: LlmRequest) -> Tuple[Optional[Any], str]:
+        """Get the next function call to make, or the answer to give."""
+        message, called = _current_turn(llm_request.contents)
+        trajectory = self.trajectories.get(message or "")
+        if trajectory is None:
+            return None, DEFAULT_ANSWER
+
+        remaining = list(trajectory["tool_uses"])
+        for name in called:
+            aliases = {remaining[0]["name"]} if remaining else set()
+            aliases |= {TOOL_ALIASES[a][0] for a in aliases if a in TOOL_ALIASES}
+            if name in aliases:
+                remaining.pop(0)
+
+        if remaining:
+            name, args = remaining[0]["name"], remaining[0]["args"]
+            if name not in llm_request.tools_dict and name in TOOL_ALIASES:
+                name, convert = TOOL_ALIASES[name]
+                args = convert(args)
+            if name in llm_request.tools_dict:
+                return types.FunctionCall(name=name, args=args), ""
+        return None, trajectory["final_response"] or DEFAULT_ANSWER
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        slow = self._random.random() < self.slow_call_share
+        await asyncio.sleep(
+            self.slow_call_latency_seconds if slow else self.latency_seconds
+        )
+        function_call, answer = self._next_step(llm_request)
+        if function_call is not None:
+            yield LlmResponse(
+                content=types.Content(
+                    role="model", parts=[types.Part(function_call=function_call)]
+                )
+            )
+            return
+
+        if stream:
+            words = answer.split(" ")
+            for start in range(0, len(words), self.chunk_words):
+                if start:
+                    await asyncio.sleep(self.chunk_latency_seconds)
+                chunk = " ".join(words[start : start + self.chunk_words])
+                yield LlmResponse(
+                    content=types.Content(
+                        role="model",
+                        parts=[types.Part(text=(" " if start else "") + chunk)],
+                    ),
+                    partial=True,
+                )
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=answer)])
+        )
@@ -1,15 +1,75 @@
 import os
+import sys
 
+from fastapi.responses import JSONResponse, PlainTextResponse
+from google.adk.cli import fast_api
 from google.adk.cli.fast_api import get_fast_api_app
 import uvicorn
 
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils.metrics import registry
+from adk_hackathon_professional_development_agent.utils.session_store import (
+    BoundedSessionService,
+)
+from adk_hackathon_professional_development_agent.utils.stream_metrics import (
+    StreamLatencyMiddleware,
+)
+from adk_hackathon_professional_development_agent.utils.warmup import (
+    readiness,
+    warmup_lifespan,
+)
+
+# This relies on ADK internals: get_fast_api_app (google-adk 1.4) takes no session
+# service, and builds one by calling the DatabaseSessionService name of its own module
+# on the session service URI. Rebinding that name is the only way to compact and evict
+# the sessions, and tests/test_session_store.py checks that the bounded session store
+# is the one serving the requests, in case an upgrade of ADK changes this.
+fast_api.DatabaseSessionService = BoundedSessionService
+
 # Call the function to get the FastAPI app instance
 app = get_fast_api_app(
     agents_dir=os.path.dirname(os.path.abspath(__file__)),
+    session_service_uri=config.session_db_url or None,
     allow_origins=["http://localhost", "http://localhost:8080", "*"],
     web=True,
+    # Warm up the clients, indexes and caches of the worker process in the background
+    lifespan=warmup_lifespan,
 )
+# Record the time to the first and last token streamed by each agent over /run_sse
+app.add_middleware(StreamLatencyMiddleware)
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> str:
+    """Expose the data access metrics in the Prometheus text exposition format."""
+    return registry.render()
+
+
+@app.get("/health")
+def health() -> dict:
+    """Report that the worker process is alive."""
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+def ready() -> JSONResponse:
+    """Report whether the worker process is warmed up, with a 503 status until then."""
+    return JSONResponse(
+        readiness.to_dict(), status_code=200 if readiness.is_ready else 503
+    )
+
 
 if __name__ == "__main__":
+    workers = config.server_worker_count
     # Use the PORT environment variable provided by Cloud Run, defaulting to 8080
-    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", 8080)))
+    port = os.environ.get("PORT", "8080")
+    if workers > 1:
+        # Hand over to the uvicorn command line, as in the container: worker processes
+        # are spawned, and would otherwise rebuild the app of this script before
+        # answering the health checks of uvicorn, and be restarted
+        os.execv(
+            sys.executable,
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "0.0.0.0"]
+            + ["--port", port, "--workers", str(workers)],
+        )
+    uvicorn.run(app, host="0.0.0.0", port=int(port))
@@ -0,0 +1,56 @@
+"""
+Shared pytest configuration.
+
+Loads the agent's `.env` file, the same way `adk web` does, so that the configuration
+module can be imported by the tests. Values already set in the environment take precedence.
+Rows accepted by the write pipeline during the tests are logged to a temporary directory.
+Web search results cached by the training catalog are persisted to a temporary directory.
+A single worker process is assumed, so rows are not shared through the write feed.
+The answer cache is disabled, so that repeated evaluation runs of the same question
+exercise the agents instead of replaying the first answer.
+
+The `local_backend` fixture serves the queries of a test from the local data backend.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+from dotenv import load_dotenv
+
+load_dotenv(
+    Path(__file__).parent.parent
+    / "adk_hackathon_professional_development_agent"
+    / ".env"
+)
+
+os.environ.setdefault(
+    "WRITE_AHEAD_LOG_PATH",
+    os.path.join(tempfile.mkdtemp(), "write_ahead_log.jsonl"),
+)
+os.environ.setdefault("SERVER_WORKERS", "1")
+os.environ.setdefault("ANSWER_CACHE_MAX_ENTRIES", "0")
+os.environ.setdefault(
+    "TRAINING_CATALOG_PATH",
+    os.path.join(tempfile.mkdtemp(), "training_catalog.json"),
+)
+
+# Imported once the configuration is set up
+from adk_hackathon_professional_development_agent.config import config  # noqa: E402
+from adk_hackathon_professional_development_agent.utils import (  # noqa: E402
+    bigquery_operations,
+)
+from adk_hackathon_professional_development_agent.utils.data_backends import (  # noqa: E402
+    LocalBackend,
+)
+
+
+@pytest.fixture
+def local_backend():
+    """Serve the queries of the tests from the local data backend."""
+    backend = LocalBackend(data_dir=config.local_data_dir)
+    bigquery_operations.set_backend(backend)
+    yield backend
+    bigquery_operations.flush_writes()
+    bigquery_operations.set_backend(None)
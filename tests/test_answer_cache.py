@@ -0,0 +1,187 @@
+"""
+Tests for the answer cache.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+from google.adk.models import LlmRequest, LlmResponse
+from google.genai import types
+
+from adk_hackathon_professional_development_agent.utils import answer_cache
+from adk_hackathon_professional_development_agent.utils.answer_cache import (
+    AnswerCache,
+    cache_answer,
+    normalize_question,
+    use_cached_answer,
+)
+from adk_hackathon_professional_development_agent.utils.document_sync import (
+    LocalDocumentStorage,
+    stamp_documents_version,
+)
+
+AGENT = "ProfessionalDevelopmentPolicyAgent"
+QUESTION = "Can I take certifications during working hours?"
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = LocalDocumentStorage(str(tmp_path / "documents"))
+    monkeypatch.setattr(answer_cache, "get_documents_storage", lambda: storage)
+    return storage
+
+
+@pytest.fixture
+def cache(storage, monkeypatch):
+    cache = make_cache()
+    monkeypatch.setattr(answer_cache.config, "answer_cache_max_entries", 8)
+    monkeypatch.setattr(answer_cache, "answer_cache", cache)
+    return cache
+
+
+def make_cache(**kwargs):
+    options = {"max_entries": 8, "ttl_seconds": 60, "version_check_seconds": 0}
+    return AnswerCache(**{**options, **kwargs})
+
+
+def make_context(question, invocation_id="first", agent_name=AGENT):
+    return MagicMock(
+        agent_name=agent_name,
+        invocation_id=invocation_id,
+        state={},
+        user_content=types.Content(role="user", parts=[types.Part(text=question)]),
+    )
+
+
+def make_request(context, *earlier_contents):
+    return LlmRequest(contents=[*earlier_contents, context.user_content])
+
+
+def make_answer(text):
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=text)])
+    )
+
+
+def test_normalize_question_drops_emails_and_punctuation():
+    assert (
+        normalize_question("What are the approvals for john.doe@amazincorp.com?")
+        == "what are the approvals for"
+    )
+
+
+def test_only_identical_questions_share_answers_per_agent():
+    cache = make_cache()
+    cache.put(AGENT, "Is a conference covered by the policy?", "Yes.")
+
+    answer = cache.get(AGENT, "is a conference covered by the policy, jane@x.com")
+    assert answer == "Yes."
+    assert cache.get(AGENT, "Is travel to a conference covered by the policy?") is None
+    assert cache.get(AGENT, "Is a conference covered by the policies?") is None
+    assert (
+        cache.get("CompanyInformationAgent", "Is a conference covered by the policy?")
+        is None
+    )
+
+
+def test_least_recently_used_answers_are_evicted():
+    cache = make_cache(max_entries=2)
+    cache.put(AGENT, "annual budget", "a")
+    cache.put(AGENT, "certification bonus", "b")
+    cache.get(AGENT, "annual budget")
+    cache.put(AGENT, "approval process", "c")
+
+    assert cache.get(AGENT, "annual budget") == "a"
+    assert cache.get(AGENT, "certification bonus") is None
+
+
+def test_answers_expire(monkeypatch):
+    cache = make_cache(ttl_seconds=10)
+    now = 1000.0
+    monkeypatch.setattr(answer_cache.time, "monotonic", lambda: now)
+    cache.put(AGENT, "annual budget", "a")
+
+    now += 11
+
+    assert cache.get(AGENT, "annual budget") is None
+
+
+@pytest.mark.asyncio
+async def test_restamping_the_documents_invalidates_answers(storage, cache):
+    stamp_documents_version(storage)
+    context = make_context(QUESTION)
+    request = make_request(context)
+    await use_cached_answer(context, request)
+    await cache_answer(context, make_answer("Yes."))
+    assert (await use_cached_answer(context, request)).content.parts[0].text == "Yes."
+
+    stamp_documents_version(storage)
+
+    assert await use_cached_answer(context, request) is None
+
+
+@pytest.mark.asyncio
+async def test_callbacks_cache_final_answers_only(cache):
+    context = make_context(QUESTION)
+    request = make_request(context)
+    tool_call = types.Content(
+        role="model",
+        parts=[types.Part(function_call=types.FunctionCall(name="search"))],
+    )
+    tool_response = types.Content(
+        role="user",
+        parts=[types.Part(function_response=types.FunctionResponse(name="search"))],
+    )
+
+    assert await use_cached_answer(context, request) is None
+    assert await cache_answer(context, LlmResponse(content=tool_call)) is None
+    # Called again with the result of the tool, after which the answer is cached
+    request.contents += [tool_call, tool_response]
+    assert await use_cached_answer(context, request) is None
+    assert await cache_answer(context, make_answer("Yes.")) is None
+
+    other_session = make_context(QUESTION, invocation_id="other")
+    cached = await use_cached_answer(other_session, make_request(other_session))
+    assert cached.content.parts[0].text == "Yes."
+
+
+@pytest.mark.asyncio
+async def test_follow_up_questions_are_keyed_by_their_conversation(cache):
+    budget_question = types.Content(
+        role="user", parts=[types.Part(text="How much budget do I have left?")]
+    )
+    budget_answer = types.Content(
+        role="model", parts=[types.Part(text="You have 3500 USD left.")]
+    )
+    follow_up = make_context(QUESTION, invocation_id="second")
+    await use_cached_answer(
+        follow_up, make_request(follow_up, budget_question, budget_answer)
+    )
+    await cache_answer(follow_up, make_answer("Only on weekends."))
+
+    # Served to the same conversation only
+    same = make_context(QUESTION, invocation_id="other")
+    cached = await use_cached_answer(
+        same, make_request(same, budget_question, budget_answer)
+    )
+    assert cached.content.parts[0].text == "Only on weekends."
+    other_answer = types.Content(
+        role="model", parts=[types.Part(text="You have 100 USD left.")]
+    )
+    assert (
+        await use_cached_answer(same, make_request(same, budget_question, other_answer))
+        is None
+    )
+    assert await use_cached_answer(same, make_request(same)) is None
+    assert cache.get(AGENT, QUESTION) is None
+
+
+@pytest.mark.asyncio
+async def test_short_questions_are_not_cached(cache):
+    short = make_context("What about for managers?")
+
+    assert await use_cached_answer(short, make_request(short)) is None
+    await cache_answer(short, make_answer("Managers get more."))
+
+    assert cache.get(AGENT, "What about for managers?") is None
+    assert short.state == {}
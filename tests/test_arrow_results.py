@@ -0,0 +1,65 @@
+"""
+Tests for the Arrow result mode and its columnar helpers.
+"""
+
+import datetime
+
+import pytest
+
+from adk_hackathon_professional_development_agent.tools.employee_training_history_tool import (
+    get_employee_training_history,
+)
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.arrow_results import (
+    format_date_column,
+    split_list_column,
+    to_records,
+)
+
+pytestmark = pytest.mark.usefixtures("local_backend")
+
+
+TRAININGS_QUERY = (
+    "SELECT name, skills, date, cost_usd FROM `local.amazincorp.employee_trainings` "
+    "WHERE email = @email"
+)
+
+
+def test_arrow_results_match_row_results():
+    params = [{"name": "email", "value": "john.doe@amazincorp.com"}]
+
+    table = bigquery_operations.query_arrow(TRAININGS_QUERY, params)
+
+    assert table.num_rows > 0
+    assert to_records(table) == bigquery_operations.query_multiple_rows(
+        TRAININGS_QUERY, params
+    )
+
+
+def test_empty_arrow_results_keep_the_column_types():
+    params = [{"name": "email", "value": "unknown@amazincorp.com"}]
+
+    table = bigquery_operations.query_arrow(TRAININGS_QUERY, params)
+
+    assert table.num_rows == 0
+    assert str(table.schema.field("date").type) == "date32[day]"
+    assert format_date_column(table, "date").num_rows == 0
+
+
+def test_columnar_transforms():
+    params = [{"name": "email", "value": "john.doe@amazincorp.com"}]
+    table = bigquery_operations.query_arrow(TRAININGS_QUERY, params)
+
+    records = to_records(split_list_column(format_date_column(table, "date"), "skills"))
+
+    assert records[0]["date"] == "2024-01-15"
+    assert records[0]["skills"] == ["Google Cloud", "Architecture", "System Design"]
+
+
+@pytest.mark.asyncio
+async def test_training_history_formats_dates():
+    history = await get_employee_training_history("john.doe@amazincorp.com")
+
+    assert history
+    for training in history:
+        datetime.date.fromisoformat(training["date"])
@@ -0,0 +1,63 @@
+"""
+Tests for the BigQuery operations utility module running on the local data backend.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.data_backends import (
+    LocalBackend,
+)
+
+
+class SlowLocalBackend(LocalBackend):
+    """Local backend that takes a fixed amount of time to answer each query."""
+
+    delay_seconds = 0.2
+
+    def query(self, query, params=None):
+        time.sleep(self.delay_seconds)
+        return super().query(query, params)
+
+
+pytestmark = pytest.mark.usefixtures("local_backend")
+
+
+PROFILE_QUERY = (
+    "SELECT name FROM `local.amazincorp.employee_profiles` WHERE email = @email"
+)
+EMAIL_PARAMS = [{"name": "email", "value": "jane.doe@amazincorp.com"}]
+
+
+@pytest.mark.asyncio
+async def test_async_variants_match_sync_results():
+    assert await bigquery_operations.query_single_row_async(
+        PROFILE_QUERY, EMAIL_PARAMS
+    ) == bigquery_operations.query_single_row(PROFILE_QUERY, EMAIL_PARAMS)
+
+
+@pytest.mark.asyncio
+async def test_async_queries_run_concurrently_on_the_thread_pool():
+    bigquery_operations.set_backend(SlowLocalBackend(data_dir=config.local_data_dir))
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(
+            bigquery_operations.query_multiple_rows_async(PROFILE_QUERY, EMAIL_PARAMS)
+            for _ in range(config.bigquery_max_concurrency)
+        )
+    )
+    elapsed = time.perf_counter() - started
+    assert elapsed < 2 * SlowLocalBackend.delay_seconds
+
+
+@pytest.mark.asyncio
+async def test_async_query_timeout():
+    bigquery_operations.set_backend(SlowLocalBackend(data_dir=config.local_data_dir))
+    with pytest.raises(asyncio.TimeoutError):
+        await bigquery_operations.query_single_row_async(
+            PROFILE_QUERY, EMAIL_PARAMS, timeout=0.01
+        )
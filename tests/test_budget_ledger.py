@@ -0,0 +1,183 @@
+"""
+Tests for the per-employee, per-year training budget ledger.
+"""
+
+import datetime
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools.employee_remaining_training_budget_tool import (
+    get_employee_remaining_training_budget,
+)
+from adk_hackathon_professional_development_agent.tools.register_new_training_tool import (
+    register_new_training,
+)
+from adk_hackathon_professional_development_agent.utils import (
+    bigquery_operations,
+    budget_ledger,
+    write_feed,
+)
+from adk_hackathon_professional_development_agent.utils.budget_ledger import (
+    BudgetLedger,
+    get_budget_ledger,
+    refresh_budget_ledger,
+    reset_budget_ledger,
+)
+from adk_hackathon_professional_development_agent.utils.write_feed import WriteFeed
+
+
+@pytest.fixture(autouse=True)
+def ledger(local_backend):
+    reset_budget_ledger()
+    yield
+    reset_budget_ledger()
+
+
+def test_spend_is_scoped_to_the_year():
+    ledger = get_budget_ledger()
+    # John Doe took three trainings in 2024 for 299 + 199 + 149 USD
+    assert ledger.spent("john.doe@amazincorp.com", 2024) == 647.0
+    assert ledger.remaining("john.doe@amazincorp.com", 2024) == 2853.0
+    assert ledger.remaining("john.doe@amazincorp.com", 2025) == 3500.0
+
+
+def test_allowance_overrides():
+    ledger = BudgetLedger(
+        default_allowance_usd=3500.0,
+        allowance_overrides={"Data": 5000.0, "jane.doe@amazincorp.com": 4000.0},
+    )
+    ledger.build(
+        [],
+        {"jane.doe@amazincorp.com": "Data", "sarah.chen@amazincorp.com": "Data"},
+    )
+    assert ledger.allowance("jane.doe@amazincorp.com") == 4000.0
+    assert ledger.allowance("sarah.chen@amazincorp.com") == 5000.0
+    assert ledger.allowance("john.doe@amazincorp.com") == 3500.0
+
+
+@pytest.mark.asyncio
+async def test_registration_updates_the_ledger_incrementally():
+    email = "john.doe@amazincorp.com"
+    today = datetime.date.today()
+    before = await get_employee_remaining_training_budget(email)
+
+    await register_new_training(
+        email=email,
+        name="Kubernetes Basics",
+        description="Introduction to Kubernetes",
+        skills="Kubernetes",
+        date=today.isoformat(),
+        cost_usd=150.0,
+        url="https://example.com/kubernetes",
+    )
+
+    assert await get_employee_remaining_training_budget(email) == before - 150.0
+    bigquery_operations.flush_writes()
+    reset_budget_ledger()
+    assert await get_employee_remaining_training_budget(email) == before - 150.0
+
+
+@pytest.mark.asyncio
+async def test_registrations_are_counted_once_across_refreshes(monkeypatch):
+    email = "john.doe@amazincorp.com"
+    ledger = get_budget_ledger()
+    before = ledger.remaining(email, 2025)
+    monkeypatch.setattr(config, "budget_ledger_refresh_seconds", 0.0)
+
+    await register_new_training(
+        email=email,
+        name="Kubernetes Basics",
+        description="Introduction to Kubernetes",
+        skills="Kubernetes",
+        date="2025-03-01",
+        cost_usd=150.0,
+        url="https://example.com/kubernetes",
+    )
+    # Counted once, whether a refresh finds it buffered or written
+    refresh_budget_ledger()
+    assert ledger.remaining(email, 2025) == before - 150.0
+    bigquery_operations.flush_writes()
+    refresh_budget_ledger()
+    assert ledger.remaining(email, 2025) == before - 150.0
+
+    # Written by another worker process, picked up by a background refresh
+    bigquery_operations.get_backend().insert_rows(
+        bigquery_operations.get_table_ref("employee_trainings"),
+        [{"email": email, "name": "Go", "date": "2025-05-01", "cost_usd": 100.0}],
+    )
+    bigquery_operations.get_query_cache().clear()
+    assert get_budget_ledger() is ledger
+    budget_ledger._refresh_thread.join()
+    assert ledger.remaining(email, 2025) == before - 250.0
+
+
+@pytest.mark.asyncio
+async def test_dead_lettered_registrations_are_no_longer_counted():
+    email = "john.doe@amazincorp.com"
+    ledger = get_budget_ledger()
+    before = ledger.remaining(email, 2025)
+    training = {
+        "email": email,
+        "name": "Kubernetes Basics",
+        "description": "Introduction to Kubernetes",
+        "skills": "Kubernetes",
+        "date": "2025-03-01",
+        "cost_usd": 150.0,
+        "url": "https://example.com/kubernetes",
+    }
+    await register_new_training(**training)
+    assert ledger.remaining(email, 2025) == before - 150.0
+
+    # The write pipeline gives up on the row after its last attempt
+    bigquery_operations._on_row_dead_lettered("employee_trainings", training)
+
+    assert ledger.remaining(email, 2025) == before
+
+
+@pytest.mark.asyncio
+async def test_trainings_registered_by_other_workers_are_counted(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "server_workers", 2)
+    monkeypatch.setattr(config, "write_feed_path", str(tmp_path / "write_feed.jsonl"))
+    monkeypatch.setattr(bigquery_operations, "_write_feed", None)
+    email = "john.doe@amazincorp.com"
+    before = await get_employee_remaining_training_budget(email)
+
+    # Written and shared by another worker process
+    training = {
+        "email": email,
+        "name": "Kubernetes Basics",
+        "date": datetime.date.today().isoformat(),
+        "cost_usd": 150.0,
+    }
+    bigquery_operations.get_backend().insert_rows(
+        bigquery_operations.get_table_ref("employee_trainings"), [training]
+    )
+    with monkeypatch.context() as other_worker:
+        other_worker.setattr(write_feed.os, "getpid", lambda: -1)
+        WriteFeed(config.write_feed_path).publish("employee_trainings", [training])
+
+    assert await get_employee_remaining_training_budget(email) == before - 150.0
+    refresh_budget_ledger()
+    assert await get_employee_remaining_training_budget(email) == before - 150.0
+
+
+@pytest.mark.asyncio
+async def test_invalid_dates_are_rejected_before_the_row_is_accepted():
+    email = "john.doe@amazincorp.com"
+    before = get_budget_ledger().spent(email, 2025)
+
+    with pytest.raises(ValueError, match="expected YYYY-MM-DD"):
+        await register_new_training(
+            email=email,
+            name="Kubernetes Basics",
+            description="Introduction to Kubernetes",
+            skills="Kubernetes",
+            date="next Monday",
+            cost_usd=150.0,
+            url="https://example.com/kubernetes",
+        )
+
+    bigquery_operations.flush_writes()
+    reset_budget_ledger()
+    assert get_budget_ledger().spent(email, 2025) == before
@@ -0,0 +1,62 @@
+"""
+Tests for merging the buffered rows into query results.
+"""
+
+import datetime
+
+import pyarrow as pa
+
+from adk_hackathon_professional_development_agent.utils.buffered_reads import (
+    can_merge_buffered_rows,
+    merge_buffered_rows,
+)
+
+QUERY = (
+    "SELECT email, name, date, cost_usd "
+    "FROM `local.amazincorp.employee_trainings` WHERE email IN UNNEST(@emails)"
+)
+PARAMS = [{"name": "emails", "value": ["john.doe@amazincorp.com"]}]
+WRITTEN = {
+    "email": "john.doe@amazincorp.com",
+    "name": "Go",
+    "date": datetime.date(2025, 5, 1),
+    "cost_usd": 100.0,
+}
+
+
+def buffered(email, name):
+    row = {"email": email, "name": name, "date": "2025-05-01", "cost_usd": "150"}
+    return "employee_trainings", row
+
+
+def test_only_aggregation_free_lookups_by_parameter_are_merged():
+    assert can_merge_buffered_rows(QUERY)
+    assert can_merge_buffered_rows(
+        "SELECT * FROM `p.d.employee_trainings` WHERE email = @email AND name = @name"
+    )
+    assert not can_merge_buffered_rows(
+        "SELECT email, SUM(cost_usd) FROM `p.d.employee_trainings` GROUP BY email"
+    )
+    assert not can_merge_buffered_rows(
+        "SELECT * FROM `p.d.employee_trainings` WHERE date >= @start"
+    )
+    # Without the key columns, written rows cannot be told apart from buffered ones
+    assert not can_merge_buffered_rows("SELECT email FROM `p.d.employee_trainings`")
+
+
+def test_matching_unwritten_rows_are_appended_as_returned_by_the_backend():
+    buffered_rows = [
+        buffered("john.doe@amazincorp.com", "Rust"),
+        buffered("jane.doe@amazincorp.com", "Rust"),
+        # Written while the query ran
+        buffered("john.doe@amazincorp.com", "Go"),
+    ]
+
+    rows = merge_buffered_rows(QUERY, PARAMS, [WRITTEN], buffered_rows)
+    table = merge_buffered_rows(
+        QUERY, PARAMS, pa.Table.from_pylist([WRITTEN]), buffered_rows
+    )
+
+    expected = [WRITTEN, {**WRITTEN, "name": "Rust", "cost_usd": 150.0}]
+    assert rows == expected
+    assert table.to_pylist() == expected
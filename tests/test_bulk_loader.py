@@ -0,0 +1,154 @@
+"""
+Tests for the bulk loader of the tables, against the embedded local data backend.
+"""
+
+import datetime
+import json
+import shutil
+
+import pytest
+from google.cloud import bigquery
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils.bulk_loader import (
+    find_source_files,
+    load_table,
+    load_tables,
+)
+from adk_hackathon_professional_development_agent.utils.data_backends import (
+    LocalBackend,
+)
+
+DATASET_ID = "amazincorp"
+TABLE_REF = "test-project.amazincorp.employee_trainings"
+
+
+@pytest.fixture
+def backend(tmp_path):
+    # An empty data directory, so that the backend does not load the CSV files itself
+    (tmp_path / "empty").mkdir()
+    return LocalBackend(
+        data_dir=str(tmp_path / "empty"),
+        database_path=str(tmp_path / "local.db"),
+        project_id="test-project",
+    )
+
+
+@pytest.fixture
+def trainings_csv(tmp_path):
+    path = tmp_path / "employee_trainings.csv"
+    shutil.copy(f"{config.local_data_dir}/employee_trainings.csv", path)
+    return path
+
+
+def _count_upserts(backend, monkeypatch):
+    upserted = []
+    upsert_rows = backend.upsert_rows
+
+    def counting_upsert_rows(table_ref, rows, key_columns):
+        if table_ref == TABLE_REF:
+            upserted.extend(rows)
+        upsert_rows(table_ref, rows, key_columns)
+
+    monkeypatch.setattr(backend, "upsert_rows", counting_upsert_rows)
+    return upserted
+
+
+def test_only_new_and_changed_rows_are_written(backend, trainings_csv, monkeypatch):
+    first = load_table(
+        backend, DATASET_ID, "employee_trainings", str(trainings_csv), chunk_rows=7
+    )
+    assert (first.rows, first.inserted, first.unchanged) == (31, 31, 0)
+
+    upserted = _count_upserts(backend, monkeypatch)
+    second = load_table(backend, DATASET_ID, "employee_trainings", str(trainings_csv))
+    assert (second.inserted, second.updated, second.unchanged) == (0, 0, 31)
+    assert upserted == []
+
+    # Raise the cost of the first training, drop the second one and add a new one
+    lines = trainings_csv.read_text(encoding="utf-8").splitlines()
+    lines[1] = lines[1].replace("|299|", "|349|")
+    del lines[2]
+    lines.append("new.hire@amazincorp.com|Onboarding|Onboarding|SQL|2025-01-06|0|")
+    trainings_csv.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    third = load_table(
+        backend,
+        DATASET_ID,
+        "employee_trainings",
+        str(trainings_csv),
+        delete_missing=True,
+    )
+
+    assert (third.inserted, third.updated, third.unchanged, third.deleted) == (
+        1,
+        1,
+        29,
+        1,
+    )
+    assert [row["email"] for row in upserted] == [
+        "john.doe@amazincorp.com",
+        "new.hire@amazincorp.com",
+    ]
+    rows = backend.query(
+        f"SELECT name, date, cost_usd FROM `{TABLE_REF}` "
+        "WHERE email = @email ORDER BY date",
+        [bigquery.ScalarQueryParameter("email", "STRING", "john.doe@amazincorp.com")],
+    )
+    assert rows[0] == {
+        "name": "Professional Cloud Architect",
+        "date": datetime.date(2024, 1, 15),
+        "cost_usd": 349.0,
+    }
+    assert "Python Mastery Workshop" not in [row["name"] for row in rows]
+    (count,) = backend.query(f"SELECT COUNT(*) AS count FROM `{TABLE_REF}`")
+    assert count["count"] == 31
+
+
+@pytest.mark.parametrize(
+    "line, error",
+    [
+        ("a@amazincorp.com|Course|Description|SQL|2024-13-01|10|", "invalid date"),
+        ("a@amazincorp.com|Course|Description|SQL|2024-01-01|ten|", "invalid cost_usd"),
+        ("a@amazincorp.com|Course|Description", "expected 7 fields"),
+        ("|Course|Description|SQL|2024-01-01|10|", "empty key column email"),
+    ],
+)
+def test_invalid_rows_are_reported_with_their_line(backend, tmp_path, line, error):
+    path = tmp_path / "employee_trainings.csv"
+    path.write_text(
+        "email|name|description|skills|date|cost_usd|url\n"
+        "b@amazincorp.com|Course|Description|SQL|2024-01-01|10|\n"
+        f"{line}\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match=f"employee_trainings.csv:3: {error}"):
+        load_table(backend, DATASET_ID, "employee_trainings", str(path))
+
+
+def test_tables_are_loaded_in_parallel_from_csv_and_ndjson(backend, tmp_path):
+    data_dir = tmp_path / "hr"
+    data_dir.mkdir()
+    shutil.copy(f"{config.local_data_dir}/project_portfolio.csv", data_dir)
+    with open(data_dir / "employee_profiles.ndjson", "w", encoding="utf-8") as file:
+        for index in range(25):
+            profile = {
+                "name": f"Employee {index}",
+                "email": f"employee{index}@amazincorp.com",
+                "department": "IT",
+                "role": "Engineer",
+                "skills": "SQL",
+            }
+            file.write(json.dumps(profile) + "\n")
+    (data_dir / "employee_trainings.jsonl").write_text(
+        '{"email": "a@amazincorp.com", "salary": 1}\n', encoding="utf-8"
+    )
+
+    sources = find_source_files(str(data_dir))
+    results = load_tables(backend, DATASET_ID, sources, chunk_rows=10)
+
+    assert results["employee_profiles"].inserted == 25
+    assert results["project_portfolio"].inserted == 10
+    # A table failing validation does not stop the others
+    assert "unknown columns ['salary']" in results["employee_trainings"].error
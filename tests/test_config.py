@@ -0,0 +1,36 @@
+"""
+Tests for the validation of the configuration of the backends.
+"""
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import Config
+
+
+@pytest.mark.parametrize(
+    "data_backend, company_information_backend, missing",
+    [
+        ("local", "local_index", []),
+        (
+            "local",
+            "vertex_ai_search",
+            ["GOOGLE_CLOUD_PROJECT", "VERTEX_AI_SEARCH_DATA_STORE_ID"],
+        ),
+        ("bigquery", "local_index", ["GOOGLE_CLOUD_PROJECT"]),
+    ],
+)
+def test_cloud_variables_are_only_required_by_the_cloud_backends(
+    data_backend, company_information_backend, missing
+):
+    settings = Config()
+    settings.data_backend = data_backend
+    settings.company_information_backend = company_information_backend
+    settings.google_cloud_project = ""
+    settings.vertex_ai_search_data_store_id = ""
+
+    assert settings.missing_variables == missing
+    if missing:
+        with pytest.raises(ValueError, match=", ".join(missing)):
+            settings.validate()
+    else:
+        settings.validate()
@@ -0,0 +1,136 @@
+"""
+Tests for the context prefetch stage of the skills agent.
+"""
+
+import asyncio
+import functools
+import json
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from google.genai import types
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools.company_documents_search_tool import (
+    search_company_documents,
+)
+from adk_hackathon_professional_development_agent.utils import context_prefetch
+from adk_hackathon_professional_development_agent.utils.context_prefetch import (
+    PREFETCHED_STATE_KEYS,
+    create_skills_context_prefetch,
+)
+
+prefetch_skills_context = create_skills_context_prefetch(
+    functools.partial(search_company_documents, top_k=3)
+)
+
+
+@pytest.fixture(autouse=True)
+def local_sources(local_backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "company_information_backend", "local_index")
+    monkeypatch.setattr(config, "document_index_dir", str(tmp_path))
+
+
+def make_context(text, state=None):
+    return MagicMock(
+        state={} if state is None else state,
+        user_content=types.Content(role="user", parts=[types.Part(text=text)]),
+    )
+
+
+@pytest.mark.asyncio
+async def test_prefetch_writes_all_sources_into_state():
+    context = make_context("How can I improve? My email is priya.sharma@amazincorp.com")
+
+    assert await prefetch_skills_context(context) is None
+
+    state = context.state
+    assert state["employee_email"] == "priya.sharma@amazincorp.com"
+    profile = json.loads(state[PREFETCHED_STATE_KEYS["employee_profile"]])
+    assert profile["email"] == "priya.sharma@amazincorp.com"
+    assert json.loads(state[PREFETCHED_STATE_KEYS["project_portfolio"]])
+    policy = json.loads(state[PREFETCHED_STATE_KEYS["company_policy"]])
+    assert policy[0]["source"].endswith(".pdf")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_without_email_does_nothing():
+    context = make_context("What skills should I learn?")
+
+    await prefetch_skills_context(context)
+
+    assert context.state == {}
+
+
+@pytest.mark.asyncio
+async def test_sources_are_fetched_concurrently(monkeypatch):
+    async def slow(*args, **kwargs):
+        await asyncio.sleep(0.2)
+        return {"ok": True}
+
+    async def failing(*args, **kwargs):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(context_prefetch, "get_employee_profile", slow)
+    monkeypatch.setattr(context_prefetch, "get_project_portfolio", failing)
+    context = make_context("Hi", state={"employee_email": "a@amazincorp.com"})
+
+    started = time.perf_counter()
+    await create_skills_context_prefetch(slow)(context)
+
+    assert time.perf_counter() - started < 0.4
+    assert context.state[PREFETCHED_STATE_KEYS["company_information"]] == '{"ok": true}'
+    assert context.state[PREFETCHED_STATE_KEYS["project_portfolio"]] == ""
+
+
+@pytest.mark.asyncio
+async def test_fresh_prefetch_is_reused_for_the_same_employee(monkeypatch):
+    calls = []
+
+    async def profile(email):
+        calls.append(email)
+        return {"email": email}
+
+    monkeypatch.setattr(context_prefetch, "get_employee_profile", profile)
+    context = make_context("Hi", state={"employee_email": "a@amazincorp.com"})
+
+    await prefetch_skills_context(context)
+    await prefetch_skills_context(context)
+    assert calls == ["a@amazincorp.com"]
+
+    await prefetch_skills_context(make_context("Me: b@amazincorp.com", context.state))
+    assert calls == ["a@amazincorp.com", "b@amazincorp.com"]
+
+    monkeypatch.setattr(config, "context_prefetch_ttl_seconds", 0)
+    await prefetch_skills_context(make_context("Hi", context.state))
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_company_sources_are_reused_for_another_employee(monkeypatch):
+    requests = []
+
+    async def ask_company_information(request):
+        requests.append(request)
+        return "AmazinCorp"
+
+    async def profile(email):
+        return {"email": email}
+
+    monkeypatch.setattr(context_prefetch, "get_employee_profile", profile)
+    prefetch = create_skills_context_prefetch(ask_company_information)
+    context = make_context("Hi", state={"employee_email": "a@amazincorp.com"})
+
+    await prefetch(context)
+    assert len(requests) == 2
+
+    await prefetch(make_context("Me: b@amazincorp.com", context.state))
+    assert len(requests) == 2
+    profile = json.loads(context.state[PREFETCHED_STATE_KEYS["employee_profile"]])
+    assert profile["email"] == "b@amazincorp.com"
+    assert context.state[PREFETCHED_STATE_KEYS["company_policy"]] == "AmazinCorp"
+
+    monkeypatch.setattr(config, "context_prefetch_ttl_seconds", 0)
+    await prefetch(make_context("Hi", context.state))
+    assert len(requests) == 4
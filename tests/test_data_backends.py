@@ -0,0 +1,115 @@
+"""
+Tests for the data backends.
+
+The local backend tests run against the CSV files under `input_data/bigquery`, and the
+BigQuery backend tests against a mocked client, so they do not need any Google Cloud
+credentials.
+"""
+
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import BadRequest
+from google.cloud import bigquery
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils import data_backends
+from adk_hackathon_professional_development_agent.utils.data_backends import (
+    BigQueryBackend,
+    LocalBackend,
+    StreamingBufferError,
+)
+
+
+@pytest.fixture
+def backend():
+    return LocalBackend(data_dir=config.local_data_dir, project_id="test-project")
+
+
+def test_loads_all_tables(backend):
+    (row,) = backend.query(
+        "SELECT COUNT(*) AS row_count FROM `test-project.amazincorp.employee_profiles`"
+    )
+    assert row["row_count"] == 15
+
+
+def test_scalar_parameter_lookup(backend):
+    rows = backend.query(
+        "SELECT name, skills FROM `test-project.amazincorp.employee_profiles` WHERE email = @email",
+        [bigquery.ScalarQueryParameter("email", "STRING", "john.doe@amazincorp.com")],
+    )
+    assert rows == [{"name": "John Doe", "skills": "SQL, Python, Java, Google Cloud"}]
+
+
+def test_array_parameter_lookup_and_date_columns(backend):
+    rows = backend.query(
+        "SELECT email, date, cost_usd FROM `test-project.amazincorp.employee_trainings` "
+        "WHERE email IN UNNEST(@emails)",
+        [
+            bigquery.ArrayQueryParameter(
+                "emails",
+                "STRING",
+                ["john.doe@amazincorp.com", "johnnie.smith@amazincorp.com"],
+            )
+        ],
+    )
+    assert {row["email"] for row in rows} == {
+        "john.doe@amazincorp.com",
+        "johnnie.smith@amazincorp.com",
+    }
+    assert all(isinstance(row["date"], datetime.date) for row in rows)
+    assert all(isinstance(row["cost_usd"], float) for row in rows)
+
+
+def test_insert_rows(backend):
+    backend.insert_rows(
+        "test-project.amazincorp.employee_trainings",
+        [
+            {
+                "email": "new.hire@amazincorp.com",
+                "name": "BigQuery Fundamentals",
+                "description": "Introduction to BigQuery",
+                "skills": "BigQuery, SQL",
+                "date": "2025-05-01",
+                "cost_usd": 99.5,
+                "url": "https://example.com/bigquery",
+            }
+        ],
+    )
+    (row,) = backend.query(
+        "SELECT 3500.0 - SUM(cost_usd) AS remaining_training_budget "
+        "FROM `test-project.amazincorp.employee_trainings` WHERE email = @email",
+        [{"name": "email", "value": "new.hire@amazincorp.com"}],
+    )
+    assert row["remaining_training_budget"] == 3400.5
+
+
+def test_bigquery_merge_waits_for_the_streaming_buffer(monkeypatch):
+    client = MagicMock(project="test-project")
+    monkeypatch.setattr(bigquery, "Client", lambda project: client)
+    delays = []
+    monkeypatch.setattr(data_backends.time, "sleep", delays.append)
+    buffered = BadRequest(
+        "UPDATE or DELETE statement over table test-project.amazincorp.employee_trainings"
+        " would affect rows in the streaming buffer, which is not supported"
+    )
+    backend = BigQueryBackend(merge_max_attempts=3, merge_retry_seconds=1.0)
+    keys = [{"email": "john.doe@amazincorp.com", "name": "Go", "date": "2025-05-01"}]
+    table_ref = "test-project.amazincorp.employee_trainings"
+
+    client.query.return_value.result.side_effect = [buffered, None]
+    backend.delete_rows(table_ref, keys, ["email", "name", "date"])
+    assert delays == [1.0]
+
+    client.query.return_value.result.side_effect = buffered
+    with pytest.raises(StreamingBufferError):
+        backend.delete_rows(table_ref, keys, ["email", "name", "date"])
+    assert delays == [1.0, 1.0, 2.0]
+    # The staging table is dropped either way
+    assert client.delete_table.call_count == 2
+
+    client.query.return_value.result.side_effect = BadRequest("Syntax error")
+    with pytest.raises(BadRequest):
+        backend.delete_rows(table_ref, keys, ["email", "name", "date"])
+    assert delays == [1.0, 1.0, 2.0]
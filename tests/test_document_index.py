@@ -0,0 +1,128 @@
+"""
+Tests for the local document index.
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools.company_documents_search_tool import (
+    search_company_documents,
+)
+from adk_hackathon_professional_development_agent.utils import document_index
+from adk_hackathon_professional_development_agent.utils.document_index import (
+    DocumentIndex,
+    build_index,
+    chunk_document,
+    get_document_index,
+    read_index_version,
+    reset_document_index,
+)
+
+
+@pytest.fixture(scope="module")
+def index_dir(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("document_index"))
+    build_index(config.company_documents_dir, path)
+    return path
+
+
+def test_chunk_document_overlaps_passages_across_pages():
+    pages = [" ".join(f"a{i}" for i in range(10)), " ".join(f"b{i}" for i in range(10))]
+
+    passages = chunk_document("doc.pdf", pages, passage_words=8, overlap_words=2)
+
+    assert [passage["page"] for passage in passages] == [1, 1, 2]
+    assert passages[0]["text"].split()[-2:] == passages[1]["text"].split()[:2]
+    assert passages[-1]["text"].split()[-1] == "b9"
+
+
+def test_load_memory_maps_arrays(index_dir):
+    index = DocumentIndex.load(index_dir)
+
+    assert isinstance(index._posting_passages, np.memmap)
+    assert isinstance(index._vectors, np.memmap)
+
+
+def test_search_ranks_relevant_passages_first(index_dir):
+    index = DocumentIndex.load(index_dir)
+
+    passages = index.search("professional certification bonus", top_k=3)
+
+    assert len(passages) == 3
+    assert "Certification Bonus" in passages[0]["text"]
+    assert (
+        passages[0]["source"] == "Awesome Company Training and Development Policy.pdf"
+    )
+    assert [p["score"] for p in passages] == sorted(
+        (p["score"] for p in passages), reverse=True
+    )
+    assert index.search("zzzz qqqq") == []
+
+
+def test_search_without_vectors(tmp_path):
+    build_index(config.company_documents_dir, str(tmp_path), vector_dimensions=0)
+    index = DocumentIndex.load(str(tmp_path))
+
+    passages = index.search("company mission", top_k=1)
+
+    assert passages[0]["source"] == "Awesome Company_ Company Profile & Mission.pdf"
+
+
+@pytest.mark.asyncio
+async def test_search_company_documents_builds_missing_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_index.config, "document_index_dir", str(tmp_path))
+    reset_document_index()
+    try:
+        passages = await search_company_documents("training approval process", top_k=2)
+    finally:
+        reset_document_index()
+
+    assert len(passages) == 2
+    assert (tmp_path / read_index_version(str(tmp_path)) / "index.json").exists()
+
+
+def test_rebuild_keeps_live_index_and_is_reloaded(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_index.config, "document_index_dir", str(tmp_path))
+    monkeypatch.setattr(document_index.config, "document_index_check_seconds", 0)
+    build_index(config.company_documents_dir, str(tmp_path))
+    reset_document_index()
+    try:
+        index = get_document_index()
+        build_index(config.company_documents_dir, str(tmp_path), vector_dimensions=0)
+
+        # The memory-mapped files of the live index are left untouched
+        assert index.search("company mission", top_k=1)
+        reloaded = get_document_index()
+    finally:
+        reset_document_index()
+
+    assert reloaded is not index
+    assert reloaded.version == read_index_version(str(tmp_path)) != index.version
+    assert reloaded._vectors.shape[1] == 0
+
+
+def test_missing_index_is_built_once_by_concurrent_workers(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_index.config, "document_index_dir", str(tmp_path))
+    builds = []
+
+    def slow_build(pdf_dir, index_dir):
+        builds.append(index_dir)
+        time.sleep(0.1)
+        build_index(pdf_dir, index_dir, vector_dimensions=0)
+
+    monkeypatch.setattr(document_index, "build_index", slow_build)
+    # Threads take the file lock through their own open file, like worker processes
+    workers = [
+        threading.Thread(target=document_index._build_missing_index) for _ in range(3)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert builds == [str(tmp_path)]
+    assert read_index_version(str(tmp_path)) is not None
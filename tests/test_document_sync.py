@@ -0,0 +1,114 @@
+"""
+Tests for the incremental sync of the company documents, against the local stand-ins
+of the bucket and the data store.
+"""
+
+import pytest
+
+from adk_hackathon_professional_development_agent.utils.document_sync import (
+    LocalDataStore,
+    LocalDocumentStorage,
+    get_document_id,
+    sync_documents,
+)
+
+
+@pytest.fixture
+def pdf_dir(tmp_path):
+    directory = tmp_path / "pdfs"
+    directory.mkdir()
+    (directory / "Policy.pdf").write_bytes(b"%PDF-1.4 policy v1")
+    (directory / "Company Profile.pdf").write_bytes(b"%PDF-1.4 profile")
+    return directory
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return LocalDocumentStorage(str(tmp_path / "bucket"))
+
+
+@pytest.fixture
+def data_store(tmp_path):
+    return LocalDataStore(str(tmp_path / "data_store.json"))
+
+
+async def _sync(pdf_dir, storage, data_store, **kwargs):
+    progress = []
+    result = await sync_documents(
+        str(pdf_dir),
+        storage,
+        data_store,
+        poll_seconds=0,
+        on_progress=lambda *report: progress.append(report),
+        **kwargs,
+    )
+    return result, progress
+
+
+@pytest.mark.asyncio
+async def test_only_changed_documents_are_uploaded(pdf_dir, storage, data_store):
+    first, progress = await _sync(pdf_dir, storage, data_store)
+    version = storage.read_version()
+
+    assert first.created_data_store
+    assert first.uploaded == ["Company Profile.pdf", "Policy.pdf"]
+    assert progress[-1] == ("Importing documents (batch 1/1)", 2, 2)
+    assert any(processed < total for _, processed, total in progress)
+
+    second, progress = await _sync(pdf_dir, storage, data_store)
+
+    assert not second.created_data_store and not second.changed
+    assert second.unchanged == ["Company Profile.pdf", "Policy.pdf"]
+    assert progress == []
+    assert storage.read_version() == version is not None
+
+    (pdf_dir / "Policy.pdf").write_bytes(b"%PDF-1.4 policy v2")
+    (pdf_dir / "Company Profile.pdf").unlink()
+    (pdf_dir / "Mission.pdf").write_bytes(b"%PDF-1.4 mission")
+
+    third, _ = await _sync(pdf_dir, storage, data_store)
+
+    assert third.uploaded == ["Mission.pdf", "Policy.pdf"]
+    assert third.deleted == ["Company Profile.pdf"]
+    assert data_store.list_document_ids() == sorted(
+        [get_document_id("Mission.pdf"), get_document_id("Policy.pdf")]
+    )
+    assert set(storage.read_manifest()) == {"Mission.pdf", "Policy.pdf"}
+    # The answers cached from the previous documents are invalidated
+    assert storage.read_version() != version
+
+
+@pytest.mark.asyncio
+async def test_existing_data_store_is_reused_and_pruned(pdf_dir, storage, data_store):
+    await _sync(pdf_dir, storage, data_store)
+    # Imported by a full GCS import, before the documents were synced
+    unmanaged = data_store.import_documents(
+        [("auto-generated-id", storage.upload(str(pdf_dir / "Policy.pdf"), "x.pdf"))]
+    )
+    while not unmanaged.done():
+        pass
+
+    result, _ = await _sync(pdf_dir, storage, data_store, prune_unmanaged=True)
+
+    assert not result.created_data_store
+    assert result.uploaded == []
+    assert result.deleted == ["auto-generated-id"]
+    assert "auto-generated-id" not in data_store.list_document_ids()
+
+
+@pytest.mark.asyncio
+async def test_failed_import_is_retried_by_the_next_sync(
+    pdf_dir, storage, data_store, monkeypatch
+):
+    upload = storage.upload
+    monkeypatch.setattr(storage, "upload", lambda path, name: "file:///missing.pdf")
+
+    with pytest.raises(RuntimeError, match="2 documents failed"):
+        await _sync(pdf_dir, storage, data_store)
+    assert storage.read_manifest() == {}
+
+    monkeypatch.setattr(storage, "upload", upload)
+    result, _ = await _sync(pdf_dir, storage, data_store)
+
+    assert result.uploaded == ["Company Profile.pdf", "Policy.pdf"]
+    assert len(data_store.list_document_ids()) == 2
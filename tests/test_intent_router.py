@@ -0,0 +1,120 @@
+"""
+Tests for the local intent router running in front of the IntentDetectionAgent.
+"""
+
+import os
+from types import SimpleNamespace
+
+import pytest
+from google.adk.models import LlmRequest
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from adk_hackathon_professional_development_agent.agent import root_agent
+from adk_hackathon_professional_development_agent.utils.intent_router import (
+    SEED_EXAMPLES,
+    extract_email,
+    get_intent_router,
+    load_eval_examples,
+    route_intent,
+)
+
+
+def make_request(text):
+    return LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=text)])]
+    )
+
+
+def test_extract_email():
+    assert (
+        extract_email("My email is: Priya.Sharma@amazincorp.com.")
+        == "priya.sharma@amazincorp.com"
+    )
+    assert extract_email("What skills should I learn?") is None
+
+
+def test_router_classifies_the_sub_agents():
+    router = get_intent_router()
+
+    assert router.predict("How much training budget do I have left?")[0] == (
+        "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent"
+    )
+    assert router.predict("Does the company policy allow language courses?")[0] == (
+        "ProfessionalDevelopmentPolicyAgent"
+    )
+    assert router.predict("Please register me for the Kubernetes course")[0] == (
+        "TrainingRegistererAgent"
+    )
+    assert router.predict("zzz")[0] is None
+
+
+def test_router_routes_the_held_out_evaluation_sets():
+    eval_examples = load_eval_examples(os.path.dirname(__file__))
+    router = get_intent_router()
+
+    seed_texts = {text for texts in SEED_EXAMPLES.values() for text in texts}
+    assert eval_examples
+    for text, agent_name in eval_examples:
+        assert text not in seed_texts
+        assert router.predict(text)[0] == agent_name
+
+
+def test_messages_without_email_fall_back_to_the_llm_router():
+    callback_context = SimpleNamespace(state={})
+
+    response = route_intent(
+        callback_context, make_request("How much training budget do I have left?")
+    )
+
+    assert response is None
+
+
+def test_email_from_an_earlier_turn_is_reused():
+    callback_context = SimpleNamespace(
+        state={"employee_email": "priya.sharma@amazincorp.com"}
+    )
+
+    response = route_intent(
+        callback_context, make_request("How much training budget do I have left?")
+    )
+
+    function_call = response.content.parts[0].function_call
+    assert function_call.args == {
+        "agent_name": "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent"
+    }
+
+
+@pytest.mark.asyncio
+async def test_confident_messages_are_transferred_without_the_llm():
+    runner = InMemoryRunner(agent=root_agent, app_name="test")
+    session = await runner.session_service.create_session(
+        app_name="test", user_id="user"
+    )
+    message = types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                text="How much training budget do I have left? "
+                "My email is priya.sharma@amazincorp.com"
+            )
+        ],
+    )
+
+    events = runner.run_async(
+        user_id="user", session_id=session.id, new_message=message
+    )
+    # Stop before the sub-agent calls its LLM
+    first_event = await anext(events)
+    await events.aclose()
+
+    assert first_event.author == "IntentDetectionAgent"
+    function_call = first_event.get_function_calls()[0]
+    assert function_call.name == "transfer_to_agent"
+    assert function_call.args == {
+        "agent_name": "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent"
+    }
+    session = await runner.session_service.get_session(
+        app_name="test", user_id="user", session_id=session.id
+    )
+    assert session.state["employee_email"] == "priya.sharma@amazincorp.com"
@@ -0,0 +1,62 @@
+"""
+Tests for the metrics registry and the data access instrumentation.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.metrics import (
+    MetricsRegistry,
+    clear_tool_call_labels,
+    label_tool_call,
+    registry,
+)
+
+pytestmark = pytest.mark.usefixtures("local_backend")
+
+
+def test_render_prometheus_text_format():
+    metrics = MetricsRegistry()
+    metrics.counter("calls_total", "Calls.", ["agent"]).inc(agent="A")
+    metrics.histogram("latency_seconds", "Latency.", ["agent"], buckets=(1,)).observe(
+        0.5, agent="A"
+    )
+
+    rendered = metrics.render()
+
+    assert "# TYPE calls_total counter" in rendered
+    assert 'calls_total{agent="A"} 1' in rendered
+    assert 'latency_seconds_bucket{agent="A",le="1"} 1' in rendered
+    assert 'latency_seconds_bucket{agent="A",le="+Inf"} 1' in rendered
+    assert 'latency_seconds_count{agent="A"} 1' in rendered
+
+
+@pytest.mark.asyncio
+async def test_queries_are_tagged_with_the_calling_tool_and_agent():
+    labels = {
+        "operation": "query_multiple_rows",
+        "tool": "get_project_portfolio",
+        "agent": "SkillsAgent",
+    }
+    calls = registry.histogram("bigquery_call_duration_seconds", "")
+    cache_hits = registry.counter("bigquery_cache_hits_total", "")
+    rows = registry.histogram("bigquery_call_rows", "")
+    calls_before = calls.count(**labels)
+    hits_before = cache_hits.value(cache="query_cache", **labels)
+
+    tool = SimpleNamespace(name="get_project_portfolio")
+    tool_context = SimpleNamespace(agent_name="SkillsAgent")
+    label_tool_call(tool, {}, tool_context)
+    try:
+        query = "SELECT name FROM `local.amazincorp.project_portfolio`"
+        await bigquery_operations.query_multiple_rows_async(query)
+        await bigquery_operations.query_multiple_rows_async(query)
+    finally:
+        clear_tool_call_labels(tool, {}, tool_context, None)
+
+    assert calls.count(**labels) == calls_before + 2
+    assert cache_hits.value(cache="query_cache", **labels) == hits_before + 1
+    assert rows.quantile(1.0, **labels) > 0
+    assert "bigquery_call_queue_seconds_count" in registry.render()
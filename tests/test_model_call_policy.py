@@ -0,0 +1,171 @@
+"""
+Tests for the deadline, hedging, retry and fallback policy of the LLM calls.
+
+The policy is exercised against a local stand-in model, injecting latency and errors.
+"""
+
+import asyncio
+import time
+from typing import ClassVar, List
+
+import pytest
+from google.adk.models import BaseLlm, LlmRequest, LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import errors, types
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils import model_call_policy
+from adk_hackathon_professional_development_agent.utils.model_call_policy import (
+    MIN_LATENCY_SAMPLES,
+    PolicyLlm,
+    get_model,
+    is_retryable,
+    latency_tracker,
+)
+
+
+class LatencyInjectingLlm(BaseLlm):
+    """Stand-in model answering with its name after the latency of each call."""
+
+    # Per call, in order: the latency in seconds, or an error to raise
+    script: ClassVar[List[object]] = []
+    calls: ClassVar[List[str]] = []
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"latency-stub-.*"]
+
+    async def generate_content_async(self, llm_request: LlmRequest, stream=False):
+        step = self.script.pop(0) if self.script else 0.0
+        self.calls.append(self.model)
+        if isinstance(step, BaseException):
+            raise step
+        await asyncio.sleep(step)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[types.Part(text=self.model)])
+        )
+
+
+LLMRegistry.register(LatencyInjectingLlm)
+
+
+@pytest.fixture(autouse=True)
+def policy(monkeypatch):
+    monkeypatch.setattr(config, "model_call_deadline_seconds", 2.0)
+    monkeypatch.setattr(config, "model_call_deadlines", "")
+    monkeypatch.setattr(config, "model_call_max_retries", 2)
+    monkeypatch.setattr(config, "model_call_hedging_enabled", True)
+    monkeypatch.setattr(config, "model_call_hedge_min_delay_seconds", 0.05)
+    monkeypatch.setattr(model_call_policy, "RETRY_BACKOFF_SECONDS", 0.01)
+    LatencyInjectingLlm.script = []
+    LatencyInjectingLlm.calls = []
+    latency_tracker.clear()
+    yield
+    latency_tracker.clear()
+
+
+def _llm() -> PolicyLlm:
+    return PolicyLlm(
+        model="latency-stub-primary",
+        agent_name="TestAgent",
+        fallback_model="latency-stub-fallback",
+    )
+
+
+async def _answer(llm: PolicyLlm) -> str:
+    request = LlmRequest(model=llm.model, contents=[])
+    responses = [response async for response in llm.generate_content_async(request)]
+    return "".join(part.text for part in responses[-1].content.parts)
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_after_the_observed_p95():
+    for _ in range(MIN_LATENCY_SAMPLES):
+        latency_tracker.observe("TestAgent", 0.01)
+    LatencyInjectingLlm.script = [1.5, 0.01]
+
+    started = time.perf_counter()
+    answer = await _answer(_llm())
+
+    assert answer == "latency-stub-primary"
+    assert time.perf_counter() - started < 0.5
+    assert len(LatencyInjectingLlm.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_hedged_requests_are_capped_at_a_share_of_the_calls(monkeypatch):
+    monkeypatch.setattr(config, "model_call_hedge_max_share", 0.1)
+    # Earns two hedged requests
+    for _ in range(MIN_LATENCY_SAMPLES):
+        latency_tracker.observe("TestAgent", 0.01)
+    LatencyInjectingLlm.script = [0.2, 0.01] * 2 + [0.2]
+
+    for _ in range(3):
+        await _answer(_llm())
+
+    assert len(LatencyInjectingLlm.calls) == 5
+
+
+@pytest.mark.asyncio
+async def test_calls_are_not_hedged_before_enough_latencies_are_observed():
+    LatencyInjectingLlm.script = [0.2]
+
+    await _answer(_llm())
+
+    assert LatencyInjectingLlm.calls == ["latency-stub-primary"]
+
+
+@pytest.mark.asyncio
+async def test_transient_errors_are_retried():
+    LatencyInjectingLlm.script = [
+        errors.ServerError(503, {"error": {"message": "Unavailable"}}),
+        0.0,
+    ]
+
+    assert await _answer(_llm()) == "latency-stub-primary"
+    assert LatencyInjectingLlm.calls == ["latency-stub-primary"] * 2
+
+
+@pytest.mark.asyncio
+async def test_falls_back_once_the_retries_are_exhausted():
+    LatencyInjectingLlm.script = [
+        errors.ServerError(500, {"error": {"message": "Internal"}})
+    ] * 3
+
+    assert await _answer(_llm()) == "latency-stub-fallback"
+    assert LatencyInjectingLlm.calls[-1] == "latency-stub-fallback"
+
+
+@pytest.mark.asyncio
+async def test_falls_back_once_the_deadline_is_exceeded(monkeypatch):
+    monkeypatch.setattr(config, "model_call_deadlines", "TestAgent=0.1")
+    LatencyInjectingLlm.script = [5.0]
+
+    started = time.perf_counter()
+    answer = await _answer(_llm())
+
+    assert answer == "latency-stub-fallback"
+    assert time.perf_counter() - started < 1.0
+
+
+@pytest.mark.asyncio
+async def test_non_transient_errors_are_raised():
+    LatencyInjectingLlm.script = [
+        errors.ClientError(400, {"error": {"message": "Invalid argument"}})
+    ]
+
+    with pytest.raises(errors.ClientError):
+        await _answer(_llm())
+    assert LatencyInjectingLlm.calls == ["latency-stub-primary"]
+
+
+def test_retryable_errors():
+    assert is_retryable(errors.ClientError(429, {"error": {"message": "Quota"}}))
+    assert is_retryable(ConnectionResetError())
+    assert not is_retryable(ValueError())
+
+
+def test_get_model_without_policy(monkeypatch):
+    monkeypatch.setattr(config, "model_call_policy_enabled", False)
+
+    assert get_model("TestAgent") == config.model_name
@@ -0,0 +1,100 @@
+"""
+Tests for the read-through query cache and its invalidation by the training registration tool.
+"""
+
+import time
+
+import pytest
+
+from adk_hackathon_professional_development_agent.tools.employee_training_history_tool import (
+    get_employee_training_history,
+)
+from adk_hackathon_professional_development_agent.tools.register_new_training_tool import (
+    register_new_training,
+)
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.query_cache import QueryCache
+
+QUERY = "SELECT * FROM `local.amazincorp.employee_trainings` WHERE email = @email"
+
+
+def _params(email):
+    return [{"name": "email", "value": email}]
+
+
+def test_lru_eviction():
+    cache = QueryCache(max_entries=2)
+    for email in ["a@x.com", "b@x.com"]:
+        cache.put(cache.make_key(QUERY, _params(email)), [email], QUERY, _params(email))
+    cache.get(cache.make_key(QUERY, _params("a@x.com")))
+    cache.put(
+        cache.make_key(QUERY, _params("c@x.com")), ["c"], QUERY, _params("c@x.com")
+    )
+
+    assert cache.get(cache.make_key(QUERY, _params("a@x.com")))[0]
+    assert not cache.get(cache.make_key(QUERY, _params("b@x.com")))[0]
+    assert cache.stats["evictions"] == 1
+
+
+def test_per_table_ttl():
+    cache = QueryCache(max_entries=10, ttl_seconds={"employee_trainings": 0.01})
+    key = cache.make_key(QUERY, _params("a@x.com"))
+    cache.put(key, [], QUERY, _params("a@x.com"))
+    time.sleep(0.02)
+    assert cache.get(key) == (False, None)
+
+
+def test_cached_rows_are_copies():
+    cache = QueryCache(max_entries=10)
+    key = cache.make_key(QUERY, _params("a@x.com"))
+    cache.put(key, [{"date": "2024-01-01"}], QUERY, _params("a@x.com"))
+    cache.get(key)[1][0]["date"] = "changed"
+    assert cache.get(key)[1] == [{"date": "2024-01-01"}]
+
+
+@pytest.mark.asyncio
+async def test_registering_a_training_only_evicts_that_employees_entries(
+    local_backend,
+):
+    cache = bigquery_operations.get_query_cache()
+    await get_employee_training_history("john.doe@amazincorp.com")
+    history = await get_employee_training_history("jane.doe@amazincorp.com")
+
+    await register_new_training(
+        email="jane.doe@amazincorp.com",
+        name="Kubernetes Basics",
+        description="Introduction to Kubernetes",
+        skills="Kubernetes",
+        date="2025-03-01",
+        cost_usd=150.0,
+        url="https://example.com/kubernetes",
+    )
+    bigquery_operations.flush_writes()
+
+    hits = cache.stats["hits"]
+    await get_employee_training_history("john.doe@amazincorp.com")
+    assert cache.stats["hits"] == hits + 1
+    assert len(await get_employee_training_history("jane.doe@amazincorp.com")) == (
+        len(history) + 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_registered_training_is_read_back_before_the_flush(local_backend):
+    history = await get_employee_training_history("jane.doe@amazincorp.com")
+
+    await register_new_training(
+        email="jane.doe@amazincorp.com",
+        name="Terraform Basics",
+        description="Introduction to Terraform",
+        skills="Terraform",
+        date="2025-03-01",
+        cost_usd=150.0,
+        url="https://example.com/terraform",
+    )
+
+    # The cached history is evicted, and the buffered row merged into the result
+    read_back = await get_employee_training_history("jane.doe@amazincorp.com")
+    assert len(read_back) == len(history) + 1
+    assert "Terraform Basics" in [training["name"] for training in read_back]
+    assert bigquery_operations._writer.pending_rows == 1
@@ -0,0 +1,135 @@
+"""
+Tests for single-flight query deduplication and batched employee email lookups.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools.employee_profile_tool import (
+    get_employee_profile,
+)
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.data_backends import (
+    LocalBackend,
+)
+from adk_hackathon_professional_development_agent.utils.request_coalescing import (
+    BatchLoader,
+    SingleFlight,
+)
+
+
+class CountingLocalBackend(LocalBackend):
+    """Local backend counting the queries it runs."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.queries = []
+
+    def query(self, query, params=None):
+        self.queries.append(query)
+        return super().query(query, params)
+
+    def query_arrow_with_statistics(self, query, params=None):
+        self.queries.append(query)
+        return super().query_arrow_with_statistics(query, params)
+
+
+def test_single_flight_shares_one_call():
+    single_flight = SingleFlight()
+    calls = []
+    barrier = threading.Barrier(5)
+
+    def slow_call():
+        calls.append(1)
+        time.sleep(0.1)
+        return [{"value": 1}]
+
+    def run():
+        barrier.wait()
+        return single_flight.do("key", slow_call)
+
+    with ThreadPoolExecutor(max_workers=5) as executor:
+        results = list(executor.map(lambda _: run(), range(5)))
+
+    assert len(calls) == 1
+    assert results == [[{"value": 1}]] * 5
+    assert len({id(result) for result in results}) == 5
+
+
+@pytest.mark.asyncio
+async def test_batch_loader_collects_keys_within_the_window():
+    batches = []
+
+    async def load_batch(keys):
+        batches.append(sorted(keys))
+        return {key: key.upper() for key in keys}
+
+    loader = BatchLoader(load_batch, window_seconds=0.01)
+    results = await asyncio.gather(*(loader.load(key) for key in ["a", "b", "a", "c"]))
+
+    assert results == ["A", "B", "A", "C"]
+    assert batches == [["a", "b", "c"]]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_batch_cancels_its_waiters():
+    started = asyncio.Event()
+
+    async def load_batch(keys):
+        started.set()
+        await asyncio.sleep(60)
+
+    loader = BatchLoader(load_batch, window_seconds=0.001)
+    waiters = [asyncio.ensure_future(loader.load(key)) for key in ["a", "a", "b"]]
+    await started.wait()
+    for task in loader._tasks:
+        task.cancel()
+
+    results = await asyncio.wait_for(
+        asyncio.gather(*waiters, return_exceptions=True), timeout=1
+    )
+    assert all(isinstance(r, asyncio.CancelledError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_the_others():
+    async def load_batch(keys):
+        await asyncio.sleep(0.05)
+        return {key: key.upper() for key in keys}
+
+    loader = BatchLoader(load_batch, window_seconds=0.001)
+    cancelled = asyncio.ensure_future(loader.load("a"))
+    other = asyncio.ensure_future(loader.load("a"))
+    await asyncio.sleep(0.01)
+    cancelled.cancel()
+
+    assert await other == "A"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_profile_lookups_use_a_single_query():
+    backend = CountingLocalBackend(data_dir=config.local_data_dir)
+    bigquery_operations.set_backend(backend)
+    try:
+        emails = [
+            "john.doe@amazincorp.com",
+            "jane.doe@amazincorp.com",
+            "sarah.chen@amazincorp.com",
+            "unknown@amazincorp.com",
+        ]
+        profiles = await asyncio.gather(*(get_employee_profile(e) for e in emails))
+
+        assert [profile["email"] for profile in profiles[:3]] == emails[:3]
+        assert profiles[3] is None
+        assert len(backend.queries) == 1
+        assert "IN UNNEST(@emails)" in backend.queries[0]
+
+        await get_employee_profile("jane.doe@amazincorp.com")
+        assert len(backend.queries) == 1
+    finally:
+        bigquery_operations.set_backend(None)
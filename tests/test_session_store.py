@@ -0,0 +1,207 @@
+"""
+Tests for the bounded session store and the compaction of the conversation history.
+"""
+
+import importlib
+import sys
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from google.adk.events import Event
+from google.genai import types
+from sqlalchemy import text
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.utils.history_compaction import (
+    compact_contents,
+)
+from adk_hackathon_professional_development_agent.utils.metrics import registry
+from adk_hackathon_professional_development_agent.utils.session_store import (
+    SUMMARY_AUTHOR,
+    SUMMARY_HEADER,
+    BoundedSessionService,
+)
+
+APP_NAME = "app"
+
+
+@pytest.fixture
+def session_service(tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "session_keep_recent_events", 4)
+    return BoundedSessionService(
+        db_url=f"sqlite:///{tmp_path / 'sessions.db'}", max_events=8, max_sessions=2
+    )
+
+
+def _text(role, value):
+    return types.Content(role=role, parts=[types.Part(text=value)])
+
+
+def _tool_call(name):
+    return types.Content(
+        role="model",
+        parts=[types.Part(function_call=types.FunctionCall(name=name, args={}))],
+    )
+
+
+def _tool_response(name):
+    return types.Content(
+        role="user",
+        parts=[
+            types.Part(
+                function_response=types.FunctionResponse(
+                    name=name, response={"result": "x" * 500}
+                )
+            )
+        ],
+    )
+
+
+async def _run_turn(session_service, session, turn):
+    invocation_id = f"invocation-{turn}"
+    for author, content in [
+        ("user", _text("user", f"Question {turn}?")),
+        ("Agent", _tool_call("get_employee_profile")),
+        ("Agent", _tool_response("get_employee_profile")),
+        ("Agent", _text("model", f"Answer {turn}. With details.")),
+    ]:
+        await session_service.append_event(
+            session,
+            Event(invocation_id=invocation_id, author=author, content=content),
+        )
+
+
+def test_sqlite_database_is_in_wal_mode(session_service):
+    with session_service.db_engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+
+
+@pytest.mark.asyncio
+async def test_old_invocations_are_compacted_into_a_summary(session_service):
+    session = await session_service.create_session(app_name=APP_NAME, user_id="u")
+
+    for turn in range(5):
+        await _run_turn(session_service, session, turn)
+
+    stored = await session_service.get_session(
+        app_name=APP_NAME, user_id="u", session_id=session.id
+    )
+    assert len(stored.events) <= 8
+    summary, *recent = stored.events
+    assert summary.author == SUMMARY_AUTHOR
+    summary_text = summary.content.parts[0].text
+    assert summary_text.startswith(SUMMARY_HEADER)
+    assert "- user: Question 0?" in summary_text
+    assert "- Agent: Answer 0. With details." in summary_text
+    assert "xxx" not in summary_text
+    # Whole invocations are kept, starting with the message of the user
+    assert recent[0].author == "user"
+    assert recent[-1].invocation_id == "invocation-4"
+    assert {event.invocation_id for event in recent} == {
+        f"invocation-{turn}" for turn in range(5 - len(recent) // 4, 5)
+    }
+
+
+@pytest.mark.asyncio
+async def test_idle_and_least_recently_active_sessions_are_evicted(session_service):
+    for user_id in ["idle", "old", "recent", "latest"]:
+        session = await session_service.create_session(
+            app_name=APP_NAME, user_id=user_id
+        )
+        timestamp = time.time() - (7 * 86400 if user_id == "idle" else 0)
+        await session_service.append_event(
+            session,
+            Event(
+                invocation_id="invocation",
+                author="user",
+                content=_text("user", "Hello"),
+                timestamp=timestamp,
+            ),
+        )
+
+    evictions = registry.counter("session_evictions_total", "", ["reason"])
+    idle_before = evictions.value(reason="idle")
+
+    assert await session_service.evict_idle_sessions() == 2
+    assert evictions.value(reason="idle") == idle_before + 1
+
+    remaining = [
+        user_id
+        for user_id in ["idle", "old", "recent", "latest"]
+        if (
+            await session_service.list_sessions(app_name=APP_NAME, user_id=user_id)
+        ).sessions
+    ]
+    assert remaining == ["recent", "latest"]
+
+
+@pytest.mark.asyncio
+async def test_compaction_runs_off_the_event_loop(session_service, monkeypatch):
+    threads = []
+    monkeypatch.setattr(
+        session_service,
+        "compact_session",
+        lambda session, invocation_id: threads.append(threading.current_thread()),
+    )
+    session = await session_service.create_session(app_name=APP_NAME, user_id="u")
+
+    await _run_turn(session_service, session, 0)
+
+    assert threads and threading.current_thread() not in threads
+
+
+def test_bounded_session_store_serves_the_app(tmp_path, monkeypatch):
+    # main.py replaces the session service class that ADK builds internally
+    monkeypatch.setattr(config, "session_db_url", f"sqlite:///{tmp_path / 's.db'}")
+    monkeypatch.delitem(sys.modules, "main", raising=False)
+    main = importlib.import_module("main")
+    created = []
+    create_session = BoundedSessionService.create_session
+
+    async def spy(self, **kwargs):
+        created.append(self)
+        return await create_session(self, **kwargs)
+
+    monkeypatch.setattr(BoundedSessionService, "create_session", spy)
+
+    response = TestClient(main.app).post(
+        "/apps/adk_hackathon_professional_development_agent/users/user/sessions"
+    )
+
+    assert response.status_code == 200
+    assert len(created) == 1
+    assert isinstance(created[0], BoundedSessionService)
+
+
+def test_history_is_compacted_before_the_current_turn():
+    contents = [
+        _text("user", "Question 0?"),
+        _tool_call("get_project_portfolio"),
+        _tool_response("get_project_portfolio"),
+        _text("model", "Answer 0. " + "Details. " * 300),
+        types.Content(
+            role="user",
+            parts=[
+                types.Part(text="For context:"),
+                types.Part(
+                    text="[Other] `get_employee_profile` tool returned result: x"
+                ),
+            ],
+        ),
+        _text("user", "Question 1?"),
+        _tool_call("get_project_portfolio"),
+        _tool_response("get_project_portfolio"),
+    ]
+
+    compacted = compact_contents(contents, max_chars=0)
+
+    assert compacted[-3:] == contents[-3:]
+    history = compacted[:-3]
+    assert [content.role for content in history] == ["user", "model"]
+    assert len(history[1].parts[0].text) <= 1000
+    assert all(part.text for content in history for part in content.parts)
+
+    # Only the latest messages of the history within the budget are kept
+    assert compact_contents(contents, max_chars=50)[:-3] == []
@@ -0,0 +1,79 @@
+"""
+Tests for the vectorized skill gap engine.
+"""
+
+import pytest
+
+from adk_hackathon_professional_development_agent.tools.skill_gaps_tool import (
+    get_top_skill_gaps,
+)
+from adk_hackathon_professional_development_agent.utils.skill_gap_engine import (
+    SkillGapEngine,
+)
+from adk_hackathon_professional_development_agent.utils.skill_index import (
+    reset_skill_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def skill_index(local_backend):
+    reset_skill_index()
+    yield
+    reset_skill_index()
+
+
+def make_engine():
+    return SkillGapEngine(
+        employee_skills={"a@x.com": {"Python", "SQL"}, "b@x.com": {"React"}},
+        project_skills={
+            "Data": {"Python", "SQL", "BigQuery"},
+            "Web": {"React", "TypeScript"},
+            "Legacy": {"COBOL"},
+        },
+        project_statuses={"Data": "Active", "Web": "Planning", "Legacy": "Completed"},
+        status_weights={"Active": 1.0, "Planning": 0.5, "Completed": 0.0},
+    )
+
+
+def test_fit_scores_cover_every_employee_project_pair():
+    engine = make_engine()
+
+    assert engine.fit_scores.shape == (2, 3)
+    data = engine.projects.index("Data")
+    assert engine.fit_scores[engine.emails.index("a@x.com"), data] == pytest.approx(
+        2 / 3
+    )
+
+
+def test_gaps_are_ranked_by_status_weighted_relevance():
+    engine = make_engine()
+
+    gaps = engine.top_gaps("a@x.com", top_k=5)
+
+    assert [gap["skill"] for gap in gaps] == ["BigQuery", "React", "TypeScript"]
+    assert gaps[0]["projects"] == ["Data"]
+    # Completed projects do not create gaps, known skills are never gaps
+    assert all(gap["skill"] not in ("COBOL", "Python", "SQL") for gap in gaps)
+    assert engine.top_gaps("unknown@x.com") == []
+    assert set(engine.top_gaps_for_all(top_k=1)) == {"a@x.com", "b@x.com"}
+
+
+def test_statuses_are_weighted_whatever_their_spelling():
+    engine = SkillGapEngine(
+        employee_skills={"a@x.com": {"Python"}},
+        project_skills={"Mobile": {"Swift"}, "Payments": {"Go"}},
+        project_statuses={"Mobile": "Active ", "Payments": "in progress"},
+        status_weights={"Active": 1.0, "In Progress": 0.8},
+    )
+
+    assert engine.status_weights.tolist() == pytest.approx([1.0, 0.8])
+    assert [gap["skill"] for gap in engine.top_gaps("a@x.com")] == ["Swift", "Go"]
+
+
+@pytest.mark.asyncio
+async def test_tool_returns_the_top_k_gaps():
+    gaps = await get_top_skill_gaps("john.doe@amazincorp.com", top_k=3)
+
+    assert len(gaps) == 3
+    assert gaps == sorted(gaps, key=lambda gap: -gap["score"])
+    assert "Python" not in [gap["skill"] for gap in gaps]
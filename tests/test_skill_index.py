@@ -0,0 +1,91 @@
+"""
+Tests for the skill vocabulary and the skill inverted index.
+"""
+
+import pytest
+
+from adk_hackathon_professional_development_agent.tools.project_skill_gaps_tool import (
+    get_project_skill_gaps,
+)
+from adk_hackathon_professional_development_agent.utils import bigquery_operations
+from adk_hackathon_professional_development_agent.utils.skill_index import (
+    SkillIndex,
+    canonicalize_skill,
+    get_skill_index,
+    reset_skill_index,
+)
+
+
+@pytest.fixture(autouse=True)
+def skill_index(local_backend):
+    reset_skill_index()
+    yield
+    reset_skill_index()
+
+
+def test_aliases_are_canonicalized():
+    assert canonicalize_skill("GCP") == "Google Cloud Platform"
+    assert canonicalize_skill(" google  cloud ") == "Google Cloud Platform"
+    assert canonicalize_skill("Solidity") == "Solidity"
+
+
+def test_index_matches_skills_across_spellings():
+    index = get_skill_index()
+
+    # Profiles spell it "Google Cloud", projects "Google Cloud Platform"
+    assert "john.doe@amazincorp.com" in index.employees_with_skill("gcp")
+    assert "Enterprise Data Warehouse Migration" in index.projects_needing_skill("GCP")
+    assert "Professional Cloud Architect" in index.trainings_covering_skill("GCP")
+
+
+@pytest.mark.asyncio
+async def test_project_skill_gaps_skip_completed_projects_and_known_skills():
+    gaps = await get_project_skill_gaps("john.doe@amazincorp.com")
+
+    assert gaps
+    assert "E-commerce Platform Upgrade" not in [gap["project"] for gap in gaps]
+    for gap in gaps:
+        assert gap["status"] != "Completed"
+        assert "Python" not in gap["missing_skills"]
+        assert "Google Cloud Platform" not in gap["missing_skills"]
+
+
+def test_padded_project_statuses_are_normalized():
+    index = SkillIndex()
+    index.build(
+        [{"email": "a@amazincorp.com", "skills": ["Python"]}],
+        [
+            # As spelled in the project portfolio
+            {"name": "Mobile", "status": "Active ", "skills_needed": ["Swift"]},
+            {"name": "Payments", "status": " in  progress", "skills_needed": ["Go"]},
+            {"name": "Archive", "status": "Completed", "skills_needed": ["COBOL"]},
+        ],
+        [],
+    )
+
+    gaps = index.project_skill_gaps("a@amazincorp.com")
+
+    assert {gap["project"]: gap["status"] for gap in gaps} == {
+        "Mobile": "Active",
+        "Payments": "In Progress",
+    }
+
+
+@pytest.mark.asyncio
+async def test_registered_trainings_are_indexed():
+    index = get_skill_index()
+    await bigquery_operations.insert_json_row_async(
+        "employee_trainings",
+        {
+            "email": "john.doe@amazincorp.com",
+            "name": "Solidity Bootcamp",
+            "description": "Smart contract development",
+            "skills": "Solidity, Security",
+            "date": "2025-09-01",
+            "cost_usd": 499.0,
+            "url": "https://example.com/solidity",
+        },
+    )
+    bigquery_operations.flush_writes()
+
+    assert "Solidity Bootcamp" in index.trainings_covering_skill("solidity")
@@ -0,0 +1,49 @@
+"""
+Tests for the lazy import of the agents and the cloud client libraries of the package.
+"""
+
+import os
+import subprocess
+import sys
+
+import adk_hackathon_professional_development_agent as package
+
+PACKAGE = "adk_hackathon_professional_development_agent"
+
+
+def test_package_and_utilities_import_without_adk_or_cloud_clients():
+    script = (
+        f"import sys, {PACKAGE}, {PACKAGE}.config, "
+        f"{PACKAGE}.utils.bigquery_operations\n"
+        "heavy = ['google.adk', 'google.cloud.bigquery', 'vertexai']\n"
+        "print([name for name in heavy if name in sys.modules])"
+    )
+    # The local backends need neither a Google Cloud project nor a data store
+    environment = {
+        name: value
+        for name, value in os.environ.items()
+        if name
+        not in (
+            "GOOGLE_CLOUD_PROJECT",
+            "VERTEX_AI_SEARCH_DATA_STORE_ID",
+            "COMPANY_INFORMATION_BACKEND",
+        )
+    }
+    environment["DATA_BACKEND"] = "local"
+
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env=environment,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert result.stdout.strip() == "[]"
+
+
+def test_root_agent_is_loaded_on_first_access():
+    from adk_hackathon_professional_development_agent.agent import root_agent
+
+    assert package.root_agent is root_agent
+    assert package.agent.root_agent is root_agent
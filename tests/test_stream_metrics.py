@@ -0,0 +1,99 @@
+"""
+Tests for the latency metrics of the streaming endpoint.
+"""
+
+import json
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from adk_hackathon_professional_development_agent.utils.metrics import registry
+from adk_hackathon_professional_development_agent.utils.stream_metrics import (
+    StreamLatencyMiddleware,
+    TurnLatencyTracker,
+)
+
+
+def _sse(event: dict) -> bytes:
+    return f"data: {json.dumps(event)}\n\n".encode("utf-8")
+
+
+def _text_event(author: str, text: str, partial: bool = True) -> dict:
+    return {
+        "author": author,
+        "partial": partial,
+        "content": {"role": "model", "parts": [{"text": text}]},
+    }
+
+
+def test_tracker_records_first_and_last_token_per_agent():
+    first_token = registry.histogram("stream_time_to_first_token_seconds", "")
+    last_token = registry.histogram("stream_time_to_last_token_seconds", "")
+    events = registry.counter("stream_events_total", "")
+    labels = {"agent": "TrackerTestAgent", "mode": "sse"}
+    first_before, last_before = first_token.count(**labels), last_token.count(**labels)
+    tool_calls_before = events.value(agent="TrackerTestAgent", type="tool_call")
+
+    tracker = TurnLatencyTracker(started=100.0)
+    tracker.add_request_body(b'{"app_name": "app", "streaming": true}')
+    tool_call = {
+        "author": "TrackerTestAgent",
+        "content": {"parts": [{"functionCall": {"name": "get_employee_profile"}}]},
+    }
+    tracker.feed(_sse(tool_call), now=100.5)
+    # Events may be split across chunks of the response body
+    chunk = _sse(_text_event("TrackerTestAgent", "Hello"))
+    tracker.feed(chunk[:10], now=101.0)
+    tracker.feed(chunk[10:], now=101.5)
+    tracker.feed(_sse(_text_event("TrackerTestAgent", "Hello!", False)), now=104.0)
+    tracker.finish()
+    tracker.finish()
+
+    assert tracker.mode == "sse"
+    assert first_token.count(**labels) == first_before + 1
+    assert last_token.count(**labels) == last_before + 1
+    assert first_token.quantile(1.0, **labels) == 2.0
+    assert last_token.quantile(1.0, **labels) == 5.0
+    assert events.value(agent="TrackerTestAgent", type="tool_call") == (
+        tool_calls_before + 1
+    )
+
+
+def test_tracker_ignores_user_thought_and_malformed_events():
+    tracker = TurnLatencyTracker(started=0.0)
+    tracker.add_request_body(b'{"streaming": false}')
+    thought = _text_event("TrackerTestAgent", "Thinking...")
+    thought["content"]["parts"][0]["thought"] = True
+    tracker.feed(_sse(_text_event("user", "Hi")) + _sse(thought) + b"data: {\n\n")
+
+    assert tracker.mode == "none"
+    assert tracker._first_token == {}
+
+
+def test_middleware_only_tracks_the_streaming_endpoint():
+    app = FastAPI()
+
+    @app.post("/run_sse")
+    async def run_sse():
+        async def events():
+            yield _sse(_text_event("MiddlewareTestAgent", "Hi"))
+            yield _sse(_text_event("MiddlewareTestAgent", "Hi there", False))
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.post("/run")
+    async def run():
+        return [_text_event("OtherEndpointTestAgent", "Hi", False)]
+
+    app.add_middleware(StreamLatencyMiddleware)
+    first_token = registry.histogram("stream_time_to_first_token_seconds", "")
+
+    with TestClient(app) as client:
+        response = client.post("/run_sse", json={"streaming": True})
+        assert response.status_code == 200
+        assert "Hi there" in response.text
+        client.post("/run", json={"streaming": True})
+
+    assert first_token.count(agent="MiddlewareTestAgent", mode="sse") == 1
+    assert first_token.count(agent="OtherEndpointTestAgent", mode="sse") == 0
@@ -0,0 +1,96 @@
+"""
+Tests for the per-session tool result memoization.
+"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from adk_hackathon_professional_development_agent.utils import tool_memoization
+from adk_hackathon_professional_development_agent.utils.tool_memoization import (
+    SAVED_CALLS_STATE_KEY,
+    memo_key,
+    memoize_result,
+    use_memoized_result,
+)
+
+
+def make_tool(name):
+    tool = MagicMock()
+    tool.name = name
+    return tool
+
+
+def make_context(state, function_call_id):
+    return MagicMock(state=state, function_call_id=function_call_id)
+
+
+def call(tool, args, state, function_call_id, result):
+    """Run a tool call through the memoization callbacks, like the ADK flow does."""
+    context = make_context(state, function_call_id)
+    response = use_memoized_result(tool, args, context)
+    executed = response is None
+    if executed:
+        response = result
+    memoize_result(tool, args, context, response)
+    return response, executed
+
+
+def test_memo_key_is_independent_of_argument_order():
+    assert memo_key("t", {"a": 1, "b": [1, 2]}) == memo_key("t", {"b": [1, 2], "a": 1})
+    assert memo_key("t", {"a": 1}) != memo_key("u", {"a": 1})
+
+
+def test_repeated_calls_are_served_from_the_session_state():
+    state = {}
+    profile = make_tool("get_employee_profile")
+
+    first = call(profile, {"email": "a@x.com"}, state, "1", {"name": "A"})
+    second = call(profile, {"email": "a@x.com"}, state, "2", {"name": "changed"})
+    other = call(profile, {"email": "b@x.com"}, state, "3", {"name": "B"})
+
+    assert first == ({"name": "A"}, True)
+    assert second == ({"name": "A"}, False)
+    assert other == ({"name": "B"}, True)
+    assert state[SAVED_CALLS_STATE_KEY] == 1
+
+
+def test_results_expire_after_the_tool_ttl(monkeypatch):
+    monkeypatch.setattr(
+        tool_memoization.config, "tool_memo_ttl_seconds", "get_employee_profile=10"
+    )
+    now = 1000.0
+    monkeypatch.setattr(tool_memoization.time, "time", lambda: now)
+    state = {}
+    profile = make_tool("get_employee_profile")
+    call(profile, {"email": "a@x.com"}, state, "1", {"name": "A"})
+
+    now += 5
+    assert call(profile, {"email": "a@x.com"}, state, "2", {"name": "B"})[1] is False
+    now += 6
+    assert call(profile, {"email": "a@x.com"}, state, "3", {"name": "B"})[1] is True
+
+
+@pytest.mark.parametrize("tool_name", ["transfer_to_agent", "register_new_training"])
+def test_excluded_and_write_tools_are_never_memoized(tool_name):
+    state = {}
+    tool = make_tool(tool_name)
+
+    call(tool, {"agent_name": "X"}, state, "1", {"status": "ok"})
+
+    assert call(tool, {"agent_name": "X"}, state, "2", {"status": "ok"})[1] is True
+
+
+def test_write_tools_invalidate_the_session_memo():
+    state = {}
+    history = make_tool("get_employee_training_history")
+    call(history, {"email": "a@x.com"}, state, "1", [{"name": "Old"}])
+
+    call(
+        make_tool("register_new_training"), {"email": "a@x.com"}, state, "2", {"ok": 1}
+    )
+
+    assert call(history, {"email": "a@x.com"}, state, "3", [{"name": "New"}]) == (
+        [{"name": "New"}],
+        True,
+    )
@@ -0,0 +1,98 @@
+"""
+Tests for the per-agent shaping of tool results.
+"""
+
+import datetime
+from unittest.mock import MagicMock
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools.project_portfolio_tool import (
+    get_project_portfolio,
+)
+from adk_hackathon_professional_development_agent.utils.metrics import registry
+from adk_hackathon_professional_development_agent.utils.tool_output_shaping import (
+    estimate_tokens,
+    shape_output,
+    shape_tool_result,
+    summarize_text,
+)
+
+SKILLS_AGENT = "CurrentOrFutureSkillsDevelopmentAgent"
+HISTORY_AGENT = "EmployeeTrainingHistoryAndRemainingTrainingBudgetAgent"
+
+
+def make_call(tool_name, agent_name):
+    tool = MagicMock()
+    tool.name = tool_name
+    return tool, MagicMock(agent_name=agent_name)
+
+
+def test_summarize_text_keeps_whole_sentences():
+    text = "First sentence. Second sentence is longer. Third."
+
+    assert summarize_text(text, 100) == text
+    assert summarize_text(text, 30) == "First sentence."
+    assert summarize_text("A single very long sentence without end", 20) == (
+        "A single very..."
+    )
+
+
+@pytest.mark.asyncio
+async def test_project_portfolio_is_projected_and_filtered(local_backend):
+    projects = await get_project_portfolio()
+    tool, context = make_call("get_project_portfolio", SKILLS_AGENT)
+    tokens_saved = registry.histogram("tool_output_tokens_saved", "")
+    saved_before = tokens_saved.count(agent=SKILLS_AGENT, tool="get_project_portfolio")
+
+    shaped = shape_tool_result(tool, {}, context, projects)["result"]
+
+    assert shaped
+    assert {p["status"] for p in shaped} <= {"Active", "In Progress"}
+    assert len(shaped) == sum(
+        p["status"].strip() in ("Active", "In Progress") for p in projects
+    )
+    # Its status is "Active " in the portfolio, with a trailing space
+    (mobile,) = [p for p in shaped if p["name"] == "Mobile App Development Platform"]
+    assert mobile["status"] == "Active"
+    assert all("customer_location" not in p for p in shaped)
+    assert all(
+        len(p["description"]) <= config.tool_output_max_text_chars for p in shaped
+    )
+    assert estimate_tokens(str(shaped)) < estimate_tokens(str(projects))
+    assert (
+        tokens_saved.count(agent=SKILLS_AGENT, tool="get_project_portfolio")
+        == saved_before + 1
+    )
+
+
+def test_training_history_of_the_current_year_only(monkeypatch):
+    this_year = datetime.date.today().year
+    trainings = [
+        {"name": "Old", "email": "a@x.com", "date": f"{this_year - 1}-05-01"},
+        {"name": "New", "email": "a@x.com", "date": f"{this_year}-02-01"},
+    ]
+
+    assert shape_output(HISTORY_AGENT, "get_employee_training_history", trainings) == [
+        {"name": "Old", "date": f"{this_year - 1}-05-01"},
+        {"name": "New", "date": f"{this_year}-02-01"},
+    ]
+
+    monkeypatch.setattr(config, "tool_output_current_year_trainings_only", True)
+    shaped = shape_output(HISTORY_AGENT, "get_employee_training_history", trainings)
+    assert shaped == [{"name": "New", "date": f"{this_year}-02-01"}]
+
+
+def test_results_of_other_agents_and_tools_are_unchanged(monkeypatch):
+    rows = [{"name": "Project", "status": "Completed"}]
+
+    for tool_name, agent_name in [
+        ("get_project_portfolio", "Other"),
+        ("get_employee_profile", SKILLS_AGENT),
+    ]:
+        tool, context = make_call(tool_name, agent_name)
+        assert shape_tool_result(tool, {}, context, rows) is None
+
+    monkeypatch.setattr(config, "tool_output_shaping_enabled", False)
+    assert shape_output(SKILLS_AGENT, "get_project_portfolio", rows) is rows
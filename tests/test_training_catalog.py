@@ -0,0 +1,118 @@
+"""
+Tests for the training catalog and the training catalog tool.
+"""
+
+import pytest
+
+from adk_hackathon_professional_development_agent.config import config
+from adk_hackathon_professional_development_agent.tools import training_catalog_tool
+from adk_hackathon_professional_development_agent.tools.training_catalog_tool import (
+    find_trainings,
+)
+from adk_hackathon_professional_development_agent.utils import training_catalog
+from adk_hackathon_professional_development_agent.utils.training_catalog import (
+    TrainingCatalog,
+    get_training_catalog,
+    reset_training_catalog,
+)
+
+
+def offering(name, skills, cost, url=None):
+    return {
+        "name": name,
+        "description": f"{name} course",
+        "skills": skills,
+        "date": "2025-09-01",
+        "cost_usd": cost,
+        "url": url or f"https://example.com/{name.lower().replace(' ', '-')}",
+    }
+
+
+@pytest.fixture(autouse=True)
+def catalog(local_backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(config, "training_catalog_path", str(tmp_path / "catalog.json"))
+    reset_training_catalog()
+    yield
+    reset_training_catalog()
+
+
+def test_find_ranks_by_matched_skills_then_cost_within_budget():
+    catalog = TrainingCatalog(refresh_seconds=60, ttl_seconds=120)
+    catalog.add_offerings(
+        [
+            offering("BigQuery Basics", "BigQuery", 100),
+            offering("Data on GCP", ["bq", "Google Cloud"], 300),
+            offering("Cloud Architect", ["GCP"], 50),
+            offering("Expensive GCP", ["GCP", "BigQuery"], 900),
+        ],
+        source="test",
+    )
+
+    names = [o["name"] for o in catalog.find(["BigQuery", "gcp"], max_cost_usd=500)]
+
+    assert names == ["Data on GCP", "Cloud Architect", "BigQuery Basics"]
+
+
+def test_cached_searches_are_refreshed_then_expire(monkeypatch):
+    catalog = TrainingCatalog(refresh_seconds=60, ttl_seconds=120)
+    now = 1000.0
+    monkeypatch.setattr(training_catalog.time, "time", lambda: now)
+    catalog.store_search(["K8s"], [offering("Kubernetes 101", ["Kubernetes"], 10)])
+
+    assert catalog.cached_search(["kubernetes"]) == (
+        [catalog.offerings["https://example.com/kubernetes-101"]],
+        False,
+    )
+    now += 61
+    assert catalog.cached_search(["Kubernetes"])[1] is True
+    now += 60
+    assert catalog.cached_search(["Kubernetes"]) is None
+
+
+def test_searches_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "catalog.json")
+    catalog = TrainingCatalog(refresh_seconds=60, ttl_seconds=120)
+    catalog.store_search(["Vertex AI"], [offering("Vertex", ["Vertex AI"], 20)])
+    catalog.save(path)
+
+    loaded = TrainingCatalog(refresh_seconds=60, ttl_seconds=120)
+    loaded.load(path)
+
+    assert loaded.cached_search(["vertex"])[0][0]["name"] == "Vertex"
+
+
+def test_catalog_is_built_from_employee_trainings():
+    catalog = get_training_catalog()
+
+    assert "Professional Cloud Architect" in {
+        o["name"] for o in catalog.offerings.values()
+    }
+    assert catalog.skills_in_text("Find me a GCP course") == ["Google Cloud Platform"]
+
+
+@pytest.mark.asyncio
+async def test_find_trainings_falls_back_to_web_search_once(monkeypatch):
+    calls = []
+
+    async def search(skills):
+        calls.append(skills)
+        return [offering("Quantum Basics", ["Quantum Computing"], 99)], "[...]"
+
+    monkeypatch.setattr(training_catalog_tool, "search_trainings_on_web", search)
+
+    first = await find_trainings(["Quantum Computing"])
+    second = await find_trainings(["quantum computing"], max_cost_usd=150)
+
+    assert first["source"] == "web_search"
+    assert second == {"source": "cached_search", "trainings": first["trainings"]}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_find_trainings_answers_common_skills_from_the_catalog(monkeypatch):
+    monkeypatch.setattr(config, "training_catalog_min_results", 1)
+
+    result = await find_trainings(["Google Cloud"])
+
+    assert result["source"] == "catalog"
+    assert result["trainings"]
@@ -0,0 +1,71 @@
+"""
+Tests for the warm-up of the worker processes and their write-ahead logs.
+"""
+
+import fcntl
+
+import pytest
+
+from adk_hackathon_professional_development_agent.utils import warmup
+from adk_hackathon_professional_development_agent.utils.warmup import (
+    readiness,
+    warm_up,
+    warm_up_until_ready,
+)
+from adk_hackathon_professional_development_agent.utils.write_pipeline import (
+    claim_log_path,
+)
+
+
+@pytest.mark.asyncio
+async def test_ready_once_every_step_succeeded():
+    calls = []
+    steps = (
+        [("first", lambda: calls.append("first"))],
+        [
+            ("second", lambda: calls.append("second")),
+            ("third", lambda: calls.append("third")),
+        ],
+    )
+
+    assert await warm_up(steps)
+
+    assert calls[0] == "first"
+    assert sorted(calls[1:]) == ["second", "third"]
+    state = readiness.to_dict()
+    assert state["status"] == "ready"
+    assert set(state["steps"]) == {"first", "second", "third"}
+    assert state["warmup_seconds"] is not None
+
+
+@pytest.mark.asyncio
+async def test_failed_warm_up_is_retried(monkeypatch):
+    monkeypatch.setattr(warmup.config, "warmup_retry_seconds", 0.01)
+    attempts = []
+
+    def canary():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("Backend unavailable")
+
+    assert not await warm_up(([], [("canary", canary)]))
+    assert readiness.to_dict()["status"] == "failed"
+    assert "Backend unavailable" in readiness.to_dict()["error"]
+    assert not readiness.is_ready
+
+    await warm_up_until_ready(([], [("canary", canary)]))
+
+    assert readiness.is_ready
+    assert len(attempts) == 3
+
+
+def test_worker_processes_claim_their_own_write_ahead_log(tmp_path):
+    path = str(tmp_path / "write_ahead_log.jsonl")
+    # Held by another worker process
+    with open(f"{path}.lock", "a") as other_worker:
+        fcntl.flock(other_worker, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+        claimed = claim_log_path(path)
+
+    assert claimed == str(tmp_path / "write_ahead_log.1.jsonl")
+    assert claim_log_path(path) == claimed
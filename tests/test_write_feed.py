@@ -0,0 +1,44 @@
+"""
+Tests for the write feed shared by the worker processes.
+"""
+
+from adk_hackathon_professional_development_agent.utils import write_feed
+from adk_hackathon_professional_development_agent.utils.write_feed import WriteFeed
+
+ROW = {"email": "john.doe@amazincorp.com", "name": "Go", "date": "2025-05-01"}
+
+
+def publish_from_other_worker(monkeypatch, feed, rows):
+    with monkeypatch.context() as other_worker:
+        other_worker.setattr(write_feed.os, "getpid", lambda: -1)
+        feed.publish("employee_trainings", rows)
+
+
+def test_rows_written_by_other_workers_are_polled_once(tmp_path, monkeypatch):
+    path = str(tmp_path / "write_feed.jsonl")
+    feed = WriteFeed(path)
+
+    feed.publish("employee_trainings", [ROW])
+    publish_from_other_worker(
+        monkeypatch, WriteFeed(path), [ROW, {**ROW, "name": "Rust"}]
+    )
+
+    assert feed.poll() == [
+        ("employee_trainings", ROW),
+        ("employee_trainings", {**ROW, "name": "Rust"}),
+    ]
+    assert feed.poll() == []
+
+
+def test_emptied_feed_reports_missed_rows(tmp_path, monkeypatch):
+    path = str(tmp_path / "write_feed.jsonl")
+    feed = WriteFeed(path)
+    other_worker_feed = WriteFeed(path, max_bytes=64)
+    publish_from_other_worker(monkeypatch, other_worker_feed, [ROW])
+    assert len(feed.poll()) == 1
+
+    # Past its maximum size, the next append empties the feed first
+    publish_from_other_worker(monkeypatch, other_worker_feed, [{**ROW, "name": "Rust"}])
+
+    assert feed.poll() is None
+    assert feed.poll() == [("employee_trainings", {**ROW, "name": "Rust"})]
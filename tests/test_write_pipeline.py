@@ -0,0 +1,154 @@
+"""
+Tests for the buffered write pipeline and its write-ahead log.
+"""
+
+import json
+import time
+
+import pytest
+
+from adk_hackathon_professional_development_agent.utils import write_pipeline
+from adk_hackathon_professional_development_agent.utils.write_pipeline import (
+    BufferedWriter,
+)
+
+ROW = {"email": "john.doe@amazincorp.com", "name": "Kubernetes Basics"}
+
+
+class RecordingTable:
+    """Collects the written batches, optionally failing every write."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def write_rows(self, table_id, rows, row_ids):
+        if self.fail:
+            raise RuntimeError("backend unavailable")
+        self.batches.append((table_id, rows, row_ids))
+
+
+@pytest.fixture
+def wal_path(tmp_path):
+    return str(tmp_path / "writes.wal")
+
+
+def test_rows_are_written_in_micro_batches(wal_path):
+    table = RecordingTable()
+    flushed = []
+    writer = BufferedWriter(
+        table.write_rows,
+        wal_path,
+        flush_interval_seconds=60,
+        on_flush=lambda table_id, rows: flushed.append(len(rows)),
+    )
+    registration_ids = [writer.submit("employee_trainings", ROW) for _ in range(3)]
+    assert table.batches == []
+
+    writer.close()
+
+    assert table.batches == [("employee_trainings", [ROW] * 3, registration_ids)]
+    assert flushed == [3]
+
+
+def test_flush_is_triggered_by_batch_size(wal_path):
+    table = RecordingTable()
+    writer = BufferedWriter(
+        table.write_rows, wal_path, max_batch_size=2, flush_interval_seconds=60
+    )
+    writer.submit("employee_trainings", ROW)
+    writer.submit("employee_trainings", ROW)
+    deadline = time.monotonic() + 5
+    while not table.batches and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert [len(rows) for _, rows, _ in table.batches] == [2]
+    writer.close()
+
+
+def test_uncommitted_rows_are_replayed_after_a_crash(wal_path):
+    failing_table = RecordingTable(fail=True)
+    crashed_writer = BufferedWriter(
+        failing_table.write_rows, wal_path, flush_interval_seconds=60
+    )
+    registration_id = crashed_writer.submit("employee_trainings", ROW)
+    crashed_writer.flush()
+    assert crashed_writer.pending_rows == 1
+
+    table = RecordingTable()
+    writer = BufferedWriter(table.write_rows, wal_path, flush_interval_seconds=60)
+    writer.close()
+
+    assert table.batches == [("employee_trainings", [ROW], [registration_id])]
+    assert BufferedWriter(table.write_rows, wal_path).pending_rows == 0
+
+
+class RejectingTable(RecordingTable):
+    """Rejects every batch holding a row without a name."""
+
+    def write_rows(self, table_id, rows, row_ids):
+        if any(not row.get("name") for row in rows):
+            raise ValueError("name is required")
+        super().write_rows(table_id, rows, row_ids)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Monotonic clock of the write pipeline, advanced by hand."""
+    now = [1000.0]
+    monkeypatch.setattr(write_pipeline.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_rejected_rows_are_isolated_and_dead_lettered(wal_path, tmp_path, clock):
+    table = RejectingTable()
+    dead_lettered = []
+    writer = BufferedWriter(
+        table.write_rows,
+        wal_path,
+        flush_interval_seconds=60,
+        max_attempts=3,
+        on_dead_letter=lambda table_id, row: dead_lettered.append(row),
+    )
+    rows = [dict(ROW, name=name) for name in ("A", "B", "", "C", "D")]
+    for row in rows:
+        writer.submit("employee_trainings", row)
+
+    assert writer.flush() == 4
+    assert [row["name"] for _, batch, _ in table.batches for row in batch] == [
+        "A",
+        "B",
+        "C",
+        "D",
+    ]
+    assert writer.pending_rows == 1
+
+    # Retried after 60 and 120 seconds
+    clock[0] += 60
+    writer.flush()
+    clock[0] += 120
+    writer.flush()
+
+    assert writer.pending_rows == 0
+    dead_letter_path = tmp_path / "writes.dead_letter.wal"
+    (record,) = [json.loads(line) for line in dead_letter_path.read_text().splitlines()]
+    assert (record["row"], record["attempts"]) == (rows[2], 3)
+    assert dead_lettered == [rows[2]]
+    assert "name is required" in record["error"]
+    writer.close()
+    # Dead-lettered rows are not replayed
+    assert BufferedWriter(table.write_rows, wal_path).pending_rows == 0
+
+
+def test_failed_rows_are_retried_with_backoff(wal_path, clock):
+    table = RecordingTable(fail=True)
+    writer = BufferedWriter(table.write_rows, wal_path, flush_interval_seconds=60)
+    writer.submit("employee_trainings", ROW)
+    writer.flush()
+    table.fail = False
+
+    clock[0] += 59
+    assert writer.flush() == 0
+    assert writer.pending_rows == 1
+    clock[0] += 1
+    assert writer.flush() == 1
+    writer.close()